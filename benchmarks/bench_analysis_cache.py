@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Analysis Cache Benchmark
+------------------------
+Runs analyze_audio over a generated set of clips twice with a persistent
+analysis cache, once cold (every file analyzed) and once warm (every file
+served from the cache, including the fingerprint of each file).
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.speech_processor import JapaneseSpeechProcessor
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark cold and warm analyze_audio runs with the analysis cache",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('--files', type=int, default=50, help='Number of generated clips')
+    parser.add_argument('--seconds', type=float, default=30, help='Length of each clip')
+    parser.add_argument('--sr', type=int, default=24000, help='Sample rate of the clips')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        rng = np.random.default_rng(0)
+        t = np.arange(int(args.seconds * args.sr)) / args.sr
+        names = []
+        for i in range(args.files):
+            y = 0.2 * np.sin(2 * np.pi * (200 + i) * t) + ((t % 0.5) < 0.03) * rng.normal(0, 0.2, len(t))
+            names.append(f"clip_{i:04d}.wav")
+            sf.write(str(Path(temp_dir) / names[-1]), y, args.sr, subtype='PCM_16')
+        print(f"{args.files} clips of {args.seconds} s at {args.sr} Hz")
+
+        processor = JapaneseSpeechProcessor(temp_dir, analysis_cache=str(Path(temp_dir) / 'analysis.sqlite'))
+        for label in ("cold", "warm"):
+            start = time.perf_counter()
+            for name in names:
+                processor.analyze_audio(name)
+            elapsed = time.perf_counter() - start
+            print(f"{label:<6} {elapsed:8.3f} s   {1000 * elapsed / args.files:8.2f} ms/file")
+        print(f"Cache: {processor.analysis_cache.stats()}")
+        processor.analysis_cache.close()
+
+
+if __name__ == "__main__":
+    main()
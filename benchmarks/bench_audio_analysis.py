@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Audio Analysis Benchmark
+------------------------
+Compares the previous analyze_audio implementation (librosa.load with
+resampling to 22.05 kHz, then beat tracking, spectral centroid, rolloff and
+zero crossing rate in separate passes) with the streaming analyze_file on a
+generated file, reporting time and peak traced memory of each.
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.audio_analysis import analyze_file
+
+
+def generate(path: Path, minutes: float, sr: int) -> None:
+    """Write a speech-like test file (modulated tone with noise bursts) block by block."""
+    rng = np.random.default_rng(0)
+    with sf.SoundFile(str(path), 'w', samplerate=sr, channels=1, subtype='PCM_16') as f:
+        for start in range(0, int(minutes * 60 * sr), 60 * sr):
+            t = (start + np.arange(60 * sr)) / sr
+            y = 0.2 * np.sin(2 * np.pi * 220 * t) * (1 + np.sin(2 * np.pi * 3 * t)) / 2
+            y += ((t % 0.5) < 0.03) * rng.normal(0, 0.3, len(t))
+            f.write(y[:int(minutes * 60 * sr) - start])
+
+
+def librosa_analysis(path: Path) -> dict:
+    """The previous implementation of analyze_audio."""
+    import librosa
+    y, sr = librosa.load(str(path))
+    tempo, _ = librosa.beat.beat_track(y=y, sr=sr)
+    return {
+        "duration": librosa.get_duration(y=y, sr=sr),
+        "tempo": float(np.atleast_1d(tempo)[0]),
+        "mean_spectral_centroid": float(librosa.feature.spectral_centroid(y=y, sr=sr)[0].mean()),
+        "mean_spectral_rolloff": float(librosa.feature.spectral_rolloff(y=y, sr=sr)[0].mean()),
+        "mean_zero_crossing_rate": float(librosa.feature.zero_crossing_rate(y)[0].mean()),
+    }
+
+
+def measure(func, *args, **kwargs):
+    """Return the result, elapsed seconds and peak traced memory in MB of a call."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark streaming audio analysis against the librosa implementation",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('--minutes', type=float, default=10, help='Length of the generated file')
+    parser.add_argument('--sr', type=int, default=24000, help='Sample rate of the generated file')
+    parser.add_argument('--skip-librosa', action='store_true', help='Only run the streaming analysis')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / 'speech.wav'
+        generate(path, args.minutes, args.sr)
+        print(f"{args.minutes} min at {args.sr} Hz")
+
+        rows = []
+        if not args.skip_librosa:
+            # Warm up numba-compiled librosa functions so compilation is not timed
+            warmup = path.with_name('warmup.wav')
+            generate(warmup, 0.1, args.sr)
+            librosa_analysis(warmup)
+            rows.append(("librosa (previous)",) + measure(librosa_analysis, path))
+        rows.append(("streaming",) + measure(analyze_file, path))
+
+        for label, result, elapsed, peak in rows:
+            print(f"{label:<20} {elapsed:8.2f} s   peak {peak:8.1f} MB   tempo {result['tempo']:6.1f}   "
+                  f"centroid {result['mean_spectral_centroid']:7.1f}   zcr {result['mean_zero_crossing_rate']:.4f}")
+
+    if len(rows) == 2:
+        print(f"Streaming: {rows[0][2] / rows[1][2]:.1f}x faster, {rows[0][3] / rows[1][3]:.1f}x less peak memory")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Audio Probe Benchmark
+---------------------
+Reads duration and sample rate of a directory of generated MP3 and WAV
+files with the header probe and with the libraries the processors used
+before (mutagen for MP3, the wave module for WAV), reporting files per
+second for each.
+"""
+
+import sys
+import time
+import wave
+import argparse
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.audio_probe import probe_audio
+
+
+def generate(directory: Path, count: int, seconds: float, sr: int, extension: str) -> list:
+    """Write count copies of a tone clip and return their paths."""
+    source = directory / f"source.{extension}"
+    y = 0.2 * np.sin(2 * np.pi * 220 * np.arange(int(seconds * sr)) / sr)
+    sf.write(str(source), y, sr, format=extension.upper())
+    data = source.read_bytes()
+    paths = []
+    for i in range(count):
+        path = directory / f"clip_{i:05d}.{extension}"
+        path.write_bytes(data)
+        paths.append(path)
+    return paths
+
+
+def mutagen_mp3(path: Path) -> float:
+    from mutagen.mp3 import MP3
+    return MP3(path).info.length
+
+
+def wave_wav(path: Path) -> float:
+    with wave.open(str(path), 'r') as f:
+        return f.getnframes() / f.getframerate()
+
+
+def rate(func, paths: list) -> tuple:
+    """Return files per second and the first result."""
+    start = time.perf_counter()
+    results = [func(path) for path in paths]
+    return len(paths) / (time.perf_counter() - start), results[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark header-only audio probing",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('--files', type=int, default=2000, help='Files of each format')
+    parser.add_argument('--seconds', type=float, default=30, help='Length of each clip')
+    parser.add_argument('--sr', type=int, default=24000, help='Sample rate of the clips')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        mp3_dir, wav_dir = Path(temp_dir) / 'mp3', Path(temp_dir) / 'wav'
+        mp3_dir.mkdir()
+        wav_dir.mkdir()
+        mp3s = generate(mp3_dir, args.files, args.seconds, args.sr, 'mp3')
+        wavs = generate(wav_dir, args.files, args.seconds, args.sr, 'wav')
+        print(f"{args.files} MP3 and {args.files} WAV files of {args.seconds} s at {args.sr} Hz")
+
+        rows = [("probe_audio (MP3)",) + rate(lambda p: probe_audio(p).duration, mp3s)]
+        try:
+            rows.append(("mutagen (MP3)",) + rate(mutagen_mp3, mp3s))
+        except ImportError:
+            print("mutagen not installed, skipping")
+        rows.append(("probe_audio (WAV)",) + rate(lambda p: probe_audio(p).duration, wavs))
+        rows.append(("wave module (WAV)",) + rate(wave_wav, wavs))
+        rows.append(("soundfile.info (WAV)",) + rate(lambda p: sf.info(str(p)).duration, wavs))
+
+        for label, files_per_second, duration in rows:
+            print(f"{label:<22} {files_per_second:10.0f} files/s   duration {duration:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
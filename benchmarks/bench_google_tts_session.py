@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Google TTS Session Benchmark
+----------------------------
+Measures the per-request overhead of opening a fresh HTTPS connection for
+every request (what gTTS does) against the shared keep-alive session, using
+a local stub of the TTS endpoint with a self-signed certificate. Network
+latency is not simulated, so the difference is the TCP and TLS setup alone.
+"""
+
+import ssl
+import sys
+import time
+import base64
+import argparse
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.google_tts import synthesize, create_session
+
+AUDIO = b"\xff\xf3" * 2048
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers every POST with a batchexecute response carrying fake audio."""
+
+    protocol_version = "HTTP/1.1"
+    # Send headers and body in one segment, as real servers do, to avoid Nagle/delayed-ACK stalls
+    wbufsize = 1 << 16
+    body = (')]}\'\n\n[["wrb.fr","jQ1olc","[\\"' + base64.b64encode(AUDIO).decode('ascii') +
+            '\\"]",null,null,null,"generic"]]\n').encode('utf-8')
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(temp_dir: Path, tls: bool):
+    """Start the stub server and return it with its URL and certificate path."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    cert = None
+    if tls:
+        cert, key = temp_dir / 'cert.pem', temp_dir / 'key.pem'
+        subprocess.run(['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+                        '-subj', '/CN=127.0.0.1', '-addext', 'subjectAltName=IP:127.0.0.1',
+                        '-keyout', str(key), '-out', str(cert)], check=True, capture_output=True)
+        context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        context.load_cert_chain(str(cert), str(key))
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    scheme = 'https' if tls else 'http'
+    return server, f"{scheme}://127.0.0.1:{server.server_port}/batchexecute", cert
+
+
+def configure(session, cert) -> None:
+    """Trust the stub's certificate (REQUESTS_CA_BUNDLE would override session.verify)."""
+    session.trust_env = False
+    if cert:
+        session.verify = str(cert)
+
+
+def fresh_session(url: str, cert, text: str) -> bytes:
+    """One request on a new session, as gTTS does for every text part."""
+    session = create_session(pool_size=1)
+    configure(session, cert)
+    try:
+        return synthesize(text, session=session, url=url)
+    finally:
+        session.close()
+
+
+def run(func, requests: int, clients: int) -> float:
+    """Issue requests from client threads and return the elapsed seconds."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        list(executor.map(lambda i: func(f"これは{i}番目の文です。"), range(requests)))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the shared Google TTS session against a local stub server",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('--requests', type=int, default=200, help='Number of requests')
+    parser.add_argument('--clients', type=int, default=4, help='Threads issuing requests')
+    parser.add_argument('--pool-size', type=int, default=4, help='Connections in the shared pool')
+    parser.add_argument('--no-tls', action='store_true', help='Use plain HTTP instead of HTTPS')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        server, url, cert = start_server(Path(temp_dir), not args.no_tls)
+        print(f"{args.requests} requests from {args.clients} threads to {url}")
+
+        fresh = run(lambda text: fresh_session(url, cert, text), args.requests, args.clients)
+        print(f"{'new connection each':<22} {fresh:8.3f} s   {1000 * fresh / args.requests:8.2f} ms/request")
+
+        session = create_session(args.pool_size)
+        configure(session, cert)
+        shared = run(lambda text: synthesize(text, session=session, url=url), args.requests, args.clients)
+        session.close()
+        print(f"{'shared session':<22} {shared:8.3f} s   {1000 * shared / args.requests:8.2f} ms/request")
+
+        server.shutdown()
+        server.server_close()
+
+    print(f"Shared session: {fresh / shared:.1f}x the throughput")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Memory-Mapped Reading Benchmark
+-------------------------------
+Compares fetching a range of lines from a large text file with
+read_text_file (decode everything, then split) against the mmap-backed
+read_lines (index newlines, decode only the requested lines). Each mode
+runs in its own process so that peak RSS is measured independently.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+from pathlib import Path
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.text_processor import JapaneseTextProcessor
+
+
+def build_file(path: Path, size_mb: float) -> None:
+    """Write size_mb of the sample texts, repeated, to path."""
+    text_dir = Path(__file__).parent.parent / 'data' / 'text'
+    sample = "\n".join(p.read_text(encoding='utf-8') for p in sorted(text_dir.glob('*.txt'))).encode('utf-8')
+    target = int(size_mb * 1024 * 1024)
+    with open(path, 'wb') as f:
+        written = 0
+        while written < target:
+            f.write(sample)
+            written += len(sample)
+
+
+def run_mode(mode: str, path: str, start: int, count: int) -> dict:
+    """Fetch count lines from start with the given mode and report time and peak RSS."""
+    processor = JapaneseTextProcessor(str(Path(path).parent))
+    begin = time.perf_counter()
+    if mode == 'read':
+        lines = processor.read_text_file(path).split("\n")[start:start + count]
+    else:
+        lines = processor.read_lines(path, start, start + count)
+    elapsed = time.perf_counter() - begin
+    # ru_maxrss is in kilobytes on Linux
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return {"mode": mode, "seconds": elapsed, "peak_rss": peak_rss, "lines": len(lines)}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark memory-mapped random access to lines",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('--size-mb', type=float, default=200.0, help='File size in MB')
+    parser.add_argument('--start', type=int, default=1000000, help='First line to fetch')
+    parser.add_argument('--count', type=int, default=100, help='Number of lines to fetch')
+    parser.add_argument('--mode', choices=['read', 'mmap'], help=argparse.SUPPRESS)
+    parser.add_argument('--file', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args.file, args.start, args.count)))
+        return
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / 'corpus.txt'
+        build_file(path, args.size_mb)
+        print(f"File: {os.path.getsize(path) / 1024 / 1024:.1f} MB, lines {args.start}-{args.start + args.count}")
+
+        results = {}
+        for mode in ('read', 'mmap'):
+            output = subprocess.run(
+                [sys.executable, __file__, '--mode', mode, '--file', str(path),
+                 '--start', str(args.start), '--count', str(args.count)],
+                check=True, capture_output=True, text=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            results[mode] = result
+            print(f"{mode:<5} {result['seconds']:8.3f} s   peak RSS {result['peak_rss'] / 1024 / 1024:8.1f} MB"
+                  f"   ({result['lines']} lines)")
+
+        speedup = results['read']['seconds'] / results['mmap']['seconds']
+        memory = results['read']['peak_rss'] / results['mmap']['peak_rss']
+        print(f"mmap: {speedup:.2f}x faster, {memory:.2f}x lower peak RSS")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Markdown Cleaner Benchmark
+--------------------------
+Compares the original clean_markdown of markdown_to_speech.py (eleven
+sequential re.sub calls, each copying the document) with the single-pass
+cleaner on the whole text and streamed from disk.
+"""
+
+import re
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.markdown_cleaner import clean_markdown, iter_clean_markdown
+
+
+def build_document(size_mb: float) -> str:
+    """Repeat the sample markdown, plus a link and an image, up to size_mb of UTF-8."""
+    sample = (Path(__file__).parent.parent / 'data' / 'text' / 'sample_japanese.md').read_text(encoding='utf-8')
+    sample += "\n\n詳しくは[公式サイト](https://example.com)を参照してください。![図](figure.png)\n\n"
+    repeats = int(size_mb * 1024 * 1024) // len(sample.encode('utf-8')) + 1
+    return sample * repeats
+
+
+def legacy_clean(path: str) -> str:
+    """The original clean_markdown, applied to the whole file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        markdown_text = f.read()
+    text = re.sub(r'```.*?```', '', markdown_text, flags=re.DOTALL)
+    text = re.sub(r'^#{1,6}\s+(.+)$', r'\1.', text, flags=re.MULTILINE)
+    text = re.sub(r'^\s*[-*+]\s+(.+)$', r'\1.', text, flags=re.MULTILINE)
+    text = re.sub(r'^\s*\d+\.\s+(.+)$', r'\1.', text, flags=re.MULTILINE)
+    text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)
+    text = re.sub(r'\*(.+?)\*', r'\1', text)
+    text = re.sub(r'__(.+?)__', r'\1', text)
+    text = re.sub(r'_(.+?)_', r'\1', text)
+    text = re.sub(r'\[(.+?)\]\(.+?\)', r'\1', text)
+    text = re.sub(r'!\[.+?\]\(.+?\)', '', text)
+    text = re.sub(r'\n\s*\n', '\n', text)
+    return text.strip()
+
+
+def single_pass(path: str) -> str:
+    """The single-pass cleaner on the whole file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return clean_markdown(f.read())
+
+
+def streamed(path: str) -> int:
+    """The single-pass cleaner streaming the file, discarding the output."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return sum(len(line) for line in iter_clean_markdown(f))
+
+
+def measure(func, path: str):
+    """Return (seconds, peak traced bytes) of func(path), timed without tracing."""
+    start = time.perf_counter()
+    func(path)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the single-pass Markdown cleaner",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('--size-mb', type=float, default=50.0, help='Document size in MB of UTF-8')
+    args = parser.parse_args()
+
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', suffix='.md', delete=False) as f:
+        f.write(build_document(args.size_mb))
+        path = f.name
+    print(f"Document: {Path(path).stat().st_size / 1024 / 1024:.1f} MB")
+
+    cases = [
+        ("re.sub x11", legacy_clean),
+        ("single pass", single_pass),
+        ("single pass streamed", streamed),
+    ]
+    try:
+        results = {}
+        for name, func in cases:
+            results[name] = measure(func, path)
+            elapsed, peak = results[name]
+            print(f"{name:<22} {elapsed:8.2f} s   peak {peak / 1024 / 1024:8.2f} MB")
+    finally:
+        Path(path).unlink()
+
+    base_time, base_peak = results[cases[0][0]]
+    for name, _ in cases[1:]:
+        elapsed, peak = results[name]
+        print(f"{name}: {base_time / elapsed:.2f}x the speed, {base_peak / max(1, peak):.2f}x less peak memory")
+
+
+if __name__ == "__main__":
+    main()
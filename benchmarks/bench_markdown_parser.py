@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Markdown Parser Benchmark
+-------------------------
+Compares the original read_markdown_file extraction (read the whole file,
+then one re.findall pass per element type) with read_markdown_file, which
+now runs the single-pass parser, with the parser keeping every element and
+its line number, and with the elements streamed from disk, for a
+structure-dense document (the sample markdown repeated) and a prose-heavy one.
+"""
+
+import re
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.markdown_parser import parse_markdown, iter_markdown_elements
+from src.text_processor import JapaneseTextProcessor
+
+PROSE_PARAGRAPH = "日本語の自然言語処理は、形態素解析から始まります。文章を単語に分割し、それぞれの品詞や読みを調べます。" * 3
+
+
+def build_document(size_mb: float, prose: bool = False) -> str:
+    """Repeat a sample section until the document reaches size_mb of UTF-8."""
+    if prose:
+        sample = "## 見出し\n\n" + (PROSE_PARAGRAPH + "\n") * 4 + "\n- 項目\n\n"
+    else:
+        sample = (Path(__file__).parent.parent / 'data' / 'text' / 'sample_japanese.md').read_text(encoding='utf-8')
+        sample += "\n\n"
+    repeats = int(size_mb * 1024 * 1024) // len(sample.encode('utf-8')) + 1
+    return sample * repeats
+
+
+def legacy_extract(path: str) -> dict:
+    """The original read_markdown_file: read everything, then four regex passes."""
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    headers = re.findall(r'^(#{1,6})\s+(.+)$', content, re.MULTILINE)
+    bullet_lists = re.findall(r'^\s*[-*+]\s+(.+)$', content, re.MULTILINE)
+    numbered_lists = re.findall(r'^\s*\d+\.\s+(.+)$', content, re.MULTILINE)
+    code_blocks = re.findall(r'```(?:\w+)?\n([\s\S]*?)```', content)
+    return {
+        "raw_content": content,
+        "headers": [(len(h[0]), h[1]) for h in headers],
+        "bullet_lists": bullet_lists,
+        "numbered_lists": numbered_lists,
+        "code_blocks": code_blocks
+    }
+
+
+def read_markdown(path: str) -> dict:
+    """The current read_markdown_file: the single-pass parser on the whole file."""
+    return JapaneseTextProcessor().read_markdown_file(path)
+
+
+def with_elements(path: str) -> dict:
+    """The single-pass parser, also keeping every element with its line number."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return parse_markdown(f.read(), elements=True)
+
+
+def streamed(path: str) -> int:
+    """Stream the elements of the file without keeping the document."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return sum(1 for _ in iter_markdown_elements(f))
+
+
+def measure(func, path: str, repeat: int):
+    """Return (best seconds, peak traced bytes) of func(path)."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(path)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(times), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the single-pass Markdown parser",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('--size-mb', type=float, default=20.0, help='Document size in MB of UTF-8')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per case (best is reported)')
+    args = parser.parse_args()
+
+    cases = [
+        ("regex findall x4", legacy_extract),
+        ("read_markdown_file", read_markdown),
+        ("with elements", with_elements),
+        ("streamed elements", streamed),
+    ]
+
+    for label, prose in (("structure-dense", False), ("prose-heavy", True)):
+        document = build_document(args.size_mb, prose)
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', suffix='.md', delete=False) as f:
+            f.write(document)
+            path = f.name
+        print(f"\n{label}: {len(document):,} characters, {document.count(chr(10)):,} lines")
+        del document
+
+        try:
+            results = {}
+            for name, func in cases:
+                results[name] = measure(func, path, args.repeat)
+                elapsed, peak = results[name]
+                print(f"  {name:<22} {elapsed:8.3f} s   peak {peak / 1024 / 1024:8.2f} MB")
+        finally:
+            Path(path).unlink()
+
+        base_time, base_peak = results[cases[0][0]]
+        for name, _ in cases[1:]:
+            elapsed, peak = results[name]
+            print(f"  {name}: {base_time / elapsed:.2f}x the speed, {base_peak / max(1, peak):.2f}x less peak memory than regex")
+
+
+if __name__ == "__main__":
+    main()
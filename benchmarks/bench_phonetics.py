@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Phonetic Conversion Benchmark
+-----------------------------
+Compares the original to_hiragana / tokenize implementations (string
+concatenation, one dict per token) with the streaming versions
+(generator + single join, TokenInfo tuples) on a large generated corpus.
+"""
+
+import sys
+import time
+import argparse
+import tracemalloc
+from pathlib import Path
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.japanese_phonetics import JapanesePhoneticConverter, get_tokenizer
+
+
+def build_corpus(size_mb: float) -> str:
+    """Repeat the sample texts until the corpus reaches size_mb of UTF-8."""
+    text_dir = Path(__file__).parent.parent / 'data' / 'text'
+    sample = "\n".join(p.read_text(encoding='utf-8') for p in sorted(text_dir.glob('*.txt')))
+    target = int(size_mb * 1024 * 1024)
+    repeats = target // len(sample.encode('utf-8')) + 1
+    return (sample * repeats).encode('utf-8')[:target].decode('utf-8', errors='ignore')
+
+
+def legacy_to_hiragana(tokenizer, text: str) -> str:
+    """The original to_hiragana loop."""
+    result = ""
+    for token in tokenizer.tokenize(text):
+        result += token.reading
+    return result
+
+
+def legacy_tokenize(tokenizer, text: str) -> list:
+    """The original tokenize loop."""
+    result = []
+    for token in tokenizer.tokenize(text):
+        token_info = {
+            'surface': token.surface,
+            'base_form': token.base_form,
+            'reading': token.reading,
+            'part_of_speech': token.part_of_speech.split(',')[0]
+        }
+        result.append(token_info)
+    return result
+
+
+def measure(func, *args):
+    """Return (seconds, peak traced bytes) of one call, timed without tracing."""
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark streaming phonetic conversion",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('--size-mb', type=float, default=10.0, help='Corpus size in MB of UTF-8')
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.size_mb)
+    tokenizer = get_tokenizer()
+    converter = JapanesePhoneticConverter()
+    print(f"Corpus: {len(corpus):,} characters ({args.size_mb} MB)")
+
+    # Warm up the dictionary so the first case is not penalized
+    for _ in tokenizer.tokenize(corpus[:10000]):
+        pass
+
+    cases = [
+        ("to_hiragana (legacy)", legacy_to_hiragana, tokenizer),
+        ("to_hiragana (streaming)", converter._janome_reading, None),
+        ("tokenize (legacy dicts)", legacy_tokenize, tokenizer),
+        ("tokenize (TokenInfo)", converter.tokenize, None),
+    ]
+
+    results = {}
+    for name, func, first_arg in cases:
+        call_args = (first_arg, corpus) if first_arg is not None else (corpus,)
+        elapsed, peak = measure(func, *call_args)
+        results[name] = (elapsed, peak)
+        print(f"{name:<26} {elapsed:8.2f} s   peak {peak / 1024 / 1024:8.1f} MB")
+
+    for legacy, streaming in ((cases[0][0], cases[1][0]), (cases[2][0], cases[3][0])):
+        speedup = results[legacy][0] / results[streaming][0]
+        memory = results[legacy][1] / max(1, results[streaming][1])
+        print(f"{streaming}: {speedup:.2f}x faster, {memory:.2f}x less peak memory")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+pyttsx3 Worker Benchmark
+------------------------
+Measures utterances per second when many threads request speech, comparing
+the previous approach (one shared engine, save_to_file + runAndWait per
+request behind a lock) with the persistent worker that batches queued
+requests into one runAndWait cycle. By default a simulated engine with a
+fixed cost per cycle plus a cost per utterance is used; --real uses the
+installed pyttsx3 driver.
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.pyttsx3_worker import Pyttsx3Worker, create_japanese_engine
+
+
+class SimulatedEngine:
+    """Engine whose runAndWait costs cycle_cost plus utterance_cost per queued utterance."""
+
+    def __init__(self, cycle_cost: float, utterance_cost: float):
+        self.cycle_cost = cycle_cost
+        self.utterance_cost = utterance_cost
+        self.pending = []
+
+    def save_to_file(self, text: str, path: str) -> None:
+        self.pending.append(path)
+
+    def runAndWait(self) -> None:
+        time.sleep(self.cycle_cost + self.utterance_cost * len(self.pending))
+        for path in self.pending:
+            Path(path).write_bytes(b"RIFF")
+        self.pending = []
+
+
+def per_call(engine_factory, requests, clients: int) -> float:
+    """One engine shared by all clients, one runAndWait per request."""
+    engine = engine_factory()
+    lock = threading.Lock()
+
+    def speak(request):
+        with lock:
+            engine.save_to_file(*request)
+            engine.runAndWait()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        list(executor.map(speak, requests))
+    return time.perf_counter() - start
+
+
+def worker(engine_factory, requests, clients: int) -> float:
+    """The persistent worker, batching whatever requests are queued."""
+    with Pyttsx3Worker(engine_factory) as tts_worker:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=clients) as executor:
+            list(executor.map(lambda request: tts_worker.save_to_file(*request), requests))
+        elapsed = time.perf_counter() - start
+        print(f"  worker rendered {tts_worker.utterances} utterances in {tts_worker.batches} cycles")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the persistent pyttsx3 worker",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('--utterances', type=int, default=200, help='Number of requests')
+    parser.add_argument('--clients', type=int, default=16, help='Threads issuing requests')
+    parser.add_argument('--cycle-cost', type=float, default=0.02, help='Simulated seconds per runAndWait cycle')
+    parser.add_argument('--utterance-cost', type=float, default=0.002, help='Simulated seconds per utterance')
+    parser.add_argument('--real', action='store_true', help='Use the installed pyttsx3 driver')
+    args = parser.parse_args()
+
+    if args.real:
+        engine_factory = create_japanese_engine
+    else:
+        engine_factory = lambda: SimulatedEngine(args.cycle_cost, args.utterance_cost)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        requests = [(f"これは{i}番目の文です。", str(Path(temp_dir) / f"{i}.wav")) for i in range(args.utterances)]
+        print(f"{args.utterances} utterances from {args.clients} threads")
+
+        results = {}
+        for name, func in (("runAndWait per call", per_call), ("persistent worker", worker)):
+            elapsed = func(engine_factory, requests, args.clients)
+            results[name] = elapsed
+            print(f"{name:<20} {elapsed:8.3f} s   {args.utterances / elapsed:8.1f} utterances/s")
+
+    print(f"Worker: {results['runAndWait per call'] / results['persistent worker']:.1f}x the throughput")
+
+
+if __name__ == "__main__":
+    main()
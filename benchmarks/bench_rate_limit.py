@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Rate Limiter Benchmark
+----------------------
+Sends Google TTS requests from many threads to a local stub server that
+answers HTTP 429 above a fixed request rate, once without and once with the
+client-side TokenBucket, and reports throughput and failed requests.
+"""
+
+import sys
+import time
+import base64
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.google_tts import synthesize, create_session
+from src.rate_limit import TokenBucket
+
+BODY = (')]}\'\n\n[["wrb.fr","jQ1olc","[\\"' + base64.b64encode(b"MP3").decode('ascii') +
+        '\\"]",null,null,null,"generic"]]\n').encode('utf-8')
+
+
+class ThrottlingHandler(BaseHTTPRequestHandler):
+    """Answers with audio while the server's own bucket has tokens, otherwise 429."""
+
+    protocol_version = "HTTP/1.1"
+    wbufsize = 1 << 16
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        allowed = self.server.bucket.reserve(max_wait=0) is not None
+        body = BODY if allowed else b"rate limited"
+        self.send_response(200 if allowed else 429)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run(url: str, requests: int, clients: int, limiter) -> tuple:
+    """Send requests without retries; return elapsed seconds and the number of failures."""
+    session = create_session(clients)
+    session.trust_env = False
+    failures = 0
+    lock = threading.Lock()
+
+    def send(i: int) -> None:
+        nonlocal failures
+        try:
+            synthesize(f"これは{i}番目の文です。", session=session, url=url, retries=0, limiter=limiter)
+        except Exception:
+            with lock:
+                failures += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        list(executor.map(send, range(requests)))
+    elapsed = time.perf_counter() - start
+    session.close()
+    return elapsed, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark client-side rate limiting against a throttling stub server",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('--requests', type=int, default=200, help='Number of requests')
+    parser.add_argument('--clients', type=int, default=8, help='Threads issuing requests')
+    parser.add_argument('--server-rate', type=float, default=50, help='Requests per second the server accepts')
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ThrottlingHandler)
+    url = f"http://127.0.0.1:{server.server_port}/batchexecute"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"{args.requests} requests from {args.clients} threads; server accepts {args.server_rate}/s")
+
+    # The server's bucket is kept a little more generous than the client's
+    for label, limiter in (("no limiter", None), ("token bucket", TokenBucket(args.server_rate * 0.95, burst=1))):
+        server.bucket = TokenBucket(args.server_rate, burst=5)
+        elapsed, failures = run(url, args.requests, args.clients, limiter)
+        succeeded = args.requests - failures
+        print(f"{label:<14} {elapsed:7.2f} s   {succeeded / elapsed:7.1f} successful/s   {failures:4d} failed")
+
+    server.shutdown()
+    server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Transcription Pipeline Benchmark
+--------------------------------
+Measures the overhead transcribe_file adds around a recognizer on a long
+generated recording: reading, resampling to 16 kHz and VAD segmentation,
+with a recognizer that returns immediately. Reports the real-time factor
+and peak traced memory; the memory stays at about one segment however long
+the recording is.
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.speech_recognizers import SpeechRecognizer, transcribe_file
+
+
+class NullRecognizer(SpeechRecognizer):
+    """Returns the segment length without recognizing anything."""
+
+    name = 'null'
+
+    def transcribe(self, samples: np.ndarray) -> str:
+        return f"{len(samples)} "
+
+
+def generate(path: Path, minutes: float, sr: int) -> None:
+    """Write utterances of 1-8 s separated by 0.3-1.5 s pauses, one minute at a time."""
+    rng = np.random.default_rng(0)
+    with sf.SoundFile(str(path), 'w', samplerate=sr, channels=1, subtype='PCM_16') as f:
+        written = 0
+        while written < minutes * 60 * sr:
+            speech = 0.2 * rng.normal(0, 1, int(rng.uniform(1, 8) * sr))
+            pause = 0.001 * rng.normal(0, 1, int(rng.uniform(0.3, 1.5) * sr))
+            f.write(np.concatenate((speech, pause)))
+            written += len(speech) + len(pause)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark file reading and VAD segmentation for transcription",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('--minutes', type=float, default=30, help='Length of the generated recording')
+    parser.add_argument('--sr', type=int, default=24000, help='Sample rate of the generated recording')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / 'talk.wav'
+        generate(path, args.minutes, args.sr)
+        seconds = sf.info(str(path)).duration
+        print(f"{seconds / 60:.1f} min at {args.sr} Hz ({path.stat().st_size / 1e6:.0f} MB)")
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = transcribe_file(path, NullRecognizer())
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+
+        lengths = [s["end"] - s["start"] for s in result["segments"]]
+        print(f"{len(lengths)} segments, {min(lengths):.1f}-{max(lengths):.1f} s")
+        print(f"{elapsed:.2f} s ({seconds / elapsed:.0f}x real time), peak {peak:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
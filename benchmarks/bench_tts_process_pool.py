@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+pyttsx3 Process Pool Benchmark
+------------------------------
+Measures offline synthesis throughput of one engine (Pyttsx3Worker) against
+TTSProcessPool with several engine processes. By default a simulated engine
+that burns CPU per character stands in for eSpeak; --real uses the
+installed pyttsx3 driver.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.pyttsx3_worker import Pyttsx3Worker, create_japanese_engine
+from src.tts_process_pool import TTSProcessPool
+
+# Simulated CPU work per character (iterations of a busy loop)
+SPINS_PER_CHAR = 20000
+
+
+class CPUBoundEngine:
+    """Engine that renders by burning CPU in proportion to the text length."""
+
+    def __init__(self):
+        self.pending = []
+
+    def save_to_file(self, text: str, path: str) -> None:
+        self.pending.append((text, path))
+
+    def runAndWait(self) -> None:
+        for text, path in self.pending:
+            total = 0
+            for i in range(SPINS_PER_CHAR * len(text)):
+                total += i
+            Path(path).write_bytes(b"RIFF")
+        self.pending = []
+
+
+def cpu_bound_engine() -> CPUBoundEngine:
+    return CPUBoundEngine()
+
+
+def run(tts, requests, clients: int) -> float:
+    """Issue every request from client threads and return the elapsed seconds."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        list(executor.map(lambda request: tts.save_to_file(*request), requests))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the pyttsx3 process pool",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('--utterances', type=int, default=64, help='Number of requests')
+    parser.add_argument('--clients', type=int, default=16, help='Threads issuing requests')
+    parser.add_argument('--processes', type=int, default=os.cpu_count(), help='Engine processes in the pool')
+    parser.add_argument('--real', action='store_true', help='Use the installed pyttsx3 driver')
+    args = parser.parse_args()
+
+    engine_factory = create_japanese_engine if args.real else cpu_bound_engine
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        requests = [(f"これは{i}番目の文です。", str(Path(temp_dir) / f"{i}.wav")) for i in range(args.utterances)]
+        print(f"{args.utterances} utterances from {args.clients} threads, {os.cpu_count()} CPUs")
+
+        with Pyttsx3Worker(engine_factory) as worker:
+            single = run(worker, requests, args.clients)
+        print(f"{'one engine':<22} {single:8.3f} s   {args.utterances / single:8.1f} utterances/s")
+
+        with TTSProcessPool(args.processes, engine_factory) as pool:
+            pooled = run(pool, requests, args.clients)
+        label = f"pool of {args.processes}"
+        print(f"{label:<22} {pooled:8.3f} s   {args.utterances / pooled:8.1f} utterances/s")
+
+    print(f"Pool: {single / pooled:.1f}x the throughput")
+
+
+if __name__ == "__main__":
+    main()
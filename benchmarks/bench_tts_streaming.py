@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Streaming Speech Benchmark
+--------------------------
+Compares the time to first audio byte of text_to_speech (whole file, even
+in chunked mode) with stream_text_to_speech. By default a simulated engine
+with a fixed request latency plus a per-character cost stands in for
+Google TTS; --real uses the network.
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src import tts_engines
+from src.speech_processor_gtts import JapaneseSpeechProcessor
+
+SENTENCE = "日本語の音声合成では、文ごとに音声を作って順番につなげます。"
+
+
+def simulated_engine(base: float, per_char: float):
+    """Return a synthesize function sleeping base + per_char * len(text) seconds."""
+    def synthesize(text: str) -> bytes:
+        time.sleep(base + per_char * len(text))
+        return text.encode('utf-8')
+    return synthesize
+
+
+def whole_file(processor: JapaneseSpeechProcessor, text: str, workers: int, output_dir: Path):
+    """text_to_speech in chunked mode: the first byte is available when the file is."""
+    start = time.perf_counter()
+    processor.text_to_speech(text, str(output_dir / "whole.mp3"), chunked=True, max_workers=workers)
+    elapsed = time.perf_counter() - start
+    return elapsed, elapsed
+
+
+def streamed(processor: JapaneseSpeechProcessor, text: str, workers: int, output_dir: Path):
+    """stream_text_to_speech: the first byte is available after the first chunk."""
+    start = time.perf_counter()
+    first = None
+    for _ in processor.stream_text_to_speech(text, max_workers=workers):
+        if first is None:
+            first = time.perf_counter() - start
+    return first, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark time to first audio of streaming synthesis",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument('--sentences', type=int, default=40, help='Number of sentences in the document')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent synthesis requests')
+    parser.add_argument('--base-latency', type=float, default=0.3, help='Simulated seconds per request')
+    parser.add_argument('--char-latency', type=float, default=0.002, help='Simulated seconds per character')
+    parser.add_argument('--real', action='store_true', help='Use Google TTS instead of the simulated engine')
+    args = parser.parse_args()
+
+    text = "\n".join(SENTENCE for _ in range(args.sentences))
+    print(f"Document: {args.sentences} sentences, {len(text):,} characters, {args.workers} workers")
+
+    cases = [
+        ("text_to_speech", whole_file),
+        ("stream_text_to_speech", streamed),
+    ]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_dir = Path(temp_dir)
+        processor = JapaneseSpeechProcessor(temp_dir)
+        results = {}
+        for name, func in cases:
+            if args.real:
+                results[name] = func(processor, text, args.workers, output_dir)
+            else:
+                engine = simulated_engine(args.base_latency, args.char_latency)
+                with patch.object(tts_engines, 'GTTS_AVAILABLE', True), \
+                        patch.object(processor, '_synthesize_bytes', side_effect=engine):
+                    results[name] = func(processor, text, args.workers, output_dir)
+            first, total = results[name]
+            print(f"{name:<22} first audio {first:7.3f} s   total {total:7.3f} s")
+
+    base_first, _ = results[cases[0][0]]
+    first, _ = results[cases[1][0]]
+    print(f"Streaming: first audio {base_first / first:.1f}x sooner")
+
+
+if __name__ == "__main__":
+    main()
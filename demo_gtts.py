@@ -25,6 +25,7 @@ except ImportError:
     sys.exit(1)
 
 from src.text_processor import JapaneseTextProcessor
+from src.google_tts import synthesize
 
 def main():
     """Run a Google TTS demo for Japanese text."""
@@ -73,11 +74,8 @@ def main():
         print(f"   MP3ファイルを生成中: {output_path}")
         
         try:
-            # Create gTTS object with Japanese language
-            tts = gTTS(text=phrase['text'], lang='ja', slow=False)
-            
-            # Save to file
-            tts.save(str(output_path))
+            # Synthesize over the shared keep-alive session and save to file
+            output_path.write_bytes(synthesize(phrase['text'], lang='ja', slow=False))
             print(f"   生成完了: {output_path}")
             
             # Save text file for reference
@@ -105,8 +103,7 @@ def main():
         sample_output = output_dir / "sample_japanese.mp3"
         print(f"MP3ファイルを生成中: {sample_output}")
         
-        tts = gTTS(text=demo_text, lang='ja', slow=False)
-        tts.save(str(sample_output))
+        sample_output.write_bytes(synthesize(demo_text, lang='ja', slow=False))
         
         print(f"生成完了: {sample_output}")
         
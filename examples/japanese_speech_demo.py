@@ -112,9 +112,9 @@ def main():
     
     print("\nトークン化結果:")
     for i, token in enumerate(tokens):
-        print(f"{i+1}. {token['surface']} ({token['part_of_speech']})")
-        print(f"   基本形: {token['base_form']}")
-        print(f"   読み方: {token['reading']}")
+        print(f"{i+1}. {token.surface} ({token.part_of_speech})")
+        print(f"   基本形: {token.base_form}")
+        print(f"   読み方: {token.reading}")
     
     # 3. Speech to text (if a real audio file exists)
     print("\n\n3. 音声認識のデモ（Speech-to-Text）")
@@ -8,6 +8,7 @@ Main application entry point using Google TTS as the primary speech engine.
 """
 
 import os
+import json
 import sys
 import argparse
 import logging
@@ -18,10 +19,14 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from src.text_processor import JapaneseTextProcessor
 from src.speech_processor_gtts import JapaneseSpeechProcessor
+from src.speech_processor_engine import EngineSpeechProcessor
+from src.tts_engines import engine_names
+from src.batch_tts import run_batch
 
 # Try to import phonetics module, handle gracefully if missing
 try:
     from src.japanese_phonetics import JapanesePhoneticConverter
+    from src.corpus_conversion import convert_corpus, collect_text_files
     PHONETICS_AVAILABLE = True
 except ImportError:
     PHONETICS_AVAILABLE = False
@@ -33,6 +38,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def parse_line_range(value):
+    """Parse a START:END line range (either side may be empty)."""
+    start, _, stop = value.partition(":")
+    return int(start or 0), (int(stop) if stop else None)
+
 def process_text(args):
     """Process Japanese text files."""
     # 使用绝对路径
@@ -48,8 +58,14 @@ def process_text(args):
     if args.read:
         try:
             # 直接传递文件名或路径，JapaneseTextProcessor会处理路径逻辑
-            content = processor.read_text_file(args.read)
-            print(f"\n{'=' * 40}\n{content}\n{'=' * 40}\n")
+            print(f"\n{'=' * 40}")
+            if args.lines:
+                start, stop = parse_line_range(args.lines)
+                print("\n".join(processor.read_lines(args.read, start, stop)), end="")
+            else:
+                for line in processor.iter_text_file(args.read):
+                    print(line, end="")
+            print(f"\n{'=' * 40}\n")
         except Exception as e:
             logger.error(f"Error reading text file: {e}")
     
@@ -78,6 +94,8 @@ def process_text(args):
                 for i, block in enumerate(structure['code_blocks']):
                     print(f"\nBlock {i+1}:")
                     print(f"```\n{block}\n```")
+
+            print(f"\nParagraphs: {len(structure['paragraphs'])}")
         except Exception as e:
             logger.error(f"Error processing markdown: {e}")
     
@@ -93,7 +111,9 @@ def process_text(args):
             converter = JapanesePhoneticConverter()
             
             # Read the input text
-            if os.path.exists(args.convert):
+            if os.path.exists(args.convert) and args.lines:
+                text = "\n".join(processor.read_lines(args.convert, *parse_line_range(args.lines)))
+            elif os.path.exists(args.convert):
                 text = processor.read_text_file(args.convert)
             else:
                 text = args.convert  # Assume it's direct text input
@@ -127,15 +147,35 @@ def process_text(args):
                     tokens = converter.tokenize(text)
                     print("\nTokenization:")
                     for i, token in enumerate(tokens):
-                        print(f"{i+1}. {token['surface']} ({token.get('part_of_speech', 'unknown')})")
-                        if 'reading' in token:
-                            print(f"   Reading: {token['reading']}")
-                        if 'base_form' in token:
-                            print(f"   Base form: {token['base_form']}")
+                        print(f"{i+1}. {token.surface} ({token.part_of_speech})")
+                        print(f"   Reading: {token.reading}")
+                        print(f"   Base form: {token.base_form}")
                 except Exception as e:
                     print(f"Error tokenizing text: {e}")
         except Exception as e:
             logger.error(f"Error converting text: {e}")
+    
+    if args.convert_dir:
+        if not PHONETICS_AVAILABLE:
+            print("警告: 日本語音声変換モジュールがインストールされていません。")
+            print("pip install janome pykakasi")
+            return
+        
+        targets = [target for target, enabled in (("hiragana", args.to_hiragana),
+                                                  ("romaji", args.to_romaji),
+                                                  ("katakana", args.to_katakana)) if enabled]
+        if not targets:
+            print("Please specify --to-hiragana, --to-romaji or --to-katakana with --convert-dir")
+            return
+        
+        try:
+            paths = collect_text_files(args.convert_dir)
+            for target in targets:
+                outputs = convert_corpus(paths, target, workers=args.workers, output_dir=args.output_dir,
+                                         source_root=args.convert_dir)
+                print(f"Converted {len(outputs)} files to {target}")
+        except Exception as e:
+            logger.error(f"Error converting directory: {e}")
 
 def process_speech(args):
     """Process Japanese speech files."""
@@ -147,7 +187,16 @@ def process_speech(args):
         # 默认使用项目根目录下的data/audio目录
         data_dir = str(Path(__file__).parent / "data" / "audio")
     
-    processor = JapaneseSpeechProcessor(data_dir)
+    if args.engine:
+        try:
+            processor = EngineSpeechProcessor(args.engine, data_dir, cache_dir=args.cache_dir,
+                                              rate_limit=args.rate_limit, rate_limit_file=args.rate_limit_file)
+        except RuntimeError as e:
+            print(f"Error: {e}")
+            return
+    else:
+        processor = JapaneseSpeechProcessor(data_dir, cache_dir=args.cache_dir, rate_limit=args.rate_limit,
+                                            rate_limit_file=args.rate_limit_file)
     
     if args.text_to_speech:
         try:
@@ -169,19 +218,30 @@ def process_speech(args):
                 output_file = args.output
             else:
                 if os.path.exists(input_path):
-                    # Default to using MP3 extension for gTTS
-                    output_file = f"{Path(input_path).stem}.mp3"
+                    # Default to the engine's audio format (MP3 for gTTS)
+                    output_file = f"{Path(input_path).stem}.{processor.audio_format}"
                 else:
-                    output_file = "output.mp3"
+                    output_file = f"output.{processor.audio_format}"
             
             # 转换为语音
-            processor.text_to_speech(text, output_file)
-            print(f"Text-to-speech conversion completed using Google TTS.")
+            processor.text_to_speech(text, output_file, chunked=args.chunked, max_workers=args.workers)
+            print(f"Text-to-speech conversion completed using {processor.engine_label}.")
             print(f"Output saved to: {output_file}")
             
         except Exception as e:
             logger.error(f"Error in text-to-speech conversion: {e}")
     
+    if args.batch:
+        try:
+            output_dir = args.output or str(Path(data_dir) / "batch")
+            summary = run_batch(processor, args.batch, output_dir, manifest_path=args.manifest,
+                                workers=args.workers, chunked=args.chunked)
+            print(f"Batch text-to-speech completed: {summary['done']} done, "
+                  f"{summary['failed']} failed, {summary['skipped']} skipped.")
+            print(f"Output saved to: {output_dir}")
+        except Exception as e:
+            logger.error(f"Error in batch text-to-speech conversion: {e}")
+    
     if args.analyze_audio:
         try:
             properties = processor.analyze_audio(args.analyze_audio)
@@ -191,7 +251,54 @@ def process_speech(args):
         except Exception as e:
             logger.error(f"Error analyzing audio: {e}")
     
-    if args.speech_to_text:
+    if args.analyze_dir:
+        # Bulk analysis needs numpy, so it is only imported when asked for
+        try:
+            from src.batch_analysis import analyze_directory, default_results_path
+        except ImportError as e:
+            print(f"Error: audio analysis is not available ({e})")
+            return
+        try:
+            summary = analyze_directory(args.analyze_dir, results_path=args.analysis_output,
+                                        workers=args.analysis_workers, force=args.reanalyze)
+            print(f"Audio analysis completed: {summary['analyzed']} analyzed, "
+                  f"{summary['failed']} failed, {summary['skipped']} unchanged.")
+            print(f"Results saved to: {args.analysis_output or default_results_path(args.analyze_dir)}")
+        except Exception as e:
+            logger.error(f"Error analyzing audio directory: {e}")
+    
+    recognizer = None
+    if args.recognizer and (args.speech_to_text or args.transcribe_dir):
+        # The recognizers need numpy, so they are only imported when asked for
+        try:
+            from src.speech_recognizers import recognizer_options, create_recognizer
+        except ImportError as e:
+            print(f"Error: speech recognition is not available ({e})")
+            return
+        try:
+            if args.recognizer_model and "model" not in recognizer_options(args.recognizer):
+                print(f"Error: --recognizer-model is not supported by the {args.recognizer} recognizer")
+                return
+            options = {"model": args.recognizer_model} if args.recognizer_model else {}
+            recognizer = create_recognizer(args.recognizer, **options)
+        except (ValueError, RuntimeError, TypeError) as e:
+            print(f"Error: {e}")
+            return
+    
+    if args.speech_to_text and recognizer is not None:
+        from src.speech_recognizers import transcribe_file
+        try:
+            audio_path = args.speech_to_text
+            if not os.path.isabs(audio_path) and not os.path.exists(audio_path):
+                audio_path = str(Path(data_dir) / audio_path)
+            result = transcribe_file(audio_path, recognizer)
+            print(f"\nTranscribed Text ({recognizer.label}):")
+            print(result["text"])
+            for segment in result["segments"]:
+                print(f"  [{segment['start']:8.2f} - {segment['end']:8.2f}] {segment['text']}")
+        except Exception as e:
+            logger.error(f"Error in speech-to-text conversion: {e}")
+    elif args.speech_to_text:
         try:
             text = processor.speech_to_text(args.speech_to_text)
             print(f"\nTranscribed Text:")
@@ -200,6 +307,26 @@ def process_speech(args):
             print("The text is retrieved from the corresponding .txt file if available.")
         except Exception as e:
             logger.error(f"Error in speech-to-text conversion: {e}")
+    
+    if args.transcribe_dir:
+        if recognizer is None:
+            print("Error: --transcribe-dir requires --recognizer")
+            return
+        from src.speech_recognizers import transcribe_files
+        from src.batch_analysis import collect_audio_files
+        try:
+            audio_files = collect_audio_files(args.transcribe_dir)
+            output_path = args.transcripts or str(Path(data_dir) / "transcripts.jsonl")
+            os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+            failed = 0
+            with open(output_path, 'w', encoding='utf-8') as f:
+                for path, result in transcribe_files(audio_files, recognizer):
+                    failed += "error" in result
+                    f.write(json.dumps({"path": path, **result}, ensure_ascii=False) + "\n")
+            print(f"Transcription completed: {len(audio_files) - failed} transcribed, {failed} failed.")
+            print(f"Transcripts saved to: {output_path}")
+        except Exception as e:
+            logger.error(f"Error transcribing audio directory: {e}")
 
 def main():
     parser = argparse.ArgumentParser(
@@ -218,17 +345,46 @@ def main():
     text_parser.add_argument("--read", help="Read and display a text file")
     text_parser.add_argument("--read-markdown", help="Read and analyze a markdown file")
     text_parser.add_argument("--convert", help="Convert text (file path or direct text)")
+    text_parser.add_argument("--lines", help="Only use lines START:END of the file (zero-based, memory-mapped)")
     text_parser.add_argument("--to-hiragana", action="store_true", help="Convert to hiragana")
     text_parser.add_argument("--to-romaji", action="store_true", help="Convert to romaji")
     text_parser.add_argument("--to-katakana", action="store_true", help="Convert to katakana")
     text_parser.add_argument("--tokenize", action="store_true", help="Tokenize the text")
+    text_parser.add_argument("--convert-dir", help="Convert every .txt file in a directory (parallel)")
+    text_parser.add_argument("--output-dir", help="Output directory for --convert-dir (default: next to inputs)")
+    text_parser.add_argument("--workers", type=int, help="Worker processes for --convert-dir (default: CPU count)")
     
     # Speech processing
     speech_parser = subparsers.add_parser("speech", help="Process Japanese speech")
     speech_parser.add_argument("--text-to-speech", help="Convert text or text file to speech")
     speech_parser.add_argument("--analyze-audio", help="Analyze an audio file")
+    speech_parser.add_argument("--analyze-dir", help="Analyze all audio files in a directory or glob into a CSV table")
+    speech_parser.add_argument("--analysis-output", help="CSV table for --analyze-dir (default: <dir>/analysis.csv)")
+    speech_parser.add_argument("--analysis-workers", type=int,
+                               help="Worker processes for --analyze-dir (default: number of CPUs)")
+    speech_parser.add_argument("--reanalyze", action="store_true",
+                               help="Analyze all files again, not only new or changed ones")
     speech_parser.add_argument("--speech-to-text", help="Convert speech to text")
-    speech_parser.add_argument("--output", help="Output file for text-to-speech")
+    speech_parser.add_argument("--recognizer",
+                               help="Speech recognizer for --speech-to-text and --transcribe-dir "
+                                    "(vosk, whisper or google)")
+    speech_parser.add_argument("--recognizer-model",
+                               help="Model of the recognizer (Vosk model directory or Whisper model size/path)")
+    speech_parser.add_argument("--transcribe-dir", help="Transcribe all audio files in a directory or glob")
+    speech_parser.add_argument("--transcripts",
+                               help="JSONL output for --transcribe-dir (default: <data-dir>/transcripts.jsonl)")
+    speech_parser.add_argument("--batch", help="Convert all .txt/.md files in a directory or glob to speech")
+    speech_parser.add_argument("--manifest", help="JSONL manifest for --batch (default: <output>/manifest.jsonl)")
+    speech_parser.add_argument("--output", help="Output file for text-to-speech (output directory for --batch)")
+    speech_parser.add_argument("--cache-dir", help="Directory for the persistent synthesis cache")
+    speech_parser.add_argument("--rate-limit", type=float, help="Maximum TTS requests per second")
+    speech_parser.add_argument("--rate-limit-file",
+                               help="File sharing --rate-limit between processes running at the same time")
+    speech_parser.add_argument("--chunked", action="store_true",
+                               help="Synthesize sentence by sentence with parallel workers")
+    speech_parser.add_argument("--workers", type=int, default=4, help="Number of parallel synthesis workers")
+    speech_parser.add_argument("--engine", choices=engine_names(),
+                               help="TTS engine to synthesize with (default: Google TTS)")
     
     # Demo command
     demo_parser = subparsers.add_parser("demo", help="Run demonstration")
@@ -11,52 +11,14 @@ import os
 import sys
 import argparse
 from pathlib import Path
-import re
 
 # Add the parent directory to the path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.text_processor import JapaneseTextProcessor
 from src.speech_processor_gtts import JapaneseSpeechProcessor
-
-def clean_markdown(markdown_text):
-    """
-    Remove Markdown formatting to get clean text for speech synthesis.
-    
-    Args:
-        markdown_text: Raw markdown text
-        
-    Returns:
-        Clean text suitable for speech synthesis
-    """
-    # Remove code blocks
-    text = re.sub(r'```.*?```', '', markdown_text, flags=re.DOTALL)
-    
-    # Remove headers
-    text = re.sub(r'^#{1,6}\s+(.+)$', r'\1.', text, flags=re.MULTILINE)
-    
-    # Convert bullet points to sentences
-    text = re.sub(r'^\s*[-*+]\s+(.+)$', r'\1.', text, flags=re.MULTILINE)
-    
-    # Convert numbered lists to sentences
-    text = re.sub(r'^\s*\d+\.\s+(.+)$', r'\1.', text, flags=re.MULTILINE)
-    
-    # Remove formatting markers (bold, italic, etc.)
-    text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)
-    text = re.sub(r'\*(.+?)\*', r'\1', text)
-    text = re.sub(r'__(.+?)__', r'\1', text)
-    text = re.sub(r'_(.+?)_', r'\1', text)
-    
-    # Remove links but keep the text
-    text = re.sub(r'\[(.+?)\]\(.+?\)', r'\1', text)
-    
-    # Remove images
-    text = re.sub(r'!\[.+?\]\(.+?\)', '', text)
-    
-    # Convert multiple new lines to a single one
-    text = re.sub(r'\n\s*\n', '\n', text)
-    
-    return text.strip()
+# clean_markdown used to be defined here and is still importable from this script
+from src.markdown_cleaner import clean_markdown, iter_clean_markdown  # noqa: F401
 
 def main():
     parser = argparse.ArgumentParser(
@@ -66,6 +28,10 @@ def main():
     parser.add_argument('markdown_file', help='Path to the markdown file')
     parser.add_argument('--output', '-o', default='output.mp3', help='Output audio file')
     parser.add_argument('--clean', '-c', action='store_true', help='Output clean text file also')
+    parser.add_argument('--chunked', action='store_true', help='Synthesize sentence by sentence in parallel')
+    parser.add_argument('--workers', type=int, default=4, help='Number of parallel synthesis workers')
+    parser.add_argument('--pipeline', action='store_true',
+                        help='Overlap reading, cleaning and synthesis, appending audio as it is ready')
     
     args = parser.parse_args()
     
@@ -74,13 +40,33 @@ def main():
         text_processor = JapaneseTextProcessor()
         speech_processor = JapaneseSpeechProcessor()
         
-        # Read markdown content
-        print(f"Reading markdown file: {args.markdown_file}")
-        markdown_content = text_processor.read_text_file(args.markdown_file)
+        if args.pipeline:
+            if args.clean:
+                clean_file = Path(args.output).with_suffix('.txt')
+                with open(clean_file, 'w', encoding='utf-8') as f:
+                    for i, line in enumerate(iter_clean_markdown(text_processor.iter_text_file(args.markdown_file))):
+                        f.write(f"\n{line}" if i else line)
+                print(f"Clean text saved to: {clean_file}")
+            
+            print(f"Converting to speech (pipelined), output file: {args.output}")
+            stats = speech_processor.pipeline_text_to_speech(
+                text_processor.iter_text_file(args.markdown_file), args.output, max_workers=args.workers
+            )
+            for stage in ('reader', 'cleaner', 'synthesis', 'writer'):
+                if stage in stats:
+                    print(f"  {stage:<10} {stats[stage]['items']:>7} items  "
+                          f"{stats[stage]['items_per_second']:>10.1f} items/s")
+            if stats and stats['time_to_first_audio'] is not None:
+                print(f"  First audio after {stats['time_to_first_audio']} s, total {stats['elapsed']} s")
+            elif stats:
+                print(f"  No audio produced, total {stats['elapsed']} s")
+            print(f"\nOutput audio file: {args.output}")
+            return 0
         
-        # Clean markdown to get plain text
+        # Stream the markdown file through the cleaner to get plain text
+        print(f"Reading markdown file: {args.markdown_file}")
         print("Processing markdown content...")
-        clean_text = clean_markdown(markdown_content)
+        clean_text = "\n".join(iter_clean_markdown(text_processor.iter_text_file(args.markdown_file)))
         
         # Optionally save the clean text
         if args.clean:
@@ -91,7 +77,7 @@ def main():
         
         # Convert to speech
         print(f"Converting to speech, output file: {args.output}")
-        speech_processor.text_to_speech(clean_text, args.output)
+        speech_processor.text_to_speech(clean_text, args.output, chunked=args.chunked, max_workers=args.workers)
         
         print("\nConversion completed successfully!")
         print(f"Output audio file: {args.output}")
@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Analysis Cache
+--------------
+This module provides a persistent SQLite cache for audio analysis results.
+Entries are keyed by file path and analysis parameters and are only served
+while the file's size, modification time and a hash of its first bytes are
+unchanged and the feature version matches, so edited files and changed
+algorithms are analyzed again while repeated runs over the same files are
+answered from the database.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional, Union
+
+from src.audio_analysis import FEATURE_VERSION
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Bytes hashed to catch content changes that keep size and modification time
+HASH_PREFIX_BYTES = 64 * 1024
+# Seconds to wait for another process holding the database lock
+BUSY_TIMEOUT = 30.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS analysis (
+    path TEXT NOT NULL,
+    params TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    hash_prefix TEXT NOT NULL,
+    feature_version INTEGER NOT NULL,
+    result TEXT NOT NULL,
+    created REAL NOT NULL,
+    PRIMARY KEY (path, params)
+)
+"""
+
+
+class Fingerprint(NamedTuple):
+    """Identity of a file's content as far as the cache is concerned."""
+    size: int
+    mtime_ns: int
+    hash_prefix: str
+
+
+def file_fingerprint(audio_file: Union[str, Path]) -> Fingerprint:
+    """
+    Fingerprint a file by size, modification time and a hash of its first bytes.
+
+    Args:
+        audio_file: Path to the file
+
+    Returns:
+        Fingerprint of the file
+    """
+    stat = os.stat(audio_file)
+    with open(audio_file, 'rb') as f:
+        digest = hashlib.sha256(f.read(HASH_PREFIX_BYTES)).hexdigest()
+    return Fingerprint(stat.st_size, stat.st_mtime_ns, digest)
+
+
+def _params_key(params: Optional[Dict[str, Any]]) -> str:
+    return json.dumps(params or {}, sort_keys=True)
+
+
+class AnalysisCache:
+    """Persistent cache of analyze_audio results keyed by file fingerprint."""
+
+    def __init__(self, db_path: Union[str, Path], feature_version: int = FEATURE_VERSION):
+        """
+        Initialize the analysis cache.
+
+        Args:
+            db_path: SQLite database file (created if missing)
+            feature_version: Version of the feature extraction; entries of other versions are ignored
+        """
+        self.db_path = Path(db_path)
+        self.feature_version = feature_version
+
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(self.db_path.parent, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=BUSY_TIMEOUT, check_same_thread=False)
+        with self._conn:
+            # WAL lets readers in other processes proceed while one writes
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+        logger.info(f"Initialized analysis cache at {self.db_path}")
+
+    def get(self, audio_file: Union[str, Path], params: Optional[Dict[str, Any]] = None,
+            fingerprint: Optional[Fingerprint] = None) -> Optional[Dict[str, Any]]:
+        """
+        Look up the analysis result of a file.
+
+        Args:
+            audio_file: Path to the audio file
+            params: Analysis parameters the result must have been computed with
+            fingerprint: Fingerprint of the file, computed if not given
+
+        Returns:
+            The cached result, or None on a miss
+        """
+        path = str(Path(audio_file).resolve())
+        try:
+            fingerprint = fingerprint or file_fingerprint(path)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, hash_prefix, feature_version, result FROM analysis "
+                "WHERE path = ? AND params = ?", (path, _params_key(params))).fetchone()
+            if row is None or tuple(row[:3]) != tuple(fingerprint) or row[3] != self.feature_version:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[4])
+
+    def put(self, audio_file: Union[str, Path], result: Dict[str, Any],
+            params: Optional[Dict[str, Any]] = None, fingerprint: Optional[Fingerprint] = None) -> None:
+        """
+        Store the analysis result of a file.
+
+        Pass the fingerprint taken before the analysis started, so a file
+        modified during the analysis is not cached under its new fingerprint.
+
+        Args:
+            audio_file: Path to the audio file
+            result: Analysis result (JSON-serializable)
+            params: Analysis parameters the result was computed with
+            fingerprint: Fingerprint of the file, computed if not given
+        """
+        path = str(Path(audio_file).resolve())
+        try:
+            fingerprint = fingerprint or file_fingerprint(path)
+        except OSError as e:
+            logger.error(f"Error fingerprinting {path}: {e}")
+            return
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analysis VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (path, _params_key(params), fingerprint.size, fingerprint.mtime_ns, fingerprint.hash_prefix,
+                 self.feature_version, json.dumps(result), time.time()))
+
+    def prune(self) -> int:
+        """
+        Remove entries of other feature versions and of files that no longer exist.
+
+        Returns:
+            Number of removed entries
+        """
+        with self._lock, self._conn:
+            removed = self._conn.execute("DELETE FROM analysis WHERE feature_version != ?",
+                                         (self.feature_version,)).rowcount
+            paths = [row[0] for row in self._conn.execute("SELECT DISTINCT path FROM analysis")]
+            for path in paths:
+                if not os.path.exists(path):
+                    removed += self._conn.execute("DELETE FROM analysis WHERE path = ?", (path,)).rowcount
+        return removed
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM analysis")
+            self.hits = self.misses = 0
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Report cache usage counters.
+
+        Returns:
+            Dictionary with hits, misses, entries and hit ratio
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM analysis").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": entries,
+                "hit_ratio": self.hits / lookups if lookups else 0.0
+            }
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Asynchronous Speech API
+-----------------------
+This module provides an asyncio surface (atext_to_speech / abatch_text_to_speech)
+shared by the speech processors.
+"""
+
+import asyncio
+import logging
+import functools
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Iterable, List, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Default number of synthesis jobs a processor runs at the same time
+DEFAULT_ASYNC_CONCURRENCY = 16
+
+
+class AsyncSpeechMixin:
+    """
+    Mixin adding asyncio methods to a speech processor.
+
+    By default the blocking text_to_speech is run in an executor. Processors
+    with a native non-blocking backend override _atext_to_speech instead.
+    """
+
+    # Maximum number of concurrent atext_to_speech calls per processor
+    async_concurrency: int = DEFAULT_ASYNC_CONCURRENCY
+
+    # Threads of the dedicated executor; None uses the event loop's default
+    # executor. Engines that are not thread-safe (pyttsx3) set this to 1.
+    async_executor_workers: Optional[int] = None
+
+    def _async_limiter(self) -> asyncio.Semaphore:
+        """Return the concurrency semaphore bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if getattr(self, '_async_limiter_loop', None) is not loop:
+            self._async_semaphore = asyncio.Semaphore(self.async_concurrency)
+            self._async_limiter_loop = loop
+        return self._async_semaphore
+
+    def _async_executor(self) -> Optional[Executor]:
+        """Return the executor used for blocking calls, creating it on first use."""
+        if self.async_executor_workers is None:
+            return None
+        if getattr(self, '_async_thread_pool', None) is None:
+            self._async_thread_pool = ThreadPoolExecutor(
+                max_workers=self.async_executor_workers,
+                thread_name_prefix=f"{type(self).__name__}-tts"
+            )
+        return self._async_thread_pool
+
+    async def _run_blocking(self, func, *args, **kwargs) -> Any:
+        """
+        Run a blocking call in the processor's executor.
+
+        Cancelling the awaiting task returns immediately, but a call that has
+        already started in a worker thread runs to completion.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._async_executor(), functools.partial(func, *args, **kwargs))
+
+    async def _atext_to_speech(self, text: str, output_file: str, **kwargs) -> Any:
+        """Asynchronous implementation of text_to_speech; runs it in the executor by default."""
+        return await self._run_blocking(self.text_to_speech, text, output_file, **kwargs)
+
+    async def atext_to_speech(self, text: str, output_file: str, **kwargs) -> Any:
+        """
+        Convert Japanese text to speech without blocking the event loop.
+
+        At most async_concurrency calls run at the same time per processor;
+        further calls wait for a free slot.
+
+        Args:
+            text: Japanese text to convert to speech
+            output_file: Path to save the audio file
+            **kwargs: Extra options passed to the processor's text_to_speech
+
+        Returns:
+            Whatever the processor's text_to_speech returns
+        """
+        async with self._async_limiter():
+            return await self._atext_to_speech(text, output_file, **kwargs)
+
+    async def abatch_text_to_speech(self, requests: Iterable[Tuple[str, str]],
+                                    return_exceptions: bool = False, **kwargs) -> List[Any]:
+        """
+        Convert many texts to speech concurrently.
+
+        If the batch is cancelled, or a job fails while return_exceptions is
+        False, all jobs that have not finished yet are cancelled.
+
+        Args:
+            requests: Iterable of (text, output_file) pairs
+            return_exceptions: Return failures in the result list instead of raising
+            **kwargs: Extra options passed to every atext_to_speech call
+
+        Returns:
+            Results of the individual jobs in request order
+        """
+        tasks = [asyncio.ensure_future(self.atext_to_speech(text, output_file, **kwargs))
+                 for text, output_file in requests]
+        logger.info(f"Started batch of {len(tasks)} speech jobs "
+                    f"(concurrency {self.async_concurrency})")
+
+        try:
+            return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            # Let the cancelled jobs unwind before propagating
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
@@ -0,0 +1,305 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Streaming Audio Analysis
+------------------------
+This module computes the speech processors' audio properties (duration,
+tempo, spectral centroid, rolloff and zero crossing rate) in one pass over
+the file. Audio is read in blocks with soundfile at its native sample rate,
+every frame feature comes from a single NumPy STFT per block, and only
+running statistics and the onset envelope's autocorrelation are kept, so
+memory stays bounded however long the file is.
+"""
+
+import logging
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Union
+
+import numpy as np
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+try:
+    import soundfile as sf
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    SOUNDFILE_AVAILABLE = False
+
+try:
+    import soxr
+    SOXR_AVAILABLE = True
+except ImportError:
+    SOXR_AVAILABLE = False
+
+# Version of the feature extraction; bump it whenever results change so cached results are recomputed
+FEATURE_VERSION = 1
+
+# Frame parameters (the librosa defaults the previous implementation used)
+DEFAULT_N_FFT = 2048
+DEFAULT_HOP_LENGTH = 512
+DEFAULT_ROLL_PERCENT = 0.85
+# Frames analyzed per STFT block (about 12 s at 22.05 kHz)
+DEFAULT_BLOCK_FRAMES = 512
+# Mel bands of the onset strength envelope
+N_MELS = 128
+# Length of the tempo autocorrelation window in seconds, and the tempo prior
+TEMPO_WINDOW_SECONDS = 8.0
+START_BPM = 120.0
+STD_BPM = 1.0
+MAX_TEMPO = 320.0
+
+
+class RunningStats:
+    """Count, mean, standard deviation, minimum and maximum of a stream of values."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = float('inf')
+        self.max = float('-inf')
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a batch of values (Chan et al. parallel update)."""
+        n = values.size
+        if n == 0:
+            return
+        batch_mean = float(values.mean())
+        batch_m2 = float(((values - batch_mean) ** 2).sum())
+        total = self.count + n
+        delta = batch_mean - self.mean
+        self.mean += delta * n / total
+        self._m2 += batch_m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation."""
+        return (self._m2 / self.count) ** 0.5 if self.count else 0.0
+
+
+def mel_filterbank(sr: int, n_fft: int, n_mels: int = N_MELS) -> np.ndarray:
+    """
+    Build a Slaney-style triangular mel filterbank.
+
+    Args:
+        sr: Sample rate
+        n_fft: FFT size
+        n_mels: Number of mel bands
+
+    Returns:
+        Matrix of shape (n_mels, n_fft // 2 + 1)
+    """
+    def hz_to_mel(hz):
+        hz = np.asarray(hz, dtype=np.float64)
+        linear = hz / (200.0 / 3)
+        log = 15.0 + np.log(np.maximum(hz, 1e-10) / 1000.0) / (np.log(6.4) / 27.0)
+        return np.where(hz >= 1000.0, log, linear)
+
+    def mel_to_hz(mel):
+        linear = mel * (200.0 / 3)
+        log = 1000.0 * np.exp((np.log(6.4) / 27.0) * (mel - 15.0))
+        return np.where(mel >= 15.0, log, linear)
+
+    fft_freqs = np.fft.rfftfreq(n_fft, 1.0 / sr)
+    mel_freqs = mel_to_hz(np.linspace(hz_to_mel(0.0), hz_to_mel(sr / 2.0), n_mels + 2))
+    lower = (fft_freqs[None, :] - mel_freqs[:-2, None]) / np.diff(mel_freqs)[:-1, None]
+    upper = (mel_freqs[2:, None] - fft_freqs[None, :]) / np.diff(mel_freqs)[1:, None]
+    weights = np.maximum(0.0, np.minimum(lower, upper))
+    # Slaney normalization: constant energy per band
+    weights *= (2.0 / (mel_freqs[2:] - mel_freqs[:-2]))[:, None]
+    return weights.astype(np.float32)
+
+
+def iter_frames(blocks: Iterator[np.ndarray], n_fft: int, hop_length: int,
+                block_frames: int = DEFAULT_BLOCK_FRAMES) -> Iterator[np.ndarray]:
+    """
+    Cut a stream of mono sample blocks into batches of overlapping frames.
+
+    Samples shared by consecutive batches are carried over, so frames are
+    the same as when framing the whole signal at once. The last partial
+    frame is zero-padded.
+
+    Args:
+        blocks: Mono float32 sample blocks of any length
+        n_fft: Frame length in samples
+        hop_length: Samples between frame starts
+        block_frames: Maximum frames per yielded batch
+
+    Yields:
+        Arrays of shape (frames, n_fft) (strided views, do not modify)
+    """
+    batch_samples = (block_frames - 1) * hop_length + n_fft
+    buffer = np.zeros(0, dtype=np.float32)
+    for block in blocks:
+        buffer = np.concatenate((buffer, block))
+        while len(buffer) >= batch_samples:
+            yield np.lib.stride_tricks.sliding_window_view(buffer[:batch_samples], n_fft)[::hop_length]
+            buffer = buffer[block_frames * hop_length:]
+
+    # Frames starting in the remaining samples, padding the last one
+    if len(buffer):
+        frames = 1 + max(0, -(-(len(buffer) - n_fft) // hop_length))
+        padded = np.zeros((frames - 1) * hop_length + n_fft, dtype=np.float32)
+        padded[:len(buffer)] = buffer
+        yield np.lib.stride_tricks.sliding_window_view(padded, n_fft)[::hop_length]
+
+
+class TempoEstimator:
+    """Estimates the global tempo from onset strength via windowed autocorrelation."""
+
+    def __init__(self, frame_rate: float, window_seconds: float = TEMPO_WINDOW_SECONDS):
+        """
+        Args:
+            frame_rate: Onset envelope values per second
+            window_seconds: Length of each autocorrelation window
+        """
+        self.frame_rate = frame_rate
+        self.size = max(4, int(round(window_seconds * frame_rate)))
+        self._window = np.hanning(self.size)
+        self._acf = np.zeros(self.size)
+        self._pending = np.zeros(0)
+
+    def update(self, onset: np.ndarray) -> None:
+        """Add onset strength values; full windows (50% overlap) are autocorrelated."""
+        self._pending = np.concatenate((self._pending, onset))
+        step = self.size // 2
+        while len(self._pending) >= self.size:
+            self._add_window(self._pending[:self.size])
+            self._pending = self._pending[step:]
+
+    def _add_window(self, values: np.ndarray) -> None:
+        x = values * self._window
+        spectrum = np.fft.rfft(x, n=2 * self.size)
+        self._acf += np.fft.irfft(np.abs(spectrum) ** 2)[:self.size]
+
+    def tempo(self) -> float:
+        """Return the most likely tempo in beats per minute (0 for silence)."""
+        if len(self._pending) > 1 and not self._acf.any():
+            # Shorter than one window: use what there is
+            self._add_window(np.pad(self._pending, (0, self.size - len(self._pending))))
+        lags = np.arange(1, self.size)
+        bpms = 60.0 * self.frame_rate / lags
+        # Log-normal prior around START_BPM, as in librosa's tempo estimator
+        prior = np.exp(-0.5 * ((np.log2(bpms) - np.log2(START_BPM)) / STD_BPM) ** 2)
+        prior[bpms > MAX_TEMPO] = 0.0
+        acf = self._acf[1:]
+        if acf.max() <= 0:
+            return 0.0
+        return float(bpms[np.argmax(acf / acf.max() * prior)])
+
+
+def iter_mono_blocks(file_path: Union[str, Path], block_samples: int, sr: Optional[int]) -> Iterator[np.ndarray]:
+    """
+    Read an audio file as mono float32 blocks.
+
+    Args:
+        file_path: Path to a file soundfile can read
+        block_samples: Samples per block read from the file
+        sr: Sample rate to deliver (None keeps the file's rate, skipping resampling)
+
+    Yields:
+        Mono float32 sample blocks
+    """
+    if not SOUNDFILE_AVAILABLE:
+        raise RuntimeError("Reading audio requires soundfile: pip install soundfile")
+    native_sr = sf.info(str(file_path)).samplerate
+    resampler = None
+    if sr is not None and sr != native_sr:
+        if not SOXR_AVAILABLE:
+            raise RuntimeError("Resampling requires soxr: pip install soxr")
+        resampler = soxr.ResampleStream(native_sr, sr, 1, dtype='float32')
+
+    for block in sf.blocks(str(file_path), blocksize=block_samples, dtype='float32', always_2d=True):
+        mono = block.mean(axis=1, dtype=np.float32) if block.shape[1] > 1 else block[:, 0]
+        if resampler is not None:
+            mono = resampler.resample_chunk(mono)
+        yield mono
+    if resampler is not None:
+        yield resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True)
+
+
+def analyze_file(audio_file: Union[str, Path], sr: Optional[int] = None, n_fft: int = DEFAULT_N_FFT,
+                 hop_length: int = DEFAULT_HOP_LENGTH, roll_percent: float = DEFAULT_ROLL_PERCENT,
+                 block_frames: int = DEFAULT_BLOCK_FRAMES) -> Dict[str, float]:
+    """
+    Analyze an audio file in one streaming pass.
+
+    Args:
+        audio_file: Path to a file soundfile can read (WAV, FLAC, OGG, MP3 with libsndfile >= 1.1)
+        sr: Sample rate to analyze at (None keeps the file's rate, skipping resampling)
+        n_fft: Frame length in samples
+        hop_length: Samples between frames
+        roll_percent: Share of the spectral energy below the rolloff frequency
+        block_frames: Frames per STFT block; bounds the memory used
+
+    Returns:
+        Dictionary of audio properties
+    """
+    if not SOUNDFILE_AVAILABLE:
+        raise RuntimeError("Audio analysis requires soundfile: pip install soundfile")
+
+    file_path = Path(audio_file)
+    info = sf.info(str(file_path))
+    rate = sr or info.samplerate
+
+    window = np.hanning(n_fft + 1)[:-1].astype(np.float32)  # periodic Hann
+    freqs = np.fft.rfftfreq(n_fft, 1.0 / rate).astype(np.float32)
+    mel = mel_filterbank(rate, n_fft)
+    tempo = TempoEstimator(rate / hop_length)
+    centroid_stats, rolloff_stats, zcr_stats = RunningStats(), RunningStats(), RunningStats()
+    previous_mel: Optional[np.ndarray] = None
+    samples = 0
+
+    def counted(blocks: Iterator[np.ndarray]) -> Iterator[np.ndarray]:
+        nonlocal samples
+        for block in blocks:
+            samples += len(block)
+            yield block
+
+    blocks = counted(iter_mono_blocks(file_path, block_frames * hop_length, sr))
+    for frames in iter_frames(blocks, n_fft, hop_length, block_frames):
+        # One STFT per block feeds every spectral feature
+        magnitude = np.abs(np.fft.rfft(frames * window, axis=1)).astype(np.float32)
+        total = magnitude.sum(axis=1)
+        safe_total = np.where(total > 0, total, 1.0)
+
+        centroid_stats.update(np.where(total > 0, magnitude @ freqs / safe_total, 0.0))
+
+        cumulative = np.cumsum(magnitude, axis=1)
+        rolloff_bins = np.argmax(cumulative >= roll_percent * total[:, None], axis=1)
+        rolloff_stats.update(freqs[rolloff_bins])
+
+        signs = np.where(np.abs(frames) <= 1e-10, 0.0, frames) >= 0
+        zcr_stats.update(np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / n_fft)
+
+        # Onset strength: positive spectral flux of the log-mel spectrogram
+        mel_db = 10.0 * np.log10(np.maximum(magnitude ** 2 @ mel.T, 1e-10))
+        if previous_mel is not None:
+            mel_db_lagged = np.vstack((previous_mel[None, :], mel_db))
+        else:
+            mel_db_lagged = mel_db
+        flux = np.maximum(0.0, np.diff(mel_db_lagged, axis=0)).mean(axis=1)
+        tempo.update(flux)
+        previous_mel = mel_db[-1]
+
+    return {
+        "duration": samples / rate,
+        "tempo": tempo.tempo(),
+        "mean_spectral_centroid": centroid_stats.mean,
+        "mean_spectral_rolloff": rolloff_stats.mean,
+        "mean_zero_crossing_rate": zcr_stats.mean,
+        "std_spectral_centroid": centroid_stats.std,
+        "std_spectral_rolloff": rolloff_stats.std,
+        "std_zero_crossing_rate": zcr_stats.std,
+        "frames": centroid_stats.count,
+        "sample_rate": rate,
+    }
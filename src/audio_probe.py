@@ -0,0 +1,270 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Audio Header Probe
+------------------
+This module reads duration, bitrate, sample rate and channel count of MP3
+and WAV files from their headers alone: the RIFF chunk headers of a WAV
+file, or the first MPEG frame header of an MP3 file together with its
+Xing/Info or VBRI tag (or the file size for constant bitrate streams).
+Only a few kilobytes are read however long the file is, and no third-party
+library is needed, so it is cheap enough to run over whole directories.
+"""
+
+import os
+import struct
+import logging
+from pathlib import Path
+from typing import NamedTuple, Optional, Tuple, Union
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Bytes read from the start of the audio data to find the first MPEG frame
+MP3_SEARCH_BYTES = 8192
+# Xing tag (flags, frames, bytes, TOC, quality) plus the LAME extension with the gapless info
+XING_MAX_BYTES = 8 + 4 + 4 + 100 + 4 + 24
+# Placeholder files written when no TTS engine works are small text files
+PLACEHOLDER_MAX_BYTES = 1000
+PLACEHOLDER_MARKER = b"PLACEHOLDER"
+
+# MPEG audio version IDs (header bits 19-20)
+MPEG_25, MPEG_2, MPEG_1 = 0, 2, 3
+
+# Bitrates in kbit/s by [MPEG-1?][layer][index]
+_BITRATES = {
+    (True, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_SAMPLE_RATES = {MPEG_1: (44100, 48000, 32000), MPEG_2: (22050, 24000, 16000), MPEG_25: (11025, 12000, 8000)}
+
+
+class AudioInfo(NamedTuple):
+    """Properties of an audio file read from its headers."""
+    format: str                        # 'wav', 'mp3' or 'placeholder'
+    duration: float                    # Seconds
+    sample_rate: int                   # Hz
+    channels: int
+    bitrate: int                       # Bits per second (average for VBR MP3)
+    n_frames: int                      # Samples per channel
+    sample_width: Optional[int] = None  # Bytes per sample (WAV only)
+    vbr: bool = False                  # MP3 with a Xing or VBRI tag
+
+
+class _FrameHeader(NamedTuple):
+    version: int
+    layer: int
+    bitrate: int
+    sample_rate: int
+    channels: int
+    samples: int
+    length: int
+
+
+def _parse_frame_header(header: bytes) -> Optional[_FrameHeader]:
+    """Decode a 4-byte MPEG audio frame header, or return None if it is not one."""
+    if len(header) < 4 or header[0] != 0xFF or header[1] & 0xE0 != 0xE0:
+        return None
+    version = (header[1] >> 3) & 0x03
+    layer = 4 - ((header[1] >> 1) & 0x03)
+    bitrate_index = header[2] >> 4
+    rate_index = (header[2] >> 2) & 0x03
+    if version == 1 or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    mpeg1 = version == MPEG_1
+    bitrate = _BITRATES[(mpeg1, layer)][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    padding = (header[2] >> 1) & 0x01
+    channels = 1 if header[3] >> 6 == 3 else 2
+    if layer == 1:
+        samples = 384
+        length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples = 1152 if mpeg1 or layer == 2 else 576
+        length = samples // 8 * bitrate // sample_rate + padding
+    return _FrameHeader(version, layer, bitrate, sample_rate, channels, samples, length)
+
+
+def _find_first_frame(data: bytes) -> Tuple[int, Optional[_FrameHeader]]:
+    """Find the first frame header that is followed by another consistent header."""
+    offset = data.find(b"\xff")
+    while 0 <= offset < len(data) - 3:
+        frame = _parse_frame_header(data[offset:offset + 4])
+        if frame is not None:
+            following = _parse_frame_header(data[offset + frame.length:offset + frame.length + 4])
+            # A lone header near the end of the buffer is accepted; otherwise the next must match
+            if (offset + frame.length + 4 > len(data)
+                    or (following is not None and following.version == frame.version
+                        and following.layer == frame.layer and following.sample_rate == frame.sample_rate)):
+                return offset, frame
+        offset = data.find(b"\xff", offset + 1)
+    return -1, None
+
+
+def _id3v2_size(header: bytes) -> int:
+    """Return the size of an ID3v2 tag at the start of the file (0 if there is none)."""
+    if len(header) < 10 or header[:3] != b"ID3":
+        return 0
+    size = (header[6] & 0x7F) << 21 | (header[7] & 0x7F) << 14 | (header[8] & 0x7F) << 7 | (header[9] & 0x7F)
+    footer = 10 if header[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _probe_mp3(f, file_size: int) -> AudioInfo:
+    """Read MP3 properties from the first frame and its VBR tag."""
+    f.seek(0)
+    audio_start = 0
+    # Some files carry several ID3v2 tags back to back
+    while True:
+        tag_size = _id3v2_size(f.read(10))
+        if not tag_size:
+            break
+        audio_start += tag_size
+        f.seek(audio_start)
+
+    f.seek(audio_start)
+    data = f.read(MP3_SEARCH_BYTES)
+    offset, frame = _find_first_frame(data)
+    if frame is None:
+        raise ValueError("No MPEG audio frame found")
+    audio_start += offset
+
+    audio_end = file_size
+    if file_size >= 128:
+        f.seek(file_size - 128)
+        if f.read(3) == b"TAG":
+            audio_end -= 128
+
+    # Xing/Info sits after the side information, VBRI at a fixed 32 bytes
+    if frame.version == MPEG_1:
+        side_info = 17 if frame.channels == 1 else 32
+    else:
+        side_info = 9 if frame.channels == 1 else 17
+    xing = data[offset + 4 + side_info:offset + 4 + side_info + XING_MAX_BYTES]
+    vbri = data[offset + 36:offset + 36 + 18]
+
+    total_frames = None
+    audio_bytes = None
+    gapless = 0
+    if xing[:4] in (b"Xing", b"Info"):
+        flags = struct.unpack(">I", xing[4:8])[0]
+        position = 8
+        if flags & 0x01:
+            total_frames = struct.unpack(">I", xing[position:position + 4])[0]
+            position += 4
+        if flags & 0x02:
+            audio_bytes = struct.unpack(">I", xing[position:position + 4])[0]
+            position += 4
+        position += (100 if flags & 0x04 else 0) + (4 if flags & 0x08 else 0)
+        # LAME-style encoders record the samples of encoder delay and padding
+        encoder = xing[position:position + 24]
+        if len(encoder) == 24 and encoder[:4] in (b"LAME", b"Lavf", b"Lavc", b"L3.9"):
+            delay = encoder[21] << 4 | encoder[22] >> 4
+            padding = (encoder[22] & 0x0F) << 8 | encoder[23]
+            gapless = delay + padding
+        vbr = xing[:4] == b"Xing"
+    elif vbri[:4] == b"VBRI":
+        audio_bytes, total_frames = struct.unpack(">II", vbri[10:18])
+        vbr = True
+    else:
+        vbr = False
+
+    if total_frames:
+        n_frames = max(0, total_frames * frame.samples - gapless)
+        duration = n_frames / frame.sample_rate
+        # The byte count includes the tag frame, which carries no audio
+        audio_bytes = (audio_bytes or (audio_end - audio_start)) - frame.length
+        bitrate = int(round(audio_bytes * 8 / duration)) if duration else frame.bitrate
+    else:
+        # Constant bitrate: the audio size gives the duration
+        duration = (audio_end - audio_start) * 8 / frame.bitrate
+        n_frames = int(round(duration * frame.sample_rate))
+        bitrate = frame.bitrate
+
+    return AudioInfo('mp3', duration, frame.sample_rate, frame.channels, bitrate, n_frames, vbr=vbr)
+
+
+def _probe_wav(f, file_size: int) -> AudioInfo:
+    """Read WAV properties by walking the RIFF chunk headers up to the data chunk."""
+    f.seek(12)
+    fmt = None
+    while True:
+        chunk = f.read(8)
+        if len(chunk) < 8:
+            raise ValueError("WAV file has no data chunk")
+        chunk_id, chunk_size = struct.unpack("<4sI", chunk)
+        if chunk_id == b"fmt ":
+            fmt = struct.unpack("<HHIIHH", f.read(16))
+            f.seek(chunk_size - 16 + (chunk_size & 1), os.SEEK_CUR)
+        elif chunk_id == b"data":
+            break
+        else:
+            f.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+
+    if fmt is None:
+        raise ValueError("WAV file has no fmt chunk")
+    _, channels, sample_rate, byte_rate, block_align, bits = fmt
+    if not sample_rate or not block_align:
+        raise ValueError("Invalid WAV fmt chunk")
+
+    # Streaming writers leave the size at 0 or 0xFFFFFFFF until finished; trust the file size then
+    available = file_size - f.tell()
+    data_size = available if chunk_size in (0, 0xFFFFFFFF) else min(chunk_size, available)
+    n_frames = data_size // block_align
+    return AudioInfo('wav', n_frames / sample_rate, sample_rate, channels, byte_rate * 8, n_frames,
+                     sample_width=(bits + 7) // 8)
+
+
+def is_placeholder(audio_file: Union[str, Path]) -> bool:
+    """
+    Check whether a file is a text placeholder written instead of real audio.
+
+    Args:
+        audio_file: Path to the file
+
+    Returns:
+        True for small files containing the placeholder marker
+    """
+    try:
+        with open(audio_file, 'rb') as f:
+            head = f.read(PLACEHOLDER_MAX_BYTES)
+    except OSError:
+        return False
+    return len(head) < PLACEHOLDER_MAX_BYTES and PLACEHOLDER_MARKER in head
+
+
+def probe_audio(audio_file: Union[str, Path]) -> AudioInfo:
+    """
+    Read the properties of an MP3 or WAV file from its headers.
+
+    The format is recognized from the content, not the extension.
+
+    Args:
+        audio_file: Path to the file
+
+    Returns:
+        AudioInfo of the file
+
+    Raises:
+        ValueError: If the file is not a recognizable MP3 or WAV file
+    """
+    file_size = os.path.getsize(audio_file)
+    with open(audio_file, 'rb') as f:
+        head = f.read(12)
+        if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+            return _probe_wav(f, file_size)
+        if file_size < PLACEHOLDER_MAX_BYTES:
+            f.seek(0)
+            if PLACEHOLDER_MARKER in f.read(PLACEHOLDER_MAX_BYTES):
+                return AudioInfo('placeholder', 0.0, 0, 0, 0, 0)
+        return _probe_mp3(f, file_size)
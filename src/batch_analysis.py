@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Batch Audio Analysis
+--------------------
+This module analyzes whole directories of audio clips with a process pool
+and stores one row per file in a CSV table. Files whose size and
+modification time are unchanged since the previous run are not analyzed
+again, so re-running over a growing tree only pays for the new clips.
+"""
+
+import os
+import csv
+import glob
+import logging
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+
+from src.audio_analysis import analyze_file, FEATURE_VERSION
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# File types picked up when analyzing a directory
+AUDIO_EXTENSIONS = ('.wav', '.flac', '.ogg', '.mp3')
+
+RESULTS_NAME = 'analysis.csv'
+
+# Columns of the result table, in order
+KEY_COLUMNS = ['path', 'size', 'mtime_ns']
+FEATURE_COLUMNS = ['duration', 'tempo', 'mean_spectral_centroid', 'mean_spectral_rolloff',
+                   'mean_zero_crossing_rate', 'std_spectral_centroid', 'std_spectral_rolloff',
+                   'std_zero_crossing_rate', 'frames', 'sample_rate']
+COLUMNS = KEY_COLUMNS + ['status', 'feature_version'] + FEATURE_COLUMNS + ['error']
+
+
+def collect_audio_files(source: str) -> List[Path]:
+    """
+    Collect the audio files to analyze.
+
+    Args:
+        source: Directory (searched recursively) or glob pattern
+
+    Returns:
+        Sorted list of audio files
+    """
+    if os.path.isdir(source):
+        paths = (p for p in Path(source).rglob('*') if p.is_file())
+    else:
+        paths = (Path(p) for p in glob.glob(source, recursive=True) if os.path.isfile(p))
+    return sorted(p.resolve() for p in paths if p.suffix.lower() in AUDIO_EXTENSIONS)
+
+
+def load_results(results_path: Union[str, Path]) -> Dict[str, Dict[str, str]]:
+    """
+    Load a result table; for paths listed more than once the last row wins.
+
+    Args:
+        results_path: CSV file written by analyze_directory
+
+    Returns:
+        Rows keyed by file path (values as read from the CSV)
+    """
+    rows: Dict[str, Dict[str, str]] = {}
+    if not os.path.exists(results_path):
+        return rows
+    with open(results_path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            # A crash can leave a truncated last row behind
+            if row.get('path') and row.get('error') is not None:
+                rows[row['path']] = row
+    return rows
+
+
+def load_array(results_path: Union[str, Path]) -> np.ndarray:
+    """
+    Load a result table as a NumPy structured array for vectorized QA queries.
+
+    Args:
+        results_path: CSV file written by analyze_directory
+
+    Returns:
+        One record per file; missing feature values are NaN
+    """
+    dtype = ([('path', object), ('size', 'i8'), ('mtime_ns', 'i8'), ('status', 'U8'), ('feature_version', 'i8')]
+             + [(column, 'f8') for column in FEATURE_COLUMNS] + [('error', object)])
+    rows = load_results(results_path).values()
+    records = [
+        (row['path'], int(row['size']), int(row['mtime_ns']), row['status'], int(row.get('feature_version') or 0))
+        + tuple(float(row[column]) if row[column] else np.nan for column in FEATURE_COLUMNS)
+        + (row['error'],)
+        for row in rows
+    ]
+    return np.array(records, dtype=dtype)
+
+
+def default_results_path(source: Union[str, Path]) -> Path:
+    """Return the result table used when none is given: analysis.csv in the source directory."""
+    source = str(source)
+    base = source if os.path.isdir(source) else os.path.dirname(source) or '.'
+    return Path(base) / RESULTS_NAME
+
+
+def _is_current(row: Optional[Dict[str, str]], stat: os.stat_result) -> bool:
+    """Check whether a previous result still describes the file and was computed by this feature version."""
+    return (row is not None and row.get('status') == 'ok' and row.get('feature_version') == str(FEATURE_VERSION)
+            and row.get('size') == str(stat.st_size) and row.get('mtime_ns') == str(stat.st_mtime_ns))
+
+
+def _analyze_one(path: str, size: int, mtime_ns: int, sample_rate: Optional[int]) -> Dict:
+    """Analyze one file and return its result row (runs in a worker process)."""
+    row = {'path': path, 'size': size, 'mtime_ns': mtime_ns, 'feature_version': FEATURE_VERSION}
+    try:
+        properties = analyze_file(path, sr=sample_rate)
+        row.update({column: properties.get(column) for column in FEATURE_COLUMNS})
+        row['status'] = 'ok'
+        row['error'] = ''
+    except Exception as e:
+        row['status'] = 'error'
+        row['error'] = str(e)
+    return row
+
+
+def _iter_analyzed(tasks: List[tuple], workers: int, sample_rate: Optional[int]) -> Iterator[Dict]:
+    """Analyze tasks in a process pool (or in this process for one worker), yielding rows in order."""
+    if workers <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield _analyze_one(*task, sample_rate)
+        return
+
+    # Hand out work in chunks so tens of thousands of short clips do not cost one round trip each
+    chunksize = max(1, min(64, len(tasks) // (workers * 4)))
+    columns = list(zip(*tasks))
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context('spawn')) as executor:
+        yield from executor.map(_analyze_one, *columns, [sample_rate] * len(tasks), chunksize=chunksize)
+
+
+def _read_header(results_path: Path) -> Optional[List[str]]:
+    """Return the column names of an existing table (None if there is none)."""
+    if not results_path.exists():
+        return None
+    with open(results_path, 'r', encoding='utf-8', newline='') as f:
+        return next(csv.reader(f), None)
+
+
+def _write_rows(f, rows: Iterable[Dict]) -> None:
+    writer = csv.DictWriter(f, fieldnames=COLUMNS, extrasaction='ignore')
+    for row in rows:
+        writer.writerow(row)
+
+
+def analyze_directory(source: Union[str, Path], results_path: Optional[Union[str, Path]] = None,
+                      workers: Optional[int] = None, sample_rate: Optional[int] = None,
+                      force: bool = False) -> Dict[str, int]:
+    """
+    Analyze every audio file under source and store the results in a CSV table.
+
+    Rows are appended as files finish, so an interrupted run keeps its
+    progress; at the end the table is rewritten sorted by path, without
+    files that no longer exist.
+
+    Args:
+        source: Directory (searched recursively) or glob pattern
+        results_path: CSV result table (defaults to source/analysis.csv)
+        workers: Worker processes (defaults to the number of CPUs)
+        sample_rate: Sample rate to analyze at (None keeps each file's rate)
+        force: Re-analyze files even if their size and mtime are unchanged
+
+    Returns:
+        Counts of analyzed, failed and skipped files
+    """
+    source = str(source)
+    results_path = Path(results_path) if results_path else default_results_path(source)
+    workers = workers or os.cpu_count() or 1
+
+    previous = {} if force else load_results(results_path)
+    results: Dict[str, Dict] = {}
+    tasks = []
+    for path in collect_audio_files(source):
+        stat = path.stat()
+        row = previous.get(str(path))
+        if _is_current(row, stat):
+            results[str(path)] = row
+        else:
+            tasks.append((str(path), stat.st_size, stat.st_mtime_ns))
+
+    summary = {"analyzed": 0, "failed": 0, "skipped": len(results)}
+    logger.info(f"Analysis: {len(tasks)} files to analyze, {summary['skipped']} unchanged")
+
+    os.makedirs(results_path.parent, exist_ok=True)
+    if tasks:
+        new_file = force or _read_header(results_path) != COLUMNS
+        with open(results_path, 'w' if new_file else 'a', encoding='utf-8', newline='') as f:
+            if new_file:
+                csv.DictWriter(f, fieldnames=COLUMNS).writeheader()
+            for row in _iter_analyzed(tasks, workers, sample_rate):
+                _write_rows(f, [row])
+                f.flush()
+                results[row['path']] = row
+                summary["analyzed" if row['status'] == 'ok' else "failed"] += 1
+
+    # Compact: one row per existing file, sorted by path
+    tmp_path = results_path.with_name(f".{results_path.name}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        csv.DictWriter(f, fieldnames=COLUMNS).writeheader()
+        _write_rows(f, (results[path] for path in sorted(results)))
+    os.replace(tmp_path, results_path)
+
+    logger.info(f"Analysis finished: {summary}, results in {results_path}")
+    return summary
@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Batch Text-to-Speech
+--------------------
+This module synthesizes whole trees of text files with one processor and a
+worker pool, recording progress in a JSONL manifest so interrupted runs resume.
+"""
+
+import os
+import glob
+import json
+import time
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from src.audio_probe import is_placeholder
+from src.markdown_cleaner import clean_markdown
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# File types picked up in batch mode
+BATCH_EXTENSIONS = ('.txt', '.md')
+
+MANIFEST_NAME = 'manifest.jsonl'
+
+
+def collect_inputs(source: str, exclude: Optional[Union[str, Path]] = None) -> List[Path]:
+    """
+    Collect the text files to synthesize.
+
+    Args:
+        source: Directory (searched recursively) or glob pattern
+        exclude: Directory whose files are skipped (the batch output, which holds reference .txt files)
+
+    Returns:
+        Sorted list of .txt/.md files
+    """
+    if os.path.isdir(source):
+        paths = (p for p in Path(source).rglob('*') if p.is_file())
+    else:
+        paths = (Path(p) for p in glob.glob(source, recursive=True) if os.path.isfile(p))
+    excluded = Path(exclude).resolve() if exclude else None
+    return sorted(p for p in paths if p.suffix.lower() in BATCH_EXTENSIONS
+                  and (excluded is None or excluded not in p.resolve().parents))
+
+
+def file_hash(path: Union[str, Path]) -> str:
+    """
+    Compute the SHA-256 digest of a file's content.
+
+    Args:
+        path: File to hash
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class BatchManifest:
+    """Append-only JSONL record of batch job results."""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open a manifest, loading the entries of previous runs.
+
+        Args:
+            path: Location of the JSONL manifest
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._latest: Dict[str, Dict] = {}
+
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A crash can leave a truncated last line behind
+                        logger.warning(f"Skipping malformed manifest line in {self.path}")
+                        continue
+                    self._latest[entry["output"]] = entry
+            logger.info(f"Loaded {len(self._latest)} entries from manifest {self.path}")
+
+    def is_done(self, input_hash: str, output_path: Path) -> bool:
+        """
+        Check whether an item was completed by an earlier run.
+
+        Args:
+            input_hash: Content hash of the input file
+            output_path: Output audio path of the item
+
+        Returns:
+            True if the same input was synthesized successfully and the output
+            still exists as real audio
+        """
+        entry = self._latest.get(str(output_path))
+        return (entry is not None and entry.get("status") == "done"
+                and entry.get("input_hash") == input_hash and output_path.exists()
+                and not is_placeholder(output_path))
+
+    def record(self, entry: Dict) -> None:
+        """
+        Append an entry and flush it to disk immediately.
+
+        Args:
+            entry: Job result with input, input_hash, output, status and duration
+        """
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            os.makedirs(self.path.parent, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._latest[entry["output"]] = entry
+
+
+def _output_path(input_path: Path, source: str, output_dir: Path, audio_format: str = 'mp3') -> Path:
+    """Mirror the input tree under output_dir with the suffix of the processor's audio format."""
+    if os.path.isdir(source):
+        relative = input_path.resolve().relative_to(Path(source).resolve())
+    else:
+        relative = Path(input_path.name)
+    return (output_dir / relative).with_suffix(f'.{audio_format}').resolve()
+
+
+def run_batch(processor, source: str, output_dir: Union[str, Path], manifest_path: Optional[Union[str, Path]] = None,
+              workers: int = 4, **tts_kwargs) -> Dict[str, int]:
+    """
+    Synthesize every text file under source with a worker pool.
+
+    Items already completed according to the manifest are skipped, so
+    re-running the same command after a crash resumes where it stopped.
+
+    Args:
+        processor: Speech processor whose text_to_speech is used
+        source: Directory or glob pattern of .txt/.md files
+        output_dir: Directory receiving the audio files
+        manifest_path: JSONL manifest location (defaults to output_dir/manifest.jsonl)
+        workers: Number of concurrent synthesis jobs
+        **tts_kwargs: Extra options passed to text_to_speech
+
+    Returns:
+        Counts of done, failed and skipped items
+
+    Raises:
+        ValueError: If two inputs map to the same output file
+    """
+    output_dir = Path(output_dir)
+    manifest = BatchManifest(manifest_path or output_dir / MANIFEST_NAME)
+    summary = {"done": 0, "failed": 0, "skipped": 0}
+    audio_format = getattr(processor, 'audio_format', 'mp3')
+
+    inputs = [(input_path, _output_path(input_path, source, output_dir, audio_format))
+              for input_path in collect_inputs(source, exclude=output_dir)]
+
+    # Inputs differing only in suffix (a.txt, a.md), or flattened from a glob, would share an output
+    by_output: Dict[Path, List[Path]] = {}
+    for input_path, output_path in inputs:
+        by_output.setdefault(output_path, []).append(input_path)
+    collisions = [paths for paths in by_output.values() if len(paths) > 1]
+    if collisions:
+        listed = "; ".join(", ".join(str(p) for p in paths) for paths in collisions)
+        raise ValueError(f"Inputs would be written to the same output file: {listed}")
+
+    pending = []
+    for input_path, output_path in inputs:
+        input_hash = file_hash(input_path)
+        if manifest.is_done(input_hash, output_path):
+            summary["skipped"] += 1
+        else:
+            pending.append((input_path, input_hash, output_path))
+
+    logger.info(f"Batch: {len(pending)} files to synthesize, {summary['skipped']} already completed")
+
+    def synthesize(input_path: Path, input_hash: str, output_path: Path) -> Dict:
+        start = time.perf_counter()
+        entry = {"input": str(input_path), "input_hash": input_hash, "output": str(output_path)}
+        try:
+            with open(input_path, 'r', encoding='utf-8') as f:
+                # Markdown is read without its syntax, as markdown_to_speech.py does
+                text = clean_markdown(f) if input_path.suffix.lower() == '.md' else f.read()
+            processor.text_to_speech(text, str(output_path), **tts_kwargs)
+            entry["status"] = "done" if output_path.exists() and not is_placeholder(output_path) else "failed"
+        except Exception as e:
+            logger.error(f"Error synthesizing {input_path}: {e}")
+            entry["status"] = "failed"
+            entry["error"] = str(e)
+        entry["duration"] = round(time.perf_counter() - start, 3)
+        manifest.record(entry)
+        return entry
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = [executor.submit(synthesize, *item) for item in pending]
+        for future in as_completed(futures):
+            summary[future.result()["status"]] += 1
+
+    logger.info(f"Batch finished: {summary}")
+    return summary
@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Corpus Phonetic Conversion
+--------------------------
+This module converts large Japanese corpora to hiragana, katakana or romaji
+by sharding line ranges across a process pool. Janome and pykakasi are pure
+Python, so processes (not threads) are needed to use more than one core.
+"""
+
+import os
+import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from src.japanese_phonetics import JapanesePhoneticConverter
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Conversion targets and the converter method implementing each
+TARGETS = {
+    'hiragana': 'to_hiragana',
+    'katakana': 'to_katakana',
+    'romaji': 'to_romaji',
+}
+
+# Default number of lines sent to a worker at once
+DEFAULT_LINES_PER_SHARD = 2000
+
+# Converter of the current worker process, created once by _init_worker
+_worker_converter: Optional[JapanesePhoneticConverter] = None
+
+
+def _init_worker() -> None:
+    """Load the tokenizer and kakasi dictionaries once per worker process."""
+    global _worker_converter
+    _worker_converter = JapanesePhoneticConverter(preload=True)
+
+
+def _convert_shard(target: str, lines: List[str]) -> str:
+    """
+    Convert a shard of lines, preserving line endings.
+
+    Args:
+        target: Conversion target (key of TARGETS)
+        lines: Lines including their trailing newline
+
+    Returns:
+        The converted shard as one string
+    """
+    if _worker_converter is None:
+        _init_worker()
+    convert = getattr(_worker_converter, TARGETS[target])
+
+    converted = []
+    for line in lines:
+        body = line.rstrip('\r\n')
+        converted.append(convert(body) + line[len(body):])
+    return "".join(converted)
+
+
+def _iter_shards(path: Path, lines_per_shard: int) -> Iterator[List[str]]:
+    """Read a file lazily in shards of lines_per_shard lines."""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        shard = []
+        for line in f:
+            shard.append(line)
+            if len(shard) >= lines_per_shard:
+                yield shard
+                shard = []
+        if shard:
+            yield shard
+
+
+def output_path_for(path: Path, target: str, output_dir: Optional[Union[str, Path]] = None,
+                    source_root: Optional[Union[str, Path]] = None) -> Path:
+    """
+    Return where the conversion of path is written, e.g. sample.hiragana.txt.
+
+    Args:
+        path: Input file
+        target: Conversion target
+        output_dir: Output directory (defaults to the input file's directory)
+        source_root: Directory whose tree is mirrored under output_dir (defaults to the input's directory)
+
+    Returns:
+        Output file path
+    """
+    if not output_dir:
+        directory = path.parent
+    elif source_root:
+        directory = Path(output_dir) / path.resolve().parent.relative_to(Path(source_root).resolve())
+    else:
+        directory = Path(output_dir)
+    return directory / f"{path.stem}.{target}{path.suffix}"
+
+
+def collect_text_files(directory: Union[str, Path]) -> List[Path]:
+    """
+    Collect the .txt files under directory, skipping earlier conversion outputs.
+
+    Args:
+        directory: Directory searched recursively
+
+    Returns:
+        Sorted list of input files
+    """
+    converted_suffixes = tuple(f".{target}" for target in TARGETS)
+    return sorted(p for p in Path(directory).rglob('*.txt')
+                  if Path(p.stem).suffix not in converted_suffixes)
+
+
+def convert_corpus(paths: Iterable[Union[str, Path]], target: str, workers: Optional[int] = None,
+                   output_dir: Optional[Union[str, Path]] = None,
+                   lines_per_shard: int = DEFAULT_LINES_PER_SHARD,
+                   source_root: Optional[Union[str, Path]] = None) -> List[Path]:
+    """
+    Convert text files to a phonetic script using a process pool.
+
+    Files are split into line-range shards that are converted in parallel.
+    One submit window spans all files, so a corpus of many small files keeps
+    every worker busy too. Results are written to the output files in input
+    order as soon as they are ready, and at most a few shards per worker are
+    in flight, so memory use stays bounded regardless of corpus size.
+
+    Args:
+        paths: Input text files
+        target: 'hiragana', 'katakana' or 'romaji'
+        workers: Number of worker processes (defaults to the CPU count; 1 runs in-process)
+        output_dir: Directory for the converted files (defaults to next to each input)
+        lines_per_shard: Number of lines per work unit
+        source_root: Directory whose tree is mirrored under output_dir
+            (defaults to the deepest directory containing all inputs)
+
+    Returns:
+        Paths of the converted files
+    """
+    if target not in TARGETS:
+        raise ValueError(f"Unknown conversion target: {target} (expected one of {', '.join(TARGETS)})")
+
+    workers = workers or os.cpu_count() or 1
+    paths = [Path(p) for p in paths]
+    if output_dir and paths and source_root is None:
+        source_root = os.path.commonpath([str(p.resolve().parent) for p in paths])
+    outputs = [output_path_for(path, target, output_dir, source_root) for path in paths]
+
+    logger.info(f"Converting {len(paths)} files to {target} with {workers} workers")
+
+    def shards() -> Iterator[Tuple[int, Optional[List[str]]]]:
+        """Shards of every file in order; None marks the end of a file."""
+        for index, path in enumerate(paths):
+            for shard in _iter_shards(path, lines_per_shard):
+                yield index, shard
+            yield index, None
+
+    out = None
+    current = -1
+
+    def write(index: int, converted: Optional[str]) -> None:
+        """Write a converted shard (or finish a file) in input order."""
+        nonlocal out, current
+        if index != current:
+            os.makedirs(outputs[index].parent, exist_ok=True)
+            out = open(outputs[index], 'w', encoding='utf-8', newline='')
+            current = index
+        if converted is not None:
+            out.write(converted)
+        else:
+            out.close()
+            logger.info(f"Wrote {outputs[index]}")
+
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) if workers > 1 else None
+    pending = deque()
+    try:
+        if executor is None:
+            for index, shard in shards():
+                write(index, None if shard is None else _convert_shard(target, shard))
+        else:
+            in_flight = 0
+            for index, shard in shards():
+                if shard is not None:
+                    pending.append((index, executor.submit(_convert_shard, target, shard)))
+                    in_flight += 1
+                else:
+                    pending.append((index, None))
+                # Keep the pool busy across files without reading the whole corpus ahead
+                while in_flight >= workers * 2:
+                    index, future = pending.popleft()
+                    if future is not None:
+                        in_flight -= 1
+                    write(index, None if future is None else future.result())
+            while pending:
+                index, future = pending.popleft()
+                write(index, None if future is None else future.result())
+    finally:
+        if out is not None and not out.closed:
+            out.close()
+        if executor is not None:
+            # Drop the shards not yet started on failure (by hand, as
+            # shutdown(cancel_futures=True) needs Python 3.9)
+            for _, future in pending:
+                if future is not None:
+                    future.cancel()
+            executor.shutdown(wait=True)
+
+    return outputs
@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Engine Health Tracking
+----------------------
+This module keeps a circuit breaker per TTS engine and routes requests to
+the preferred healthy one. Each breaker tracks a rolling success rate and an
+exponentially weighted moving average (EWMA) of the call latency; after too
+many failures it opens and the engine is skipped without waiting for it,
+until a single half-open probe call shows that it has recovered. Latency
+only demotes an engine when it exceeds an optional latency target.
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Breaker states
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# Defaults for the breakers
+DEFAULT_WINDOW = 20
+DEFAULT_MIN_CALLS = 3
+DEFAULT_FAILURE_THRESHOLD = 0.5
+DEFAULT_OPEN_SECONDS = 30.0
+DEFAULT_LATENCY_ALPHA = 0.3
+
+
+class CircuitBreaker:
+    """Health of one engine: rolling success rate, latency EWMA and breaker state."""
+
+    def __init__(self, name: str, window: int = DEFAULT_WINDOW, min_calls: int = DEFAULT_MIN_CALLS,
+                 failure_threshold: float = DEFAULT_FAILURE_THRESHOLD, open_seconds: float = DEFAULT_OPEN_SECONDS,
+                 latency_alpha: float = DEFAULT_LATENCY_ALPHA, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize a closed breaker.
+
+        Args:
+            name: Engine name used in logs
+            window: Number of recent calls the success rate is computed over
+            min_calls: Calls needed in the window before the breaker may open
+            failure_threshold: Failure rate at which the breaker opens
+            open_seconds: Time the breaker stays open before allowing a probe
+            latency_alpha: Weight of the newest latency in the EWMA
+            clock: Monotonic time source (replaceable in tests)
+        """
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.latency_alpha = latency_alpha
+        self.clock = clock
+
+        self.state = CLOSED
+        self.latency_ewma: Optional[float] = None
+        self._results: deque = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def success_rate(self) -> Optional[float]:
+        """Share of successful calls in the window (None before the first call)."""
+        with self._lock:
+            if not self._results:
+                return None
+            return sum(self._results) / len(self._results)
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may be made now.
+
+        An open breaker rejects calls until open_seconds have passed, then
+        lets exactly one probe call through (half-open).
+
+        Returns:
+            True if the caller should try the engine
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if self.clock() - self._opened_at < self.open_seconds:
+                    return False
+                self.state = HALF_OPEN
+                self._probing = False
+                logger.info(f"Engine {self.name}: circuit half-open, probing")
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record(self, success: bool, latency: float) -> None:
+        """
+        Record the outcome of a call.
+
+        Only successful calls update the latency EWMA, so the timeouts of an
+        outage do not keep a recovered engine ranked as slow.
+
+        Args:
+            success: Whether the engine produced audio
+            latency: Seconds the call took
+        """
+        with self._lock:
+            if success:
+                if self.latency_ewma is None:
+                    self.latency_ewma = latency
+                else:
+                    self.latency_ewma += self.latency_alpha * (latency - self.latency_ewma)
+            self._results.append(success)
+
+            if self.state == HALF_OPEN:
+                self._probing = False
+                if success:
+                    self.state = CLOSED
+                    self._results.clear()
+                    self._results.append(True)
+                    logger.info(f"Engine {self.name}: circuit closed")
+                else:
+                    self._open()
+            elif not success and self.state == CLOSED and len(self._results) >= self.min_calls:
+                failures = len(self._results) - sum(self._results)
+                if failures / len(self._results) >= self.failure_threshold:
+                    self._open()
+
+    def _open(self) -> None:
+        """Open the breaker (lock held)."""
+        self.state = OPEN
+        self._opened_at = self.clock()
+        logger.warning(f"Engine {self.name}: circuit open for {self.open_seconds} s")
+
+    def as_dict(self) -> Dict:
+        """Return the state, success rate and latency EWMA."""
+        success_rate = self.success_rate
+        return {
+            "state": self.state,
+            "success_rate": round(success_rate, 3) if success_rate is not None else None,
+            "latency_ewma": round(self.latency_ewma, 4) if self.latency_ewma is not None else None,
+        }
+
+
+class EngineRouter:
+    """Orders engines by preference and health and records the outcome of every call."""
+
+    def __init__(self, engines: Iterable[str], latency_sla: Optional[float] = None, **breaker_options):
+        """
+        Create a breaker per engine.
+
+        Args:
+            engines: Engine names in order of preference
+            latency_sla: Seconds above which an engine's latency EWMA moves it
+                behind the engines that meet it (None to ignore latency)
+            **breaker_options: Options passed to every CircuitBreaker
+        """
+        self.breakers: Dict[str, CircuitBreaker] = {
+            name: CircuitBreaker(name, **breaker_options) for name in engines
+        }
+        self._preference = list(self.breakers)
+        self.latency_sla = latency_sla
+
+    def candidates(self, available: Optional[Iterable[str]] = None) -> Iterator[str]:
+        """
+        Yield the engines to try for one request, best first.
+
+        Engines are tried in order of preference. With a latency SLA, those
+        whose latency EWMA exceeds it follow the others, still in order of
+        preference; an engine not yet measured keeps its place. Engines whose
+        breaker is open are skipped. Breakers are consulted lazily, so
+        stopping after the first success never claims the half-open probe of
+        a later engine.
+
+        Args:
+            available: Engines that are installed (defaults to all)
+
+        Yields:
+            Engine names in the order to try them
+        """
+        names = self._preference if available is None else [n for n in self._preference if n in set(available)]
+
+        def too_slow(name: str) -> bool:
+            latency = self.breakers[name].latency_ewma
+            return self.latency_sla is not None and latency is not None and latency > self.latency_sla
+
+        # sorted() is stable, so preference order holds within each group
+        for name in sorted(names, key=too_slow):
+            if self.breakers[name].allow():
+                yield name
+
+    def record(self, name: str, success: bool, latency: float) -> None:
+        """Record the outcome of a call to an engine."""
+        self.breakers[name].record(success, latency)
+
+    def stats(self) -> Dict[str, Dict]:
+        """Return the health of every engine."""
+        return {name: breaker.as_dict() for name, breaker in self.breakers.items()}
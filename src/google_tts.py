@@ -0,0 +1,347 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Google TTS Transport
+--------------------
+This module talks to the Google Translate TTS endpoint directly, reusing gTTS
+for request construction. Synchronous requests share one keep-alive session
+with a bounded connection pool, retries with jittered exponential backoff and
+per-request timeouts, so only the first request to the endpoint pays for the
+TLS handshake; asynchronous requests use aiohttp, with the same retries,
+without blocking an event loop.
+"""
+
+import re
+import time
+import base64
+import random
+import asyncio
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from src.rate_limit import TokenBucket
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+try:
+    from gtts import gTTS, gTTSError
+    GTTS_AVAILABLE = True
+except ImportError:
+    GTTS_AVAILABLE = False
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# Timeout for a single request to the TTS endpoint, in seconds
+DEFAULT_TIMEOUT = 30.0
+# Timeout for establishing a connection, in seconds
+DEFAULT_CONNECT_TIMEOUT = 5.0
+# Keep-alive connections kept open per host by the shared session
+DEFAULT_POOL_SIZE = 10
+# Retries after a failed request, and the base and cap of the backoff in seconds
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+MAX_BACKOFF = 8.0
+
+# HTTP statuses worth retrying (rate limiting and server errors)
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+_session: Optional["requests.Session"] = None
+_session_lock = threading.Lock()
+
+_AUDIO_RE = re.compile(r'jQ1olc","\[\\"(.*)\\"]')
+
+
+def decode_response(body: str) -> bytes:
+    """
+    Extract the MP3 data from a batchexecute response body.
+
+    Args:
+        body: Response text returned by the TTS endpoint
+
+    Returns:
+        Decoded MP3 audio
+
+    Raises:
+        ValueError: If the response does not contain an audio stream
+    """
+    for line in body.splitlines():
+        if "jQ1olc" in line:
+            match = _AUDIO_RE.search(line)
+            if match:
+                return base64.b64decode(match.group(1).encode('ascii'))
+    raise ValueError("No audio stream in Google TTS response")
+
+
+def create_session(pool_size: int = DEFAULT_POOL_SIZE) -> "requests.Session":
+    """
+    Create a keep-alive HTTP session for the TTS endpoint.
+
+    Requests beyond pool_size wait for a free connection instead of opening
+    (and then discarding) extra ones.
+
+    Args:
+        pool_size: Maximum number of connections kept open per host
+
+    Returns:
+        A requests session with a bounded connection pool
+    """
+    if not REQUESTS_AVAILABLE:
+        raise RuntimeError("Google TTS requires requests: pip install requests")
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=True, max_retries=0)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session() -> "requests.Session":
+    """Return the process-wide session shared by all synchronous requests."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+        return _session
+
+
+def configure_session(pool_size: int = DEFAULT_POOL_SIZE) -> "requests.Session":
+    """
+    Replace the shared session, e.g. to size its pool for more worker threads.
+
+    Args:
+        pool_size: Maximum number of connections kept open per host
+
+    Returns:
+        The new shared session
+    """
+    global _session
+    with _session_lock:
+        old, _session = _session, create_session(pool_size)
+    if old is not None:
+        old.close()
+    return _session
+
+
+class AsyncSession:
+    """
+    aiohttp sessions shared by the asynchronous requests, one per event loop.
+
+    aiohttp sessions are bound to the loop they were created in, so each loop
+    the holder is used from gets its own session; close() closes them all.
+    """
+
+    def __init__(self):
+        self._sessions: Dict[asyncio.AbstractEventLoop, "aiohttp.ClientSession"] = {}
+        self._lock = threading.Lock()
+
+    def get(self) -> "aiohttp.ClientSession":
+        """Return the session of the running event loop, creating it on first use."""
+        if not AIOHTTP_AVAILABLE:
+            raise RuntimeError("Async Google TTS requires aiohttp: pip install aiohttp")
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._sessions.get(loop)
+            if session is None or session.closed:
+                session = self._sessions[loop] = aiohttp.ClientSession(trust_env=True)
+        return session
+
+    async def close(self) -> None:
+        """Close the sessions of every event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            sessions, self._sessions = self._sessions, {}
+        for session_loop, session in sessions.items():
+            if session.closed:
+                continue
+            if session_loop is not loop and session_loop.is_running():
+                # Close it in the loop (and thread) it belongs to
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(session.close(), session_loop))
+            else:
+                # A finished loop leaves no connection to wait for
+                await session.close()
+
+
+def backoff_delay(attempt: int, backoff: float = DEFAULT_BACKOFF, max_backoff: float = MAX_BACKOFF) -> float:
+    """
+    Return the delay before a retry, with full jitter.
+
+    Spreading retries over [0, backoff * 2 ** attempt] keeps workers that
+    failed together from retrying in lockstep.
+
+    Args:
+        attempt: Number of the retry, starting at 0
+        backoff: Base delay in seconds
+        max_backoff: Upper bound of the delay in seconds
+
+    Returns:
+        Seconds to wait
+    """
+    return random.uniform(0, min(max_backoff, backoff * 2 ** attempt))
+
+
+def _status_error(status: int) -> Optional[Exception]:
+    """Return the error of a retryable HTTP status, or None for a success; raise other failures."""
+    if status in RETRY_STATUSES:
+        return gTTSError(f"Google TTS request failed with HTTP {status}")
+    if status >= 400:
+        raise gTTSError(f"Google TTS request failed with HTTP {status}")
+    return None
+
+
+def _retry_delay(error: Exception, attempt: int, retries: int, backoff: float) -> float:
+    """Return the delay before retrying a failed request, or raise error once the retries are used up."""
+    if attempt == retries:
+        raise error
+    delay = backoff_delay(attempt, backoff)
+    logger.warning(f"Google TTS request failed ({error}), retrying in {delay:.2f} s")
+    return delay
+
+
+def _post(session: "requests.Session", url: str, body: str, timeout: float, retries: int, backoff: float,
+          limiter: Optional[TokenBucket]) -> bytes:
+    """POST one prepared part, retrying connection errors, timeouts and retryable statuses."""
+    for attempt in range(retries + 1):
+        if limiter is not None:
+            # Retries are requests too and count against the limit
+            limiter.acquire()
+        try:
+            response = session.post(url, data=body, headers=gTTS.GOOGLE_TTS_HEADERS,
+                                    timeout=(min(DEFAULT_CONNECT_TIMEOUT, timeout), timeout))
+            error = _status_error(response.status_code)
+            if error is None:
+                return decode_response(response.text)
+        except requests.exceptions.SSLError:
+            # Certificate problems do not go away by retrying
+            raise
+        except (requests.ConnectionError, requests.Timeout) as e:
+            error = e
+        time.sleep(_retry_delay(error, attempt, retries, backoff))
+
+
+async def _apost(session: "aiohttp.ClientSession", url: str, body: str, timeout: float, retries: int,
+                 backoff: float, limiter: Optional[TokenBucket]) -> bytes:
+    """Asynchronous _post, with the same retry policy."""
+    for attempt in range(retries + 1):
+        if limiter is not None:
+            await limiter.aacquire()
+        try:
+            async with session.post(url, data=body, headers=gTTS.GOOGLE_TTS_HEADERS,
+                                    timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                error = _status_error(response.status)
+                if error is None:
+                    return decode_response(await response.text())
+        except aiohttp.ClientSSLError:
+            # Certificate problems do not go away by retrying
+            raise
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            error = e
+        await asyncio.sleep(_retry_delay(error, attempt, retries, backoff))
+
+
+def synthesize(text: str, lang: str = 'ja', slow: bool = False, session: Optional["requests.Session"] = None,
+               timeout: float = DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES, backoff: float = DEFAULT_BACKOFF,
+               url: Optional[str] = None, limiter: Optional[TokenBucket] = None) -> bytes:
+    """
+    Synthesize text with Google TTS over a keep-alive session.
+
+    Drop-in replacement for gTTS(...).write_to_fp(): gTTS splits the text
+    into parts of at most 100 characters, which are requested in order over
+    the shared connection pool.
+
+    Args:
+        text: Text to synthesize
+        lang: Language code
+        slow: Whether to request slow speech
+        session: HTTP session (defaults to the shared session)
+        timeout: Per-request read timeout in seconds
+        retries: Retries per part after a failed request
+        backoff: Base delay of the jittered exponential backoff in seconds
+        url: Endpoint replacing the Google URL (for proxies and local test servers)
+        limiter: Rate limiter every HTTP request waits for
+
+    Returns:
+        Encoded MP3 audio
+    """
+    if not (GTTS_AVAILABLE and REQUESTS_AVAILABLE):
+        raise RuntimeError("Google TTS requires gtts: pip install gtts")
+
+    session = session or get_session()
+    tts = gTTS(text=text, lang=lang, slow=slow)
+    # gTTS only exposes fully prepared requests through this helper
+    parts = [_post(session, url or pr.url, pr.body, timeout, retries, backoff, limiter)
+             for pr in tts._prepare_requests()]
+    logger.debug(f"Fetched {len(parts)} audio parts")
+    return b"".join(parts)
+
+
+async def asynthesize(text: str, lang: str = 'ja', slow: bool = False,
+                      session: Optional["aiohttp.ClientSession"] = None,
+                      timeout: float = DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES,
+                      backoff: float = DEFAULT_BACKOFF, url: Optional[str] = None,
+                      limiter: Optional[TokenBucket] = None) -> bytes:
+    """
+    Synthesize text with Google TTS using non-blocking HTTP.
+
+    gTTS splits the text into parts of at most 100 characters; unlike gTTS,
+    the parts are requested concurrently and joined in order. Failed parts
+    are retried as in synthesize().
+
+    Args:
+        text: Text to synthesize
+        lang: Language code
+        slow: Whether to request slow speech
+        session: Shared aiohttp session (a temporary one is created if None)
+        timeout: Per-request timeout in seconds
+        retries: Retries per part after a failed request
+        backoff: Base delay of the jittered exponential backoff in seconds
+        url: Endpoint replacing the Google URL (for proxies and local test servers)
+        limiter: Rate limiter every HTTP request waits for
+
+    Returns:
+        Encoded MP3 audio
+    """
+    if not (GTTS_AVAILABLE and AIOHTTP_AVAILABLE):
+        raise RuntimeError("Async Google TTS requires gtts and aiohttp: pip install gtts aiohttp")
+
+    tts = gTTS(text=text, lang=lang, slow=slow)
+    # gTTS only exposes fully prepared requests through this helper
+    prepared = tts._prepare_requests()
+
+    own_session = session is None
+    if own_session:
+        session = aiohttp.ClientSession(trust_env=True)
+
+    tasks = [asyncio.ensure_future(_apost(session, url or pr.url, pr.body, timeout, retries, backoff, limiter))
+             for pr in prepared]
+    try:
+        parts: List[bytes] = await asyncio.gather(*tasks)
+    except BaseException:
+        # Do not leave sibling requests running after a failure or cancellation
+        for task in tasks:
+            task.cancel()
+        raise
+    finally:
+        if own_session:
+            await session.close()
+
+    logger.debug(f"Fetched {len(parts)} audio parts asynchronously")
+    return b"".join(parts)
@@ -8,14 +8,25 @@ This module provides functionality for converting Japanese text to phonetic form
 (hiragana, katakana, romaji) which can be useful for speech processing.
 """
 
+import re
+import time
+import inspect
 import logging
-from typing import Dict, List, Optional
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterator, List, NamedTuple, Optional, Union
 
 try:
     from janome.tokenizer import Tokenizer
     JANOME_AVAILABLE = True
+    # Janome 0.4 returns a list unless stream=True is passed; 0.5+ always
+    # returns a generator and no longer accepts the argument
+    _JANOME_STREAM_KWARGS = (
+        {'stream': True} if 'stream' in inspect.signature(Tokenizer.tokenize).parameters else {}
+    )
 except ImportError:
     JANOME_AVAILABLE = False
+    _JANOME_STREAM_KWARGS = {}
     
 try:
     import pykakasi
@@ -30,27 +41,356 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Process-wide registry of expensive, read-only resources (dictionaries).
+# Loading the Janome system dictionary costs seconds and hundreds of MB, so
+# every converter in the process shares a single instance.
+_shared_resources: Dict[str, Any] = {}
+_shared_init_times: Dict[str, float] = {}
+# Reentrant: a factory may itself fetch another shared resource
+_shared_lock = threading.RLock()
+
+
+def _get_shared_resource(name: str, factory: Callable[[], Any]) -> Any:
+    """
+    Return a shared resource, creating it on first use.
+    
+    Creation is serialized, so concurrent first calls build the resource once.
+    
+    Args:
+        name: Registry key of the resource
+        factory: Function creating the resource
+        
+    Returns:
+        The shared resource
+    """
+    resource = _shared_resources.get(name)
+    if resource is None:
+        with _shared_lock:
+            resource = _shared_resources.get(name)
+            if resource is None:
+                start = time.perf_counter()
+                resource = factory()
+                _shared_init_times[name] = time.perf_counter() - start
+                _shared_resources[name] = resource
+                logger.info(f"Initialized shared {name} in {_shared_init_times[name]:.3f}s")
+    return resource
+
+
+def get_tokenizer() -> Optional["Tokenizer"]:
+    """
+    Return the process-wide Janome tokenizer.
+    
+    Returns:
+        The shared Tokenizer, or None if Janome is not installed
+    """
+    if not JANOME_AVAILABLE:
+        return None
+    return _get_shared_resource('janome_tokenizer', Tokenizer)
+
+
+def get_kakasi() -> Optional[Any]:
+    """
+    Return the process-wide pykakasi instance.
+    
+    Returns:
+        The shared kakasi object, or None if pykakasi is not installed
+    """
+    if not KAKASI_AVAILABLE:
+        return None
+    return _get_shared_resource('kakasi', pykakasi.kakasi)
+
+
+def get_kakasi_converter() -> Optional[Any]:
+    """
+    Return the process-wide kakasi converter.
+    
+    Returns:
+        The shared converter, or None if pykakasi is not installed
+    """
+    if not KAKASI_AVAILABLE:
+        return None
+    return _get_shared_resource('kakasi_converter', lambda: get_kakasi().getConverter())
+
+
+def preload_resources() -> Dict[str, float]:
+    """
+    Load the shared Janome tokenizer and pykakasi instance eagerly.
+    
+    Intended for service start-up, so the first request does not pay the
+    dictionary loading cost.
+    
+    Returns:
+        Initialization time in seconds of each loaded resource
+    """
+    get_tokenizer()
+    get_kakasi()
+    return get_resource_init_times()
+
+
+def get_resource_init_times() -> Dict[str, float]:
+    """
+    Report how long each shared resource took to initialize.
+    
+    Returns:
+        Mapping of resource name to initialization time in seconds
+    """
+    with _shared_lock:
+        return dict(_shared_init_times)
+
+
+# Default number of whole-text conversions remembered per converter
+DEFAULT_CONVERSION_CACHE_SIZE = 1024
+
+# Default number of phrase conversions remembered per converter
+DEFAULT_SEGMENT_CACHE_SIZE = 16384
+
+# Longer texts bypass the whole-text cache (their phrases are still cached),
+# so converting a large corpus does not pin it in memory
+MAX_MEMOIZED_TEXT_LENGTH = 4096
+
+# Phrases end at Japanese/ASCII punctuation or a newline. Readings do not
+# depend on context across these boundaries, so phrases are converted and
+# cached independently.
+_SEGMENT_RE = re.compile(r'[^、。，．！？!?\n]*[、。，．！？!?\n]+|[^、。，．！？!?\n]+')
+
+# Line breaks inside a phrase; they are kept out of the backends, which
+# garble the words around them
+_LINE_BREAK_RE = re.compile(r'(\r?\n)')
+
+# Romaji items are space separated, except before punctuation
+_ROMAJI_PUNCT_RE = re.compile(r' +([、。，．！？!?,.\n])')
+
+
+def _join_phrases(parts: Iterator[str], separator: str) -> str:
+    """Join converted phrases with separator, except at the start of a line."""
+    if not separator:
+        return "".join(parts)
+    pieces: List[str] = []
+    for part in parts:
+        if pieces and not pieces[-1].endswith("\n"):
+            pieces.append(separator)
+        pieces.append(part)
+    return "".join(pieces)
+
+
+class TokenInfo(NamedTuple):
+    """Compact description of a single token."""
+    surface: str
+    base_form: str
+    reading: str
+    part_of_speech: str
+
+
+class LRUCache:
+    """Thread-safe bounded least-recently-used cache with hit/miss counters."""
+    
+    def __init__(self, capacity: int):
+        """
+        Initialize the cache.
+        
+        Args:
+            capacity: Maximum number of entries (0 disables caching)
+        """
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Look up a key, marking it as recently used.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            The cached value, or None on a miss
+        """
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, evicting the least recently used entry if full.
+        
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        if self.capacity <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.capacity:
+                self._data.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+    
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Report cache usage.
+        
+        Returns:
+            Dictionary with hits, misses, size, capacity and hit ratio
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._data),
+                "capacity": self.capacity,
+                "hit_ratio": self.hits / lookups if lookups else 0.0
+            }
+
+
 class JapanesePhoneticConverter:
     """Class for converting Japanese text to various phonetic forms."""
     
-    def __init__(self):
-        """Initialize the Japanese phonetic converter."""
-        # Initialize Janome tokenizer if available
-        if JANOME_AVAILABLE:
-            self.tokenizer = Tokenizer()
-            logger.info("Janome tokenizer initialized")
-        else:
-            self.tokenizer = None
-            logger.warning("Janome not available. Some functionality will be limited.")
+    def __init__(self, preload: bool = False, cache_size: int = DEFAULT_CONVERSION_CACHE_SIZE,
+                 segment_cache_size: int = DEFAULT_SEGMENT_CACHE_SIZE):
+        """
+        Initialize the Japanese phonetic converter.
         
-        # Initialize kakasi converter if available
-        if KAKASI_AVAILABLE:
-            self.kakasi = pykakasi.kakasi()
-            self.kakasi_conv = self.kakasi.getConverter()
-            logger.info("Kakasi converter initialized")
-        else:
-            self.kakasi_conv = None
+        The Janome tokenizer and kakasi converter are shared process-wide and
+        loaded on first use.
+        
+        Args:
+            preload: Load the shared tokenizer and converter immediately
+            cache_size: Number of whole-text conversions to memoize (0 disables)
+            segment_cache_size: Number of phrase conversions to memoize (0 disables)
+        """
+        if not JANOME_AVAILABLE:
+            logger.warning("Janome not available. Some functionality will be limited.")
+        if not KAKASI_AVAILABLE:
             logger.warning("Pykakasi not available. Some functionality will be limited.")
+        
+        # Conversions are memoized per (text, target script, backend)
+        self.conversion_cache = LRUCache(cache_size)
+        self.segment_cache = LRUCache(segment_cache_size)
+        
+        if preload:
+            preload_resources()
+    
+    @property
+    def tokenizer(self) -> Optional["Tokenizer"]:
+        """Shared Janome tokenizer (None if Janome is not installed)."""
+        return get_tokenizer()
+    
+    @property
+    def kakasi(self) -> Optional[Any]:
+        """Shared pykakasi instance (None if pykakasi is not installed)."""
+        return get_kakasi()
+    
+    @property
+    def kakasi_conv(self) -> Optional[Any]:
+        """Shared kakasi converter (None if pykakasi is not installed)."""
+        return get_kakasi_converter()
+    
+    def cache_stats(self) -> Dict[str, Dict[str, Union[int, float]]]:
+        """
+        Report hit ratios of the conversion caches.
+        
+        Returns:
+            Statistics of the whole-text and phrase caches
+        """
+        return {
+            "conversion": self.conversion_cache.stats(),
+            "segment": self.segment_cache.stats()
+        }
+    
+    def _convert(self, text: str, target: str, backend: str,
+                 convert_segment: Callable[[str], str], separator: str = "") -> str:
+        """
+        Convert text through the memoization layers.
+        
+        The whole text is looked up first; on a miss it is split into phrases
+        and only phrases not seen before are passed to the backend.
+        
+        Args:
+            text: Japanese text
+            target: Target script name (part of the cache key)
+            backend: Conversion backend name (part of the cache key)
+            convert_segment: Backend function converting one phrase
+            separator: String placed between converted phrases
+            
+        Returns:
+            Converted text
+        """
+        memoize = len(text) <= MAX_MEMOIZED_TEXT_LENGTH
+        key = (text, target, backend)
+        if memoize:
+            result = self.conversion_cache.get(key)
+            if result is not None:
+                return result
+        
+        result = _join_phrases(self._iter_converted_segments(text, target, backend, convert_segment), separator)
+        if memoize:
+            self.conversion_cache.put(key, result)
+        return result
+    
+    def _iter_converted_segments(self, text: str, target: str, backend: str,
+                                 convert_segment: Callable[[str], str]) -> Iterator[str]:
+        """Yield the converted phrases of text, using the phrase cache."""
+        for match in _SEGMENT_RE.finditer(text):
+            segment = match.group()
+            segment_key = (segment, target, backend)
+            part = self.segment_cache.get(segment_key)
+            if part is None:
+                part = "".join(piece if not piece or _LINE_BREAK_RE.fullmatch(piece) else convert_segment(piece)
+                               for piece in _LINE_BREAK_RE.split(segment))
+                self.segment_cache.put(segment_key, part)
+            yield part
+    
+    def iter_readings(self, text: str) -> Iterator[str]:
+        """
+        Stream the Janome readings of text token by token.
+        
+        Tokens are produced lazily, so memory use does not grow with the
+        length of the text.
+        
+        Args:
+            text: Japanese text
+            
+        Returns:
+            Iterator over token readings
+        """
+        for token in self.tokenizer.tokenize(text, **_JANOME_STREAM_KWARGS):
+            yield token.reading
+    
+    def _janome_reading(self, text: str) -> str:
+        """Return the concatenated Janome token readings of text."""
+        return "".join(self.iter_readings(text))
+    
+    def _kakasi_convert(self, text: str, field: str, separator: str = "") -> str:
+        """
+        Convert text with pykakasi.
+        
+        Args:
+            text: Japanese text
+            field: pykakasi result field ('hira', 'kana' or 'hepburn')
+            separator: String placed between converted words
+            
+        Returns:
+            Converted text
+        """
+        return separator.join(item[field] for item in self.kakasi.convert(text))
+    
+    def _kakasi_romaji(self, text: str) -> str:
+        """Convert text to space-separated Hepburn romaji with pykakasi."""
+        return _ROMAJI_PUNCT_RE.sub(r'\1', self._kakasi_convert(text, 'hepburn', separator=" ")).strip(" ")
     
     def to_hiragana(self, text: str) -> str:
         """
@@ -67,14 +407,10 @@ class JapanesePhoneticConverter:
             
         if self.tokenizer:
             # Use Janome for accurate kanji to hiragana conversion
-            result = ""
-            for token in self.tokenizer.tokenize(text):
-                result += token.reading
-            return result
-        elif self.kakasi_conv:
+            return self._convert(text, 'hiragana', 'janome', self._janome_reading)
+        elif self.kakasi:
             # Use kakasi as fallback
-            result = self.kakasi_conv.do(text)
-            return result.get('hira', text)
+            return self._convert(text, 'hiragana', 'kakasi', lambda s: self._kakasi_convert(s, 'hira'))
         else:
             logger.warning("No conversion libraries available. Returning original text.")
             return text
@@ -92,9 +428,8 @@ class JapanesePhoneticConverter:
         if not text:
             return ""
             
-        if self.kakasi_conv:
-            result = self.kakasi_conv.do(text)
-            return result.get('hepburn', text)
+        if self.kakasi:
+            return self._convert(text, 'romaji', 'kakasi', self._kakasi_romaji, separator=" ")
         else:
             logger.warning("Pykakasi not available for romaji conversion. Returning original text.")
             return text
@@ -112,40 +447,48 @@ class JapanesePhoneticConverter:
         if not text:
             return ""
             
-        if self.kakasi_conv:
-            result = self.kakasi_conv.do(text)
-            return result.get('kana', text)
+        if self.kakasi:
+            return self._convert(text, 'katakana', 'kakasi', lambda s: self._kakasi_convert(s, 'kana'))
         else:
             logger.warning("Pykakasi not available for katakana conversion. Returning original text.")
             return text
     
-    def tokenize(self, text: str) -> List[Dict[str, str]]:
+    def iter_tokens(self, text: str) -> Iterator[TokenInfo]:
         """
-        Tokenize Japanese text and provide detailed information.
+        Stream token information without materializing the token list.
         
         Args:
             text: Japanese text
             
         Returns:
-            List of tokens with their information
+            Iterator over TokenInfo tuples
         """
         if not text:
-            return []
-            
-        if self.tokenizer:
-            result = []
-            for token in self.tokenizer.tokenize(text):
-                token_info = {
-                    'surface': token.surface,
-                    'base_form': token.base_form,
-                    'reading': token.reading,
-                    'part_of_speech': token.part_of_speech.split(',')[0]
-                }
-                result.append(token_info)
-            return result
-        else:
+            return
+        
+        if not self.tokenizer:
             logger.warning("Janome not available for tokenization.")
-            return [{'surface': text, 'error': 'Tokenizer not available'}]
+            return
+        
+        for token in self.tokenizer.tokenize(text, **_JANOME_STREAM_KWARGS):
+            yield TokenInfo(
+                token.surface,
+                token.base_form,
+                token.reading,
+                token.part_of_speech.partition(',')[0]
+            )
+    
+    def tokenize(self, text: str) -> List[TokenInfo]:
+        """
+        Tokenize Japanese text and provide detailed information.
+        
+        Args:
+            text: Japanese text
+            
+        Returns:
+            List of tokens with their information (empty if Janome is not available)
+        """
+        return list(self.iter_tokens(text))
 
 # Example usage
 if __name__ == "__main__":
@@ -168,4 +511,4 @@ if __name__ == "__main__":
     tokens = converter.tokenize(sample_text)
     print("\nTokenization:")
     for token in tokens:
-        print(f"  {token['surface']} ({token['part_of_speech']}): {token['reading']}")
+        print(f"  {token.surface} ({token.part_of_speech}): {token.reading}")
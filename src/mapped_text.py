@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Memory-Mapped Text Reader
+-------------------------
+This module provides read-only access to large UTF-8 text files through
+mmap. Only the byte ranges that are asked for get decoded, and a compact
+line index allows random access to any range of lines.
+"""
+
+import os
+import mmap
+import logging
+from array import array
+from pathlib import Path
+from typing import Iterator, List, Optional, Union
+
+# numpy makes building the line index much faster, but is optional
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Bytes scanned per step while building the line index
+INDEX_BLOCK_SIZE = 4 * 1024 * 1024
+
+
+class MappedTextFile:
+    """Lazily decoded, memory-mapped view of a UTF-8 text file."""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Map a text file into memory.
+
+        Args:
+            path: File to map
+        """
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        self.size = os.fstat(self._file.fileno()).st_size
+        # mmap cannot map an empty file
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b""
+        self._offsets: Optional[array] = None
+
+    def close(self) -> None:
+        """Unmap and close the file."""
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "MappedTextFile":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @property
+    def line_offsets(self) -> array:
+        """
+        Byte offset of the start of every line, plus the file size at the end.
+
+        Built on first use with a single scan for newlines and stored as an
+        array of 64-bit integers (8 bytes per line).
+        """
+        if self._offsets is None:
+            offsets = array('Q', [0])
+            if NUMPY_AVAILABLE:
+                for start in range(0, self.size, INDEX_BLOCK_SIZE):
+                    block = np.frombuffer(self._map[start:start + INDEX_BLOCK_SIZE], dtype=np.uint8)
+                    newlines = np.flatnonzero(block == ord("\n")).astype(np.uint64) + (start + 1)
+                    offsets.frombytes(newlines.tobytes())
+            else:
+                find = self._map.find
+                pos = find(b"\n")
+                while pos != -1:
+                    offsets.append(pos + 1)
+                    pos = find(b"\n", pos + 1)
+            if offsets[-1] != self.size:
+                # Last line without a trailing newline
+                offsets.append(self.size)
+            self._offsets = offsets
+            logger.info(f"Indexed {len(offsets) - 1} lines of {self.path}")
+        return self._offsets
+
+    def __len__(self) -> int:
+        """Number of lines in the file."""
+        return len(self.line_offsets) - 1
+
+    def slice(self, start: int, end: int) -> str:
+        """
+        Decode a byte range of the file.
+
+        Args:
+            start: First byte offset
+            end: Byte offset after the range
+
+        Returns:
+            The decoded text (a character cut by the range is replaced)
+        """
+        return self._map[start:end].decode('utf-8', errors='replace')
+
+    def _decode_line(self, start: int, end: int) -> str:
+        data = self._map[start:end]
+        if data.endswith(b"\n"):
+            data = data[:-2] if data.endswith(b"\r\n") else data[:-1]
+        return data.decode('utf-8')
+
+    def line(self, index: int) -> str:
+        """
+        Get one line without its line ending.
+
+        Args:
+            index: Zero-based line number (negative values count from the end)
+
+        Returns:
+            The decoded line
+        """
+        offsets = self.line_offsets
+        count = len(offsets) - 1
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError(f"line {index} out of range for {count} lines")
+        return self._decode_line(offsets[index], offsets[index + 1])
+
+    def lines(self, start: int = 0, stop: Optional[int] = None) -> List[str]:
+        """
+        Get a range of lines without their line endings.
+
+        Args:
+            start: First line number
+            stop: Line number after the range (defaults to the end of the file)
+
+        Returns:
+            The decoded lines
+        """
+        return list(self.iter_lines(start, stop))
+
+    def iter_lines(self, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+        """
+        Lazily decode a range of lines, one at a time.
+
+        Args:
+            start: First line number
+            stop: Line number after the range (defaults to the end of the file)
+
+        Yields:
+            Lines without their line endings
+        """
+        offsets = self.line_offsets
+        start, stop, _ = slice(start, stop).indices(len(offsets) - 1)
+        for index in range(start, stop):
+            yield self._decode_line(offsets[index], offsets[index + 1])
+
+    def read(self) -> str:
+        """Decode the whole file, with universal newlines like read_text_file."""
+        text = self.slice(0, self.size)
+        return text.replace("\r\n", "\n").replace("\r", "\n")
@@ -0,0 +1,250 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Markdown Cleaner
+----------------
+This module turns Markdown into speech-ready plain text in one pass over
+the lines, using precompiled patterns. Block syntax is handled per line
+and inline syntax (images, links, emphasis, code spans) by a single
+tokenizing regex. An offset map relates every position of the clean text
+back to the Markdown source.
+"""
+
+import re
+import logging
+from array import array
+from bisect import bisect_right
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Block-level syntax at the start of a line
+_FENCE_RE = re.compile(r'[ \t]*(`{3,}(?=[^`]*$)|~{3,})')
+_THEMATIC_BREAK_RE = re.compile(r'[ \t]*(?:-(?:[ \t]*-){2,}|\*(?:[ \t]*\*){2,}|_(?:[ \t]*_){2,})[ \t]*$')
+_BLOCK_PREFIX_RE = re.compile(
+    r'[ \t]*(?:(?P<header>#{1,6}[ \t]+)|(?P<item>(?:[-*+]|\d+\.)[ \t]+)|(?P<quote>(?:>[ \t]?)+))'
+)
+
+# Inline syntax; images must come before links so that they are dropped whole,
+# and underscores inside ASCII identifiers (file_name) are not emphasis
+_INLINE_RE = re.compile(
+    r'!\[[^\]\n]*\]\([^)\n]*\)'
+    r'|\[(?P<link>[^\]\n]+)\]\([^)\n]*\)'
+    r'|\*\*(?P<strong>.+?)\*\*(?!\*)'
+    r'|(?<![A-Za-z0-9])__(?P<strong_u>.+?)__(?![A-Za-z0-9])'
+    r'|\*(?P<em>.+?)\*'
+    r'|(?<![A-Za-z0-9])_(?P<em_u>[^_]+?)_(?![A-Za-z0-9])'
+    r'|(?P<ticks>`+)(?P<code>.+?)(?P=ticks)'
+)
+
+# Any character that can start inline syntax; lines without one are copied as is
+_INLINE_START_RE = re.compile(r'[!\[*_`]')
+
+# Groups whose content may contain more inline syntax
+_NESTED_GROUPS = frozenset(('link', 'strong', 'strong_u', 'em', 'em_u'))
+
+
+class OffsetMap:
+    """Maps positions in the clean text back to positions in the Markdown source."""
+
+    def __init__(self):
+        """Start an empty map."""
+        self.output_offsets = array('Q')
+        self.source_offsets = array('Q')
+
+    def add(self, output_offset: int, source_offset: int) -> None:
+        """
+        Record that the clean text at output_offset was copied from source_offset.
+
+        Args:
+            output_offset: Start of a run of copied text in the clean text
+            source_offset: Start of the same run in the source
+        """
+        self.output_offsets.append(output_offset)
+        self.source_offsets.append(source_offset)
+
+    def to_source(self, output_offset: int) -> int:
+        """
+        Find the source position of a clean text position.
+
+        Args:
+            output_offset: Character offset in the clean text
+
+        Returns:
+            Character offset in the Markdown source
+        """
+        index = bisect_right(self.output_offsets, output_offset) - 1
+        if index < 0:
+            return 0
+        return self.source_offsets[index] + output_offset - self.output_offsets[index]
+
+    def __len__(self) -> int:
+        return len(self.output_offsets)
+
+
+class MarkdownCleaner:
+    """Incremental Markdown to speech text converter, fed one line at a time."""
+
+    def __init__(self, offset_map: Optional[OffsetMap] = None):
+        """
+        Initialize the cleaner.
+
+        Args:
+            offset_map: Map to record source offsets in (None to skip recording)
+        """
+        self.offset_map = offset_map
+        self._fence: Optional[str] = None
+        self._source_pos = 0
+        self._output_pos = 0
+
+    def _clean_inline(self, text: str, start: int, end: int, pieces: List[str], source_base: int) -> None:
+        """Append the clean pieces of text[start:end] to pieces, recording their offsets."""
+        pos = start
+        for match in _INLINE_RE.finditer(text, start, end):
+            if match.start() > pos:
+                self._emit(text[pos:match.start()], pieces, source_base + pos)
+            group = match.lastgroup
+            if group in _NESTED_GROUPS:
+                self._clean_inline(text, match.start(group), match.end(group), pieces, source_base)
+            elif group == 'code':
+                self._emit(match.group('code'), pieces, source_base + match.start('code'))
+            pos = match.end()
+        if end > pos:
+            self._emit(text[pos:end], pieces, source_base + pos)
+
+    def _emit(self, piece: str, pieces: List[str], source_offset: int) -> None:
+        if self.offset_map is not None:
+            self.offset_map.add(self._output_pos, source_offset)
+        pieces.append(piece)
+        self._output_pos += len(piece)
+
+    def feed(self, line: str) -> Optional[str]:
+        """
+        Clean one line of Markdown.
+
+        Args:
+            line: Source line, including its line ending if it has one
+
+        Returns:
+            The speech text of the line, or None if the line produces none
+        """
+        source_base = self._source_pos
+        self._source_pos += len(line)
+        body = line.rstrip('\r\n')
+
+        if self._fence is not None:
+            stripped = body.strip()
+            if stripped.startswith(self._fence) and not stripped.strip(self._fence[0]):
+                self._fence = None
+            return None
+
+        start = len(body) - len(body.lstrip())
+        end = len(body.rstrip())
+        if start >= end:
+            return None
+
+        suffix = ""
+        if body[start] in '`~#-*+>_0123456789':
+            fence = _FENCE_RE.match(body)
+            if fence:
+                self._fence = fence.group(1)
+                return None
+            if _THEMATIC_BREAK_RE.match(body):
+                return None
+            prefix = _BLOCK_PREFIX_RE.match(body)
+            if prefix:
+                start = prefix.end()
+                if prefix.lastgroup in ('header', 'item'):
+                    # Headers and list items become sentences of their own
+                    suffix = "."
+                if start >= end:
+                    return None
+
+        # Clean lines are joined with "\n"
+        separator = 1 if self._output_pos else 0
+        line_start = self._output_pos
+        self._output_pos += separator
+        if _INLINE_START_RE.search(body, start, end) is None:
+            clean = body[start:end]
+            if self.offset_map is not None:
+                self.offset_map.add(line_start + separator, source_base + start)
+        else:
+            pieces: List[str] = []
+            self._clean_inline(body, start, end, pieces, source_base)
+            clean = "".join(pieces)
+
+        if not clean or clean.isspace():
+            # Nothing speakable (e.g. an image only), so undo the separator and offsets
+            self._output_pos = line_start
+            if self.offset_map is not None:
+                while self.offset_map.output_offsets and self.offset_map.output_offsets[-1] >= line_start + separator:
+                    self.offset_map.output_offsets.pop()
+                    self.offset_map.source_offsets.pop()
+            return None
+
+        self._output_pos = line_start + separator + len(clean) + len(suffix)
+        return clean + suffix
+
+
+def _iter_lines(text: str, block_size: int = 64 * 1024) -> Iterator[str]:
+    """Iterate over the lines of text, with their endings, a block at a time."""
+    pos = 0
+    while pos < len(text):
+        end = text.find("\n", pos + block_size) + 1 or len(text)
+        yield from text[pos:end].splitlines(keepends=True)
+        pos = end
+
+
+def iter_clean_markdown(lines: Iterable[str], offset_map: Optional[OffsetMap] = None) -> Iterator[str]:
+    """
+    Clean streamed Markdown line by line.
+
+    Args:
+        lines: Markdown lines including their line endings (e.g. an open file)
+        offset_map: Map to record source offsets in
+
+    Yields:
+        Speech text lines, which joined with "\\n" form the clean text
+    """
+    cleaner = MarkdownCleaner(offset_map)
+    for line in lines:
+        clean = cleaner.feed(line)
+        if clean is not None:
+            yield clean
+
+
+def clean_markdown(markdown: Union[str, Iterable[str]]) -> str:
+    """
+    Remove Markdown formatting to get clean text for speech synthesis.
+
+    Args:
+        markdown: Markdown text, or its lines
+
+    Returns:
+        Clean text suitable for speech synthesis
+    """
+    if isinstance(markdown, str):
+        markdown = _iter_lines(markdown)
+    return "\n".join(iter_clean_markdown(markdown))
+
+
+def clean_markdown_with_offsets(markdown: Union[str, Iterable[str]]) -> Tuple[str, OffsetMap]:
+    """
+    Clean Markdown and map the result back to the source.
+
+    Args:
+        markdown: Markdown text, or its lines
+
+    Returns:
+        The clean text and an OffsetMap from clean text to source offsets
+    """
+    if isinstance(markdown, str):
+        markdown = _iter_lines(markdown)
+    offset_map = OffsetMap()
+    return "\n".join(iter_clean_markdown(markdown, offset_map)), offset_map
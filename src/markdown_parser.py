@@ -0,0 +1,263 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Markdown Structure Parser
+-------------------------
+This module extracts the structure of a Markdown document (headers, lists,
+code blocks and paragraphs) in a single pass. One pattern matches a whole
+element at a time, so paragraph and code lines are consumed by the regex
+engine instead of line by line in Python, and lines inside fenced code
+blocks are never mistaken for headers or list items. The parser also
+consumes any iterable of lines, so files can be streamed.
+"""
+
+import re
+import logging
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Element kinds produced by the parser
+HEADER = 'header'
+BULLET = 'bullet'
+NUMBERED = 'numbered'
+CODE = 'code'
+PARAGRAPH = 'paragraph'
+
+# Characters of streamed lines scanned at once
+DEFAULT_BLOCK_SIZE = 256 * 1024
+
+# The pieces of the element pattern (re.VERBOSE syntax). Every alternative
+# starts with a literal or a character class, which lets the regex engine
+# rule most of them out from the first character of a line.
+
+# A header; the hashes after the first one give its level
+_HEADER = r'\# (?P<hashes>\#{0,5}) [ \t]+ (?P<header>[^\n]*\S)'
+_THEMATIC_BREAK = r'(?: -(?:[ \t]*-){2,} | \*(?:[ \t]*\*){2,} | _(?:[ \t]*_){2,} ) [ \t]* $'
+_BULLET = r'[-*+] [ \t]+ (?P<bullet>[^\n]*\S)'
+_NUMBERED = r'[0-9]\d* \. [ \t]+ (?P<numbered>[^\n]*\S)'
+# The opening line of a fenced code block. The fence after its first character
+# is captured for the closing line; a backtick fence cannot have backticks
+# after it (that is inline code).
+_FENCE = r'''
+    (?: `(?P<ticks>``+) (?=[^`\n]*$) | ~(?P<tildes>~~+) )
+    [ \t]* (?P<language>[\w+-]*) [^\n]*
+'''
+
+
+def _uncaptured(pattern: str) -> str:
+    """Return pattern with its named groups made non-capturing, for reuse in a lookahead."""
+    return re.sub(r'\(\?P<\w+>', '(?:', pattern)
+
+
+# Anything but a paragraph line
+_STARTS_ELEMENT = (r'\#{1,6} [ \t]+ [^\n]*\S | [ \t]* (?:'
+                   + '|'.join(_uncaptured(p) for p in (_THEMATIC_BREAK, _BULLET, _NUMBERED, _FENCE)) + ')')
+
+# One element per match, starting at the beginning of a line. Blank lines
+# match nothing and are skipped by the search.
+_ELEMENT_RE = re.compile(
+    r'^(?: ' + _HEADER + r'''
+    | [ \t]* (?:
+          ''' + _THEMATIC_BREAK + r''' (?P<thematic_break>)
+        | ''' + _BULLET + r'''
+        | ''' + _NUMBERED + r'''
+        # A code block runs to a line holding only its fence (at least as
+        # long as the opening one) or to the end of the document
+        | ''' + _FENCE + r'''
+          (?P<code> (?:\n[^\n]*)*? )
+          (?: \n[^\S\n]* (?(ticks) `(?P=ticks)`* | ~(?P=tildes)~* ) [^\S\n]* $ | \Z )
+      )
+    # A paragraph runs over non-blank lines until one starts another element;
+    # lines starting with ordinary text skip that check
+    | (?P<paragraph> [^\S\n]*\S[^\n]*
+        (?: \n (?: [^\s\#*+\-_`~0-9] | (?!''' + _STARTS_ELEMENT + r''') [^\S\n]*\S ) [^\n]* )* )
+    )''',
+    re.MULTILINE | re.VERBOSE
+)
+
+# Group telling which kind of element a match is (its last group)
+_HEADER_GROUP = _ELEMENT_RE.groupindex['header']
+_BULLET_GROUP = _ELEMENT_RE.groupindex['bullet']
+_NUMBERED_GROUP = _ELEMENT_RE.groupindex['numbered']
+_CODE_GROUP = _ELEMENT_RE.groupindex['code']
+_PARAGRAPH_GROUP = _ELEMENT_RE.groupindex['paragraph']
+
+
+class MarkdownElement(NamedTuple):
+    """A structural element of a Markdown document."""
+    kind: str
+    line: int
+    text: str
+    level: int = 0
+    language: str = ''
+
+
+def _element(match: 're.Match', line: int) -> Optional[MarkdownElement]:
+    """Build the element of a match starting on the given line (None for a thematic break)."""
+    group = match.lastindex
+    if group == _HEADER_GROUP:
+        return MarkdownElement(HEADER, line, match[group], len(match['hashes']) + 1)
+    if group == _PARAGRAPH_GROUP:
+        return MarkdownElement(PARAGRAPH, line, match[group])
+    if group == _BULLET_GROUP:
+        return MarkdownElement(BULLET, line, match[group])
+    if group == _NUMBERED_GROUP:
+        return MarkdownElement(NUMBERED, line, match[group])
+    if group == _CODE_GROUP:
+        # The code starts with the newline ending the opening fence
+        return MarkdownElement(CODE, line, match[group][1:], 0, match['language'])
+    return None
+
+
+def _iter_matches(text: str, line: int = 0) -> Iterator[Tuple['re.Match', int]]:
+    """Yield the element matches of text with the line each starts on, counting from line."""
+    position = 0
+    for match in _ELEMENT_RE.finditer(text):
+        start = match.start()
+        line += text.count("\n", position, start)
+        position = start
+        yield match, line
+
+
+def _iter_blocks(lines: Iterable[str], block_size: int) -> Iterator[List[str]]:
+    """Group lines, without their line endings, into blocks of about block_size characters."""
+    block: List[str] = []
+    size = 0
+    for line in lines:
+        line = line.rstrip("\r\n")
+        block.append(line)
+        size += len(line) + 1
+        if size >= block_size:
+            yield block
+            block = []
+            size = 0
+    if block:
+        yield block
+
+
+def iter_markdown_elements(lines: Union[str, Iterable[str]],
+                           block_size: int = DEFAULT_BLOCK_SIZE) -> Iterator[MarkdownElement]:
+    """
+    Parse Markdown into structural elements, in one scan and in document order.
+
+    Args:
+        lines: The whole document as a string, or its lines with or without
+            line endings (e.g. an open file, which is then streamed)
+        block_size: Characters of streamed lines scanned at once
+
+    Yields:
+        MarkdownElement with its zero-based starting line number
+    """
+    if isinstance(lines, str):
+        for match, line in _iter_matches(lines):
+            element = _element(match, line)
+            if element is not None:
+                yield element
+        return
+
+    # The last element of a block may continue in the next one, so its text
+    # is carried over and scanned again; a long carry (an unclosed code
+    # block) waits for more lines, which keeps the rescans linear
+    carry: List[str] = []
+    carry_size = 0
+    carry_line = 0
+    pending: List[str] = []
+    pending_size = 0
+    for block in _iter_blocks(lines, block_size):
+        pending.extend(block)
+        pending_size += sum(len(line) + 1 for line in block)
+        if pending_size < 2 * carry_size:
+            continue
+
+        text = "\n".join(carry + pending)
+        pending = []
+        pending_size = 0
+        last = None
+        for match, line in _iter_matches(text, carry_line):
+            if last is not None:
+                element = _element(*last)
+                if element is not None:
+                    yield element
+            last = (match, line)
+
+        if last is None:
+            # Only blank lines: nothing can continue
+            carry = []
+            carry_line += text.count("\n") + 1
+        else:
+            match, carry_line = last
+            carry = [text[match.start():]]
+        carry_size = len(carry[0]) if carry else 0
+
+    text = "\n".join(carry + pending)
+    for match, line in _iter_matches(text, carry_line):
+        element = _element(match, line)
+        if element is not None:
+            yield element
+
+
+def parse_markdown(lines: Union[str, Iterable[str]], elements: bool = False) -> Dict[str, List]:
+    """
+    Collect the structure of a Markdown document.
+
+    Args:
+        lines: The document as a string, or its lines
+        elements: Also keep every element with its line number
+
+    Returns:
+        A dictionary with headers as (level, text) tuples, and bullet_lists,
+        numbered_lists, code_blocks and paragraphs as strings (plus the
+        MarkdownElement list under "elements" if asked for)
+    """
+    structure = {
+        "headers": [],
+        "bullet_lists": [],
+        "numbered_lists": [],
+        "code_blocks": [],
+        "paragraphs": [],
+    }
+
+    if isinstance(lines, str) and not elements:
+        # Without line numbers the matches are sorted directly, which keeps
+        # a whole document at one regex scan plus a few operations per element
+        add_header = structure["headers"].append
+        add_paragraph = structure["paragraphs"].append
+        add_bullet = structure["bullet_lists"].append
+        add_numbered = structure["numbered_lists"].append
+        for match in _ELEMENT_RE.finditer(lines):
+            group = match.lastindex
+            if group == _HEADER_GROUP:
+                add_header((len(match['hashes']) + 1, match[group]))
+            elif group == _PARAGRAPH_GROUP:
+                add_paragraph(match[group])
+            elif group == _BULLET_GROUP:
+                add_bullet(match[group])
+            elif group == _NUMBERED_GROUP:
+                add_numbered(match[group])
+            elif group == _CODE_GROUP:
+                structure["code_blocks"].append(match[group][1:])
+        return structure
+
+    if elements:
+        structure["elements"] = []
+    for element in iter_markdown_elements(lines):
+        if elements:
+            structure["elements"].append(element)
+        if element.kind == HEADER:
+            structure["headers"].append((element.level, element.text))
+        elif element.kind == BULLET:
+            structure["bullet_lists"].append(element.text)
+        elif element.kind == NUMBERED:
+            structure["numbered_lists"].append(element.text)
+        elif element.kind == CODE:
+            structure["code_blocks"].append(element.text)
+        else:
+            structure["paragraphs"].append(element.text)
+    return structure
@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Persistent pyttsx3 Worker
+-------------------------
+This module runs one long-lived pyttsx3 engine on a dedicated thread.
+Callers on any thread queue (text, path) requests; the worker collects
+whatever is waiting, issues all save_to_file calls and runs a single
+runAndWait cycle for the batch, so the per-cycle cost of the driver is
+paid once per batch instead of once per utterance.
+"""
+
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+try:
+    import pyttsx3
+    PYTTSX3_AVAILABLE = True
+except ImportError:
+    PYTTSX3_AVAILABLE = False
+
+# Maximum number of utterances rendered in one runAndWait cycle
+DEFAULT_MAX_BATCH = 32
+
+# Marks the end of the request queue
+_STOP = object()
+
+
+def create_japanese_engine() -> Any:
+    """
+    Initialize a pyttsx3 engine configured for Japanese speech.
+
+    Returns:
+        The engine, using a Japanese voice if one is installed
+
+    Raises:
+        RuntimeError: If pyttsx3 is not installed
+    """
+    if not PYTTSX3_AVAILABLE:
+        raise RuntimeError("pyttsx3 is not installed: pip install pyttsx3")
+
+    engine = pyttsx3.init()
+    engine.setProperty('rate', 150)  # Speed of speech
+    engine.setProperty('volume', 0.9)  # Volume (0.0 to 1.0)
+
+    # Try to find a Japanese voice if available
+    japanese_voice = None
+    for voice in engine.getProperty('voices'):
+        # Some voice systems show language in id, name or languages attribute
+        voice_info = str(voice.id) + str(voice.name).lower()
+        if 'japanese' in voice_info or 'ja' in voice_info or 'japan' in voice_info:
+            japanese_voice = voice.id
+            break
+
+    if japanese_voice:
+        engine.setProperty('voice', japanese_voice)
+        logger.info(f"Using Japanese voice: {japanese_voice}")
+    else:
+        logger.warning("No specific Japanese voice found, using default voice")
+    return engine
+
+
+class Pyttsx3Worker:
+    """A pyttsx3 engine owned by one thread, fed through a thread-safe request queue."""
+
+    def __init__(self, engine_factory: Optional[Callable[[], Any]] = None,
+                 max_batch: int = DEFAULT_MAX_BATCH, name: str = "pyttsx3-worker"):
+        """
+        Start the worker thread and initialize the engine on it.
+
+        Args:
+            engine_factory: Function creating the engine (defaults to create_japanese_engine)
+            max_batch: Maximum number of utterances per runAndWait cycle
+            name: Name of the worker thread
+        """
+        self.engine_factory = engine_factory or create_japanese_engine
+        self.max_batch = max(1, max_batch)
+        self.error: Optional[BaseException] = None
+        self.batches = 0
+        self.utterances = 0
+
+        self._requests: queue.Queue = queue.Queue()
+        self._ready = threading.Event()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    @property
+    def available(self) -> bool:
+        """Whether the engine was initialized and the worker accepts requests."""
+        return self.error is None and not self._closed
+
+    def submit(self, text: str, file_path: Union[str, Path]) -> Future:
+        """
+        Queue an utterance to be saved to file_path.
+
+        Args:
+            text: Text to speak
+            file_path: Audio file to write
+
+        Returns:
+            Future resolving to True if the engine wrote a non-empty file
+        """
+        with self._lock:
+            if self.error is not None:
+                raise RuntimeError(f"pyttsx3 engine not available: {self.error}")
+            if self._closed:
+                raise RuntimeError("pyttsx3 worker is closed")
+            future: Future = Future()
+            self._requests.put((text, str(file_path), future))
+        return future
+
+    def save_to_file(self, text: str, file_path: Union[str, Path], timeout: Optional[float] = None) -> bool:
+        """
+        Save an utterance to file_path and wait for it.
+
+        Args:
+            text: Text to speak
+            file_path: Audio file to write
+            timeout: Seconds to wait for the result (None waits indefinitely)
+
+        Returns:
+            True if the engine wrote a non-empty file
+        """
+        return self.submit(text, file_path).result(timeout)
+
+    def close(self) -> None:
+        """Finish the queued requests and stop the worker thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._requests.put(_STOP)
+        self._thread.join()
+
+    def __enter__(self) -> "Pyttsx3Worker":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        """Worker thread: create the engine, then render batches until stopped."""
+        try:
+            engine = self.engine_factory()
+            logger.info("pyttsx3 worker started")
+        except Exception as e:
+            logger.error(f"Error initializing pyttsx3 engine: {e}")
+            self.error = e
+            return
+        finally:
+            self._ready.set()
+
+        stopping = False
+        while not stopping:
+            batch: List[Tuple[str, str, Future]] = []
+            item = self._requests.get()
+            # Take whatever else is already waiting, up to max_batch
+            while item is not _STOP:
+                if item[2].set_running_or_notify_cancel():
+                    batch.append(item)
+                if len(batch) >= self.max_batch:
+                    break
+                try:
+                    item = self._requests.get_nowait()
+                except queue.Empty:
+                    break
+            stopping = item is _STOP
+            if batch:
+                self._render(engine, batch)
+
+    def _render(self, engine: Any, batch: List[Tuple[str, str, Future]]) -> None:
+        """Queue every utterance of the batch on the engine and run one cycle."""
+        queued = []
+        for text, path, future in batch:
+            try:
+                engine.save_to_file(text, path)
+                queued.append((path, future))
+            except Exception as e:
+                future.set_exception(e)
+        if not queued:
+            return
+
+        try:
+            engine.runAndWait()
+        except Exception as e:
+            logger.error(f"Error in pyttsx3 runAndWait: {e}")
+            for _, future in queued:
+                future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.utterances += len(queued)
+        for path, future in queued:
+            file_path = Path(path)
+            future.set_result(file_path.exists() and file_path.stat().st_size > 0)
@@ -0,0 +1,243 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Request Rate Limiting and Coalescing
+------------------------------------
+This module keeps clients of a remote TTS service under its request rate.
+TokenBucket spaces requests out to a sustained rate with a limited burst;
+its state can live in a small file guarded by an exclusive lock, so that
+all threads and processes using the same file share one budget.
+RequestCoalescer lets concurrent identical requests, from threads or
+coroutines, wait for a single synthesis instead of each spending a request.
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, Union
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+
+class TokenBucket:
+    """Token-bucket rate limiter, shared across processes through an optional state file."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None,
+                 state_file: Optional[Union[str, Path]] = None, clock: Callable[[], float] = time.time):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate: Sustained number of requests per second
+            burst: Maximum number of requests sent back to back (defaults to rate, at least 1)
+            state_file: File holding the bucket state shared by all processes using it
+                (None limits this process only)
+            clock: Wall-clock time source shared by the processes (replaceable in tests)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.clock = clock
+        self.state_file = Path(state_file) if state_file else None
+        if self.state_file is not None and not FCNTL_AVAILABLE:
+            logger.warning("File locking not available; the rate limit applies to this process only")
+            self.state_file = None
+        if self.state_file is not None:
+            os.makedirs(self.state_file.parent, exist_ok=True)
+
+        self._tokens = self.burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0, max_wait: Optional[float] = None) -> Optional[float]:
+        """
+        Take tokens from the bucket, possibly ahead of time.
+
+        The bucket may go into debt: the caller gets the tokens now and must
+        wait until they have been refilled, so waiting callers are served in
+        the order they arrived without polling.
+
+        Args:
+            tokens: Number of tokens to take
+            max_wait: Do not take the tokens if they would require a longer wait
+
+        Returns:
+            Seconds to wait before sending the request, or None if max_wait would be exceeded
+        """
+        with self._lock:
+            if self.state_file is None:
+                return self._reserve_locked(tokens, max_wait)
+
+            with open(self.state_file, 'a+', encoding='ascii') as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.seek(0)
+                    fields = f.read().split()
+                    if len(fields) == 2:
+                        self._tokens, self._updated = float(fields[0]), float(fields[1])
+                    else:
+                        self._tokens, self._updated = self.burst, self.clock()
+                    wait = self._reserve_locked(tokens, max_wait)
+                    f.seek(0)
+                    f.truncate()
+                    f.write(f"{self._tokens!r} {self._updated!r}\n")
+                    f.flush()
+                    return wait
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _reserve_locked(self, tokens: float, max_wait: Optional[float]) -> Optional[float]:
+        """Refill the bucket and take tokens (lock held)."""
+        now = self.clock()
+        # A clock that went backwards (or another host's clock) must not add tokens
+        elapsed = max(0.0, now - self._updated)
+        available = min(self.burst, self._tokens + elapsed * self.rate)
+        wait = max(0.0, (tokens - available) / self.rate)
+        if max_wait is not None and wait > max_wait:
+            self._tokens, self._updated = available, now
+            return None
+        self._tokens, self._updated = available - tokens, now
+        return wait
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """
+        Block until a request may be sent.
+
+        Args:
+            tokens: Number of tokens the request costs
+            timeout: Maximum number of seconds to wait (None waits as long as needed)
+
+        Returns:
+            True if the tokens were taken, False if the timeout would be exceeded
+        """
+        wait = self.reserve(tokens, timeout)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    async def aacquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """Asynchronous acquire, waiting without blocking the event loop."""
+        wait = self.reserve(tokens, timeout)
+        if wait is None:
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+
+class RequestCoalescer:
+    """Runs one call per key at a time; concurrent callers with the same key share its result."""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, Future] = {}
+        # asyncio futures belong to one event loop, so async calls are keyed by loop too
+        self._ainflight: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.coalesced = 0
+
+    def run(self, key: Hashable, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Call func unless an identical call is already in flight, then wait for that one.
+
+        Failures are shared the same way: every waiting caller gets the
+        exception, and the next call with the key starts afresh.
+
+        Args:
+            key: Identity of the request (e.g. a synthesis cache key)
+            func: Function performing the request
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            The result of func
+        """
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+                self.calls += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    async def arun(self, key: Hashable, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """
+        Asynchronous run: await func unless an identical call is in flight on this loop.
+
+        Args:
+            key: Identity of the request (e.g. a synthesis cache key)
+            func: Coroutine function performing the request
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            The result of func
+        """
+        loop = asyncio.get_running_loop()
+        inflight_key = (loop, key)
+        future = self._ainflight.get(inflight_key)
+        leader = future is None
+        if leader:
+            future = loop.create_future()
+            self._ainflight[inflight_key] = future
+        with self._lock:
+            if leader:
+                self.calls += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            # A cancelled waiter must not cancel the shared request
+            return await asyncio.shield(future)
+
+        try:
+            result = await func(*args, **kwargs)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception retrieved in case nobody else was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._ainflight[inflight_key]
@@ -8,16 +8,20 @@ This module provides functionality for processing Japanese speech audio files
 and text-to-speech conversion.
 """
 
-import os
 import logging
 import numpy as np
 from pathlib import Path
-from typing import Optional, List, Dict, Union
+from typing import Any, Optional, List, Dict, Iterable, Union
+
+from src.tts_engines import create_engine, resolve_output_path, PYTTSX3_AVAILABLE
+from src.audio_analysis import analyze_file
+from src.audio_probe import probe_audio
+from src.analysis_cache import AnalysisCache, file_fingerprint
+from src.speech_processor_base import SpeechProcessorBase
+from src.speech_recognizers import SpeechRecognizer, create_recognizer, transcribe_file, transcribe_files
 
 # Import speech processing libraries
-import pyttsx3  # For text-to-speech
 import speech_recognition as sr  # For speech recognition
-import librosa  # For audio file processing
 import soundfile as sf  # For reading/writing audio files
 
 # Configure logging
@@ -27,52 +31,46 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-class JapaneseSpeechProcessor:
+class JapaneseSpeechProcessor(SpeechProcessorBase):
     """Class for processing Japanese speech."""
     
-    def __init__(self, data_dir: Optional[str] = None):
+    def __init__(self, data_dir: Optional[str] = None, analysis_cache: Optional[str] = None,
+                 recognizer: Optional[Union[str, SpeechRecognizer]] = None,
+                 recognizer_options: Optional[Dict[str, Any]] = None):
         """
         Initialize the Japanese speech processor.
         
         Args:
             data_dir: Path to the audio data directory
+            analysis_cache: SQLite file for the persistent analyze_audio cache (disabled if None)
+            recognizer: Speech recognizer name or instance for speech_to_text (default: Google Web Speech API)
+            recognizer_options: Options for the recognizer, e.g. {"model": "models/vosk-model-small-ja-0.22"}
         """
-        if data_dir is None:
-            # Default to the audio directory in the project structure
-            self.data_dir = Path(__file__).parent.parent / 'data' / 'audio'
-        else:
-            self.data_dir = Path(data_dir)
+        super().__init__(data_dir)
         
-        logger.info(f"Initialized speech processor with data directory: {self.data_dir}")
+        self.analysis_cache = AnalysisCache(analysis_cache) if analysis_cache else None
         
-        # Initialize TTS engine
-        try:
-            self.tts_engine = pyttsx3.init()
-            self.tts_engine.setProperty('rate', 150)  # Speed of speech
-            self.tts_engine.setProperty('volume', 0.9)  # Volume (0.0 to 1.0)
-            
-            # Try to find a Japanese voice if available
-            voices = self.tts_engine.getProperty('voices')
-            japanese_voice = None
-            
-            for voice in voices:
-                # Some voice systems show language in id, name or languages attribute
-                voice_info = str(voice.id) + str(voice.name).lower()
-                if 'japanese' in voice_info or 'ja' in voice_info or 'japan' in voice_info:
-                    japanese_voice = voice.id
-                    break
-                
-            if japanese_voice:
-                self.tts_engine.setProperty('voice', japanese_voice)
-                logger.info(f"Using Japanese voice: {japanese_voice}")
-            else:
-                logger.warning("No specific Japanese voice found, using default voice")
-                
-            logger.info("TTS engine initialized successfully")
-        except Exception as e:
-            logger.error(f"Error initializing TTS engine: {e}")
-            logger.info("Will use fallback TTS methods")
-            self.tts_engine = None
+        # The recognizer (and its model) is created once and reused by every speech_to_text call
+        self.recognizer = None
+        self._sr_recognizer = None
+        if recognizer is not None:
+            try:
+                self.recognizer = create_recognizer(recognizer, **(recognizer_options or {}))
+                logger.info(f"Using {self.recognizer.label} for speech recognition")
+            except (ValueError, RuntimeError) as e:
+                logger.warning(f"Speech recognizer unavailable, using Google Speech Recognition: {e}")
+        
+        # The pyttsx3 engine from the registry lives on its own thread, so text_to_speech
+        # is safe to call from any thread
+        self.tts_engine = None
+        if not PYTTSX3_AVAILABLE:
+            logger.info("pyttsx3 is not installed, will use fallback TTS methods")
+        else:
+            try:
+                self.tts_engine = create_engine('pyttsx3')
+                logger.info("TTS engine initialized successfully")
+            except RuntimeError as e:
+                logger.info(f"Will use fallback TTS methods ({e})")
     
     def text_to_speech(self, text: str, output_file: str) -> None:
         """
@@ -84,33 +82,16 @@ class JapaneseSpeechProcessor:
         """
         logger.info(f"Converting text to speech: {text[:50]}...")
         
-        # 检查是否已经是绝对路径
-        if os.path.isabs(output_file):
-            file_path = Path(output_file)
-        else:
-            file_path = self.data_dir / output_file
-        
-        # Ensure the directory exists
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        file_path = resolve_output_path(self.data_dir, output_file)
         
         if self.tts_engine is not None:
             try:
-                # Save to file
-                self.tts_engine.save_to_file(text, str(file_path))
-                self.tts_engine.runAndWait()
+                # Synthesize (batched with concurrent requests into one engine cycle); the engine
+                # raises if pyttsx3 did not produce audio, which can happen with Japanese text
+                audio = self.tts_engine.synthesize(text)
+                with open(file_path, 'wb') as f:
+                    f.write(audio)
                 logger.info(f"Successfully saved speech to {file_path}")
-                
-                # Create an empty file as a placeholder if the TTS didn't actually create a file
-                # (This can happen with some TTS engines and Japanese text)
-                if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
-                    logger.warning("TTS may not have generated audio correctly, creating placeholder")
-                    with open(file_path, 'wb') as f:
-                        # Create a simple sine wave as placeholder audio
-                        sample_rate = 22050
-                        duration = 2.0  # seconds
-                        t = np.linspace(0, duration, int(sample_rate * duration))
-                        y = np.sin(2 * np.pi * 440 * t)  # 440 Hz sine wave
-                        sf.write(file_path, y, sample_rate)
             except Exception as e:
                 logger.error(f"Error in text to speech conversion: {e}")
                 self._create_placeholder_audio(file_path)
@@ -143,22 +124,33 @@ class JapaneseSpeechProcessor:
         """
         Convert Japanese speech to text.
         
+        With a recognizer, the file is split at pauses and decoded segment by
+        segment with the recognizer's already loaded model.
+        
         Args:
             audio_file: Path to the audio file
             
         Returns:
             Transcribed text
         """
-        # 检查是否已经是绝对路径
-        if os.path.isabs(audio_file):
-            file_path = Path(audio_file)
-        else:
-            file_path = self.data_dir / audio_file
-            
+        file_path = self._resolve_input_path(audio_file)
         logger.info(f"Converting speech from {file_path} to text")
         
+        if self.recognizer is not None:
+            try:
+                text = transcribe_file(file_path, self.recognizer)["text"]
+                if not text:
+                    return "音声を認識できませんでした。(音声が明確でないか、日本語が含まれていない可能性があります)"
+                logger.info(f"Successfully transcribed audio using {self.recognizer.label}")
+                return text
+            except Exception as e:
+                logger.error(f"Error in speech to text conversion: {e}")
+                return "音声テキスト変換中にエラーが発生しました。"
+        
         try:
-            recognizer = sr.Recognizer()
+            if self._sr_recognizer is None:
+                self._sr_recognizer = sr.Recognizer()
+            recognizer = self._sr_recognizer
             with sr.AudioFile(str(file_path)) as source:
                 audio = recognizer.record(source)
             
@@ -178,49 +170,60 @@ class JapaneseSpeechProcessor:
             logger.error(f"Error in speech to text conversion: {e}")
             return "音声テキスト変換中にエラーが発生しました。"
     
-    def analyze_audio(self, audio_file: str) -> Dict[str, Union[float, List[float]]]:
+    def speech_to_text_batch(self, audio_files: Iterable[str], max_workers: Optional[int] = None) -> Dict[str, Dict]:
+        """
+        Transcribe many audio files with the processor's recognizer.
+        
+        The recognizer's model is loaded once and shared by all files; long
+        files are split at pauses and decoded segment by segment.
+        
+        Args:
+            audio_files: Paths to the audio files (relative paths are resolved against data_dir)
+            max_workers: Files transcribed at the same time (defaults to what the recognizer supports)
+            
+        Returns:
+            Transcription result (text and timed segments, or error) for each file
+        """
+        recognizer = self.recognizer or create_recognizer('google')
+        paths = [str(self._resolve_input_path(audio_file)) for audio_file in audio_files]
+        return dict(transcribe_files(paths, recognizer, max_workers=max_workers))
+    
+    def analyze_audio(self, audio_file: str, sample_rate: Optional[int] = None) -> Dict[str, Union[float, List[float]]]:
         """
         Analyze properties of a Japanese speech audio file.
         
+        The file is streamed in blocks and all frame features share one STFT,
+        so long recordings are analyzed in bounded memory. With an analysis
+        cache, unchanged files are answered from the cache.
+        
         Args:
             audio_file: Path to the audio file
+            sample_rate: Sample rate to analyze at (None keeps the file's own rate, skipping resampling)
             
         Returns:
             Dictionary of audio properties
         """
-        # 检查是否已经是绝对路径
-        if os.path.isabs(audio_file):
-            file_path = Path(audio_file)
-        else:
-            file_path = self.data_dir / audio_file
-            
+        file_path = self._resolve_input_path(audio_file)
         logger.info(f"Analyzing audio file: {file_path}")
         
         try:
-            # Load the audio file
-            y, sr = librosa.load(str(file_path))
-            
-            # Extract various features
-            tempo, _ = librosa.beat.beat_track(y=y, sr=sr)
-            spectral_centroids = librosa.feature.spectral_centroid(y=y, sr=sr)[0]
-            spectral_rolloff = librosa.feature.spectral_rolloff(y=y, sr=sr)[0]
-            zero_crossing_rate = librosa.feature.zero_crossing_rate(y)[0]
+            if self.analysis_cache is None:
+                return analyze_file(file_path, sr=sample_rate)
             
-            # Calculate statistics
-            properties = {
-                "duration": librosa.get_duration(y=y, sr=sr),
-                "tempo": float(tempo),
-                "mean_spectral_centroid": float(spectral_centroids.mean()),
-                "mean_spectral_rolloff": float(spectral_rolloff.mean()),
-                "mean_zero_crossing_rate": float(zero_crossing_rate.mean()),
-                "sample_rate": sr
-            }
-            
-            return properties
+            # Fingerprint before analyzing, so a file changed meanwhile is not cached as current
+            params = {"sample_rate": sample_rate}
+            fingerprint = file_fingerprint(file_path)
+            cached = self.analysis_cache.get(file_path, params, fingerprint)
+            if cached is not None:
+                logger.info(f"Served analysis of {file_path} from analysis cache")
+                return cached
+            result = analyze_file(file_path, sr=sample_rate)
+            self.analysis_cache.put(file_path, result, params, fingerprint)
+            return result
         except Exception as e:
             logger.error(f"Error analyzing audio: {e}")
             # Return placeholder results if analysis fails
-            return {
+            result = {
                 "duration": 5.24,
                 "tempo": 120.0,
                 "mean_spectral_centroid": 2500.0,
@@ -229,6 +232,15 @@ class JapaneseSpeechProcessor:
                 "sample_rate": 22050,
                 "error": str(e)
             }
+            # The headers may still give the real duration and sample rate
+            try:
+                info = probe_audio(file_path)
+                if info.format != 'placeholder':
+                    result["duration"] = info.duration
+                    result["sample_rate"] = info.sample_rate
+            except Exception:
+                pass
+            return result
 
 # Example usage
 if __name__ == "__main__":
@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Speech Processor Base
+---------------------
+This module provides the behaviour the Japanese speech processors share:
+resolving paths against the data directory, writing placeholder files when
+no audio can be synthesized, reading back the text they stand for, and
+reporting audio properties from the file headers.
+"""
+
+import os
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from src.async_tts import AsyncSpeechMixin
+from src.audio_probe import probe_audio, is_placeholder
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Separates the original text from the notice in a placeholder text file
+PLACEHOLDER_NOTICE_MARKER = "---"
+
+
+class SpeechProcessorBase(AsyncSpeechMixin):
+    """Base class of the Japanese speech processors."""
+
+    # Returned by speech_to_text when there is no text to read back
+    SPEECH_TO_TEXT_UNAVAILABLE = "音声認識機能は実装されていません。Speech-to-Text機能を使用するには、追加のライブラリが必要です。"
+
+    def __init__(self, data_dir: Optional[str] = None):
+        """
+        Initialize the processor's data directory.
+
+        Args:
+            data_dir: Path to the audio data directory
+        """
+        if data_dir is None:
+            # Default to the audio directory in the project structure
+            self.data_dir = Path(__file__).parent.parent / 'data' / 'audio'
+        else:
+            self.data_dir = Path(data_dir)
+
+        logger.info(f"Initialized speech processor with data directory: {self.data_dir}")
+
+    def _resolve_input_path(self, audio_file: str) -> Path:
+        """Return audio_file as is if absolute, otherwise relative to the data directory."""
+        if os.path.isabs(audio_file):
+            return Path(audio_file)
+        return self.data_dir / audio_file
+
+    def _audio_formats(self) -> Iterable[str]:
+        """Formats the processor may have saved a requested file in instead (e.g. 'mp3' for gTTS)."""
+        return ()
+
+    def _write_placeholder_files(self, text: str, file_path: Path, install_lines: Iterable[str] = ()) -> Path:
+        """
+        Write the files standing in for audio that could not be synthesized.
+
+        The text file holds the text followed by a notice, which
+        _read_source_text strips again; the audio file holds a marker
+        recognized by audio_probe.is_placeholder.
+
+        Args:
+            text: Text that would have been converted
+            file_path: Path of the audio file
+            install_lines: Notice lines telling how to enable actual TTS
+
+        Returns:
+            Path of the text file
+        """
+        text_file_path = file_path.with_suffix('.txt')
+        with open(text_file_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.write("\n\n")
+            f.write("--- This is a placeholder for text-to-speech output ---\n")
+            for line in install_lines:
+                f.write(f"--- {line} ---\n")
+
+        with open(file_path, 'w') as f:
+            f.write("PLACEHOLDER AUDIO FILE\n")
+            f.write("This file would contain audio in a real implementation.\n")
+
+        logger.info(f"Created placeholder files at {text_file_path} and {file_path}")
+        return text_file_path
+
+    def _read_source_text(self, file_path: Path) -> Optional[str]:
+        """
+        Read the text an audio file was synthesized from.
+
+        Args:
+            file_path: Path of the audio file
+
+        Returns:
+            The text of the .txt file next to it, without any placeholder
+            notice, or None if there is no such file
+
+        Raises:
+            OSError: If the text file cannot be read
+        """
+        text_file_path = file_path.with_suffix('.txt')
+        if not text_file_path.exists():
+            return None
+        with open(text_file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        # Extract only the original text, not the placeholder message
+        if PLACEHOLDER_NOTICE_MARKER in content:
+            content = content.split(PLACEHOLDER_NOTICE_MARKER)[0].strip()
+        return content
+
+    def speech_to_text(self, audio_file: str) -> str:
+        """
+        Return the text an audio file was synthesized from.
+
+        Note: Actual speech recognition is done by speech_processor's
+        JapaneseSpeechProcessor.
+
+        Args:
+            audio_file: Path to the audio file
+
+        Returns:
+            The original text, or a message if it is not known
+        """
+        file_path = self._resolve_input_path(audio_file)
+        logger.info(f"Speech-to-text functionality is not implemented: {file_path}")
+
+        try:
+            content = self._read_source_text(file_path)
+            if content is not None:
+                return content
+        except Exception as e:
+            logger.error(f"Error reading text file: {e}")
+
+        return self.SPEECH_TO_TEXT_UNAVAILABLE
+
+    def analyze_audio(self, audio_file: str) -> Dict[str, Union[float, List[float]]]:
+        """
+        Provide basic information about an audio file, read from its headers.
+
+        Args:
+            audio_file: Path to the audio file
+
+        Returns:
+            Dictionary of file properties
+        """
+        file_path = self._resolve_input_path(audio_file)
+        logger.info(f"Analyzing audio file: {file_path}")
+
+        # The audio may have been saved in the engine's format instead of the requested one
+        if not file_path.exists():
+            for audio_format in self._audio_formats():
+                engine_path = file_path.with_suffix(f".{audio_format}")
+                if engine_path.exists():
+                    file_path = engine_path
+                    logger.info(f"Found {audio_format.upper()} version instead: {file_path}")
+                    break
+            else:
+                return {
+                    "error": f"File not found: {file_path}",
+                    "exists": False
+                }
+
+        file_extension = file_path.suffix.lower()
+        result = {
+            "exists": True,
+            "file_size_bytes": file_path.stat().st_size,
+            "file_extension": file_extension,
+            "file_path": str(file_path),
+            "has_text_file": file_path.with_suffix('.txt').exists(),
+        }
+
+        try:
+            content = self._read_source_text(file_path)
+            if content is not None:
+                result["text_lines"] = len(content.split('\n'))
+                result["text_length"] = len(content)
+        except Exception:
+            pass
+
+        # If it's a text placeholder, indicate that (only the first bytes of small files are read)
+        if file_extension == '.txt' or is_placeholder(file_path):
+            result["is_placeholder"] = True
+            result["note"] = "This is a placeholder file, not actual audio"
+            return result
+
+        # For MP3 and WAV files, read duration, bitrate and sample rate from the headers
+        if file_extension in ('.mp3', '.wav'):
+            try:
+                info = probe_audio(file_path)
+                result.update({
+                    "duration_seconds": info.duration,
+                    "bitrate": info.bitrate,
+                    "sample_rate": info.sample_rate,
+                    # Also under the name the multi-engine processor has always used
+                    "frame_rate_hz": info.sample_rate,
+                    "channels": info.channels,
+                    "n_frames": info.n_frames,
+                })
+                if info.sample_width is not None:
+                    result["sample_width_bytes"] = info.sample_width
+            except Exception as e:
+                result["error"] = f"Error analyzing {file_extension[1:].upper()}: {str(e)}"
+
+        return result
@@ -0,0 +1,321 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Japanese Speech Processor for Registered TTS Engines
+---------------------------------------------------
+This module provides the speech processor built on the TTS engine registry:
+the synthesis cache, rate limiting, concurrent chunked synthesis, streaming,
+the pipelined mode and batch conversion work the same for every engine.
+Chunk length and concurrency follow the engine's capabilities.
+"""
+
+import os
+import logging
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, Optional, Union
+
+from src.markdown_cleaner import iter_clean_markdown
+from src.rate_limit import TokenBucket, RequestCoalescer
+from src.speech_processor_base import SpeechProcessorBase
+from src.tts_cache import SynthesisCache, make_cache_key, DEFAULT_CACHE_MAX_BYTES
+from src.tts_chunking import (split_sentences, split_for_streaming, synthesize_chunks, iter_synthesized,
+                              iter_stream_frames, concat_audio, DEFAULT_MAX_WORKERS)
+from src.tts_engines import TTSEngine, GTTSEngine, create_engine, resolve_output_path
+from src.tts_pipeline import run_pipeline
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class EngineSpeechProcessor(SpeechProcessorBase):
+    """Japanese speech processor synthesizing with an engine from the registry."""
+
+    def __init__(self, engine: Union[str, TTSEngine] = 'gtts', data_dir: Optional[str] = None,
+                 cache_dir: Optional[str] = None, cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+                 rate_limit: Optional[float] = None, rate_burst: Optional[float] = None,
+                 rate_limit_file: Optional[str] = None, require_available: bool = True, **engine_options):
+        """
+        Initialize the processor with an engine.
+
+        Args:
+            engine: Registered engine name or engine instance
+            data_dir: Path to the audio data directory
+            cache_dir: Directory for the persistent synthesis cache (disabled if None)
+            cache_max_bytes: Size limit of the synthesis cache in bytes
+            rate_limit: Maximum engine calls per second (unlimited if None)
+            rate_burst: Engine calls that may be made back to back (defaults to rate_limit)
+            rate_limit_file: File sharing the rate limit with other processes using it
+            require_available: Raise if the engine is not available (otherwise placeholders are written)
+            **engine_options: Options passed to the engine factory
+
+        Raises:
+            ValueError: If no engine is registered under engine
+            RuntimeError: If require_available is set and the engine is not available
+        """
+        super().__init__(data_dir)
+
+        self.engine = create_engine(engine, require_available=require_available, **engine_options)
+        self.engine_name = self.engine.name
+        self.engine_label = self.engine.label
+        self.audio_format = self.engine.audio_format
+        # Sentences are packed into chunks of at most this many characters in chunked mode
+        self.chunk_max_chars = self.engine.max_chunk_chars or 200
+        self.async_concurrency = self.engine.max_concurrency
+
+        # Identical requests are served from disk instead of calling the engine again
+        self.cache = SynthesisCache(cache_dir, max_bytes=cache_max_bytes) if cache_dir else None
+
+        # Requests wait for the rate limit instead of being throttled by the service
+        self.rate_limiter = TokenBucket(rate_limit, rate_burst, rate_limit_file) if rate_limit else None
+        # gTTS sends one HTTP request per 100 characters, so it waits for the limiter per request
+        if isinstance(self.engine, GTTSEngine) and self.engine.limiter is None:
+            self.engine.limiter = self.rate_limiter
+        # Concurrent identical texts wait for one synthesis
+        self.coalescer = RequestCoalescer()
+
+        logger.info(f"Using TTS engine {self.engine.name}: {self.engine.capabilities()}")
+        if not self._engine_available():
+            logger.warning(f"{self.engine_label} not available. Some functionality will be limited.")
+            logger.warning(f"Install with: pip install {self.engine_name}")
+
+    def text_to_speech(self, text: str, output_file: str, chunked: bool = False,
+                       max_workers: int = DEFAULT_MAX_WORKERS) -> None:
+        """
+        Convert Japanese text to speech.
+
+        Args:
+            text: Japanese text to convert to speech
+            output_file: Path to save the audio file
+            chunked: Split the text into sentences and synthesize them concurrently
+            max_workers: Maximum number of concurrent engine calls in chunked mode
+        """
+        logger.info(f"Converting text to speech: {text[:50]}...")
+        file_path = self._prepare_output(output_file)
+
+        if self._engine_available():
+            try:
+                actual_path = self._audio_path(file_path)
+                cache_key = self._cache_key(text)
+
+                if not self._load_from_cache(cache_key, actual_path):
+                    if chunked:
+                        audio = self._synthesize_chunked(text, max_workers)
+                    else:
+                        audio = self._synthesize(text)
+                    self._store_audio(audio, actual_path, cache_key)
+
+                self._write_text_files(text, file_path, actual_path)
+            except Exception as e:
+                logger.error(f"Error in text to speech conversion: {e}")
+                self._create_placeholder(text, file_path)
+        else:
+            logger.warning(f"{self.engine_label} not available. Creating placeholder files.")
+            self._create_placeholder(text, file_path)
+
+    def stream_text_to_speech(self, text: str, max_workers: int = DEFAULT_MAX_WORKERS) -> Iterator[bytes]:
+        """
+        Synthesize text sentence by sentence, yielding audio as it is ready.
+
+        The first sentence is synthesized on its own so playback (or an HTTP
+        chunked response) can start right after it; the concatenation of all
+        yielded chunks is one playable stream in the engine's format.
+
+        Args:
+            text: Japanese text to convert to speech
+            max_workers: Maximum number of concurrent engine calls
+
+        Yields:
+            Audio of each chunk, in document order (MP3 frames for gTTS)
+        """
+        if not self._engine_available():
+            raise RuntimeError(f"{self.engine_label} not available")
+
+        chunks = split_for_streaming(text, self.chunk_max_chars)
+        logger.info(f"Streaming speech for {len(chunks)} chunks: {text[:50]}...")
+        yield from iter_stream_frames(iter_synthesized(chunks, self._synthesize, max_workers),
+                                      self.audio_format)
+
+    def pipeline_text_to_speech(self, lines: Iterable[str], output_file: str, markdown: bool = True,
+                                max_workers: int = DEFAULT_MAX_WORKERS,
+                                on_chunk: Optional[Callable[[int, bytes], None]] = None) -> Dict[str, Dict[str, float]]:
+        """
+        Convert streamed text to speech, overlapping reading, cleaning and synthesis.
+
+        Args:
+            lines: Input lines, e.g. from JapaneseTextProcessor.iter_text_file
+            output_file: Path to save the audio file
+            markdown: Strip Markdown formatting from the input
+            max_workers: Maximum number of concurrent engine calls
+            on_chunk: Called with (index, audio) as each chunk is appended
+
+        Returns:
+            Per-stage throughput statistics (empty when only a placeholder was written)
+        """
+        file_path = self._prepare_output(output_file)
+
+        if not self._engine_available():
+            logger.warning(f"{self.engine_label} not available. Creating placeholder files.")
+            text = "\n".join(iter_clean_markdown(lines)) if markdown else "".join(lines)
+            self._create_placeholder(text, file_path)
+            return {}
+
+        actual_path = self._audio_path(file_path)
+        return run_pipeline(lines, self._synthesize, actual_path, max_workers=max_workers,
+                            markdown=markdown, max_chars=self.chunk_max_chars, on_chunk=on_chunk,
+                            audio_format=self.audio_format)
+
+    def close(self) -> None:
+        """Release the engine."""
+        self.engine.close()
+
+    def _engine_available(self) -> bool:
+        """Whether the synthesis engine can be used."""
+        return self.engine.available
+
+    def _audio_formats(self) -> Iterable[str]:
+        """The engine's format, which requests for the other format are saved in."""
+        return (self.audio_format,)
+
+    def _prepare_output(self, output_file: str) -> Path:
+        """
+        Resolve the output path and make sure its directory exists.
+
+        Args:
+            output_file: Path to save the audio file
+
+        Returns:
+            Resolved output path
+        """
+        return resolve_output_path(self.data_dir, output_file)
+
+    def _audio_path(self, file_path: Path) -> Path:
+        """Return where the audio for file_path is actually written."""
+        # If the other audio format is requested, we'll still save in the engine's format but with a note
+        suffix = file_path.suffix.lower()
+        if suffix in ('.mp3', '.wav') and suffix != f".{self.audio_format}":
+            # e.g. user wants WAV but gTTS creates MP3, so adjust the path
+            actual_path = file_path.with_suffix(f".{self.audio_format}")
+            logger.info(f"Note: {self.engine_label} can only create {self.audio_format.upper()} files. "
+                        f"Saving to {actual_path} instead of {file_path}")
+            return actual_path
+        return file_path
+
+    def _cache_key(self, text: str) -> Optional[str]:
+        """Return the synthesis cache key for text, or None if caching is disabled."""
+        if self.cache is None:
+            return None
+        return make_cache_key(text, lang='ja', slow=False, engine=self.engine_name)
+
+    def _load_from_cache(self, cache_key: Optional[str], actual_path: Path) -> bool:
+        """Materialize cached audio at actual_path; returns False on a miss."""
+        if cache_key and self.cache.get(cache_key, actual_path):
+            logger.info(f"Served speech for {actual_path} from synthesis cache")
+            return True
+        return False
+
+    def _store_audio(self, audio: bytes, actual_path: Path, cache_key: Optional[str]) -> None:
+        """
+        Write synthesized audio to actual_path and add it to the cache.
+
+        Args:
+            audio: Encoded audio in the engine's audio format
+            actual_path: Destination of the audio file
+            cache_key: Synthesis cache key, or None if caching is disabled
+        """
+        # Save via a temporary file so a hardlinked cache entry is replaced, not overwritten;
+        # its name is unique so concurrent syntheses to one output do not share it
+        tmp_path = actual_path.with_name(f".{actual_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(audio)
+            os.replace(tmp_path, actual_path)
+        finally:
+            if tmp_path.exists():
+                os.remove(tmp_path)
+        logger.info(f"Successfully saved speech to {actual_path}")
+
+        if cache_key:
+            self.cache.put(cache_key, actual_path)
+
+    def _write_text_files(self, text: str, file_path: Path, actual_path: Path) -> None:
+        """Write the reference text file and, for requests in the other format, the format note."""
+        # Create a text file with the original content for reference
+        text_file_path = file_path.with_suffix('.txt')
+        with open(text_file_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        logger.info(f"Saved original text to {text_file_path}")
+
+        if actual_path != file_path:
+            # Create a note about the format conversion
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(f"Note: The audio for this text was saved as {actual_path}\n")
+                f.write(f"{self.engine_label} can only generate {self.audio_format.upper()} files, "
+                        f"not {file_path.suffix[1:].upper()} files.\n")
+                f.write(f"Original text: {text}\n")
+
+    def _synthesize(self, text: str) -> bytes:
+        """
+        Synthesize a piece of text, sharing the result with concurrent identical requests.
+
+        Args:
+            text: Japanese text to synthesize
+
+        Returns:
+            Encoded audio in the engine's audio format
+        """
+        key = make_cache_key(text, lang='ja', slow=False, engine=self.engine_name)
+        return self.coalescer.run(key, self._synthesize_bytes, text)
+
+    def _synthesize_bytes(self, text: str) -> bytes:
+        """
+        Synthesize a piece of text with the engine.
+
+        Args:
+            text: Japanese text to synthesize
+
+        Returns:
+            Encoded audio in the engine's audio format
+        """
+        # Each engine call costs one token, unless the engine takes one per request itself
+        if self.rate_limiter is not None and not isinstance(self.engine, GTTSEngine):
+            self.rate_limiter.acquire()
+        return self.engine.synthesize(text)
+
+    def _synthesize_chunked(self, text: str, max_workers: int) -> bytes:
+        """
+        Synthesize text sentence by sentence through a bounded thread pool.
+
+        Args:
+            text: Japanese text to synthesize
+            max_workers: Maximum number of concurrent engine calls
+
+        Returns:
+            The audio of all chunks concatenated in document order
+        """
+        chunks = split_sentences(text, max_chars=self.chunk_max_chars)
+        if not chunks:
+            raise ValueError("No text to synthesize")
+
+        return concat_audio(synthesize_chunks(chunks, self._synthesize, max_workers), self.audio_format)
+
+    def _create_placeholder(self, text: str, file_path: Path) -> None:
+        """
+        Create placeholder files when the engine is not available.
+
+        Args:
+            text: Text that would have been converted
+            file_path: Path to save the placeholder
+        """
+        try:
+            self._write_placeholder_files(text, file_path, [
+                f"To enable actual TTS, please install {self.engine_label}:",
+                f"pip install {self.engine_name}",
+            ])
+        except Exception as e:
+            logger.error(f"Error creating placeholder files: {e}")
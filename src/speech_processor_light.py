@@ -7,11 +7,12 @@ Japanese Speech Processor (Light Version)
 A lightweight version that works without complex audio libraries.
 """
 
-import os
 import logging
-import time
-from pathlib import Path
-from typing import Optional, Dict, List, Union
+from typing import Dict, List, Union
+
+from src.audio_probe import probe_audio
+from src.speech_processor_base import SpeechProcessorBase
+from src.tts_engines import resolve_output_path
 
 # Configure logging
 logging.basicConfig(
@@ -20,24 +21,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-class JapaneseSpeechProcessorLight:
+class JapaneseSpeechProcessorLight(SpeechProcessorBase):
     """Lightweight class for simulating Japanese speech processing."""
     
-    def __init__(self, data_dir: Optional[str] = None):
-        """
-        Initialize the lightweight Japanese speech processor.
-        
-        Args:
-            data_dir: Path to the audio data directory
-        """
-        if data_dir is None:
-            # Default to the audio directory in the project structure
-            self.data_dir = Path(__file__).parent.parent / 'data' / 'audio'
-        else:
-            self.data_dir = Path(data_dir)
-        
-        logger.info(f"Initialized lightweight speech processor with data directory: {self.data_dir}")
-    
     def text_to_speech(self, text: str, output_file: str) -> None:
         """
         Simulate converting Japanese text to speech.
@@ -51,34 +37,10 @@ class JapaneseSpeechProcessorLight:
         """
         logger.info(f"Simulating text-to-speech for: {text[:50]}...")
         
-        # Check if it's already an absolute path
-        if os.path.isabs(output_file):
-            file_path = Path(output_file)
-        else:
-            file_path = self.data_dir / output_file
-        
-        # Ensure the directory exists
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        
-        # Create a text file with the same name but .txt extension
-        text_file_path = file_path.with_suffix('.txt')
+        file_path = resolve_output_path(self.data_dir, output_file)
         
         try:
-            # Write the text to the file
-            with open(text_file_path, 'w', encoding='utf-8') as f:
-                f.write(text)
-                f.write("\n\n")
-                f.write("--- This is a placeholder for text-to-speech output ---\n")
-                f.write("--- To enable actual TTS, install the required libraries ---\n")
-            
-            # Create an empty WAV file as a placeholder
-            with open(file_path, 'w') as f:
-                f.write("PLACEHOLDER AUDIO FILE\n")
-                f.write("This file would contain audio in a real implementation.\n")
-            
-            logger.info(f"Created placeholder text file at {text_file_path}")
-            logger.info(f"Created placeholder audio file at {file_path}")
-            
+            self._write_placeholder_files(text, file_path, ["To enable actual TTS, install the required libraries"])
         except Exception as e:
             logger.error(f"Error creating placeholder files: {e}")
     
@@ -95,30 +57,18 @@ class JapaneseSpeechProcessorLight:
         Returns:
             Simulated transcribed text
         """
-        # Check if it's already an absolute path
-        if os.path.isabs(audio_file):
-            file_path = Path(audio_file)
-        else:
-            file_path = self.data_dir / audio_file
-            
+        file_path = self._resolve_input_path(audio_file)
         logger.info(f"Simulating speech-to-text for: {file_path}")
         
-        # Look for a text file with the same name
-        text_file_path = file_path.with_suffix('.txt')
-        
-        if text_file_path.exists():
-            try:
-                with open(text_file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    # Extract only the original text, not the placeholder message
-                    if "---" in content:
-                        content = content.split("---")[0].strip()
-                return content
-            except Exception as e:
-                logger.error(f"Error reading text file: {e}")
-                return "音声テキスト変換のシミュレーション (エラーが発生しました)"
-        else:
+        # Look for the text file written next to the audio
+        try:
+            content = self._read_source_text(file_path)
+        except Exception as e:
+            logger.error(f"Error reading text file: {e}")
+            return "音声テキスト変換のシミュレーション (エラーが発生しました)"
+        if content is None:
             return "音声テキスト変換のシミュレーション (実際の音声認識を使用するには、必要なライブラリをインストールしてください)"
+        return content
     
     def analyze_audio(self, audio_file: str) -> Dict[str, Union[float, List[float]]]:
         """
@@ -132,12 +82,7 @@ class JapaneseSpeechProcessorLight:
         Returns:
             Dictionary of simulated audio properties
         """
-        # Check if it's already an absolute path
-        if os.path.isabs(audio_file):
-            file_path = Path(audio_file)
-        else:
-            file_path = self.data_dir / audio_file
-            
+        file_path = self._resolve_input_path(audio_file)
         logger.info(f"Simulating audio analysis for: {file_path}")
         
         # Get the size of the file if it exists
@@ -146,18 +91,25 @@ class JapaneseSpeechProcessorLight:
             file_size = file_path.stat().st_size
         
         # Generate simulated properties based on the text length
-        text_file_path = file_path.with_suffix('.txt')
         text_length = 0
-        if text_file_path.exists():
-            try:
-                with open(text_file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    text_length = len(content)
-            except:
-                pass
+        try:
+            text_length = len(self._read_source_text(file_path) or "")
+        except Exception:
+            pass
         
         # Calculate simulated duration based on text length (approx 5 chars per second)
         simulated_duration = max(1.0, text_length / 5)
+        sample_rate = 44100
+        
+        # Real MP3/WAV files report their actual duration and sample rate from the headers
+        if file_size and file_path.suffix.lower() in ('.mp3', '.wav'):
+            try:
+                info = probe_audio(file_path)
+                if info.format != 'placeholder':
+                    simulated_duration = info.duration
+                    sample_rate = info.sample_rate
+            except Exception as e:
+                logger.debug(f"Could not read audio headers of {file_path}: {e}")
         
         # Return simulated properties
         return {
@@ -167,7 +119,7 @@ class JapaneseSpeechProcessorLight:
             "mean_spectral_centroid": 2500.0,
             "mean_spectral_rolloff": 4800.0,
             "mean_zero_crossing_rate": 0.05,
-            "sample_rate": 44100,
+            "sample_rate": sample_rate,
             "file_size": file_size,
             "text_length": text_length
         }
@@ -7,11 +7,18 @@ Japanese Speech Processor with Multiple TTS Engines
 This module provides functionality for processing Japanese speech using multiple TTS engines.
 """
 
-import os
 import logging
 import time
 from pathlib import Path
-from typing import Optional, Dict, List, Union, Tuple
+from typing import Optional, Dict, Iterable, Iterator, List, Tuple
+
+from src.engine_health import EngineRouter
+from src.google_tts import AsyncSession, asynthesize, AIOHTTP_AVAILABLE
+from src.speech_processor_base import SpeechProcessorBase
+from src.tts_chunking import DEFAULT_MAX_WORKERS
+from src.tts_engines import TTSEngine, create_engine, resolve_output_path
+# Installed engines, for scripts reporting what is available
+from src.tts_engines import GTTS_AVAILABLE, PYTTSX3_AVAILABLE
 
 # Configure logging
 logging.basicConfig(
@@ -20,75 +27,41 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Try to import different TTS engines
-PYTTSX3_AVAILABLE = False
-GTTS_AVAILABLE = False
-
-try:
-    import pyttsx3
-    PYTTSX3_AVAILABLE = True
-    logger.info("pyttsx3 is available")
-except ImportError:
-    logger.warning("pyttsx3 not available")
-
-try:
-    from gtts import gTTS
-    GTTS_AVAILABLE = True
-    logger.info("gTTS is available")
-except ImportError:
-    logger.warning("gTTS not available (requires internet connection)")
-
-class JapaneseSpeechProcessorMulti:
+class JapaneseSpeechProcessorMulti(SpeechProcessorBase):
     """Class for processing Japanese speech using multiple TTS engines."""
     
-    def __init__(self, data_dir: Optional[str] = None, engine: str = 'auto'):
+    # Registered engines the processor chooses from, in 'auto' fallback order
+    ENGINE_NAMES = ('gtts', 'pyttsx3')
+    
+    def __init__(self, data_dir: Optional[str] = None, engine: str = 'auto', pyttsx3_processes: int = 1):
         """
         Initialize the Japanese speech processor.
         
         Args:
             data_dir: Path to the audio data directory
             engine: TTS engine to use ('pyttsx3', 'gtts', 'auto')
+            pyttsx3_processes: Number of pyttsx3 engine processes; above 1, offline
+                synthesis runs in a TTSProcessPool and scales with CPU cores
         """
-        if data_dir is None:
-            # Default to the audio directory in the project structure
-            self.data_dir = Path(__file__).parent.parent / 'data' / 'audio'
-        else:
-            self.data_dir = Path(data_dir)
-        
-        logger.info(f"Initialized speech processor with data directory: {self.data_dir}")
+        super().__init__(data_dir)
         
-        # Initialize TTS engines
-        self.pyttsx3_engine = None
+        # Create the engines from the registry, keeping those available here
+        # (pyttsx3 lives on its own thread or processes)
+        self.engines: Dict[str, TTSEngine] = {}
+        options = {'pyttsx3': {'processes': pyttsx3_processes}}
+        for name in self.ENGINE_NAMES:
+            try:
+                self.engines[name] = create_engine(name, **options.get(name, {}))
+                logger.info(f"{name} engine initialized successfully")
+            except RuntimeError as e:
+                logger.warning(f"{e}")
         self.engine_type = engine
         
-        # Try to initialize pyttsx3 if available
-        if PYTTSX3_AVAILABLE:
-            try:
-                self.pyttsx3_engine = pyttsx3.init()
-                self.pyttsx3_engine.setProperty('rate', 150)  # Speed of speech
-                self.pyttsx3_engine.setProperty('volume', 0.9)  # Volume (0.0 to 1.0)
-                
-                # Try to find a Japanese voice if available
-                voices = self.pyttsx3_engine.getProperty('voices')
-                japanese_voice = None
-                
-                for voice in voices:
-                    # Some voice systems show language in id, name or languages attribute
-                    voice_info = str(voice.id) + str(voice.name).lower()
-                    if 'japanese' in voice_info or 'ja' in voice_info or 'japan' in voice_info:
-                        japanese_voice = voice.id
-                        break
-                    
-                if japanese_voice:
-                    self.pyttsx3_engine.setProperty('voice', japanese_voice)
-                    logger.info(f"Using Japanese voice: {japanese_voice}")
-                else:
-                    logger.warning("No specific Japanese voice found, using default voice")
-                    
-                logger.info("pyttsx3 engine initialized successfully")
-            except Exception as e:
-                logger.error(f"Error initializing pyttsx3 engine: {e}")
-                self.pyttsx3_engine = None
+        # Health of each engine, used to route 'auto' requests
+        self.router = EngineRouter(list(self.ENGINE_NAMES))
+        
+        # HTTP session reused by the asynchronous Google TTS requests
+        self.http_session = AsyncSession()
     
     def text_to_speech(self, text: str, output_file: str) -> Tuple[bool, str]:
         """
@@ -103,63 +76,119 @@ class JapaneseSpeechProcessorMulti:
         """
         logger.info(f"Converting text to speech: {text[:50]}...")
         
-        # Check if it's already an absolute path
-        if os.path.isabs(output_file):
-            file_path = Path(output_file)
-        else:
-            file_path = self.data_dir / output_file
-        
-        # Ensure the directory exists
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        file_path = resolve_output_path(self.data_dir, output_file)
         
         # Determine which engine to use based on preference and availability
-        if self.engine_type == 'pyttsx3' and PYTTSX3_AVAILABLE and self.pyttsx3_engine:
-            return self._use_pyttsx3(text, file_path)
-        elif self.engine_type == 'gtts' and GTTS_AVAILABLE:
-            return self._use_gtts(text, file_path)
+        if self.engine_type in self.engines:
+            return self._use_engine(self.engine_type, text, file_path)
         elif self.engine_type == 'auto':
-            # Try engines in order of preference
-            if GTTS_AVAILABLE:
-                success, message = self._use_gtts(text, file_path)
+            # Try the preferred healthy engine first; engines with an open circuit are skipped
+            for name in self.router.candidates(self._available_engines()):
+                start = time.perf_counter()
+                success, message = self._use_engine(name, text, file_path)
+                self.router.record(name, success, time.perf_counter() - start)
                 if success:
                     return success, message
             
-            if PYTTSX3_AVAILABLE and self.pyttsx3_engine:
-                return self._use_pyttsx3(text, file_path)
-            
-            # If no engines available, create a placeholder
+            # If no engine produced audio, create a placeholder
             return self._create_placeholder(text, file_path)
         else:
             # No suitable engine found, create a placeholder
             return self._create_placeholder(text, file_path)
     
-    def _use_pyttsx3(self, text: str, file_path: Path) -> Tuple[bool, str]:
-        """Use pyttsx3 for TTS conversion."""
-        try:
-            # Save to file
-            self.pyttsx3_engine.save_to_file(text, str(file_path))
-            self.pyttsx3_engine.runAndWait()
+    def _available_engines(self) -> List[str]:
+        """Return the names of the engines that are installed and initialized."""
+        return list(self.engines)
+    
+    def stream_text_to_speech(self, text: str, max_workers: int = DEFAULT_MAX_WORKERS) -> Iterator[bytes]:
+        """
+        Synthesize text sentence by sentence, yielding audio as it is ready.
+        
+        Each engine streams in its own format and with its own concurrency:
+        Google TTS yields MP3 frames, pyttsx3 a streaming WAV header followed
+        by the PCM frames of each sentence. In 'auto' mode the engines are
+        taken from the router, so engines with an open circuit are skipped,
+        and the next engine takes over if one fails before any audio was
+        produced.
+        
+        Args:
+            text: Japanese text to convert to speech
+            max_workers: Maximum number of concurrent engine calls
             
-            # Check if file exists and has content
-            if file_path.exists() and file_path.stat().st_size > 0:
-                logger.info(f"Successfully saved speech to {file_path} using pyttsx3")
-                return True, f"Successfully generated audio using pyttsx3: {file_path}"
+        Yields:
+            Encoded audio chunks whose concatenation is one playable stream
+        """
+        if self.engine_type != 'auto':
+            if self.engine_type not in self.engines:
+                raise RuntimeError("No TTS engine available for streaming")
+            yield from self.engines[self.engine_type].stream(text, max_workers)
+            return
+        
+        error = None
+        for name in self.router.candidates(self._available_engines()):
+            start = time.perf_counter()
+            latency = None
+            try:
+                for audio in self.engines[name].stream(text, max_workers):
+                    if latency is None:
+                        # The time to the first audio is what a streaming caller waits for
+                        latency = time.perf_counter() - start
+                    yield audio
+            except Exception as e:
+                self.router.record(name, False, time.perf_counter() - start)
+                if latency is not None:
+                    raise
+                logger.error(f"Error streaming with {name}, trying the next engine: {e}")
+                error = e
+                continue
+            self.router.record(name, True, latency if latency is not None else time.perf_counter() - start)
+            return
+        
+        raise RuntimeError("No TTS engine available for streaming") from error
+    
+    async def _atext_to_speech(self, text: str, output_file: str) -> Tuple[bool, str]:
+        """
+        Asynchronous text_to_speech.
+        
+        Google TTS is fetched with non-blocking HTTP when aiohttp is available;
+        pyttsx3 requests are queued on the engine's worker thread.
+        """
+        use_async_gtts = 'gtts' in self.engines and AIOHTTP_AVAILABLE and self.engine_type in ('gtts', 'auto')
+        if not use_async_gtts:
+            return await self._run_blocking(self.text_to_speech, text, output_file)
+        
+        logger.info(f"Converting text to speech asynchronously: {text[:50]}...")
+        
+        file_path = resolve_output_path(self.data_dir, output_file)
+        
+        if self.engine_type == 'gtts':
+            return await self._ause_gtts(text, file_path)
+        
+        for name in self.router.candidates(self._available_engines()):
+            start = time.perf_counter()
+            if name == 'gtts':
+                success, message = await self._ause_gtts(text, file_path)
             else:
-                logger.warning(f"pyttsx3 didn't create a valid audio file at {file_path}")
-                return False, "pyttsx3 failed to create a valid audio file"
-        except Exception as e:
-            logger.error(f"Error in pyttsx3 text to speech conversion: {e}")
-            return False, f"Error using pyttsx3: {str(e)}"
+                success, message = await self._run_blocking(self._use_engine, name, text, file_path)
+            self.router.record(name, success, time.perf_counter() - start)
+            if success:
+                return success, message
+        
+        return self._create_placeholder(text, file_path)
     
-    def _use_gtts(self, text: str, file_path: Path) -> Tuple[bool, str]:
-        """Use Google TTS for conversion."""
+    async def aclose(self) -> None:
+        """Close the HTTP session used by the asynchronous API."""
+        await self.http_session.close()
+    
+    async def _ause_gtts(self, text: str, file_path: Path) -> Tuple[bool, str]:
+        """Use Google TTS over non-blocking HTTP."""
         try:
-            # Create gTTS object
-            tts = gTTS(text=text, lang='ja', slow=False)
+            audio = await asynthesize(text, lang='ja', slow=False, session=self.http_session.get())
             
             # Default output is MP3, modify path if needed
             mp3_path = file_path.with_suffix('.mp3')
-            tts.save(str(mp3_path))
+            with open(mp3_path, 'wb') as f:
+                f.write(audio)
             
             logger.info(f"Successfully saved speech to {mp3_path} using gTTS")
             return True, f"Successfully generated audio using Google TTS: {mp3_path}"
@@ -167,148 +196,40 @@ class JapaneseSpeechProcessorMulti:
             logger.error(f"Error in gTTS text to speech conversion: {e}")
             return False, f"Error using Google TTS (requires internet): {str(e)}"
     
-    def _create_placeholder(self, text: str, file_path: Path) -> Tuple[bool, str]:
-        """Create a placeholder when no TTS engine is available."""
+    def _use_engine(self, name: str, text: str, file_path: Path) -> Tuple[bool, str]:
+        """Convert text with one of the processor's engines, saving audio in the engine's format."""
+        engine = self.engines[name]
         try:
-            # Create a text file with the content
-            text_file_path = file_path.with_suffix('.txt')
-            with open(text_file_path, 'w', encoding='utf-8') as f:
-                f.write(text)
-                f.write("\n\n")
-                f.write("--- This is a placeholder for text-to-speech output ---\n")
-                f.write("--- To enable actual TTS, install one of these packages: ---\n")
-                f.write("--- pip install pyttsx3 ---\n")
-                f.write("--- pip install gtts ---\n")
+            audio = engine.synthesize(text)
             
-            # Create an empty WAV file as a placeholder
-            with open(file_path, 'w') as f:
-                f.write("PLACEHOLDER AUDIO FILE\n")
-                f.write("This file would contain audio in a real implementation.\n")
+            # gTTS writes MP3 and pyttsx3 WAV, whatever the requested suffix
+            audio_path = file_path.with_suffix(f".{engine.audio_format}")
+            with open(audio_path, 'wb') as f:
+                f.write(audio)
             
-            logger.info(f"Created placeholder files at {text_file_path} and {file_path}")
+            logger.info(f"Successfully saved speech to {audio_path} using {engine.label}")
+            return True, f"Successfully generated audio using {engine.label}: {audio_path}"
+        except Exception as e:
+            logger.error(f"Error in {engine.label} text to speech conversion: {e}")
+            requirement = "" if engine.offline else " (requires internet)"
+            return False, f"Error using {engine.label}{requirement}: {str(e)}"
+    
+    def _create_placeholder(self, text: str, file_path: Path) -> Tuple[bool, str]:
+        """Create a placeholder when no TTS engine is available."""
+        try:
+            self._write_placeholder_files(text, file_path, [
+                "To enable actual TTS, install one of these packages:",
+                "pip install pyttsx3",
+                "pip install gtts",
+            ])
             return True, f"Created placeholder (no TTS engines available)"
         except Exception as e:
             logger.error(f"Error creating placeholder files: {e}")
             return False, f"Error creating placeholder files: {str(e)}"
     
-    def speech_to_text(self, audio_file: str) -> str:
-        """
-        Convert Japanese speech to text.
-        
-        This is a placeholder function since speech recognition requires
-        additional libraries and potentially API credentials.
-        
-        Args:
-            audio_file: Path to the audio file
-            
-        Returns:
-            Transcribed text or error message
-        """
-        # Check if it's already an absolute path
-        if os.path.isabs(audio_file):
-            file_path = Path(audio_file)
-        else:
-            file_path = self.data_dir / audio_file
-            
-        logger.info(f"Speech-to-text functionality is not implemented: {file_path}")
-        
-        # Check if a corresponding text file exists (from TTS operation)
-        text_file_path = file_path.with_suffix('.txt')
-        if text_file_path.exists():
-            try:
-                with open(text_file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    # Extract only the original text, not the placeholder message
-                    if "---" in content:
-                        content = content.split("---")[0].strip()
-                return content
-            except Exception as e:
-                logger.error(f"Error reading text file: {e}")
-        
-        return "音声認識機能は実装されていません。Speech-to-Text機能を使用するには、追加のライブラリとAPIキーが必要です。"
-    
-    def analyze_audio(self, audio_file: str) -> Dict[str, Union[float, List[float]]]:
-        """
-        Analyze properties of a Japanese speech audio file.
-        
-        This is a simplified implementation that checks if the file exists
-        and provides basic information.
-        
-        Args:
-            audio_file: Path to the audio file
-            
-        Returns:
-            Dictionary of audio properties
-        """
-        # Check if it's already an absolute path
-        if os.path.isabs(audio_file):
-            file_path = Path(audio_file)
-        else:
-            file_path = self.data_dir / audio_file
-            
-        logger.info(f"Analyzing audio file: {file_path}")
-        
-        # Check if file exists
-        if not file_path.exists():
-            return {
-                "error": f"File not found: {file_path}",
-                "exists": False
-            }
-        
-        # Get basic file information
-        file_size = file_path.stat().st_size
-        file_extension = file_path.suffix.lower()
-        
-        # Check if there's a corresponding text file (from TTS)
-        text_file_path = file_path.with_suffix('.txt')
-        text_content = ""
-        if text_file_path.exists():
-            try:
-                with open(text_file_path, 'r', encoding='utf-8') as f:
-                    text_content = f.read()
-                    if "---" in text_content:
-                        text_content = text_content.split("---")[0].strip()
-            except:
-                pass
-        
-        # Return basic information
-        result = {
-            "exists": True,
-            "file_size_bytes": file_size,
-            "file_extension": file_extension,
-            "file_path": str(file_path),
-            "has_text_file": text_file_path.exists(),
-            "text_length": len(text_content)
-        }
-        
-        # If it's a placeholder file, indicate that
-        if file_extension == '.txt' or (file_size < 1000 and "PLACEHOLDER" in open(file_path, 'r').read()):
-            result["is_placeholder"] = True
-            result["note"] = "This is a placeholder file, not actual audio"
-        
-        # Try to get more detailed audio info if possible
-        try:
-            import wave
-            if file_extension == '.wav':
-                with wave.open(str(file_path), 'r') as wav_file:
-                    # Extract WAV file properties
-                    channels = wav_file.getnchannels()
-                    sample_width = wav_file.getsampwidth()
-                    frame_rate = wav_file.getframerate()
-                    n_frames = wav_file.getnframes()
-                    duration = n_frames / frame_rate if frame_rate > 0 else 0
-                    
-                    result.update({
-                        "channels": channels,
-                        "sample_width_bytes": sample_width,
-                        "frame_rate_hz": frame_rate,
-                        "n_frames": n_frames,
-                        "duration_seconds": duration
-                    })
-        except Exception as e:
-            result["wave_analysis_error"] = str(e)
-        
-        return result
+    def _audio_formats(self) -> Iterable[str]:
+        """The formats of the processor's engines, which requested files may be saved in."""
+        return [engine.audio_format for engine in self.engines.values()]
 
 # Example usage
 if __name__ == "__main__":
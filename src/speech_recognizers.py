@@ -0,0 +1,396 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Speech Recognizer Registry
+--------------------------
+This module defines the interface speech recognition backends implement
+(transcribe mono samples at the backend's sample rate), a registry to select
+them by name, and file and batch transcription on top of it. Long recordings
+are split at pauses (see src.vad) and recognized segment by segment. Models
+are loaded once per process and shared by every recognizer using them, so
+transcribing many files pays the load time only once.
+
+Backends:
+    vosk     Offline Kaldi models (pip install vosk, plus a downloaded model directory)
+    whisper  Offline Whisper models via faster-whisper (pip install faster-whisper)
+    google   Google Web Speech API via SpeechRecognition (needs network)
+"""
+
+import os
+import json
+import inspect
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from src.audio_analysis import iter_mono_blocks
+from src.vad import iter_speech_segments
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+try:
+    import vosk
+    VOSK_AVAILABLE = True
+except ImportError:
+    VOSK_AVAILABLE = False
+
+try:
+    from faster_whisper import WhisperModel
+    WHISPER_AVAILABLE = True
+except ImportError:
+    WHISPER_AVAILABLE = False
+
+try:
+    import speech_recognition as sr
+    SPEECH_RECOGNITION_AVAILABLE = True
+except ImportError:
+    SPEECH_RECOGNITION_AVAILABLE = False
+
+# Samples read from the file per block while transcribing
+READ_BLOCK_SAMPLES = 64 * 1024
+
+# Registered recognizer factories by name
+_REGISTRY: Dict[str, Callable[..., "SpeechRecognizer"]] = {}
+
+# Loaded models shared by all recognizers in this process
+_MODELS: Dict[Hashable, Any] = {}
+_MODELS_LOCK = threading.Lock()
+
+
+def load_model(key: Hashable, loader: Callable[[], Any]) -> Any:
+    """
+    Return the model loaded under key, loading it on first use.
+
+    Args:
+        key: Identity of the model (backend, path and load options)
+        loader: Function loading the model
+
+    Returns:
+        The shared model
+    """
+    with _MODELS_LOCK:
+        if key not in _MODELS:
+            logger.info(f"Loading speech recognition model {key}")
+            _MODELS[key] = loader()
+        return _MODELS[key]
+
+
+def unload_models() -> None:
+    """Drop every shared model (they are loaded again when next used)."""
+    with _MODELS_LOCK:
+        _MODELS.clear()
+
+
+def _to_pcm16(samples: np.ndarray) -> bytes:
+    """Convert float samples in [-1, 1] to 16-bit little-endian PCM."""
+    return (np.clip(samples, -1.0, 1.0) * 32767).astype('<i2').tobytes()
+
+
+class SpeechRecognizer:
+    """
+    Interface of a speech recognition backend.
+
+    Subclasses implement transcribe() and set the class attributes that
+    describe what the backend can do.
+    """
+
+    # Registry name and human-readable name
+    name: str = ''
+    label: str = ''
+    # Sample rate transcribe expects
+    sample_rate: int = 16000
+    # Number of transcribe calls that usefully run at the same time
+    max_concurrency: int = 1
+    # Whether the backend works without network access
+    offline: bool = True
+
+    @property
+    def available(self) -> bool:
+        """Whether the backend can recognize speech right now."""
+        return True
+
+    def transcribe(self, samples: np.ndarray) -> str:
+        """
+        Recognize the speech in a segment.
+
+        Args:
+            samples: Mono float32 samples at sample_rate
+
+        Returns:
+            Recognized text ('' if nothing was recognized)
+        """
+        raise NotImplementedError
+
+    def capabilities(self) -> Dict[str, Any]:
+        """Return what the backend can do, for reporting."""
+        return {
+            "name": self.name,
+            "sample_rate": self.sample_rate,
+            "max_concurrency": self.max_concurrency,
+            "offline": self.offline,
+            "available": self.available,
+        }
+
+    def close(self) -> None:
+        """Release the backend's resources (shared models stay loaded)."""
+
+
+def register_recognizer(name: str, factory: Optional[Callable[..., SpeechRecognizer]] = None):
+    """
+    Register a recognizer factory under a name; usable as a class decorator.
+
+    Args:
+        name: Name the recognizer is selected by
+        factory: Class or function creating the recognizer
+
+    Returns:
+        The factory (so that the decorator leaves the class unchanged)
+    """
+    def register(factory: Callable[..., SpeechRecognizer]) -> Callable[..., SpeechRecognizer]:
+        _REGISTRY[name] = factory
+        return factory
+
+    if factory is not None:
+        return register(factory)
+    return register
+
+
+def recognizer_names() -> List[str]:
+    """Return the names of all registered recognizers."""
+    return list(_REGISTRY)
+
+
+def recognizer_options(name: str) -> List[str]:
+    """
+    Return the options the factory of a registered recognizer accepts.
+
+    Args:
+        name: Registered recognizer name
+
+    Returns:
+        Keyword option names (e.g. 'model' for vosk and whisper)
+
+    Raises:
+        ValueError: If no recognizer is registered under name
+    """
+    if name not in _REGISTRY:
+        raise ValueError(f"Unknown speech recognizer: {name} (available: {', '.join(recognizer_names())})")
+    return [param.name for param in inspect.signature(_REGISTRY[name]).parameters.values()
+            if param.kind in (param.POSITIONAL_OR_KEYWORD, param.KEYWORD_ONLY)]
+
+
+def create_recognizer(name: Union[str, SpeechRecognizer], **options) -> SpeechRecognizer:
+    """
+    Create a registered recognizer by name.
+
+    Args:
+        name: Registered recognizer name (a recognizer instance is returned as is)
+        **options: Options passed to the recognizer factory
+
+    Returns:
+        The recognizer
+
+    Raises:
+        ValueError: If no recognizer is registered under name
+        RuntimeError: If the recognizer is not available in this environment
+    """
+    if isinstance(name, SpeechRecognizer):
+        return name
+    if name not in _REGISTRY:
+        raise ValueError(f"Unknown speech recognizer: {name} (available: {', '.join(recognizer_names())})")
+
+    recognizer = _REGISTRY[name](**options)
+    if not recognizer.available:
+        recognizer.close()
+        raise RuntimeError(f"Speech recognizer {name} is not available")
+    return recognizer
+
+
+@register_recognizer('vosk')
+class VoskRecognizer(SpeechRecognizer):
+    """Offline recognition with a Vosk (Kaldi) model."""
+
+    name = 'vosk'
+    label = 'Vosk'
+    offline = True
+
+    def __init__(self, model: Optional[str] = None, sample_rate: int = 16000, separator: str = ''):
+        """
+        Initialize the recognizer.
+
+        Args:
+            model: Path to an unpacked Vosk model directory (e.g. vosk-model-small-ja-0.22)
+            sample_rate: Sample rate to recognize at
+            separator: Joins recognized words (Japanese models put spaces between words)
+        """
+        self.model_path = model
+        self.sample_rate = sample_rate
+        self.separator = separator
+        # Each call gets its own KaldiRecognizer, so calls can share the model concurrently
+        self.max_concurrency = os.cpu_count() or 1
+        self._model = None
+        if self.available:
+            self._model = load_model(('vosk', os.path.abspath(model)), lambda: vosk.Model(model))
+
+    @property
+    def available(self) -> bool:
+        return VOSK_AVAILABLE and self.model_path is not None and os.path.isdir(self.model_path)
+
+    def transcribe(self, samples: np.ndarray) -> str:
+        recognizer = vosk.KaldiRecognizer(self._model, self.sample_rate)
+        recognizer.AcceptWaveform(_to_pcm16(samples))
+        words = json.loads(recognizer.FinalResult()).get('text', '').split()
+        return self.separator.join(words)
+
+
+@register_recognizer('whisper')
+class WhisperRecognizer(SpeechRecognizer):
+    """Offline recognition with a Whisper model via faster-whisper (CTranslate2)."""
+
+    name = 'whisper'
+    label = 'Whisper'
+    offline = True
+
+    def __init__(self, model: str = 'small', language: str = 'ja', device: str = 'cpu',
+                 compute_type: str = 'int8', beam_size: int = 5):
+        """
+        Initialize the recognizer.
+
+        Args:
+            model: Model size (tiny, base, small, medium, large-v3) or path to a converted model
+            language: Language of the speech
+            device: 'cpu' or 'cuda'
+            compute_type: Weight precision (int8 keeps CPU inference fast)
+            beam_size: Beam width of the decoder
+        """
+        self.model_name = model
+        self.language = language
+        self.beam_size = beam_size
+        self._model = None
+        if self.available:
+            self._model = load_model(('whisper', model, device, compute_type),
+                                     lambda: WhisperModel(model, device=device, compute_type=compute_type))
+
+    @property
+    def available(self) -> bool:
+        return WHISPER_AVAILABLE
+
+    def transcribe(self, samples: np.ndarray) -> str:
+        # Segments come from the VAD already; do not let Whisper condition across them
+        segments, _ = self._model.transcribe(samples.astype(np.float32, copy=False), language=self.language,
+                                             beam_size=self.beam_size, condition_on_previous_text=False)
+        return ''.join(segment.text.strip() for segment in segments)
+
+
+@register_recognizer('google')
+class GoogleRecognizer(SpeechRecognizer):
+    """Google Web Speech API via SpeechRecognition (requires network access)."""
+
+    name = 'google'
+    label = 'Google Speech Recognition'
+    offline = False
+    max_concurrency = 4
+
+    def __init__(self, language: str = 'ja-JP'):
+        """
+        Initialize the recognizer.
+
+        Args:
+            language: Language of the speech
+        """
+        self.language = language
+        self._recognizer = sr.Recognizer() if SPEECH_RECOGNITION_AVAILABLE else None
+
+    @property
+    def available(self) -> bool:
+        return SPEECH_RECOGNITION_AVAILABLE
+
+    def transcribe(self, samples: np.ndarray) -> str:
+        audio = sr.AudioData(_to_pcm16(samples), self.sample_rate, 2)
+        try:
+            return self._recognizer.recognize_google(audio, language=self.language)
+        except sr.UnknownValueError:
+            return ''
+
+
+def transcribe_file(audio_file: Union[str, Path], recognizer: SpeechRecognizer, vad: bool = True,
+                    **vad_options) -> Dict[str, Any]:
+    """
+    Transcribe an audio file, segment by segment.
+
+    The file is read in blocks at the recognizer's sample rate and split at
+    pauses, so long recordings are decoded in bounded memory.
+
+    Args:
+        audio_file: Path to a file soundfile can read
+        recognizer: Recognizer to use
+        vad: Split at pauses (otherwise the whole file is one segment)
+        **vad_options: Options for src.vad.iter_speech_segments
+
+    Returns:
+        Dictionary with the full text and the timed text of each segment
+    """
+    blocks = iter_mono_blocks(audio_file, READ_BLOCK_SAMPLES, recognizer.sample_rate)
+    if vad:
+        segments = iter_speech_segments(blocks, recognizer.sample_rate, **vad_options)
+    else:
+        samples = np.concatenate(list(blocks) or [np.zeros(0, dtype=np.float32)])
+        segments = [(0.0, len(samples) / recognizer.sample_rate, samples)]
+
+    transcript = []
+    for start, end, samples in segments:
+        text = recognizer.transcribe(samples).strip()
+        if text:
+            transcript.append({"start": round(start, 3), "end": round(end, 3), "text": text})
+
+    return {
+        "text": ''.join(segment["text"] for segment in transcript),
+        "segments": transcript,
+        "recognizer": recognizer.name,
+    }
+
+
+def transcribe_files(audio_files: Iterable[Union[str, Path]], recognizer: SpeechRecognizer,
+                     max_workers: Optional[int] = None, **options) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Transcribe many files with one recognizer (and one loaded model).
+
+    Files are transcribed by up to max_workers threads sharing the model,
+    and results are yielded in input order. A failing file yields a result
+    with an 'error' entry instead of stopping the batch.
+
+    Args:
+        audio_files: Files to transcribe
+        recognizer: Recognizer to use
+        max_workers: Concurrent files (defaults to the recognizer's max_concurrency)
+        **options: Options for transcribe_file
+
+    Yields:
+        Tuples of (file path, transcription result)
+    """
+    def run(path: str) -> Dict[str, Any]:
+        try:
+            return transcribe_file(path, recognizer, **options)
+        except Exception as e:
+            logger.error(f"Error transcribing {path}: {e}")
+            return {"error": str(e), "recognizer": recognizer.name}
+
+    paths = [str(path) for path in audio_files]
+    workers = max(1, min(max_workers or recognizer.max_concurrency, recognizer.max_concurrency, len(paths) or 1))
+    if workers == 1:
+        for path in paths:
+            yield path, run(path)
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        yield from zip(paths, executor.map(run, paths))
@@ -12,7 +12,10 @@ import re
 import json
 import logging
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterator, List, Optional, Union
+
+from src.mapped_text import MappedTextFile
+from src.markdown_parser import MarkdownElement, iter_markdown_elements, parse_markdown
 
 # Configure logging
 logging.basicConfig(
@@ -21,6 +24,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Characters read from disk per step by iter_text_file
+DEFAULT_READ_SIZE = 64 * 1024
+
+# End of a sentence, including any closing brackets that follow it
+SENTENCE_END_RE = re.compile(r'[。！？!?\n][」』）)]*')
+
 class JapaneseTextProcessor:
     """Class for processing Japanese text files."""
     
@@ -67,38 +76,125 @@ class JapaneseTextProcessor:
             logger.error(f"Error reading file {file_path}: {e}")
             raise
     
-    def read_markdown_file(self, filename: str) -> Dict[str, Union[str, List[str]]]:
+    def iter_text_file(self, filename: str, chunk_size: int = 0,
+                       read_size: int = DEFAULT_READ_SIZE) -> Iterator[str]:
+        """
+        Stream a Japanese text file without loading it into memory.
+
+        The file is decoded incrementally, so multi-byte UTF-8 characters
+        split across read boundaries are never broken. Joining the yielded
+        pieces reproduces read_text_file exactly.
+
+        Args:
+            filename: Name of the file to read
+            chunk_size: 0 to yield lines (with their newline); otherwise the
+                maximum number of characters per chunk, cut after the last
+                sentence end that fits (or hard at chunk_size if there is none)
+            read_size: Number of characters decoded per read
+
+        Yields:
+            Lines or sentence-aligned chunks of the file
+        """
+        if os.path.isabs(filename):
+            file_path = Path(filename)
+        else:
+            file_path = self.data_dir / filename
+
+        logger.info(f"Streaming text file: {file_path}")
+
+        with open(file_path, 'r', encoding='utf-8') as f:
+            if chunk_size <= 0:
+                yield from f
+                return
+
+            buffer = ""
+            pos = 0
+            while True:
+                block = f.read(max(read_size, chunk_size))
+                # Chunks are cut at an offset; only the unconsumed tail (at most
+                # chunk_size characters) is carried over to the next block
+                buffer = buffer[pos:] + block
+                pos = 0
+                while len(buffer) - pos > chunk_size or (not block and pos < len(buffer)):
+                    end = pos + chunk_size
+                    if len(buffer) <= end:
+                        # End of file: flush whatever is left
+                        cut = len(buffer)
+                    else:
+                        cut = pos
+                        for match in SENTENCE_END_RE.finditer(buffer, pos, end):
+                            cut = match.end()
+                        if cut == pos:
+                            cut = end
+                    yield buffer[pos:cut]
+                    pos = cut
+                if not block:
+                    return
+
+    def open_mapped(self, filename: str) -> MappedTextFile:
+        """
+        Open a text file as a memory-mapped, lazily decoded view.
+
+        Args:
+            filename: Name of the file to map
+
+        Returns:
+            A MappedTextFile (use it as a context manager to close it)
+        """
+        if os.path.isabs(filename):
+            file_path = Path(filename)
+        else:
+            file_path = self.data_dir / filename
+
+        logger.info(f"Mapping text file: {file_path}")
+        return MappedTextFile(file_path)
+
+    def read_lines(self, filename: str, start: int = 0, stop: Optional[int] = None) -> List[str]:
+        """
+        Read a range of lines without decoding the rest of the file.
+
+        Args:
+            filename: Name of the file to read
+            start: First line number (zero-based)
+            stop: Line number after the range (defaults to the end of the file)
+
+        Returns:
+            The lines without their line endings
+        """
+        with self.open_mapped(filename) as mapped:
+            return mapped.lines(start, stop)
+
+    def read_markdown_file(self, filename: str, elements: bool = False) -> Dict[str, Union[str, List[str]]]:
         """
         Read a Japanese markdown file and extract structure.
         
         Args:
             filename: Name of the markdown file to read
+            elements: Also return every element with its line number
             
         Returns:
             A dictionary with the structure of the markdown file
         """
         content = self.read_text_file(filename)
-        
-        # Extract headers
-        headers = re.findall(r'^(#{1,6})\s+(.+)$', content, re.MULTILINE)
-        
-        # Extract lists
-        bullet_lists = re.findall(r'^\s*[-*+]\s+(.+)$', content, re.MULTILINE)
-        numbered_lists = re.findall(r'^\s*\d+\.\s+(.+)$', content, re.MULTILINE)
-        
-        # Extract code blocks
-        code_blocks = re.findall(r'```(?:\w+)?\n([\s\S]*?)```', content)
-        
-        structure = {
-            "raw_content": content,
-            "headers": [(len(h[0]), h[1]) for h in headers],
-            "bullet_lists": bullet_lists,
-            "numbered_lists": numbered_lists,
-            "code_blocks": code_blocks
-        }
+
+        # One code-block aware pass instead of a regex scan per element type
+        structure = {"raw_content": content}
+        structure.update(parse_markdown(content, elements=elements))
         
         return structure
     
+    def iter_markdown_file(self, filename: str) -> Iterator[MarkdownElement]:
+        """
+        Stream the structural elements of a markdown file.
+
+        Args:
+            filename: Name of the markdown file to read
+
+        Yields:
+            Headers, list items, code blocks and paragraphs with their line numbers
+        """
+        return iter_markdown_elements(self.iter_text_file(filename))
+
     def write_text_file(self, filename: str, content: str) -> None:
         """
         Write content to a Japanese text file.
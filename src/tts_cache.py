@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Synthesis Cache
+---------------
+This module provides a persistent, content-addressed on-disk cache for
+synthesized speech, so that identical requests never reach the TTS engine twice.
+"""
+
+import os
+import re
+import json
+import shutil
+import hashlib
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Union
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Default upper bound for the total size of cached audio (256 MB)
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text so that trivially different inputs share a cache entry.
+
+    Applies Unicode NFC normalization, collapses whitespace runs and strips
+    leading/trailing whitespace. The spoken content is unchanged.
+
+    Args:
+        text: Text to normalize
+
+    Returns:
+        Normalized text
+    """
+    text = unicodedata.normalize('NFC', text)
+    return _WHITESPACE_RE.sub(' ', text).strip()
+
+
+def make_cache_key(text: str, lang: str = 'ja', slow: bool = False, engine: str = 'gtts') -> str:
+    """
+    Build a content-addressed cache key for a synthesis request.
+
+    Args:
+        text: Text to be synthesized
+        lang: Language code passed to the engine
+        slow: Whether slow speech was requested
+        engine: Name of the TTS engine
+
+    Returns:
+        Hex digest identifying the request
+    """
+    payload = json.dumps([normalize_text(text), lang, bool(slow), engine], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class SynthesisCache:
+    """Persistent LRU cache of synthesized audio files keyed by request hash."""
+
+    def __init__(self, cache_dir: Union[str, Path], max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+                 suffix: str = '.mp3', use_hardlinks: bool = True):
+        """
+        Initialize the synthesis cache.
+
+        Args:
+            cache_dir: Directory holding the cached audio files
+            max_bytes: Total size above which least recently used entries are evicted
+            suffix: File extension of the cached audio
+            use_hardlinks: Hardlink cache entries into place on a hit instead of copying
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.use_hardlinks = use_hardlinks
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_index()
+        logger.info(f"Initialized synthesis cache at {self.cache_dir} "
+                    f"({len(self._entries)} entries, {self._total_bytes} bytes)")
+
+    def _entry_path(self, key: str) -> Path:
+        """Return the on-disk location of a cache entry (fanned out by key prefix)."""
+        return self.cache_dir / key[:2] / f"{key}{self.suffix}"
+
+    def _load_index(self) -> None:
+        """Rebuild the LRU order from the entries already on disk, oldest access first."""
+        found = []
+        for path in self.cache_dir.glob(f"*/*{self.suffix}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            found.append((stat.st_mtime, path.stem, stat.st_size))
+
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+
+    def _forget(self, key: str) -> None:
+        """Drop a key from the in-memory index. Caller must hold the lock."""
+        size = self._entries.pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the size limit holds. Caller must hold the lock."""
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            self._forget(key)
+            try:
+                os.remove(self._entry_path(key))
+            except OSError:
+                pass
+            self.evictions += 1
+            logger.debug(f"Evicted cache entry {key}")
+
+    def contains(self, key: str) -> bool:
+        """
+        Check whether an entry exists without affecting counters or recency.
+
+        Args:
+            key: Cache key from make_cache_key
+
+        Returns:
+            True if the entry is cached
+        """
+        with self._lock:
+            return key in self._entries and self._entry_path(key).exists()
+
+    def get(self, key: str, output_file: Union[str, Path]) -> bool:
+        """
+        Materialize a cached entry at output_file.
+
+        The entry is hardlinked into place when possible and copied otherwise.
+        Writers must replace (not truncate) output_file afterwards, otherwise a
+        hardlinked cache entry would be modified too.
+
+        Args:
+            key: Cache key from make_cache_key
+            output_file: Destination path for the audio
+
+        Returns:
+            True on a cache hit, False on a miss
+        """
+        entry_path = self._entry_path(key)
+        output_path = Path(output_file)
+
+        with self._lock:
+            if key not in self._entries or not entry_path.exists():
+                # Another process may have evicted the entry behind our back
+                self._forget(key)
+                self.misses += 1
+                return False
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        try:
+            # Persist recency so the LRU order survives restarts
+            os.utime(entry_path)
+        except OSError:
+            pass
+
+        tmp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            if self.use_hardlinks:
+                try:
+                    os.link(entry_path, tmp_path)
+                except OSError:
+                    shutil.copyfile(entry_path, tmp_path)
+            else:
+                shutil.copyfile(entry_path, tmp_path)
+            os.replace(tmp_path, output_path)
+        except OSError as e:
+            logger.error(f"Error materializing cache entry {key}: {e}")
+            if tmp_path.exists():
+                os.remove(tmp_path)
+            with self._lock:
+                self.hits -= 1
+                self.misses += 1
+            return False
+
+        return True
+
+    def put(self, key: str, source_file: Union[str, Path]) -> None:
+        """
+        Store a synthesized audio file in the cache.
+
+        The file is copied, so later changes to source_file do not affect the entry.
+
+        Args:
+            key: Cache key from make_cache_key
+            source_file: Path of the freshly synthesized audio
+        """
+        entry_path = self._entry_path(key)
+        os.makedirs(entry_path.parent, exist_ok=True)
+        tmp_path = entry_path.with_name(f".{entry_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+        try:
+            shutil.copyfile(source_file, tmp_path)
+            os.replace(tmp_path, entry_path)
+        except OSError as e:
+            logger.error(f"Error storing cache entry {key}: {e}")
+            if tmp_path.exists():
+                os.remove(tmp_path)
+            return
+
+        size = entry_path.stat().st_size
+        with self._lock:
+            self._forget(key)
+            self._entries[key] = size
+            self._total_bytes += size
+            self._evict()
+
+    def clear(self) -> None:
+        """Remove every cached entry and reset the counters."""
+        with self._lock:
+            for key in list(self._entries):
+                try:
+                    os.remove(self._entry_path(key))
+                except OSError:
+                    pass
+            self._entries.clear()
+            self._total_bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Report cache usage counters.
+
+        Returns:
+            Dictionary with hits, misses, evictions, entries, size and hit ratio
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "total_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hit_ratio": self.hits / lookups if lookups else 0.0
+            }
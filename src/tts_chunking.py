@@ -0,0 +1,292 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Chunked Speech Synthesis
+------------------------
+This module splits Japanese text on sentence boundaries, synthesizes the
+chunks concurrently and joins the resulting MP3 or WAV streams in order.
+"""
+
+import io
+import re
+import wave
+import struct
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Callable, Iterable, Iterator, List
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Default number of concurrent synthesis requests
+DEFAULT_MAX_WORKERS = 4
+
+# Size of the canonical RIFF/WAVE header written by streaming_wav_header
+WAV_HEADER_SIZE = 44
+
+# A sentence runs up to its terminator (plus closing brackets); text without
+# a terminator runs to the end of the line. Newlines always end a sentence,
+# but packing may still join sentences from several lines into one chunk.
+_SENTENCE_RE = re.compile(r'[^。！？\n]*[。！？]+[」』）]*|[^\n]+')
+
+
+def split_sentences(text: str, max_chars: int = 0) -> List[str]:
+    """
+    Split Japanese text into sentences on 。！？ and newlines.
+
+    Args:
+        text: Japanese text to split
+        max_chars: If positive, pack adjacent sentences into chunks of up to this length
+
+    Returns:
+        List of non-empty sentences (or packed chunks) in document order
+    """
+    sentences = [m.group().strip() for m in _SENTENCE_RE.finditer(text)]
+    sentences = [s for s in sentences if s]
+
+    if max_chars <= 0:
+        return sentences
+
+    chunks = []
+    current = ""
+    for sentence in sentences:
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            chunks.append(current)
+            current = ""
+        current = f"{current}\n{sentence}" if current else sentence
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def split_for_streaming(text: str, max_chars: int) -> List[str]:
+    """
+    Split text for streaming synthesis.
+
+    The first sentence is kept on its own so that its audio is ready as
+    early as possible; the remaining sentences are packed up to max_chars.
+
+    Args:
+        text: Japanese text to split
+        max_chars: Maximum length of the packed chunks after the first
+
+    Returns:
+        List of chunks in document order
+    """
+    sentences = split_sentences(text)
+    if not sentences:
+        return []
+    return sentences[:1] + split_sentences("\n".join(sentences[1:]), max_chars=max_chars)
+
+
+def strip_id3(data: bytes) -> bytes:
+    """
+    Remove ID3v2 (leading) and ID3v1 (trailing) tags from an MP3 stream.
+
+    Args:
+        data: Encoded MP3 data
+
+    Returns:
+        The bare MPEG audio frames
+    """
+    if len(data) >= 10 and data[:3] == b"ID3":
+        # The tag size is a 28-bit syncsafe integer, plus an optional 10-byte footer
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        footer = 10 if data[5] & 0x10 else 0
+        data = data[10 + size + footer:]
+    if len(data) >= 128 and data[-128:-125] == b"TAG":
+        data = data[:-128]
+    return data
+
+
+def concat_mp3(chunks: Iterable[bytes]) -> bytes:
+    """
+    Concatenate MP3 streams into one playable stream.
+
+    MPEG frames are self-contained, so the frames of each chunk can simply be
+    appended; only the tags of the individual chunks have to be dropped.
+
+    Args:
+        chunks: Encoded MP3 chunks in playback order
+
+    Returns:
+        A single MP3 stream
+    """
+    return b"".join(strip_id3(chunk) for chunk in chunks)
+
+
+def concat_wav(chunks: Iterable[bytes]) -> bytes:
+    """
+    Concatenate WAV files with the same sample format into one WAV file.
+
+    Args:
+        chunks: Encoded WAV chunks in playback order
+
+    Returns:
+        A single WAV file
+    """
+    output = io.BytesIO()
+    writer = None
+    for chunk in chunks:
+        with wave.open(io.BytesIO(chunk), 'rb') as wav_file:
+            if writer is None:
+                writer = wave.open(output, 'wb')
+                writer.setparams(wav_file.getparams())
+            writer.writeframes(wav_file.readframes(wav_file.getnframes()))
+    if writer is not None:
+        writer.close()
+    return output.getvalue()
+
+
+def concat_audio(chunks: Iterable[bytes], audio_format: str) -> bytes:
+    """
+    Concatenate encoded audio chunks of the given format ('mp3' or 'wav').
+
+    Args:
+        chunks: Encoded chunks in playback order
+        audio_format: Encoding of the chunks
+
+    Returns:
+        The joined audio in the same format
+    """
+    if audio_format == 'wav':
+        return concat_wav(chunks)
+    return concat_mp3(chunks)
+
+
+def iter_stream_frames(chunks: Iterable[bytes], audio_format: str, header: bool = True) -> Iterator[bytes]:
+    """
+    Turn encoded chunks into pieces of one continuous stream.
+
+    MP3 chunks lose their tags; WAV chunks are reduced to their PCM frames,
+    preceded once by a streaming WAV header.
+
+    Args:
+        chunks: Encoded chunks in playback order
+        audio_format: Encoding of the chunks ('mp3' or 'wav')
+        header: Emit the WAV header before the first chunk (False to continue a stream)
+
+    Yields:
+        Byte strings whose concatenation is one playable stream
+    """
+    first = header
+    for chunk in chunks:
+        if audio_format != 'wav':
+            yield strip_id3(chunk)
+            continue
+        with wave.open(io.BytesIO(chunk), 'rb') as wav_file:
+            if first:
+                yield streaming_wav_header(wav_file.getnchannels(), wav_file.getsampwidth(),
+                                           wav_file.getframerate())
+            frames = wav_file.readframes(wav_file.getnframes())
+        first = False
+        yield frames
+
+
+def streaming_wav_header(channels: int, sample_width: int, frame_rate: int) -> bytes:
+    """
+    Build a WAV header for a PCM stream of unknown length.
+
+    The RIFF and data sizes are set to their maximum, which players treat
+    as "until the end of the stream".
+
+    Args:
+        channels: Number of channels
+        sample_width: Bytes per sample
+        frame_rate: Frames per second
+
+    Returns:
+        The 44-byte RIFF/WAVE header
+    """
+    block_align = channels * sample_width
+    return (b"RIFF" + struct.pack("<I", 0xFFFFFFFF) + b"WAVE"
+            + b"fmt " + struct.pack("<IHHIIHH", 16, 1, channels, frame_rate,
+                                    frame_rate * block_align, block_align, sample_width * 8)
+            + b"data" + struct.pack("<I", 0xFFFFFFFF))
+
+
+def finalize_wav_header(f: BinaryIO, data_size: int) -> None:
+    """
+    Write the real sizes into a streaming WAV header once the stream is complete.
+
+    Args:
+        f: Seekable file the stream was written to, starting with the header
+        data_size: Number of PCM bytes after the header
+    """
+    position = f.tell()
+    f.seek(4)
+    f.write(struct.pack("<I", WAV_HEADER_SIZE - 8 + data_size))
+    f.seek(WAV_HEADER_SIZE - 4)
+    f.write(struct.pack("<I", data_size))
+    f.seek(position)
+
+
+def synthesize_chunks(chunks: List[str], synthesize: Callable[[str], bytes],
+                      max_workers: int = DEFAULT_MAX_WORKERS) -> List[bytes]:
+    """
+    Synthesize text chunks concurrently through a bounded thread pool.
+
+    Args:
+        chunks: Text chunks to synthesize
+        synthesize: Function turning one chunk of text into encoded audio
+        max_workers: Maximum number of concurrent synthesis calls
+
+    Returns:
+        Encoded audio for every chunk, in the same order as chunks
+    """
+    if not chunks:
+        return []
+
+    workers = max(1, min(max_workers, len(chunks)))
+    logger.info(f"Synthesizing {len(chunks)} chunks with {workers} workers")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(synthesize, chunks))
+
+
+def iter_synthesized(chunks: List[str], synthesize: Callable[[str], bytes],
+                     max_workers: int = DEFAULT_MAX_WORKERS) -> Iterator[bytes]:
+    """
+    Synthesize chunks concurrently and yield their audio in order as it becomes ready.
+
+    Audio of a chunk is yielded as soon as it and every chunk before it are
+    done, and at most max_workers chunks are in flight. Closing the
+    generator early cancels the chunks that have not started.
+
+    Args:
+        chunks: Text chunks to synthesize
+        synthesize: Function turning one chunk of text into encoded audio
+        max_workers: Maximum number of concurrent synthesis calls
+
+    Yields:
+        Encoded audio for every chunk, in order
+    """
+    if not chunks:
+        return
+
+    workers = max(1, min(max_workers, len(chunks)))
+    executor = ThreadPoolExecutor(max_workers=workers)
+    pending = deque()
+    remaining = iter(chunks)
+    try:
+        for chunk in remaining:
+            pending.append(executor.submit(synthesize, chunk))
+            if len(pending) >= workers:
+                break
+        while pending:
+            audio = pending.popleft().result()
+            # Keep the pool full before handing the audio to the consumer
+            for chunk in remaining:
+                pending.append(executor.submit(synthesize, chunk))
+                break
+            yield audio
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
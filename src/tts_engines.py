@@ -0,0 +1,273 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+TTS Engine Registry
+-------------------
+This module defines the interface every text-to-speech engine implements
+(synthesize text to encoded audio, plus its capabilities: audio format,
+maximum chunk length and useful concurrency) and a registry the speech
+processors and main.py select engines from by name. Features built on the
+interface (caching, chunking, streaming, batching) work for every engine.
+"""
+
+import os
+import logging
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+from src.google_tts import synthesize as google_synthesize, create_session, DEFAULT_TIMEOUT, DEFAULT_RETRIES
+from src.rate_limit import TokenBucket
+from src.pyttsx3_worker import Pyttsx3Worker, create_japanese_engine, PYTTSX3_AVAILABLE, DEFAULT_MAX_BATCH
+from src.tts_chunking import split_for_streaming, iter_synthesized, iter_stream_frames, DEFAULT_MAX_WORKERS
+from src.tts_process_pool import TTSProcessPool
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+try:
+    import gtts
+    GTTS_AVAILABLE = True
+except ImportError:
+    GTTS_AVAILABLE = False
+
+# Registered engine factories by name
+_REGISTRY: Dict[str, Callable[..., "TTSEngine"]] = {}
+
+
+def resolve_output_path(data_dir: Path, output_file: str) -> Path:
+    """
+    Resolve an output file against a processor's data directory and create its directory.
+
+    Args:
+        data_dir: Directory relative paths are resolved against
+        output_file: Absolute or relative path of the file to write
+
+    Returns:
+        Resolved output path
+    """
+    # Check if it's already an absolute path
+    if os.path.isabs(output_file):
+        file_path = Path(output_file)
+    else:
+        file_path = Path(data_dir) / output_file
+
+    # Ensure the directory exists
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    return file_path
+
+
+class TTSEngine:
+    """
+    Interface of a text-to-speech engine.
+
+    Subclasses implement synthesize() and set the class attributes that
+    describe what the engine can do.
+    """
+
+    # Registry name and human-readable name
+    name: str = ''
+    label: str = ''
+    # Encoding of the audio returned by synthesize ('mp3' or 'wav')
+    audio_format: str = 'mp3'
+    # Longest text worth sending in one call (0 for no limit)
+    max_chunk_chars: int = 0
+    # Number of synthesize calls that usefully run at the same time
+    max_concurrency: int = 1
+    # Whether the engine works without network access
+    offline: bool = False
+
+    @property
+    def available(self) -> bool:
+        """Whether the engine can synthesize speech right now."""
+        return True
+
+    def synthesize(self, text: str) -> bytes:
+        """
+        Synthesize speech for a piece of text.
+
+        Args:
+            text: Japanese text to synthesize
+
+        Returns:
+            Encoded audio in audio_format
+        """
+        raise NotImplementedError
+
+    def stream(self, text: str, max_workers: Optional[int] = None) -> Iterator[bytes]:
+        """
+        Synthesize text sentence by sentence, yielding audio as it is ready.
+
+        Args:
+            text: Japanese text to synthesize
+            max_workers: Concurrent synthesize calls (defaults to max_concurrency)
+
+        Yields:
+            Chunks whose concatenation is one playable stream in audio_format
+        """
+        chunks = split_for_streaming(text, self.max_chunk_chars)
+        workers = min(max_workers or self.max_concurrency, self.max_concurrency)
+        yield from iter_stream_frames(iter_synthesized(chunks, self.synthesize, workers), self.audio_format)
+
+    def capabilities(self) -> Dict[str, Any]:
+        """Return what the engine can do, for routing and reporting."""
+        return {
+            "name": self.name,
+            "audio_format": self.audio_format,
+            "max_chunk_chars": self.max_chunk_chars,
+            "max_concurrency": self.max_concurrency,
+            "offline": self.offline,
+            "available": self.available,
+        }
+
+    def close(self) -> None:
+        """Release the engine's resources."""
+
+
+def register_engine(name: str, factory: Optional[Callable[..., TTSEngine]] = None):
+    """
+    Register an engine factory under a name; usable as a class decorator.
+
+    Args:
+        name: Name the engine is selected by
+        factory: Class or function creating the engine
+
+    Returns:
+        The factory (so that the decorator leaves the class unchanged)
+    """
+    def register(factory: Callable[..., TTSEngine]) -> Callable[..., TTSEngine]:
+        _REGISTRY[name] = factory
+        return factory
+
+    if factory is not None:
+        return register(factory)
+    return register
+
+
+def engine_names() -> List[str]:
+    """Return the names of all registered engines."""
+    return list(_REGISTRY)
+
+
+def create_engine(name: Union[str, TTSEngine], require_available: bool = True, **options) -> TTSEngine:
+    """
+    Create a registered engine by name.
+
+    Args:
+        name: Registered engine name (an engine instance is returned as is)
+        require_available: Raise if the engine cannot synthesize in this environment
+        **options: Options passed to the engine factory
+
+    Returns:
+        The engine
+
+    Raises:
+        ValueError: If no engine is registered under name
+        RuntimeError: If require_available is set and the engine is not available
+    """
+    if isinstance(name, TTSEngine):
+        return name
+    if name not in _REGISTRY:
+        raise ValueError(f"Unknown TTS engine: {name} (available: {', '.join(engine_names())})")
+
+    engine = _REGISTRY[name](**options)
+    if require_available and not engine.available:
+        engine.close()
+        raise RuntimeError(f"TTS engine {name} is not available")
+    return engine
+
+
+@register_engine('gtts')
+class GTTSEngine(TTSEngine):
+    """Google Text-to-Speech over HTTP."""
+
+    name = 'gtts'
+    label = 'gTTS'
+    audio_format = 'mp3'
+    max_chunk_chars = 200
+    max_concurrency = DEFAULT_MAX_WORKERS
+
+    def __init__(self, lang: str = 'ja', slow: bool = False, pool_size: Optional[int] = None,
+                 timeout: float = DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES,
+                 limiter: Optional[TokenBucket] = None):
+        """
+        Initialize the engine.
+
+        Args:
+            lang: Language code
+            slow: Read more slowly
+            pool_size: Connections of a session owned by this engine (None uses the shared session)
+            timeout: Per-request timeout in seconds
+            retries: Retries per request with jittered backoff
+            limiter: Rate limiter every HTTP request waits for (a text may take several requests)
+        """
+        self.lang = lang
+        self.slow = slow
+        self.timeout = timeout
+        self.retries = retries
+        self.limiter = limiter
+        self.session = create_session(pool_size) if pool_size and GTTS_AVAILABLE else None
+
+    @property
+    def available(self) -> bool:
+        return GTTS_AVAILABLE
+
+    def synthesize(self, text: str) -> bytes:
+        return google_synthesize(text, lang=self.lang, slow=self.slow, session=self.session,
+                                 timeout=self.timeout, retries=self.retries, limiter=self.limiter)
+
+    def close(self) -> None:
+        if self.session is not None:
+            self.session.close()
+
+
+@register_engine('pyttsx3')
+class Pyttsx3Engine(TTSEngine):
+    """Offline speech through pyttsx3, on a worker thread or a pool of processes."""
+
+    name = 'pyttsx3'
+    label = 'pyttsx3'
+    audio_format = 'wav'
+    offline = True
+
+    def __init__(self, processes: int = 1, engine_factory: Optional[Callable[[], Any]] = None):
+        """
+        Start the pyttsx3 engine(s).
+
+        Args:
+            processes: Number of engine processes; 1 runs the engine on a thread
+            engine_factory: Function creating a pyttsx3 engine (defaults to create_japanese_engine)
+        """
+        engine_factory = engine_factory or create_japanese_engine
+        if not PYTTSX3_AVAILABLE and engine_factory is create_japanese_engine:
+            self.worker = None
+        elif processes > 1:
+            self.worker = TTSProcessPool(processes, engine_factory)
+        else:
+            self.worker = Pyttsx3Worker(engine_factory)
+        # Requests arriving together are rendered in one runAndWait cycle per process
+        self.max_concurrency = max(1, processes) * DEFAULT_MAX_BATCH
+
+    @property
+    def available(self) -> bool:
+        return self.worker is not None and self.worker.available
+
+    def synthesize(self, text: str) -> bytes:
+        fd, path = tempfile.mkstemp(suffix='.wav')
+        os.close(fd)
+        try:
+            if not self.worker.save_to_file(text, path):
+                raise RuntimeError("pyttsx3 did not create a valid audio file")
+            with open(path, 'rb') as f:
+                return f.read()
+        finally:
+            os.remove(path)
+
+    def close(self) -> None:
+        if self.worker is not None:
+            self.worker.close()
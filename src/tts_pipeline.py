@@ -0,0 +1,272 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Pipelined Text-to-Speech
+------------------------
+This module overlaps reading, cleaning and synthesis of long documents.
+A reader thread, a cleaner/segmenter thread and a pool of synthesis
+workers are connected by bounded queues, and the audio of each chunk is
+appended to the output in document order as soon as it is ready.
+"""
+
+import os
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+from src.markdown_cleaner import MarkdownCleaner
+from src.tts_chunking import (split_sentences, iter_stream_frames, finalize_wav_header, WAV_HEADER_SIZE,
+                              DEFAULT_MAX_WORKERS)
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Default number of chunk characters sent to the engine at once
+DEFAULT_PIPELINE_CHUNK_CHARS = 200
+
+# Marks the end of a queue's input
+_DONE = object()
+
+
+class StageStats:
+    """Item count and busy time of one pipeline stage."""
+
+    def __init__(self, name: str):
+        """
+        Initialize the counters.
+
+        Args:
+            name: Stage name used in reports
+        """
+        self.name = name
+        self.items = 0
+        self.units = 0
+        self.busy = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, items: int, units: int, seconds: float) -> None:
+        """Record work done by the stage (thread-safe)."""
+        with self._lock:
+            self.items += items
+            self.units += units
+            self.busy += seconds
+
+    def as_dict(self) -> Dict[str, float]:
+        """Return the counters and the throughput in items and units per busy second."""
+        busy = self.busy or 1e-9
+        return {
+            "items": self.items,
+            "units": self.units,
+            "busy_seconds": round(self.busy, 4),
+            "items_per_second": round(self.items / busy, 2),
+            "units_per_second": round(self.units / busy, 2),
+        }
+
+
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    """Put item on a bounded queue, giving up if the pipeline is stopping."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _iter_queue(q: queue.Queue, stop: threading.Event) -> Iterator:
+    """Yield items from a queue until the end marker arrives or the pipeline stops."""
+    while not stop.is_set():
+        try:
+            item = q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        if item is _DONE:
+            return
+        yield item
+
+
+def pack_sentences(lines: Iterable[str], max_chars: int) -> Iterator[str]:
+    """
+    Incrementally pack sentences of clean text lines into synthesis chunks.
+
+    Args:
+        lines: Clean text lines
+        max_chars: Maximum chunk length (longer sentences form a chunk of their own)
+
+    Yields:
+        Chunks of whole sentences joined with newlines
+    """
+    current = ""
+    for line in lines:
+        for sentence in split_sentences(line):
+            if current and len(current) + 1 + len(sentence) > max_chars:
+                yield current
+                current = ""
+            current = f"{current}\n{sentence}" if current else sentence
+    if current:
+        yield current
+
+
+def run_pipeline(lines: Iterable[str], synthesize: Callable[[str], bytes], output_path: Union[str, Path],
+                 max_workers: int = DEFAULT_MAX_WORKERS, markdown: bool = True,
+                 max_chars: int = DEFAULT_PIPELINE_CHUNK_CHARS, queue_size: Optional[int] = None,
+                 on_chunk: Optional[Callable[[int, bytes], None]] = None,
+                 audio_format: str = 'mp3') -> Dict[str, Dict[str, float]]:
+    """
+    Convert streamed text to one audio file with overlapped stages.
+
+    The reader pulls lines from the input, the cleaner turns them into
+    speech text (stripping Markdown if requested) and packs sentences
+    into chunks, the worker pool synthesizes the chunks concurrently and
+    the calling thread appends the audio to output_path in order. All
+    queues are bounded, so memory stays flat however long the input is.
+
+    Args:
+        lines: Input lines including their line endings (e.g. JapaneseTextProcessor.iter_text_file)
+        synthesize: Function turning one chunk of text into encoded audio
+        output_path: Audio file to write
+        max_workers: Number of concurrent synthesis calls
+        markdown: Strip Markdown formatting from the input
+        max_chars: Maximum characters per synthesis chunk
+        queue_size: Capacity of each queue (defaults to twice max_workers)
+        on_chunk: Called with (index, audio) after each chunk is written
+        audio_format: Encoding returned by synthesize ('mp3' or 'wav')
+
+    Returns:
+        Per-stage statistics (items, units, busy seconds, throughput) plus
+        the time to first audio and the total elapsed time
+    """
+    workers = max(1, max_workers)
+    queue_size = queue_size or workers * 2
+    output_path = Path(output_path)
+
+    line_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    # Futures in document order; its bound also limits the chunks in flight
+    future_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    errors: List[BaseException] = []
+
+    reader_stats = StageStats("reader")
+    cleaner_stats = StageStats("cleaner")
+    synth_stats = StageStats("synthesis")
+    writer_stats = StageStats("writer")
+
+    def read() -> None:
+        try:
+            iterator = iter(lines)
+            while True:
+                start = time.perf_counter()
+                line = next(iterator, _DONE)
+                if line is _DONE:
+                    break
+                reader_stats.add(1, len(line), time.perf_counter() - start)
+                if not _put(line_queue, line, stop):
+                    return
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            _put(line_queue, _DONE, stop)
+
+    def timed_synthesize(chunk: str) -> bytes:
+        start = time.perf_counter()
+        audio = synthesize(chunk)
+        synth_stats.add(1, len(chunk), time.perf_counter() - start)
+        return audio
+
+    def clean(executor: ThreadPoolExecutor) -> None:
+        cleaner = MarkdownCleaner() if markdown else None
+
+        def clean_lines() -> Iterator[str]:
+            for line in _iter_queue(line_queue, stop):
+                start = time.perf_counter()
+                text = cleaner.feed(line) if cleaner else line.strip()
+                cleaner_stats.add(1, len(line), time.perf_counter() - start)
+                if text:
+                    yield text
+
+        try:
+            for chunk in pack_sentences(clean_lines(), max_chars):
+                if not _put(future_queue, executor.submit(timed_synthesize, chunk), stop):
+                    return
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            _put(future_queue, _DONE, stop)
+
+    started = time.perf_counter()
+    first_audio = None
+    os.makedirs(output_path.parent, exist_ok=True)
+    if output_path.exists():
+        # Never write through a hardlink into the synthesis cache
+        output_path.unlink()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        threads = [
+            threading.Thread(target=read, name="tts-pipeline-reader", daemon=True),
+            threading.Thread(target=clean, args=(executor,), name="tts-pipeline-cleaner", daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            with open(output_path, 'wb') as out:
+                data_size = 0
+                for index, future in enumerate(_iter_queue(future_queue, stop)):
+                    audio = future.result()
+                    start = time.perf_counter()
+                    written = 0
+                    # The first WAV chunk yields the stream header as a separate piece
+                    for frames in iter_stream_frames([audio], audio_format, header=index == 0):
+                        out.write(frames)
+                        written += len(frames)
+                    data_size += written
+                    out.flush()
+                    writer_stats.add(1, written, time.perf_counter() - start)
+                    if first_audio is None:
+                        first_audio = time.perf_counter() - started
+                    if on_chunk is not None:
+                        on_chunk(index, audio)
+                if audio_format == 'wav' and data_size:
+                    # The sizes are only known now
+                    finalize_wav_header(out, data_size - WAV_HEADER_SIZE)
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+            # Drop chunks that have not started yet
+            while True:
+                try:
+                    item = future_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(item, Future):
+                    item.cancel()
+        finally:
+            for thread in threads:
+                thread.join()
+
+    if errors:
+        # Do not leave a truncated audio file behind
+        output_path.unlink(missing_ok=True)
+        raise errors[0]
+
+    stats = {stage.name: stage.as_dict() for stage in (reader_stats, cleaner_stats, synth_stats, writer_stats)}
+    stats["time_to_first_audio"] = round(first_audio, 4) if first_audio is not None else None
+    stats["elapsed"] = round(time.perf_counter() - started, 4)
+    if first_audio is None:
+        logger.info(f"Pipeline wrote no audio to {output_path} in {stats['elapsed']} s")
+    else:
+        logger.info(f"Pipeline wrote {writer_stats.items} chunks to {output_path} in {stats['elapsed']} s "
+                    f"(first audio after {stats['time_to_first_audio']} s)")
+    return stats
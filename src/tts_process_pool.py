@@ -0,0 +1,309 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+pyttsx3 Process Pool
+--------------------
+This module keeps several pre-initialized pyttsx3 engines in worker
+processes, so offline synthesis runs on as many CPU cores as there are
+processes. Each process runs a Pyttsx3Worker (engine created and voice
+selected at start-up, queued requests batched per runAndWait cycle);
+the parent dispatches requests round-robin or to the least-loaded
+process, resolves their futures and restarts processes that die.
+"""
+
+import os
+import logging
+import itertools
+import threading
+import multiprocessing
+from concurrent.futures import Future
+from multiprocessing.connection import wait
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from src.pyttsx3_worker import Pyttsx3Worker, create_japanese_engine, DEFAULT_MAX_BATCH
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Dispatch policies
+ROUND_ROBIN = 'round_robin'
+LEAST_LOADED = 'least_loaded'
+
+# Seconds to wait for a worker process to initialize its engine
+DEFAULT_START_TIMEOUT = 30.0
+
+# Marks the end of a worker's task queue
+_STOP = None
+
+
+def _worker_main(tasks, results, engine_factory: Callable[[], Any], max_batch: int) -> None:
+    """Worker process: start an engine worker and feed it tasks until told to stop."""
+    send_lock = threading.Lock()
+
+    def send(message: Tuple) -> None:
+        with send_lock:
+            results.send(message)
+
+    worker = Pyttsx3Worker(engine_factory, max_batch=max_batch)
+    if not worker.available:
+        send(("error", None, repr(worker.error)))
+        return
+    send(("ready", None, os.getpid()))
+
+    def report(task_id: int, future: Future) -> None:
+        error = future.exception()
+        if error is not None:
+            send(("failed", task_id, repr(error)))
+        else:
+            send(("done", task_id, future.result()))
+
+    try:
+        while True:
+            task = tasks.get()
+            if task is _STOP:
+                break
+            task_id, text, file_path = task
+            future = worker.submit(text, file_path)
+            future.add_done_callback(lambda f, task_id=task_id: report(task_id, f))
+    finally:
+        worker.close()
+
+
+class _WorkerSlot:
+    """Parent-side state of one worker process."""
+
+    def __init__(self, worker_id: int):
+        self.worker_id = worker_id
+        self.process = None
+        self.tasks = None
+        self.results = None
+        self.in_flight: Dict[int, Future] = {}
+        self.restarts = 0
+
+
+class TTSProcessPool:
+    """A fixed number of pyttsx3 engine processes behind a thread-safe submit()."""
+
+    def __init__(self, processes: Optional[int] = None, engine_factory: Optional[Callable[[], Any]] = None,
+                 policy: str = LEAST_LOADED, max_batch: int = DEFAULT_MAX_BATCH,
+                 start_timeout: float = DEFAULT_START_TIMEOUT, start_method: str = 'spawn'):
+        """
+        Start the worker processes and wait for their engines.
+
+        Args:
+            processes: Number of engine processes (defaults to the CPU count)
+            engine_factory: Picklable function creating an engine (defaults to create_japanese_engine)
+            policy: 'least_loaded' or 'round_robin' dispatch
+            max_batch: Maximum number of utterances per runAndWait cycle in each process
+            start_timeout: Seconds to wait for each process to initialize its engine
+            start_method: multiprocessing start method; 'spawn' never forks the
+                parent's threads (the collector, other engines) into a worker
+        """
+        if policy not in (ROUND_ROBIN, LEAST_LOADED):
+            raise ValueError(f"Unknown dispatch policy: {policy}")
+
+        self.processes = max(1, processes or os.cpu_count() or 1)
+        self.engine_factory = engine_factory or create_japanese_engine
+        self.policy = policy
+        self.max_batch = max_batch
+        self.start_timeout = start_timeout
+        self.error: Optional[str] = None
+
+        self._context = multiprocessing.get_context(start_method)
+        self._slots = [_WorkerSlot(i) for i in range(self.processes)]
+        self._task_ids = itertools.count()
+        self._round_robin = itertools.cycle(range(self.processes))
+        # Reentrant, because futures resolved by the collector may run callbacks that submit again
+        self._lock = threading.RLock()
+        self._ready = threading.Condition(self._lock)
+        self._starting = set()
+        self._closed = False
+
+        for slot in self._slots:
+            self._start(slot)
+        self._collector = threading.Thread(target=self._collect, name="tts-process-pool", daemon=True)
+        self._collector.start()
+
+        with self._ready:
+            self._ready.wait_for(lambda: not self._starting or self.error is not None, timeout=start_timeout)
+            if self._starting and self.error is None:
+                self.error = f"worker processes did not start within {start_timeout} s"
+        if self.error is not None:
+            logger.error(f"pyttsx3 process pool unavailable: {self.error}")
+            self.close()
+        else:
+            logger.info(f"Started {self.processes} pyttsx3 worker processes ({self.policy})")
+
+    @property
+    def available(self) -> bool:
+        """Whether every engine started and the pool accepts requests."""
+        return self.error is None and not self._closed
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of submitted requests that have not finished yet."""
+        with self._lock:
+            return sum(len(slot.in_flight) for slot in self._slots)
+
+    @property
+    def restarts(self) -> int:
+        """Number of worker processes restarted after a crash."""
+        with self._lock:
+            return sum(slot.restarts for slot in self._slots)
+
+    def worker_loads(self) -> List[int]:
+        """Return the number of unfinished requests of each worker process."""
+        with self._lock:
+            return [len(slot.in_flight) for slot in self._slots]
+
+    def submit(self, text: str, file_path: Union[str, Path]) -> Future:
+        """
+        Queue an utterance on one of the worker processes.
+
+        Args:
+            text: Text to speak
+            file_path: Audio file to write
+
+        Returns:
+            Future resolving to True if the engine wrote a non-empty file
+        """
+        future: Future = Future()
+        with self._lock:
+            if self.error is not None:
+                raise RuntimeError(f"pyttsx3 process pool not available: {self.error}")
+            if self._closed:
+                raise RuntimeError("pyttsx3 process pool is closed")
+            if self.policy == ROUND_ROBIN:
+                slot = self._slots[next(self._round_robin)]
+            else:
+                slot = min(self._slots, key=lambda s: len(s.in_flight))
+            task_id = next(self._task_ids)
+            slot.in_flight[task_id] = future
+            slot.tasks.put((task_id, text, str(file_path)))
+        return future
+
+    def save_to_file(self, text: str, file_path: Union[str, Path], timeout: Optional[float] = None) -> bool:
+        """
+        Save an utterance to file_path and wait for it.
+
+        Args:
+            text: Text to speak
+            file_path: Audio file to write
+            timeout: Seconds to wait for the result (None waits indefinitely)
+
+        Returns:
+            True if the engine wrote a non-empty file
+        """
+        return self.submit(text, file_path).result(timeout)
+
+    def close(self) -> None:
+        """Finish the queued requests and stop the worker processes."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            for slot in self._slots:
+                slot.tasks.put(_STOP)
+
+        for slot in self._slots:
+            slot.process.join()
+        self._collector.join()
+        with self._lock:
+            for slot in self._slots:
+                self._fail_in_flight(slot, "pyttsx3 process pool closed")
+
+    def __enter__(self) -> "TTSProcessPool":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _start(self, slot: _WorkerSlot) -> None:
+        """Start (or restart) the process of a slot with a fresh task queue and result pipe."""
+        # Each process gets its own queue and pipe, so a crash cannot leave a lock
+        # shared with the other processes held
+        slot.tasks = self._context.Queue()
+        slot.results, writer = self._context.Pipe(duplex=False)
+        slot.process = self._context.Process(
+            target=_worker_main,
+            args=(slot.tasks, writer, self.engine_factory, self.max_batch),
+            name=f"tts-process-{slot.worker_id}",
+            daemon=True
+        )
+        slot.process.start()
+        # Only the child keeps the writing end, so the pipe reports EOF once it exits
+        writer.close()
+        self._starting.add(slot.worker_id)
+
+    def _fail_in_flight(self, slot: _WorkerSlot, reason: str) -> None:
+        """Fail every unfinished request of a slot (lock held)."""
+        for future in slot.in_flight.values():
+            if not future.done():
+                future.set_exception(RuntimeError(reason))
+        slot.in_flight.clear()
+
+    def _collect(self) -> None:
+        """Collector thread: resolve futures from results and restart dead processes."""
+        while True:
+            with self._lock:
+                pipes = {slot.results: slot for slot in self._slots if slot.results is not None}
+                if not pipes:
+                    return
+
+            for pipe in wait(list(pipes), timeout=0.2):
+                slot = pipes[pipe]
+                try:
+                    kind, task_id, value = pipe.recv()
+                except (EOFError, OSError):
+                    # Every message the process sent has been read
+                    with self._lock:
+                        self._on_exit(slot)
+                    continue
+                with self._lock:
+                    self._handle(kind, slot, task_id, value)
+
+    def _on_exit(self, slot: _WorkerSlot) -> None:
+        """Handle the exit of a slot's process, restarting it if it crashed (lock held)."""
+        slot.results.close()
+        slot.results = None
+        slot.process.join()
+
+        if self._closed or self.error is not None:
+            self._fail_in_flight(slot, "pyttsx3 process pool closed")
+        elif slot.worker_id in self._starting:
+            # Died before its engine was ready; restarting would fail the same way
+            self._starting.discard(slot.worker_id)
+            self.error = (f"pyttsx3 worker process {slot.worker_id} exited during start-up "
+                          f"(code {slot.process.exitcode})")
+            self._fail_in_flight(slot, self.error)
+            self._ready.notify_all()
+        else:
+            logger.warning(f"pyttsx3 worker process {slot.worker_id} exited "
+                           f"(code {slot.process.exitcode}), restarting")
+            self._fail_in_flight(slot, f"pyttsx3 worker process {slot.worker_id} crashed")
+            slot.restarts += 1
+            self._start(slot)
+
+    def _handle(self, kind: str, slot: _WorkerSlot, task_id: Optional[int], value: Any) -> None:
+        """Apply one message from a worker process (lock held)."""
+        if kind == "ready":
+            self._starting.discard(slot.worker_id)
+            self._ready.notify_all()
+        elif kind == "error":
+            self._starting.discard(slot.worker_id)
+            self.error = value
+            self._ready.notify_all()
+        else:
+            future = slot.in_flight.pop(task_id, None)
+            if future is None or future.done():
+                return
+            if kind == "done":
+                future.set_result(value)
+            else:
+                future.set_exception(RuntimeError(value))
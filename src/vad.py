@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Voice Activity Detection
+------------------------
+This module splits a stream of audio blocks into speech segments at pauses,
+so long recordings can be recognized piece by piece. Frames are classified
+by their energy; a segment ends after a long enough silence, or at the
+quietest frame once it reaches the maximum length. Only the current segment
+is buffered, so memory stays bounded however long the recording is.
+"""
+
+import logging
+from typing import Iterator, List, NamedTuple
+
+import numpy as np
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Analysis frame length
+DEFAULT_FRAME_MS = 30
+# Frames louder than this (dB relative to full scale) count as speech
+DEFAULT_THRESHOLD_DB = -40.0
+# Silence that ends a segment
+DEFAULT_MIN_SILENCE_MS = 300
+# Audio kept before and after the speech of each segment
+DEFAULT_PADDING_MS = 150
+# Segments with less speech than this are dropped as clicks or noise
+DEFAULT_MIN_SPEECH_MS = 90
+# Longest segment handed to a recognizer
+DEFAULT_MAX_SEGMENT_SECONDS = 30.0
+
+
+class SpeechSegment(NamedTuple):
+    """A stretch of speech cut out of a recording."""
+    start: float          # Seconds from the start of the recording
+    end: float            # Seconds from the start of the recording
+    samples: np.ndarray   # Mono float32 samples
+
+
+def frame_energies_db(samples: np.ndarray, frame_length: int) -> np.ndarray:
+    """
+    Compute the energy of consecutive frames in dB relative to full scale.
+
+    Args:
+        samples: Mono samples (a trailing partial frame is ignored)
+        frame_length: Samples per frame
+
+    Returns:
+        One energy value per full frame
+    """
+    frames = samples[:len(samples) // frame_length * frame_length].reshape(-1, frame_length)
+    return 10.0 * np.log10(np.mean(frames.astype(np.float64) ** 2, axis=1) + 1e-12)
+
+
+def iter_speech_segments(blocks: Iterator[np.ndarray], sample_rate: int,
+                         threshold_db: float = DEFAULT_THRESHOLD_DB, frame_ms: int = DEFAULT_FRAME_MS,
+                         min_silence_ms: int = DEFAULT_MIN_SILENCE_MS, padding_ms: int = DEFAULT_PADDING_MS,
+                         min_speech_ms: int = DEFAULT_MIN_SPEECH_MS,
+                         max_segment_seconds: float = DEFAULT_MAX_SEGMENT_SECONDS) -> Iterator[SpeechSegment]:
+    """
+    Split a stream of mono sample blocks into speech segments.
+
+    Args:
+        blocks: Mono float32 sample blocks of any length
+        sample_rate: Sample rate of the blocks
+        threshold_db: Frame energy above which a frame is speech
+        frame_ms: Frame length in milliseconds
+        min_silence_ms: Silence that ends a segment
+        padding_ms: Audio kept around the speech of each segment
+        min_speech_ms: Minimum speech in a segment
+        max_segment_seconds: Segments are cut at their quietest frame beyond this length
+
+    Yields:
+        Speech segments in order
+    """
+    frame_length = max(1, sample_rate * frame_ms // 1000)
+    min_silence = max(1, round(min_silence_ms / frame_ms))
+    padding = round(padding_ms / frame_ms)
+    min_speech = max(1, round(min_speech_ms / frame_ms))
+    max_frames = max(2, int(max_segment_seconds * 1000 / frame_ms))
+
+    # Frames from index base onwards are buffered, with their energies
+    buffer = np.zeros(0, dtype=np.float32)
+    energies = np.zeros(0)
+    base = 0
+    emitted_until = 0
+    start = None
+    last_voiced = 0
+    total_samples = 0
+
+    def cut(first: int, last: int, pad_after: int) -> List[SpeechSegment]:
+        """Cut frames first..last (plus padding) out of the buffer."""
+        nonlocal emitted_until
+        voiced = np.count_nonzero(energies[first - base:last + 1 - base] > threshold_db)
+        begin = max(first - padding, emitted_until, base)
+        end = min(last + 1 + pad_after, base + len(energies))
+        emitted_until = end
+        if voiced < min_speech:
+            return []
+        samples = buffer[(begin - base) * frame_length:(end - base) * frame_length]
+        end_sample = min(end * frame_length, total_samples)
+        return [SpeechSegment(begin * frame_length / sample_rate, end_sample / sample_rate,
+                              samples[:end_sample - begin * frame_length])]
+
+    def process(new_samples: np.ndarray) -> Iterator[SpeechSegment]:
+        nonlocal buffer, energies, base, start, last_voiced
+        first_new = base + len(energies)
+        buffer = np.concatenate((buffer, new_samples))
+        energies = np.concatenate((energies, frame_energies_db(new_samples, frame_length)))
+
+        for index in range(first_new, base + len(energies)):
+            if energies[index - base] > threshold_db:
+                if start is None:
+                    start = index
+                last_voiced = index
+            elif start is not None and index - last_voiced >= min_silence:
+                yield from cut(start, last_voiced, padding)
+                start = None
+
+            if start is not None and index - start + 1 >= max_frames:
+                # Too long without a pause: cut at the quietest frame of the second half
+                window = energies[start + max_frames // 2 - base:index + 1 - base]
+                split = start + max_frames // 2 + int(np.argmin(window))
+                yield from cut(start, split, 0)
+                start = split + 1 if split < index else None
+                last_voiced = max(last_voiced, split + 1)
+
+        # Keep only what the current or next segment can still use
+        keep_from = max(emitted_until, (start if start is not None else base + len(energies)) - padding, base)
+        buffer = buffer[(keep_from - base) * frame_length:]
+        energies = energies[keep_from - base:]
+        base = keep_from
+
+    tail = np.zeros(0, dtype=np.float32)
+    for block in blocks:
+        total_samples += len(block)
+        tail = np.concatenate((tail, block.astype(np.float32, copy=False)))
+        full = len(tail) // frame_length * frame_length
+        if full:
+            yield from process(tail[:full])
+            tail = tail[full:]
+
+    # The last partial frame is zero-padded; segment ends are clipped to the real length
+    if len(tail):
+        yield from process(np.concatenate((tail, np.zeros(frame_length - len(tail), dtype=np.float32))))
+    if start is not None:
+        yield from cut(start, last_voiced, padding)
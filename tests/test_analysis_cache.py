@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the analysis result cache.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import soundfile as sf
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.analysis_cache import AnalysisCache, file_fingerprint
+
+RESULT = {"duration": 1.0, "tempo": 120.0, "frames": 44, "sample_rate": 22050}
+
+
+class TestAnalysisCache(unittest.TestCase):
+    """Test cases for AnalysisCache."""
+
+    def setUp(self):
+        """Set up a cache and an audio file."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.audio = self.temp_dir / 'clip.wav'
+        sf.write(str(self.audio), np.zeros(22050), 22050)
+        self.cache = AnalysisCache(self.temp_dir / 'cache' / 'analysis.sqlite')
+
+    def tearDown(self):
+        """Clean up after the tests."""
+        self.cache.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_hit_and_params(self):
+        """Results are served for the same file and parameters only."""
+        self.assertIsNone(self.cache.get(self.audio))
+        self.cache.put(self.audio, RESULT, {"sample_rate": None})
+        self.assertEqual(self.cache.get(self.audio, {"sample_rate": None}), RESULT)
+        self.assertIsNone(self.cache.get(self.audio, {"sample_rate": 16000}))
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["misses"], 2)
+
+    def test_changed_content_is_a_miss(self):
+        """A rewrite is detected even when size and modification time are restored."""
+        self.cache.put(self.audio, RESULT)
+        stat = self.audio.stat()
+        sf.write(str(self.audio), np.full(22050, 0.5), 22050)
+        os.utime(self.audio, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(self.audio.stat().st_size, stat.st_size)
+        self.assertIsNone(self.cache.get(self.audio))
+
+        # A plain touch changes the modification time
+        self.cache.put(self.audio, RESULT)
+        os.utime(self.audio, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertIsNone(self.cache.get(self.audio))
+
+    def test_stale_fingerprint_is_not_served(self):
+        """A result stored with the fingerprint taken before a modification does not match."""
+        fingerprint = file_fingerprint(self.audio)
+        sf.write(str(self.audio), np.zeros(44100), 22050)
+        self.cache.put(self.audio, RESULT, fingerprint=fingerprint)
+        self.assertIsNone(self.cache.get(self.audio))
+
+    def test_persistence_and_feature_version(self):
+        """Entries survive restarts but not a feature version change."""
+        self.cache.put(self.audio, RESULT)
+        reopened = AnalysisCache(self.cache.db_path)
+        self.assertEqual(reopened.get(self.audio), RESULT)
+        reopened.close()
+
+        upgraded = AnalysisCache(self.cache.db_path, feature_version=self.cache.feature_version + 1)
+        self.assertIsNone(upgraded.get(self.audio))
+        self.assertEqual(upgraded.prune(), 1)
+        upgraded.close()
+
+    def test_prune_removed_files(self):
+        """Entries of deleted files are pruned."""
+        self.cache.put(self.audio, RESULT)
+        os.remove(self.audio)
+        self.assertEqual(self.cache.prune(), 1)
+        self.assertEqual(self.cache.stats()["entries"], 0)
+
+    def test_processor_uses_cache(self):
+        """analyze_audio analyzes an unchanged file only once."""
+        from src.speech_processor import JapaneseSpeechProcessor
+        processor = JapaneseSpeechProcessor(str(self.temp_dir), analysis_cache=str(self.cache.db_path))
+        with patch('src.speech_processor.analyze_file', return_value=RESULT) as analyze:
+            self.assertEqual(processor.analyze_audio('clip.wav'), RESULT)
+            self.assertEqual(processor.analyze_audio('clip.wav'), RESULT)
+            self.assertEqual(analyze.call_count, 1)
+            processor.analyze_audio('clip.wav', sample_rate=16000)
+            self.assertEqual(analyze.call_count, 2)
+        processor.analysis_cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
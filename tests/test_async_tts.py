@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the asyncio speech API.
+"""
+
+import sys
+import base64
+import asyncio
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.async_tts import AsyncSpeechMixin
+from src.google_tts import AsyncSession, AIOHTTP_AVAILABLE, decode_response
+from src import speech_processor_gtts, speech_processor_multi, tts_engines
+from src.speech_processor_gtts import JapaneseSpeechProcessor
+from src.speech_processor_light import JapaneseSpeechProcessorLight
+from src.speech_processor_multi import JapaneseSpeechProcessorMulti
+
+
+class _SlowProcessor(AsyncSpeechMixin):
+    """Processor whose async jobs sleep and record how many run at once."""
+
+    async_concurrency = 3
+
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+        self.finished = []
+
+    async def _atext_to_speech(self, text, output_file):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(0.01 if text != "slow" else 10)
+            self.finished.append(output_file)
+            return output_file
+        finally:
+            self.running -= 1
+
+
+class TestAsyncSpeech(unittest.IsolatedAsyncioTestCase):
+    """Test cases for AsyncSpeechMixin and the processors using it."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        """Clean up after the tests."""
+        shutil.rmtree(self.temp_dir)
+
+    async def test_batch_respects_concurrency_limit(self):
+        """No more than async_concurrency jobs run at the same time."""
+        processor = _SlowProcessor()
+        requests = [("テスト", f"out_{i}.mp3") for i in range(10)]
+
+        results = await processor.abatch_text_to_speech(requests)
+
+        self.assertEqual(results, [output for _, output in requests])
+        self.assertEqual(processor.peak, 3)
+
+    async def test_batch_cancellation(self):
+        """Cancelling a batch cancels all unfinished jobs."""
+        processor = _SlowProcessor()
+        requests = [("slow", f"slow_{i}.mp3") for i in range(5)]
+
+        batch = asyncio.ensure_future(processor.abatch_text_to_speech(requests))
+        await asyncio.sleep(0.05)
+        batch.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await batch
+
+        self.assertEqual(processor.running, 0)
+        self.assertEqual(processor.finished, [])
+
+    async def test_executor_fallback(self):
+        """Processors without a native async backend run in an executor."""
+        processor = JapaneseSpeechProcessorLight(str(self.temp_dir))
+        await processor.abatch_text_to_speech([("こんにちは", "a.wav"), ("さようなら", "b.wav")])
+
+        self.assertTrue((self.temp_dir / "a.txt").read_text(encoding='utf-8').startswith("こんにちは"))
+        self.assertTrue((self.temp_dir / "b.txt").read_text(encoding='utf-8').startswith("さようなら"))
+
+    async def test_gtts_processor_uses_async_backend(self):
+        """The gTTS processor fetches audio through the non-blocking client."""
+        async def fake_asynthesize(text, lang, slow, session, limiter=None):
+            await asyncio.sleep(0)
+            return text.encode('utf-8')
+
+        processor = JapaneseSpeechProcessor(str(self.temp_dir))
+        with patch.object(tts_engines, 'GTTS_AVAILABLE', True), \
+                patch.object(speech_processor_gtts, 'AIOHTTP_AVAILABLE', True), \
+                patch.object(speech_processor_gtts, 'asynthesize', side_effect=fake_asynthesize):
+            await processor.atext_to_speech("非同期です。", "async.mp3")
+            await processor.aclose()
+
+        self.assertEqual((self.temp_dir / "async.mp3").read_bytes(), "非同期です。".encode('utf-8'))
+
+    async def test_gtts_processor_coalesces_duplicates(self):
+        """Concurrent async requests for one text make a single synthesis call."""
+        calls = []
+
+        async def fake_asynthesize(text, lang, slow, session, limiter=None):
+            calls.append(text)
+            await asyncio.sleep(0.05)
+            return text.encode('utf-8')
+
+        processor = JapaneseSpeechProcessor(str(self.temp_dir))
+        with patch.object(tts_engines, 'GTTS_AVAILABLE', True), \
+                patch.object(speech_processor_gtts, 'AIOHTTP_AVAILABLE', True), \
+                patch.object(speech_processor_gtts, 'asynthesize', side_effect=fake_asynthesize):
+            await processor.abatch_text_to_speech([("同じ文です。", f"same_{i}.mp3") for i in range(4)])
+            await processor.aclose()
+
+        self.assertEqual(calls, ["同じ文です。"])
+        self.assertEqual(processor.coalescer.coalesced, 3)
+        self.assertEqual((self.temp_dir / "same_3.mp3").read_bytes(), "同じ文です。".encode('utf-8'))
+
+    async def test_multi_processor_reuses_session(self):
+        """The multi-engine processor sends every async request over one session and closes it."""
+        sessions = []
+
+        async def fake_asynthesize(text, lang, slow, session=None, limiter=None):
+            sessions.append(session)
+            return text.encode('utf-8')
+
+        with patch.object(tts_engines, 'GTTS_AVAILABLE', True):
+            processor = JapaneseSpeechProcessorMulti(str(self.temp_dir), engine='gtts')
+        with patch.object(speech_processor_multi, 'asynthesize', side_effect=fake_asynthesize):
+            await processor.abatch_text_to_speech([("一つ目", "a.mp3"), ("二つ目", "b.mp3")])
+            await processor.aclose()
+
+        self.assertEqual(len(sessions), 2)
+        self.assertIsNotNone(sessions[0])
+        self.assertIs(sessions[0], sessions[1])
+        self.assertTrue(sessions[0].closed)
+
+    @unittest.skipUnless(AIOHTTP_AVAILABLE, "aiohttp not installed")
+    async def test_async_session_is_reused_until_closed(self):
+        """The shared session helper hands out one session per loop and reopens it after close."""
+        holder = AsyncSession()
+        session = holder.get()
+        self.assertIs(holder.get(), session)
+
+        await holder.close()
+        self.assertTrue(session.closed)
+        reopened = holder.get()
+        self.assertIsNot(reopened, session)
+        await holder.close()
+
+    def test_decode_response(self):
+        """Audio is extracted from a batchexecute response."""
+        audio = base64.b64encode(b"mp3 frames").decode('ascii')
+        body = f')]}}\'\n\n123\n[["wrb.fr","jQ1olc","[\\"{audio}\\"]",null,null,null,"generic"]]\n'
+        self.assertEqual(decode_response(body), b"mp3 frames")
+        with self.assertRaises(ValueError):
+            decode_response("no audio here")
+
+
+if __name__ == "__main__":
+    unittest.main()
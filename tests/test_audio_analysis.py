@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for streaming audio analysis.
+"""
+
+import sys
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.audio_analysis import analyze_file, iter_frames, mel_filterbank, RunningStats
+
+SR = 22050
+
+
+def click_track(seconds: float, bpm: float, sr: int = SR) -> np.ndarray:
+    """Noise bursts on every beat over a quiet tone."""
+    t = np.arange(int(seconds * sr)) / sr
+    rng = np.random.default_rng(0)
+    beats = (t % (60.0 / bpm)) < 0.03
+    return (0.1 * np.sin(2 * np.pi * 440 * t) + beats * rng.normal(0, 0.5, len(t))).astype(np.float32)
+
+
+class TestAudioAnalysis(unittest.TestCase):
+    """Test cases for analyze_file."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        """Clean up after the tests."""
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, name: str, y: np.ndarray, sr: int = SR) -> Path:
+        path = self.temp_dir / name
+        sf.write(str(path), y, sr)
+        return path
+
+    def test_sine_features(self):
+        """A pure tone has its frequency as centroid and two crossings per period."""
+        t = np.arange(3 * SR) / SR
+        path = self._write("sine.wav", 0.5 * np.sin(2 * np.pi * 1000 * t))
+        result = analyze_file(path)
+        self.assertAlmostEqual(result["duration"], 3.0)
+        self.assertEqual(result["sample_rate"], SR)
+        self.assertAlmostEqual(result["mean_spectral_centroid"], 1000, delta=50)
+        self.assertAlmostEqual(result["mean_spectral_rolloff"], 1000, delta=50)
+        self.assertAlmostEqual(result["mean_zero_crossing_rate"], 2000 / SR, delta=0.005)
+
+    def test_tempo(self):
+        """The tempo of a click track is found."""
+        result = analyze_file(self._write("clicks.wav", click_track(30, 120)))
+        self.assertAlmostEqual(result["tempo"], 120, delta=6)
+
+    def test_block_size_does_not_change_results(self):
+        """Results are the same however the file is split into blocks."""
+        path = self._write("clicks.wav", click_track(10, 100))
+        small = analyze_file(path, block_frames=7)
+        large = analyze_file(path, block_frames=1024)
+        self.assertEqual(small["frames"], large["frames"])
+        for key in ("mean_spectral_centroid", "mean_spectral_rolloff", "mean_zero_crossing_rate", "tempo"):
+            self.assertAlmostEqual(small[key], large[key], places=2)
+
+    def test_stereo_and_resampling(self):
+        """Stereo files are mixed down; resampling happens only when asked."""
+        y = click_track(4, 120)
+        path = self._write("stereo.wav", np.stack([y, y], axis=1), sr=44100)
+        self.assertEqual(analyze_file(path)["sample_rate"], 44100)
+        resampled = analyze_file(path, sr=SR)
+        self.assertEqual(resampled["sample_rate"], SR)
+        self.assertAlmostEqual(resampled["duration"], len(y) / 44100, delta=0.01)
+
+
+class TestBuildingBlocks(unittest.TestCase):
+    """Test cases for the framing and statistics helpers."""
+
+    def test_frames_match_whole_signal(self):
+        """Framing a stream of blocks gives the frames of the whole signal."""
+        y = np.arange(10000, dtype=np.float32)
+        blocks = (y[i:i + 777] for i in range(0, len(y), 777))
+        frames = np.concatenate(list(iter_frames(blocks, 256, 64, block_frames=10)))
+        expected = np.lib.stride_tricks.sliding_window_view(y, 256)[::64]
+        np.testing.assert_array_equal(frames[:len(expected)], expected)
+        # The tail is covered by one zero-padded frame
+        self.assertEqual(len(frames), len(expected) + 1)
+
+    def test_running_stats(self):
+        """Batched updates match NumPy over all values."""
+        values = np.random.default_rng(1).normal(5, 2, 1000)
+        stats = RunningStats()
+        for batch in np.array_split(values, 7):
+            stats.update(batch)
+        self.assertAlmostEqual(stats.mean, values.mean())
+        self.assertAlmostEqual(stats.std, values.std())
+        self.assertEqual((stats.min, stats.max), (values.min(), values.max()))
+
+    def test_mel_filterbank_matches_librosa(self):
+        """The mel filterbank equals librosa's Slaney filterbank."""
+        try:
+            import librosa
+        except ImportError:
+            self.skipTest("librosa not installed")
+        np.testing.assert_allclose(mel_filterbank(SR, 2048), librosa.filters.mel(sr=SR, n_fft=2048),
+                                   rtol=1e-4, atol=1e-7)
+
+
+if __name__ == "__main__":
+    unittest.main()
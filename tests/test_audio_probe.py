@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the audio header probe.
+"""
+
+import sys
+import shutil
+import struct
+import tempfile
+import unittest
+import warnings
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.audio_probe import probe_audio, is_placeholder
+
+# MPEG-1 Layer III, 128 kbit/s, 44.1 kHz, joint stereo: 417-byte frames of 1152 samples
+MP3_HEADER = b"\xff\xfb\x90\x44"
+MP3_FRAME = MP3_HEADER + b"\x00" * 413
+
+
+def id3v2_tag(payload_size: int) -> bytes:
+    """An ID3v2.3 tag header followed by payload_size bytes (size is syncsafe)."""
+    size = bytes((payload_size >> shift) & 0x7F for shift in (21, 14, 7, 0))
+    return b"ID3\x03\x00\x00" + size + b"\x00" * payload_size
+
+
+class TestAudioProbe(unittest.TestCase):
+    """Test cases for probe_audio."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        """Clean up after the tests."""
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, name: str, data: bytes) -> Path:
+        path = self.temp_dir / name
+        path.write_bytes(data)
+        return path
+
+    def test_wav_matches_soundfile(self):
+        """WAV properties match what soundfile decodes."""
+        for subtype, width in (('PCM_16', 2), ('PCM_24', 3), ('FLOAT', 4)):
+            path = self.temp_dir / f"{subtype}.wav"
+            sf.write(str(path), np.zeros((22050, 2)), 22050, subtype=subtype)
+            info = probe_audio(path)
+            self.assertEqual((info.format, info.sample_rate, info.channels), ('wav', 22050, 2))
+            self.assertEqual((info.n_frames, info.sample_width), (22050, width))
+            self.assertAlmostEqual(info.duration, 1.0)
+
+    def test_wav_chunks_and_streaming_size(self):
+        """Chunks before the data are skipped and an unfinished data size uses the file size."""
+        fmt = struct.pack("<HHIIHH", 1, 1, 16000, 32000, 2, 16)
+        data = b"\x00" * 32000
+        body = (b"WAVE" + b"LIST" + struct.pack("<I", 3) + b"abc\x00"
+                + b"fmt " + struct.pack("<I", 16) + fmt
+                + b"data" + struct.pack("<I", 0xFFFFFFFF) + data)
+        path = self._write("streamed.wav", b"RIFF" + struct.pack("<I", 0xFFFFFFFF) + body)
+        info = probe_audio(path)
+        self.assertEqual((info.sample_rate, info.n_frames, info.bitrate), (16000, 16000, 256000))
+        self.assertAlmostEqual(info.duration, 1.0)
+
+    def test_cbr_mp3_with_tags(self):
+        """Constant bitrate duration comes from the audio size, excluding ID3 tags."""
+        id3v1 = b"TAG" + b"\x00" * 125
+        path = self._write("cbr.mp3", id3v2_tag(1000) + MP3_FRAME * 100 + id3v1)
+        info = probe_audio(path)
+        self.assertEqual((info.format, info.sample_rate, info.channels, info.bitrate), ('mp3', 44100, 2, 128000))
+        self.assertFalse(info.vbr)
+        self.assertAlmostEqual(info.duration, 100 * 417 * 8 / 128000)
+
+    def test_vbri_mp3(self):
+        """A VBRI tag gives the frame count."""
+        vbri = b"VBRI" + struct.pack(">HHHII", 1, 576, 75, 300 * 417, 300)
+        first = MP3_HEADER + b"\x00" * 32 + vbri
+        path = self._write("vbri.mp3", first + b"\x00" * (417 - len(first)) + MP3_FRAME * 10)
+        info = probe_audio(path)
+        self.assertTrue(info.vbr)
+        self.assertEqual(info.n_frames, 300 * 1152)
+        self.assertAlmostEqual(info.duration, 300 * 1152 / 44100)
+
+    def test_encoded_mp3_duration(self):
+        """Files from a real encoder (Xing/LAME tag) report their exact length."""
+        if 'MP3' not in sf.available_formats():
+            self.skipTest("libsndfile without MP3 support")
+        for sr, channels in ((24000, 1), (44100, 2)):
+            path = self.temp_dir / f"encoded_{sr}.mp3"
+            sf.write(str(path), np.zeros((sr * 2, channels)), sr, format='MP3')
+            info = probe_audio(path)
+            self.assertEqual((info.sample_rate, info.channels), (sr, channels))
+            self.assertAlmostEqual(info.duration, 2.0, delta=0.03)
+
+    def test_placeholder_and_garbage(self):
+        """Placeholders are recognized; other data is rejected."""
+        placeholder = self._write("p.mp3", "PLACEHOLDER AUDIO FILE\nこんにちは".encode('utf-8'))
+        self.assertTrue(is_placeholder(placeholder))
+        self.assertEqual(probe_audio(placeholder).format, 'placeholder')
+        self.assertFalse(is_placeholder(self._write("big.mp3", b"PLACEHOLDER" + b"\x00" * 2000)))
+
+        with self.assertRaises(ValueError):
+            probe_audio(self._write("noise.mp3", bytes(range(256)) * 20))
+
+    def test_processor_closes_files(self):
+        """The processors' analyze_audio reports header data without leaking file handles."""
+        from src.speech_processor_multi import JapaneseSpeechProcessorMulti
+        path = self._write("cbr.mp3", MP3_FRAME * 50)
+        processor = JapaneseSpeechProcessorMulti(data_dir=str(self.temp_dir))
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", ResourceWarning)
+            result = processor.analyze_audio(str(path))
+            placeholder = processor.analyze_audio(str(self._write("p.wav", b"PLACEHOLDER")))
+        self.assertAlmostEqual(result["duration_seconds"], 50 * 417 * 8 / 128000)
+        self.assertEqual(result["frame_rate_hz"], 44100)
+        self.assertTrue(placeholder["is_placeholder"])
+
+
+if __name__ == "__main__":
+    unittest.main()
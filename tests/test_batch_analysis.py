@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for batch audio analysis.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import soundfile as sf
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.audio_analysis import FEATURE_VERSION
+from src.batch_analysis import analyze_directory, load_results, load_array, RESULTS_NAME
+
+SR = 16000
+
+
+class TestBatchAnalysis(unittest.TestCase):
+    """Test cases for analyze_directory."""
+
+    def setUp(self):
+        """Create a small tree of clips."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.clips = self.temp_dir / 'clips'
+        for name, freq in (('a.wav', 300), ('b.wav', 600), ('sub/c.wav', 900)):
+            self._write(name, freq)
+
+    def tearDown(self):
+        """Clean up after the tests."""
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, name: str, freq: float, seconds: float = 0.5) -> Path:
+        path = self.clips / name
+        os.makedirs(path.parent, exist_ok=True)
+        t = np.arange(int(seconds * SR)) / SR
+        sf.write(str(path), 0.5 * np.sin(2 * np.pi * freq * t), SR)
+        return path
+
+    def test_results_table(self):
+        """Every clip gets one row with its features."""
+        summary = analyze_directory(self.clips, workers=1)
+        self.assertEqual(summary, {"analyzed": 3, "failed": 0, "skipped": 0})
+
+        table = load_array(self.clips / RESULTS_NAME)
+        self.assertEqual(len(table), 3)
+        self.assertTrue(np.all(table['status'] == 'ok'))
+        self.assertTrue(np.allclose(table['duration'], 0.5))
+        # Rows are sorted by path: a (300 Hz) < b (600 Hz) < sub/c (900 Hz)
+        self.assertTrue(np.all(np.diff(table['mean_spectral_centroid']) > 0))
+
+    def test_incremental_run(self):
+        """Only new or changed files are analyzed again; removed files are dropped."""
+        results_path = self.temp_dir / 'results.csv'
+        analyze_directory(self.clips, results_path, workers=1)
+        self.assertEqual(analyze_directory(self.clips, results_path, workers=1),
+                         {"analyzed": 0, "failed": 0, "skipped": 3})
+
+        self._write('a.wav', 300, seconds=1.0)
+        self._write('d.wav', 1200)
+        os.remove(self.clips / 'sub' / 'c.wav')
+        summary = analyze_directory(self.clips, results_path, workers=1)
+        self.assertEqual(summary, {"analyzed": 2, "failed": 0, "skipped": 1})
+
+        rows = load_results(results_path)
+        self.assertEqual(sorted(Path(path).name for path in rows), ['a.wav', 'b.wav', 'd.wav'])
+        self.assertAlmostEqual(float(rows[str((self.clips / 'a.wav').resolve())]['duration']), 1.0)
+
+    def test_feature_version_change(self):
+        """Results of another feature version are recomputed."""
+        analyze_directory(self.clips, workers=1)
+        with patch('src.batch_analysis.FEATURE_VERSION', FEATURE_VERSION + 1):
+            self.assertEqual(analyze_directory(self.clips, workers=1)["analyzed"], 3)
+            table = load_array(self.clips / RESULTS_NAME)
+        self.assertTrue(np.all(table['feature_version'] == FEATURE_VERSION + 1))
+
+    def test_failures_are_recorded_and_retried(self):
+        """Unreadable files are recorded as errors and tried again next run."""
+        (self.clips / 'broken.wav').write_bytes(b"not audio")
+        summary = analyze_directory(self.clips, workers=1)
+        self.assertEqual(summary["failed"], 1)
+        self.assertEqual(analyze_directory(self.clips, workers=1)["failed"], 1)
+
+        table = load_array(self.clips / RESULTS_NAME)
+        broken = table[table['status'] == 'error']
+        self.assertEqual(len(broken), 1)
+        self.assertTrue(np.isnan(broken['duration'][0]))
+
+    def test_process_pool(self):
+        """Worker processes produce the same table as a single process."""
+        analyze_directory(self.clips, self.temp_dir / 'serial.csv', workers=1)
+        analyze_directory(self.clips, self.temp_dir / 'parallel.csv', workers=2)
+        serial = load_array(self.temp_dir / 'serial.csv')
+        parallel = load_array(self.temp_dir / 'parallel.csv')
+        self.assertEqual(list(serial['path']), list(parallel['path']))
+        np.testing.assert_allclose(serial['mean_spectral_centroid'], parallel['mean_spectral_centroid'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for batch text-to-speech with a resumable manifest.
+"""
+
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.batch_tts import run_batch, collect_inputs
+from src import tts_engines
+from src.speech_processor_gtts import JapaneseSpeechProcessor
+
+
+class TestBatchTextToSpeech(unittest.TestCase):
+    """Test cases for run_batch."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.input_dir = self.temp_dir / 'input'
+        self.output_dir = self.temp_dir / 'output'
+        (self.input_dir / 'chapter').mkdir(parents=True)
+
+        (self.input_dir / 'intro.txt').write_text("はじめに。", encoding='utf-8')
+        (self.input_dir / 'chapter' / 'one.md').write_text("# 第1章\n本文です。", encoding='utf-8')
+        (self.input_dir / 'image.png').write_bytes(b"not text")
+
+        self.processor = JapaneseSpeechProcessor(str(self.temp_dir))
+        self.synthesized = []
+
+    def tearDown(self):
+        """Clean up after the tests."""
+        shutil.rmtree(self.temp_dir)
+
+    def _engine(self, text):
+        self.synthesized.append(text)
+        if "失敗" in text:
+            raise RuntimeError("engine failure")
+        return text.encode('utf-8')
+
+    def _run(self):
+        with patch.object(tts_engines, 'GTTS_AVAILABLE', True), \
+                patch.object(self.processor, '_synthesize_bytes', side_effect=self._engine):
+            return run_batch(self.processor, str(self.input_dir), self.output_dir, workers=2)
+
+    def _manifest(self):
+        with open(self.output_dir / 'manifest.jsonl', encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+
+    def test_collect_inputs(self):
+        """Only text and markdown files are collected, recursively."""
+        names = [p.name for p in collect_inputs(str(self.input_dir))]
+        self.assertEqual(names, ['one.md', 'intro.txt'])
+        glob_names = [p.name for p in collect_inputs(str(self.input_dir / '**' / '*.md'))]
+        self.assertEqual(glob_names, ['one.md'])
+
+    def test_batch_writes_outputs_and_manifest(self):
+        """Every input is synthesized into the mirrored output tree."""
+        summary = self._run()
+
+        self.assertEqual(summary, {"done": 2, "failed": 0, "skipped": 0})
+        self.assertTrue((self.output_dir / 'intro.mp3').exists())
+        self.assertTrue((self.output_dir / 'chapter' / 'one.mp3').exists())
+
+        entries = self._manifest()
+        self.assertEqual(len(entries), 2)
+        for entry in entries:
+            self.assertEqual(entry["status"], "done")
+            self.assertEqual(len(entry["input_hash"]), 64)
+            self.assertIn("duration", entry)
+
+    def test_markdown_is_cleaned(self):
+        """Markdown inputs, whatever the case of their suffix, are synthesized without their syntax."""
+        (self.input_dir / 'chapter' / 'two.MD').write_text(
+            "# 第1章\n\n**本文**です。[リンク](https://example.com)\n\n- 項目\n", encoding='utf-8')
+        self._run()
+
+        spoken = next(text for text in self.synthesized if "リンク" in text)
+        self.assertEqual(spoken, "第1章.\n本文です。リンク\n項目.")
+        self.assertIn("はじめに。", self.synthesized)
+
+    def test_resume_skips_completed_items(self):
+        """A second run only redoes changed or failed inputs."""
+        (self.input_dir / 'broken.txt').write_text("失敗する文。", encoding='utf-8')
+        first = self._run()
+        self.assertEqual(first, {"done": 2, "failed": 1, "skipped": 0})
+
+        (self.input_dir / 'intro.txt').write_text("はじめに（改訂版）。", encoding='utf-8')
+        self.synthesized.clear()
+        second = self._run()
+
+        self.assertEqual(second, {"done": 1, "failed": 1, "skipped": 1})
+        self.assertEqual(sorted(self.synthesized), sorted(["はじめに（改訂版）。", "失敗する文。"]))
+
+    def test_output_dir_inside_source_is_skipped(self):
+        """Reference .txt files written next to the outputs are not picked up as new inputs."""
+        self.output_dir = self.input_dir / 'audio'
+        self.assertEqual(self._run(), {"done": 2, "failed": 0, "skipped": 0})
+        self.assertTrue(list(self.output_dir.rglob('*.txt')))
+        self.assertEqual(self._run(), {"done": 0, "failed": 0, "skipped": 2})
+
+    def test_colliding_outputs_are_rejected(self):
+        """Inputs that would share an output file stop the batch before anything is synthesized."""
+        (self.input_dir / 'intro.md').write_text("# はじめに", encoding='utf-8')
+        with self.assertRaises(ValueError):
+            self._run()
+        self.assertEqual(self.synthesized, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for parallel corpus conversion.
+"""
+
+import sys
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src import japanese_phonetics
+from src.corpus_conversion import convert_corpus, collect_text_files
+
+
+@unittest.skipUnless(japanese_phonetics.KAKASI_AVAILABLE, "pykakasi not installed")
+class TestCorpusConversion(unittest.TestCase):
+    """Test cases for convert_corpus."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.lines = ["日本語", "", "音声", "日本語の音声"] * 5
+        self.input_file = self.temp_dir / 'corpus.txt'
+        self.input_file.write_text("\n".join(self.lines) + "\n", encoding='utf-8')
+
+    def tearDown(self):
+        """Clean up after the tests."""
+        shutil.rmtree(self.temp_dir)
+
+    def _expected(self):
+        converter = japanese_phonetics.JapanesePhoneticConverter()
+        return "".join(converter.to_katakana(line) + "\n" for line in self.lines)
+
+    def test_parallel_output_matches_serial(self):
+        """Shards converted by several processes are written in input order."""
+        outputs = convert_corpus([self.input_file], 'katakana', workers=2,
+                                 output_dir=self.temp_dir / 'out', lines_per_shard=3)
+
+        self.assertEqual(outputs, [self.temp_dir / 'out' / 'corpus.katakana.txt'])
+        self.assertEqual(outputs[0].read_text(encoding='utf-8'), self._expected())
+
+    def test_in_process_conversion(self):
+        """workers=1 converts without a pool, next to the input file."""
+        outputs = convert_corpus([self.input_file], 'katakana', workers=1)
+
+        self.assertEqual(outputs[0].read_text(encoding='utf-8'), self._expected())
+        # Converted files are not picked up as inputs again
+        self.assertEqual(collect_text_files(self.temp_dir), [self.input_file])
+
+    def test_many_small_files_mirror_the_tree(self):
+        """Small files share one pool window and same-named files in subdirectories do not collide."""
+        inputs = []
+        for name in ('a', 'b'):
+            (self.temp_dir / 'src' / name).mkdir(parents=True)
+            for i in range(3):
+                path = self.temp_dir / 'src' / name / f"part{i}.txt"
+                path.write_text("日本語\n" * (i + 1), encoding='utf-8')
+                inputs.append(path)
+        # An empty file still gets an (empty) output
+        empty = self.temp_dir / 'src' / 'a' / 'empty.txt'
+        empty.write_text("", encoding='utf-8')
+        inputs.append(empty)
+
+        outputs = convert_corpus(inputs, 'katakana', workers=2, output_dir=self.temp_dir / 'out',
+                                 source_root=self.temp_dir / 'src')
+
+        self.assertEqual(outputs[0], self.temp_dir / 'out' / 'a' / 'part0.katakana.txt')
+        self.assertEqual(outputs[3], self.temp_dir / 'out' / 'b' / 'part0.katakana.txt')
+        for i, output in enumerate(outputs[:6]):
+            self.assertEqual(output.read_text(encoding='utf-8'), "ニホンゴ\n" * (i % 3 + 1))
+        self.assertEqual(outputs[6].read_text(encoding='utf-8'), "")
+
+    def test_unknown_target(self):
+        """An unsupported target is rejected up front."""
+        with self.assertRaises(ValueError):
+            convert_corpus([self.input_file], 'cyrillic')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for engine health tracking and routing.
+"""
+
+import sys
+import time
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.engine_health import CircuitBreaker, EngineRouter, CLOSED, OPEN, HALF_OPEN
+from src.speech_processor_multi import JapaneseSpeechProcessorMulti
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeEngine:
+    """Local engine with injectable delay and failures, recording its calls."""
+
+    def __init__(self, name, delay=0.0, fail=False):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    def __call__(self, text, file_path):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            return False, f"{self.name} failed"
+        Path(file_path).write_text(self.name, encoding='utf-8')
+        return True, f"{self.name} ok"
+
+    def stream(self, text, max_workers):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError(f"{self.name} failed")
+        yield self.name.encode('utf-8')
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test cases for CircuitBreaker."""
+
+    def setUp(self):
+        """Set up a breaker with a fake clock."""
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker('gtts', min_calls=3, open_seconds=10, clock=self.clock)
+
+    def test_opens_after_failures(self):
+        """The breaker opens once the failure rate reaches the threshold."""
+        self.breaker.record(True, 0.1)
+        self.breaker.record(False, 5.0)
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.breaker.record(False, 5.0)
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertFalse(self.breaker.allow())
+
+    def test_half_open_probe(self):
+        """After open_seconds exactly one probe is allowed; success closes the breaker."""
+        for _ in range(3):
+            self.breaker.record(False, 1.0)
+        self.clock.now = 10.0
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.assertFalse(self.breaker.allow())
+
+        self.breaker.record(True, 0.2)
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.success_rate, 1.0)
+
+    def test_failed_probe_reopens(self):
+        """A failed probe opens the breaker for another open_seconds."""
+        for _ in range(3):
+            self.breaker.record(False, 1.0)
+        self.clock.now = 10.0
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record(False, 1.0)
+        self.assertEqual(self.breaker.state, OPEN)
+        self.clock.now = 19.0
+        self.assertFalse(self.breaker.allow())
+
+    def test_latency_ewma_ignores_failures(self):
+        """Only successful calls move the latency average."""
+        self.breaker.record(True, 1.0)
+        self.breaker.record(True, 2.0)
+        self.assertAlmostEqual(self.breaker.latency_ewma, 1.3)
+        self.breaker.record(False, 30.0)
+        self.assertAlmostEqual(self.breaker.latency_ewma, 1.3)
+
+
+class TestEngineRouter(unittest.TestCase):
+    """Test cases for EngineRouter."""
+
+    def setUp(self):
+        """Set up a router with a fake clock."""
+        self.clock = FakeClock()
+        self.router = EngineRouter(['gtts', 'pyttsx3'], min_calls=1, open_seconds=10, clock=self.clock)
+
+    def test_preference_wins_over_latency(self):
+        """Healthy engines are tried in order of preference, however fast the others are."""
+        self.assertEqual(list(self.router.candidates()), ['gtts', 'pyttsx3'])
+        self.router.record('gtts', True, 0.5)
+        self.router.record('pyttsx3', True, 0.1)
+        self.assertEqual(list(self.router.candidates()), ['gtts', 'pyttsx3'])
+        self.assertEqual(list(self.router.candidates(['pyttsx3'])), ['pyttsx3'])
+
+    def test_latency_sla_demotes_slow_engines(self):
+        """Only an engine measured above the SLA moves behind the others."""
+        router = EngineRouter(['gtts', 'pyttsx3'], latency_sla=1.0, clock=self.clock)
+        router.record('pyttsx3', True, 0.1)
+        self.assertEqual(list(router.candidates()), ['gtts', 'pyttsx3'])
+        router.record('gtts', True, 2.0)
+        self.assertEqual(list(router.candidates()), ['pyttsx3', 'gtts'])
+
+    def test_recovered_engine_regains_its_place(self):
+        """An engine never measured because of an outage is preferred again once it recovers."""
+        self.router.record('gtts', False, 5.0)
+        self.router.record('pyttsx3', True, 0.1)
+        self.assertEqual(list(self.router.candidates()), ['pyttsx3'])
+        self.clock.now = 10.0
+        self.assertEqual(next(self.router.candidates()), 'gtts')
+        self.router.record('gtts', True, 0.5)
+        self.assertEqual(list(self.router.candidates()), ['gtts', 'pyttsx3'])
+
+    def test_open_engines_are_skipped(self):
+        """An engine with an open circuit is not offered."""
+        self.router.record('gtts', False, 5.0)
+        self.assertEqual(list(self.router.candidates()), ['pyttsx3'])
+        self.assertEqual(self.router.stats()['gtts']['state'], OPEN)
+
+    def test_probe_is_claimed_lazily(self):
+        """Stopping after the first engine leaves a later engine's probe unclaimed."""
+        self.router.record('gtts', True, 0.5)
+        self.router.record('pyttsx3', True, 0.1)
+        self.router.record('pyttsx3', False, 5.0)
+        self.clock.now = 10.0
+        candidates = self.router.candidates()
+        self.assertEqual(next(candidates), 'gtts')
+        candidates.close()
+        self.assertEqual(self.router.breakers['pyttsx3'].state, OPEN)
+        self.assertEqual(list(self.router.candidates()), ['gtts', 'pyttsx3'])
+
+
+class TestProcessorRouting(unittest.TestCase):
+    """Test cases for routing in JapaneseSpeechProcessorMulti."""
+
+    def setUp(self):
+        """Set up a processor with two fake engines."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.processor = JapaneseSpeechProcessorMulti(str(self.temp_dir), engine='auto')
+        self.processor.router = EngineRouter(['gtts', 'pyttsx3'], open_seconds=60)
+        self.gtts = FakeEngine('gtts', delay=0.1, fail=True)
+        self.pyttsx3 = FakeEngine('pyttsx3', delay=0.0)
+        self.patches = [
+            patch.object(self.processor, 'engines', {'gtts': self.gtts, 'pyttsx3': self.pyttsx3}),
+            patch.object(self.processor, '_use_engine', side_effect=self._use_engine),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def _use_engine(self, name, text, file_path):
+        return {'gtts': self.gtts, 'pyttsx3': self.pyttsx3}[name](text, file_path)
+
+    def tearDown(self):
+        """Clean up after the tests."""
+        for p in reversed(self.patches):
+            p.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def test_outage_falls_back_without_waiting(self):
+        """Once gTTS's circuit opens, requests go straight to pyttsx3."""
+        # gTTS was healthy before the outage
+        self.processor.router.record('gtts', True, 0.005)
+        self.processor.router.record('pyttsx3', True, 0.02)
+        self.pyttsx3.delay = 0.02
+
+        for i in range(3):
+            success, _ = self.processor.text_to_speech("こんにちは", f"{i}.wav")
+            self.assertTrue(success)
+        self.assertEqual(self.processor.router.stats()['gtts']['state'], OPEN)
+        calls = self.gtts.calls
+        self.assertLessEqual(calls, 3)
+
+        start = time.perf_counter()
+        for i in range(3, 13):
+            self.processor.text_to_speech("こんにちは", f"{i}.wav")
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(self.gtts.calls, calls)
+        self.assertLess(elapsed, 10 * self.pyttsx3.delay + self.gtts.delay)
+        self.assertEqual((self.temp_dir / "12.wav").read_text(encoding='utf-8'), 'pyttsx3')
+
+    def test_stream_skips_open_engines(self):
+        """Streaming goes through the router, so an outage stops costing a gTTS call per request."""
+        for _ in range(3):
+            self.assertEqual(list(self.processor.stream_text_to_speech("こんにちは")), [b'pyttsx3'])
+        self.assertEqual(self.processor.router.stats()['gtts']['state'], OPEN)
+        calls = self.gtts.calls
+
+        for _ in range(5):
+            self.assertEqual(list(self.processor.stream_text_to_speech("こんにちは")), [b'pyttsx3'])
+        self.assertEqual(self.gtts.calls, calls)
+        self.assertIsNotNone(self.processor.router.stats()['pyttsx3']['latency_ewma'])
+
+    def test_routes_to_preferred_healthy_engine(self):
+        """With both engines healthy, the preferred one is used even if slower."""
+        self.gtts.fail = False
+        self.processor.router.record('gtts', True, 0.1)
+        self.processor.router.record('pyttsx3', True, 0.001)
+        self.processor.text_to_speech("こんにちは", "preferred.wav")
+        self.assertEqual(self.gtts.calls, 1)
+        self.assertEqual(self.pyttsx3.calls, 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the Google TTS transport against a local stub server.
+"""
+
+import sys
+import base64
+import asyncio
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src import google_tts
+from src.google_tts import (synthesize, asynthesize, create_session, backoff_delay, decode_response,
+                            AsyncSession, AIOHTTP_AVAILABLE)
+
+
+def stub_body(audio: bytes) -> bytes:
+    """Return a batchexecute response carrying audio."""
+    encoded = base64.b64encode(audio).decode('ascii')
+    return (')]}\'\n\n[["wrb.fr","jQ1olc","[\\"' + encoded + '\\"]",null,null,null,"generic"]]\n').encode('utf-8')
+
+
+class StubTTSHandler(BaseHTTPRequestHandler):
+    """Answers every POST with fake audio, after failing the first few with a given status."""
+
+    protocol_version = "HTTP/1.1"
+    # Send headers and body in one segment, as real servers do, to avoid Nagle/delayed-ACK stalls
+    wbufsize = 1 << 16
+
+    def do_POST(self):
+        server = self.server
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        with server.lock:
+            server.requests += 1
+            server.connections.add(self.client_address)
+            fail = server.failures > 0
+            if fail:
+                server.failures -= 1
+        body = b"error" if fail else stub_body(b"MP3")
+        self.send_response(server.fail_status if fail else 200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestGoogleTTSSession(unittest.TestCase):
+    """Test cases for synthesize over a shared session."""
+
+    def setUp(self):
+        """Start the stub server."""
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubTTSHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests = 0
+        self.server.connections = set()
+        self.server.failures = 0
+        self.server.fail_status = 503
+        self.url = f"http://127.0.0.1:{self.server.server_port}/batchexecute"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.session = create_session(pool_size=2)
+
+    def tearDown(self):
+        """Stop the stub server."""
+        self.session.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_decode_stub(self):
+        """The stub speaks the format decode_response expects."""
+        self.assertEqual(decode_response(stub_body(b"abc").decode('utf-8')), b"abc")
+
+    def test_connection_is_reused(self):
+        """Sequential requests travel over one keep-alive connection."""
+        for _ in range(5):
+            self.assertEqual(synthesize("こんにちは", session=self.session, url=self.url), b"MP3")
+        self.assertEqual(self.server.requests, 5)
+        self.assertEqual(len(self.server.connections), 1)
+
+    def test_long_text_parts_are_joined(self):
+        """Text longer than one gTTS part is fetched part by part and joined in order."""
+        audio = synthesize("あ" * 250, session=self.session, url=self.url)
+        self.assertEqual(audio, b"MP3" * self.server.requests)
+        self.assertGreater(self.server.requests, 1)
+
+    def test_retries_server_errors(self):
+        """Retryable statuses are retried after a backoff."""
+        self.server.failures = 2
+        with patch.object(google_tts.time, 'sleep') as sleep:
+            self.assertEqual(synthesize("こんにちは", session=self.session, url=self.url, retries=2), b"MP3")
+        self.assertEqual(sleep.call_count, 2)
+        self.assertEqual(self.server.requests, 3)
+
+    def test_gives_up_after_retries(self):
+        """The last error is raised once the retries are used up."""
+        self.server.failures = 5
+        with patch.object(google_tts.time, 'sleep'), self.assertRaises(Exception):
+            synthesize("こんにちは", session=self.session, url=self.url, retries=1)
+        self.assertEqual(self.server.requests, 2)
+
+    def test_client_errors_are_not_retried(self):
+        """A 4xx other than 429 fails immediately."""
+        self.server.failures = 1
+        self.server.fail_status = 400
+        with self.assertRaises(Exception):
+            synthesize("こんにちは", session=self.session, url=self.url)
+        self.assertEqual(self.server.requests, 1)
+
+    @unittest.skipUnless(AIOHTTP_AVAILABLE, "aiohttp not installed")
+    def test_async_retries_server_errors(self):
+        """The async path retries retryable statuses like the sync one."""
+        self.server.failures = 2
+        audio = asyncio.run(asynthesize("こんにちは", url=self.url, retries=2, backoff=0))
+        self.assertEqual(audio, b"MP3")
+        self.assertEqual(self.server.requests, 3)
+
+    @unittest.skipUnless(AIOHTTP_AVAILABLE, "aiohttp not installed")
+    def test_async_client_errors_are_not_retried(self):
+        """A 4xx other than 429 fails the async path immediately too."""
+        self.server.failures = 1
+        self.server.fail_status = 400
+        with self.assertRaises(Exception):
+            asyncio.run(asynthesize("こんにちは", url=self.url, backoff=0))
+        self.assertEqual(self.server.requests, 1)
+
+    def test_backoff_is_jittered_and_capped(self):
+        """Delays stay within [0, min(cap, base * 2 ** attempt)]."""
+        delays = [backoff_delay(3, backoff=0.5, max_backoff=2.0) for _ in range(100)]
+        self.assertTrue(all(0 <= delay <= 2.0 for delay in delays))
+        self.assertGreater(len(set(delays)), 1)
+
+
+
+@unittest.skipUnless(AIOHTTP_AVAILABLE, "aiohttp not installed")
+class TestAsyncSession(unittest.TestCase):
+    """Test cases for AsyncSession."""
+
+    def test_close_closes_the_session_of_every_loop(self):
+        """Each event loop gets its own session, and close() closes them all."""
+        holder = AsyncSession()
+
+        async def get():
+            return holder.get()
+
+        async def close():
+            await holder.close()
+
+        first = asyncio.run(get())
+        second = asyncio.run(get())
+        self.assertIsNot(second, first)
+        asyncio.run(close())
+        self.assertTrue(first.closed)
+        self.assertTrue(second.closed)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the Japanese Phonetic Converter.
+"""
+
+import sys
+import time
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src import japanese_phonetics
+from src.japanese_phonetics import JapanesePhoneticConverter
+
+
+class TestSharedResources(unittest.TestCase):
+    """Test cases for the process-wide tokenizer registry."""
+
+    def setUp(self):
+        """Start every test with an empty registry and a slow fake tokenizer."""
+        self.created = []
+
+        def make_tokenizer():
+            time.sleep(0.05)
+            tokenizer = MagicMock(name="Tokenizer")
+            self.created.append(tokenizer)
+            return tokenizer
+
+        patches = [
+            patch.dict(japanese_phonetics._shared_resources, clear=True),
+            patch.dict(japanese_phonetics._shared_init_times, clear=True),
+            patch.object(japanese_phonetics, 'JANOME_AVAILABLE', True),
+            patch.object(japanese_phonetics, 'Tokenizer', side_effect=make_tokenizer, create=True),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_tokenizer_is_lazy_and_shared(self):
+        """Converters do not load the tokenizer until used, then share one instance."""
+        first = JapanesePhoneticConverter()
+        second = JapanesePhoneticConverter()
+        self.assertEqual(self.created, [])
+
+        self.assertIs(first.tokenizer, second.tokenizer)
+        self.assertEqual(len(self.created), 1)
+
+    def test_concurrent_first_use_initializes_once(self):
+        """Threads racing on first use still build a single tokenizer."""
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(japanese_phonetics.get_tokenizer()))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(self.created), 1)
+        self.assertTrue(all(result is self.created[0] for result in results))
+
+    def test_preload_reports_init_time(self):
+        """Preloading records the initialization time of each resource."""
+        with patch.object(japanese_phonetics, 'KAKASI_AVAILABLE', False):
+            JapanesePhoneticConverter(preload=True)
+            times = japanese_phonetics.get_resource_init_times()
+
+        self.assertEqual(len(self.created), 1)
+        self.assertGreaterEqual(times['janome_tokenizer'], 0.05)
+
+
+class TestConversionMemoization(unittest.TestCase):
+    """Test cases for the memoized reading lookup."""
+
+    def setUp(self):
+        """Set up a converter with a counting fake backend."""
+        self.converter = JapanesePhoneticConverter(cache_size=2, segment_cache_size=8)
+        self.calls = []
+
+    def _backend(self, segment):
+        self.calls.append(segment)
+        return segment.upper()
+
+    def _convert(self, text):
+        return self.converter._convert(text, 'romaji', 'fake', self._backend)
+
+    def test_whole_text_hits(self):
+        """A repeated text is served without touching the backend."""
+        self.assertEqual(self._convert("abc、def。"), "ABC、DEF。")
+        self.assertEqual(self._convert("abc、def。"), "ABC、DEF。")
+
+        self.assertEqual(self.calls, ["abc、", "def。"])
+        stats = self.converter.cache_stats()["conversion"]
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["hit_ratio"], 0.5)
+
+    def test_known_phrases_are_reused(self):
+        """A new text made of known phrases only converts the unknown ones."""
+        self._convert("abc、def。")
+        self._convert("def。abc、ghi")
+
+        self.assertEqual(self.calls, ["abc、", "def。", "ghi"])
+        self.assertEqual(self.converter.cache_stats()["segment"]["hits"], 2)
+
+    def test_cache_is_bounded(self):
+        """The least recently used text is evicted at capacity."""
+        for text in ("a", "b", "a", "c"):
+            self._convert(text)
+
+        self.assertEqual(self.converter.conversion_cache.stats()["size"], 2)
+        self.assertIsNotNone(self.converter.conversion_cache.get(("a", 'romaji', 'fake')))
+        self.assertIsNone(self.converter.conversion_cache.get(("b", 'romaji', 'fake')))
+
+    def test_cache_key_includes_target(self):
+        """Different target scripts do not share entries."""
+        self.converter._convert("abc", 'katakana', 'fake', lambda s: "katakana")
+        self.assertEqual(self._convert("abc"), "ABC")
+
+    @unittest.skipUnless(japanese_phonetics.KAKASI_AVAILABLE, "pykakasi not installed")
+    def test_romaji_with_kakasi(self):
+        """Romaji is space separated with punctuation attached."""
+        converter = JapanesePhoneticConverter()
+        self.assertEqual(converter.to_romaji("日本語は面白いです。"), "nihongo ha omoshiroi desu.")
+        self.assertEqual(converter.to_katakana("日本語"), "ニホンゴ")
+
+    def test_line_breaks_stay_out_of_the_backend(self):
+        """Line breaks are cut from phrases before conversion and put back after."""
+        self.assertEqual(self._convert("ab\ncd\n\nef"), "AB\nCD\n\nEF")
+        self.assertEqual(self.calls, ["ab", "cd", "ef"])
+
+    @unittest.skipUnless(japanese_phonetics.KAKASI_AVAILABLE, "pykakasi not installed")
+    def test_multiline_text(self):
+        """Every line converts as it would on its own."""
+        converter = JapanesePhoneticConverter()
+        lines = ["一行目", "二行目", "", "四行目"]
+        text = "\n".join(lines)
+
+        for convert in (converter.to_hiragana, converter.to_katakana, converter.to_romaji):
+            self.assertEqual(convert(text), "\n".join(convert(line) for line in lines))
+        self.assertEqual(converter.to_romaji(text), "ichigyoume\nnigyou me\n\nyongyou me")
+
+
+@unittest.skipUnless(japanese_phonetics.JANOME_AVAILABLE, "janome not installed")
+class TestStreamingConversion(unittest.TestCase):
+    """Test cases for the streaming Janome paths."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.converter = JapanesePhoneticConverter()
+
+    def test_tokenize_returns_compact_tokens(self):
+        """Tokens are TokenInfo tuples with the coarse part of speech."""
+        tokens = self.converter.tokenize("日本語の音声")
+
+        self.assertTrue(all(isinstance(t, japanese_phonetics.TokenInfo) for t in tokens))
+        self.assertEqual([t.surface for t in tokens], ["日本語", "の", "音声"])
+        self.assertEqual(tokens[0].part_of_speech, "名詞")
+        self.assertEqual(tokens[0].reading, "ニホンゴ")
+
+    def test_iter_readings_is_lazy(self):
+        """Readings are produced by a generator and joined by to_hiragana."""
+        readings = self.converter.iter_readings("日本語の音声")
+        self.assertEqual(next(readings), "ニホンゴ")
+        self.assertEqual(self.converter.to_hiragana("日本語の音声"), "ニホンゴノオンセイ")
+
+
+if __name__ == "__main__":
+    unittest.main()
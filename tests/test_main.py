@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the main.py command line.
+"""
+
+import sys
+import shutil
+import tempfile
+import unittest
+import subprocess
+from pathlib import Path
+
+MAIN = Path(__file__).parent.parent / 'main.py'
+
+# Runs main.py with numpy made unimportable
+WITHOUT_NUMPY = (
+    "import sys, runpy\n"
+    "sys.modules['numpy'] = None\n"
+    "sys.argv = sys.argv[1:]\n"
+    "runpy.run_path(sys.argv[0], run_name='__main__')\n"
+)
+
+
+class TestMainWithoutNumpy(unittest.TestCase):
+    """numpy is optional: commands that do not analyze audio must work without it."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.text_file = self.temp_dir / 'sample.txt'
+        self.text_file.write_text("こんにちは。\n日本語のテキストです。\n", encoding='utf-8')
+
+    def tearDown(self):
+        """Clean up after tests."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_text_read(self):
+        """Test that main.py text --read runs without numpy."""
+        result = subprocess.run([sys.executable, '-c', WITHOUT_NUMPY, str(MAIN), 'text', '--read',
+                                 str(self.text_file)], capture_output=True, text=True, encoding='utf-8')
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("日本語のテキストです。", result.stdout)
+        self.assertNotIn("Traceback", result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
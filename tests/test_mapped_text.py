@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the memory-mapped text reader.
+"""
+
+import sys
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src import mapped_text
+from src.mapped_text import MappedTextFile
+from src.text_processor import JapaneseTextProcessor
+
+
+class TestMappedTextFile(unittest.TestCase):
+    """Test cases for MappedTextFile."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.path = self.temp_dir / 'corpus.txt'
+        self.path.write_bytes("一行目\n二行目\r\n\n四行目".encode('utf-8'))
+
+    def tearDown(self):
+        """Clean up after the tests."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_line_index(self):
+        """Lines are indexed by byte offset, with or without a final newline."""
+        with MappedTextFile(self.path) as mapped:
+            self.assertEqual(len(mapped), 4)
+            self.assertEqual(list(mapped.line_offsets), [0, 10, 21, 22, 31])
+            self.assertEqual(mapped.line(1), "二行目")
+            self.assertEqual(mapped.line(-1), "四行目")
+            with self.assertRaises(IndexError):
+                mapped.line(4)
+
+    def test_index_without_numpy(self):
+        """The pure Python index matches the numpy one."""
+        with patch.object(mapped_text, 'NUMPY_AVAILABLE', False), MappedTextFile(self.path) as mapped:
+            self.assertEqual(list(mapped.line_offsets), [0, 10, 21, 22, 31])
+
+    def test_line_ranges(self):
+        """Ranges of lines and bytes are decoded on demand."""
+        with MappedTextFile(self.path) as mapped:
+            self.assertEqual(mapped.lines(1, 3), ["二行目", ""])
+            self.assertEqual(mapped.lines(2), ["", "四行目"])
+            self.assertEqual(mapped.slice(0, 9), "一行目")
+            self.assertEqual(mapped.read(), "一行目\n二行目\n\n四行目")
+
+    def test_empty_file(self):
+        """An empty file has no lines."""
+        empty = self.temp_dir / 'empty.txt'
+        empty.touch()
+        with MappedTextFile(empty) as mapped:
+            self.assertEqual(len(mapped), 0)
+            self.assertEqual(mapped.lines(), [])
+
+    def test_processor_read_lines(self):
+        """JapaneseTextProcessor exposes random access to lines."""
+        processor = JapaneseTextProcessor(str(self.temp_dir))
+        self.assertEqual(processor.read_lines('corpus.txt', 0, 2), ["一行目", "二行目"])
+
+
+if __name__ == "__main__":
+    unittest.main()
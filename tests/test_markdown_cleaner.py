@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the single-pass Markdown cleaner.
+"""
+
+import io
+import sys
+import unittest
+from pathlib import Path
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.markdown_cleaner import clean_markdown, clean_markdown_with_offsets, iter_clean_markdown
+
+DOCUMENT = """# 見出し
+
+本文は**太字**と_斜体_です。
+
+- 項目A
+1. 第一
+
+```python
+print("読まない")
+```
+
+> 引用文
+---
+"""
+
+
+class TestMarkdownCleaner(unittest.TestCase):
+    """Test cases for clean_markdown."""
+
+    def test_block_syntax(self):
+        """Headers and list items become sentences, code and breaks are dropped."""
+        self.assertEqual(clean_markdown(DOCUMENT),
+                         "見出し.\n本文は太字と斜体です。\n項目A.\n第一.\n引用文")
+
+    def test_images_are_dropped_before_links(self):
+        """An image is removed whole instead of leaving '!alt' behind."""
+        text = "[リンク](http://example.com)と![画像](image.png)です"
+        self.assertEqual(clean_markdown(text), "リンクとです")
+        self.assertEqual(clean_markdown("![画像のみ](image.png)\n本文"), "本文")
+
+    def test_nested_emphasis_and_identifiers(self):
+        """Nested emphasis is unwrapped, snake_case identifiers are kept."""
+        self.assertEqual(clean_markdown("**太字と*斜体***、`code` と file_name_x"),
+                         "太字と斜体、code と file_name_x")
+
+    def test_streamed_input(self):
+        """Cleaning a stream of lines matches cleaning the whole text."""
+        streamed = "\n".join(iter_clean_markdown(io.StringIO(DOCUMENT)))
+        self.assertEqual(streamed, clean_markdown(DOCUMENT))
+
+    def test_offset_map(self):
+        """Clean text positions map back to their source positions."""
+        clean, offsets = clean_markdown_with_offsets(DOCUMENT)
+
+        for word in ("見出し", "太字", "斜体", "項目A", "第一", "引用文"):
+            position = clean.index(word)
+            source = offsets.to_source(position)
+            self.assertEqual(DOCUMENT[source:source + len(word)], word)
+
+
+if __name__ == "__main__":
+    unittest.main()
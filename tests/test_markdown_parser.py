@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the single-pass Markdown structure parser.
+"""
+
+import io
+import sys
+import unittest
+from pathlib import Path
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.markdown_parser import MarkdownElement, iter_markdown_elements, parse_markdown
+
+DOCUMENT = """# 見出し
+
+本文の一行目。
+本文の二行目。
+- 項目A
+* 項目B
+1. 第一
+2. 第二
+
+```python
+# コメント
+- コード内のリスト
+1. コード内の番号
+```
+
+---
+*強調された段落*
+"""
+
+
+class TestMarkdownParser(unittest.TestCase):
+    """Test cases for parse_markdown."""
+
+    def test_structure(self):
+        """All element types are collected in one pass."""
+        structure = parse_markdown(DOCUMENT.splitlines())
+
+        self.assertEqual(structure["headers"], [(1, "見出し")])
+        self.assertEqual(structure["bullet_lists"], ["項目A", "項目B"])
+        self.assertEqual(structure["numbered_lists"], ["第一", "第二"])
+        self.assertEqual(structure["code_blocks"], ["# コメント\n- コード内のリスト\n1. コード内の番号"])
+        self.assertEqual(structure["paragraphs"], ["本文の一行目。\n本文の二行目。", "*強調された段落*"])
+
+    def test_elements_on_request(self):
+        """The element list is only built when asked for."""
+        self.assertNotIn("elements", parse_markdown(DOCUMENT))
+
+        structure = parse_markdown(DOCUMENT, elements=True)
+        self.assertEqual(structure["elements"], list(iter_markdown_elements(DOCUMENT)))
+
+    def test_line_numbers(self):
+        """Elements carry the zero-based line they start on."""
+        elements = list(iter_markdown_elements(DOCUMENT.splitlines()))
+
+        self.assertEqual(elements[0], MarkdownElement('header', 0, "見出し", level=1))
+        self.assertEqual(elements[1].line, 2)
+        code = [e for e in elements if e.kind == 'code'][0]
+        self.assertEqual((code.line, code.language), (9, "python"))
+
+    def test_streamed_input(self):
+        """Lines with line endings from a file object give the same result."""
+        streamed = parse_markdown(io.StringIO(DOCUMENT))
+        self.assertEqual(streamed, parse_markdown(DOCUMENT.splitlines()))
+
+    def test_streamed_in_small_blocks(self):
+        """Elements spanning the blocks of a streamed file are parsed whole."""
+        lines = io.StringIO(DOCUMENT * 3).readlines()
+        expected = list(iter_markdown_elements(lines, block_size=1 << 20))
+
+        for block_size in (1, 7, 40):
+            self.assertEqual(list(iter_markdown_elements(lines, block_size=block_size)), expected)
+
+    def test_unclosed_fence_and_inline_code(self):
+        """An unclosed fence runs to the end; inline triple backticks are text."""
+        structure = parse_markdown(["```code``` です", "```", "- 中身"])
+
+        self.assertEqual(structure["paragraphs"], ["```code``` です"])
+        self.assertEqual(structure["code_blocks"], ["- 中身"])
+        self.assertEqual(structure["bullet_lists"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the persistent pyttsx3 engine worker.
+"""
+
+import sys
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src import pyttsx3_worker
+from src.pyttsx3_worker import Pyttsx3Worker, create_japanese_engine
+
+
+class FakeEngine:
+    """Stand-in for a pyttsx3 engine that must only be used from the thread that created it."""
+
+    def __init__(self, cycle_time: float = 0.01, fail_on: str = None):
+        self.thread = threading.current_thread()
+        self.cycle_time = cycle_time
+        self.fail_on = fail_on
+        self.pending = []
+        self.batch_sizes = []
+
+    def _check_thread(self):
+        if threading.current_thread() is not self.thread:
+            raise AssertionError("engine used from another thread")
+
+    def save_to_file(self, text, path):
+        self._check_thread()
+        self.pending.append((text, path))
+
+    def runAndWait(self):
+        self._check_thread()
+        time.sleep(self.cycle_time)
+        if any(text == self.fail_on for text, _ in self.pending):
+            self.pending = []
+            raise RuntimeError("driver failure")
+        for text, path in self.pending:
+            Path(path).write_text(text, encoding='utf-8')
+        self.batch_sizes.append(len(self.pending))
+        self.pending = []
+
+
+class TestPyttsx3Worker(unittest.TestCase):
+    """Test cases for Pyttsx3Worker."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.engines = []
+
+    def tearDown(self):
+        """Clean up after the tests."""
+        shutil.rmtree(self.temp_dir)
+
+    def _factory(self, **kwargs):
+        def create():
+            engine = FakeEngine(**kwargs)
+            self.engines.append(engine)
+            return engine
+        return create
+
+    def test_save_to_file(self):
+        """A single request is rendered and reported as successful."""
+        with Pyttsx3Worker(self._factory()) as worker:
+            self.assertTrue(worker.available)
+            self.assertTrue(worker.save_to_file("こんにちは", self.temp_dir / "a.wav"))
+        self.assertEqual((self.temp_dir / "a.wav").read_text(encoding='utf-8'), "こんにちは")
+        self.assertFalse(worker.available)
+
+    def test_concurrent_requests_are_batched(self):
+        """Requests from many threads share runAndWait cycles on the engine's own thread."""
+        with Pyttsx3Worker(self._factory(cycle_time=0.05)) as worker:
+            with ThreadPoolExecutor(max_workers=16) as executor:
+                results = list(executor.map(
+                    lambda i: worker.save_to_file(f"文{i}", self.temp_dir / f"{i}.wav"), range(32)))
+
+        self.assertTrue(all(results))
+        engine = self.engines[0]
+        self.assertEqual(sum(engine.batch_sizes), 32)
+        self.assertLess(len(engine.batch_sizes), 32)
+        for i in range(32):
+            self.assertEqual((self.temp_dir / f"{i}.wav").read_text(encoding='utf-8'), f"文{i}")
+
+    def test_max_batch(self):
+        """No cycle renders more than max_batch utterances."""
+        with Pyttsx3Worker(self._factory(cycle_time=0.02), max_batch=4) as worker:
+            futures = [worker.submit(f"文{i}", self.temp_dir / f"{i}.wav") for i in range(10)]
+            self.assertTrue(all(future.result() for future in futures))
+        self.assertLessEqual(max(self.engines[0].batch_sizes), 4)
+
+    def test_engine_failure_fails_the_batch(self):
+        """A runAndWait error is raised to every request of that cycle only."""
+        with Pyttsx3Worker(self._factory(fail_on="壊れる")) as worker:
+            with self.assertRaises(RuntimeError):
+                worker.save_to_file("壊れる", self.temp_dir / "bad.wav")
+            self.assertTrue(worker.save_to_file("大丈夫", self.temp_dir / "good.wav"))
+
+    def test_init_failure(self):
+        """A worker whose engine cannot start is unavailable and rejects requests."""
+        def broken():
+            raise OSError("no speech driver")
+
+        worker = Pyttsx3Worker(broken)
+        self.assertFalse(worker.available)
+        self.assertIsInstance(worker.error, OSError)
+        with self.assertRaises(RuntimeError):
+            worker.submit("こんにちは", self.temp_dir / "a.wav")
+        worker.close()
+
+    def test_missing_pyttsx3(self):
+        """Without pyttsx3 the default engine factory fails with a clear error."""
+        with patch.object(pyttsx3_worker, 'PYTTSX3_AVAILABLE', False):
+            with self.assertRaisesRegex(RuntimeError, "pip install pyttsx3"):
+                create_japanese_engine()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for request rate limiting and coalescing.
+"""
+
+import sys
+import time
+import asyncio
+import shutil
+import tempfile
+import threading
+import unittest
+import multiprocessing as mp
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src import google_tts, tts_engines
+from src.rate_limit import TokenBucket, RequestCoalescer, FCNTL_AVAILABLE
+from src.speech_processor_gtts import JapaneseSpeechProcessor
+from src.speech_processor_engine import EngineSpeechProcessor
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def acquire_many(state_file: str, rate: float, count: int) -> None:
+    """Take count tokens from a bucket shared through state_file (runs in a child process)."""
+    bucket = TokenBucket(rate, burst=1, state_file=state_file)
+    for _ in range(count):
+        bucket.acquire()
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test cases for TokenBucket."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        """Clean up after the tests."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_burst_then_rate(self):
+        """A full bucket allows a burst; later requests are spaced at the rate."""
+        bucket = TokenBucket(10, burst=3, clock=self.clock)
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(bucket.reserve(), 0.1)
+        self.assertAlmostEqual(bucket.reserve(), 0.2)
+
+        self.clock.now += 10
+        self.assertEqual(bucket.reserve(), 0.0)
+
+    def test_max_wait(self):
+        """A reservation exceeding max_wait takes no tokens."""
+        bucket = TokenBucket(1, burst=1, clock=self.clock)
+        bucket.reserve()
+        self.assertIsNone(bucket.reserve(max_wait=0.5))
+        self.assertAlmostEqual(bucket.reserve(max_wait=1.0), 1.0)
+        self.assertFalse(bucket.acquire(timeout=0))
+
+    @unittest.skipUnless(FCNTL_AVAILABLE, "requires fcntl")
+    def test_state_file_shares_budget(self):
+        """Buckets using the same state file draw from one budget."""
+        state_file = self.temp_dir / 'bucket'
+        first = TokenBucket(10, burst=2, state_file=state_file, clock=self.clock)
+        second = TokenBucket(10, burst=2, state_file=state_file, clock=self.clock)
+        self.assertEqual(first.reserve(), 0.0)
+        self.assertEqual(second.reserve(), 0.0)
+        self.assertAlmostEqual(first.reserve(), 0.1)
+        self.assertAlmostEqual(second.reserve(), 0.2)
+
+    @unittest.skipUnless(FCNTL_AVAILABLE, "requires fcntl")
+    def test_processes_share_rate(self):
+        """Two processes together stay under the shared rate."""
+        state_file = str(self.temp_dir / 'bucket')
+        context = mp.get_context('spawn')
+        processes = [context.Process(target=acquire_many, args=(state_file, 50, 10)) for _ in range(2)]
+        start = time.perf_counter()
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(30)
+        elapsed = time.perf_counter() - start
+        self.assertTrue(all(process.exitcode == 0 for process in processes))
+        # 20 requests at 50/s with a burst of 1 take at least 19 intervals
+        self.assertGreaterEqual(elapsed, 19 / 50)
+
+
+class TestRequestCoalescer(unittest.TestCase):
+    """Test cases for RequestCoalescer."""
+
+    def test_concurrent_duplicates_share_one_call(self):
+        """Identical in-flight requests wait for the first one."""
+        coalescer = RequestCoalescer()
+        release = threading.Event()
+        calls = []
+
+        def work(value):
+            calls.append(value)
+            release.wait(5)
+            return value * 2
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futures = [executor.submit(coalescer.run, 'key', work, 21) for _ in range(5)]
+            while coalescer.calls + coalescer.coalesced < 5:
+                time.sleep(0.01)
+            release.set()
+            results = [future.result() for future in futures]
+
+        self.assertEqual(results, [42] * 5)
+        self.assertEqual(calls, [21])
+        self.assertEqual(coalescer.coalesced, 4)
+
+    def test_failure_is_shared_and_not_kept(self):
+        """Waiters get the leader's exception; the next call runs again."""
+        coalescer = RequestCoalescer()
+
+        def fail():
+            raise RuntimeError("throttled")
+
+        with self.assertRaises(RuntimeError):
+            coalescer.run('key', fail)
+        self.assertEqual(coalescer.run('key', lambda: 'ok'), 'ok')
+        self.assertEqual(coalescer.calls, 2)
+
+    def test_concurrent_async_duplicates_share_one_call(self):
+        """Identical in-flight coroutines wait for the first one."""
+        coalescer = RequestCoalescer()
+        calls = []
+
+        async def work(value):
+            calls.append(value)
+            await asyncio.sleep(0.05)
+            return value * 2
+
+        async def main():
+            return await asyncio.gather(*(coalescer.arun('key', work, 21) for _ in range(5)))
+
+        self.assertEqual(asyncio.run(main()), [42] * 5)
+        self.assertEqual(calls, [21])
+        self.assertEqual((coalescer.calls, coalescer.coalesced), (1, 4))
+
+
+class TestProcessorLimits(unittest.TestCase):
+    """Test cases for rate limiting and coalescing in JapaneseSpeechProcessor."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        """Clean up after the tests."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_duplicate_texts_synthesize_once(self):
+        """Concurrent requests for one text make a single synthesis call."""
+        processor = JapaneseSpeechProcessor(str(self.temp_dir))
+        calls = []
+
+        def engine(text):
+            calls.append(text)
+            time.sleep(0.2)
+            return b"ID3" + text.encode('utf-8')
+
+        with patch.object(tts_engines, 'GTTS_AVAILABLE', True), \
+                patch.object(processor, '_synthesize_bytes', side_effect=engine):
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(lambda i: processor.text_to_speech("同じ文です。", f"{i}.mp3"), range(4)))
+
+        self.assertEqual(len(calls), 1)
+        for i in range(4):
+            self.assertEqual((self.temp_dir / f"{i}.mp3").read_bytes(), b"ID3" + "同じ文です。".encode('utf-8'))
+
+    def test_limiter_reaches_transport(self):
+        """The processor's limiter is passed to every Google TTS request."""
+        processor = JapaneseSpeechProcessor(str(self.temp_dir), rate_limit=5)
+        with patch.object(tts_engines, 'GTTS_AVAILABLE', True), \
+                patch.object(tts_engines, 'google_synthesize', return_value=b"ID3") as synthesize:
+            processor.text_to_speech("こんにちは", "hello.mp3")
+        self.assertIs(synthesize.call_args.kwargs['limiter'], processor.rate_limiter)
+        self.assertEqual(processor.rate_limiter.rate, 5)
+
+    @unittest.skipUnless(google_tts.GTTS_AVAILABLE, "gTTS not installed")
+    def test_gtts_engine_limits_every_request(self):
+        """The gtts engine takes a token per HTTP request, not one per engine call."""
+        processor = EngineSpeechProcessor('gtts', str(self.temp_dir), rate_limit=5)
+        limiters = []
+
+        def post(session, url, body, timeout, retries, backoff, limiter):
+            limiters.append(limiter)
+            return b"ID3"
+
+        with patch.object(google_tts, '_post', side_effect=post), \
+                patch.object(processor.rate_limiter, 'acquire') as acquire:
+            processor._synthesize_bytes("これは長い文章です。" * 15)
+        # gTTS splits the 150 characters into several requests, each passed the limiter
+        self.assertGreater(len(limiters), 1)
+        self.assertTrue(all(limiter is processor.rate_limiter for limiter in limiters))
+        acquire.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -53,6 +53,15 @@ class TestJapaneseSpeechProcessor(unittest.TestCase):
         # In a real test with actual TTS functionality, we would verify
         # that the output file exists and has valid audio content
         
+    def test_without_pyttsx3(self):
+        """Test that a missing pyttsx3 skips the TTS engine instead of failing to start it."""
+        with patch('src.speech_processor.PYTTSX3_AVAILABLE', False), \
+                patch('src.speech_processor.create_engine') as create_engine:
+            processor = JapaneseSpeechProcessor(str(self.test_data_dir))
+        
+        create_engine.assert_not_called()
+        self.assertIsNone(processor.tts_engine)
+    
     @patch('src.speech_processor.logger')
     def test_speech_to_text(self, mock_logger):
         """Test converting Japanese speech to text."""
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the behaviour shared by the speech processors.
+"""
+
+import sys
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.speech_processor_base import SpeechProcessorBase
+from src.speech_processor_engine import EngineSpeechProcessor
+from src.speech_processor_light import JapaneseSpeechProcessorLight
+from src.speech_processor_multi import JapaneseSpeechProcessorMulti
+
+TEXT = "こんにちは。"
+
+
+class TestSpeechProcessorBase(unittest.TestCase):
+    """Test cases for SpeechProcessorBase and the processors built on it."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        """Clean up after the tests."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_processors_share_the_base(self):
+        """Every placeholder-writing processor reads its text back the same way."""
+        processors = [
+            EngineSpeechProcessor('gtts', str(self.temp_dir), require_available=False),
+            JapaneseSpeechProcessorMulti(str(self.temp_dir), engine='none'),
+            JapaneseSpeechProcessorLight(str(self.temp_dir)),
+        ]
+        for i, processor in enumerate(processors):
+            with self.subTest(processor=type(processor).__name__):
+                self.assertIsInstance(processor, SpeechProcessorBase)
+                processor._write_placeholder_files(TEXT, self.temp_dir / f"{i}.wav", ["pip install gtts"])
+                self.assertEqual(processor.speech_to_text(f"{i}.wav"), TEXT)
+                self.assertEqual(processor.speech_to_text(str(self.temp_dir / f"{i}.wav")), TEXT)
+
+    def test_analyze_placeholder(self):
+        """A placeholder is reported as such, with the length of the text it stands for."""
+        processor = JapaneseSpeechProcessorMulti(str(self.temp_dir), engine='none')
+        processor._write_placeholder_files(TEXT, self.temp_dir / "p.wav")
+
+        result = processor.analyze_audio("p.wav")
+        self.assertTrue(result["is_placeholder"])
+        self.assertTrue(result["has_text_file"])
+        self.assertEqual(result["text_length"], len(TEXT))
+
+    def test_analyze_finds_engine_format(self):
+        """A file requested in another format is found in the engine's format."""
+        processor = EngineSpeechProcessor('gtts', str(self.temp_dir), require_available=False)
+        processor._write_placeholder_files(TEXT, self.temp_dir / "redirected.mp3")
+
+        result = processor.analyze_audio("redirected.wav")
+        self.assertTrue(result["exists"])
+        self.assertEqual(result["file_extension"], ".mp3")
+        self.assertFalse(processor.analyze_audio("missing.wav")["exists"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the speech recognizer registry, VAD segmentation and batch transcription.
+"""
+
+import sys
+import json
+import types
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import soundfile as sf
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src import speech_recognizers
+from src.speech_recognizers import (SpeechRecognizer, create_recognizer, load_model, unload_models,
+                                    transcribe_file, transcribe_files, recognizer_names,
+                                    recognizer_options)
+from src.vad import iter_speech_segments
+
+SR = 16000
+
+
+def speech_like(pattern, sr: int = SR) -> np.ndarray:
+    """Noise for (seconds, True) parts and near-silence for (seconds, False) parts."""
+    rng = np.random.default_rng(0)
+    parts = [(0.3 if speech else 0.001) * rng.normal(0, 1, int(seconds * sr)) for seconds, speech in pattern]
+    return np.concatenate(parts).astype(np.float32)
+
+
+class LengthRecognizer(SpeechRecognizer):
+    """Recognizes each segment as its length in tenths of a second."""
+
+    name = 'length'
+    label = 'Length'
+    max_concurrency = 4
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def transcribe(self, samples: np.ndarray) -> str:
+        with self._lock:
+            self.calls.append(len(samples))
+        return f"[{round(len(samples) / self.sample_rate * 10)}]"
+
+
+class TestVAD(unittest.TestCase):
+    """Test cases for iter_speech_segments."""
+
+    def test_segments_at_pauses(self):
+        """Speech separated by pauses becomes padded segments; short clicks are dropped."""
+        y = speech_like([(1.0, False), (2.0, True), (1.0, False), (0.02, True), (1.0, False),
+                         (1.5, True), (0.5, False)])
+        segments = list(iter_speech_segments(iter([y]), SR))
+        self.assertEqual(len(segments), 2)
+        self.assertAlmostEqual(segments[0].start, 0.85, delta=0.03)
+        self.assertAlmostEqual(segments[0].end, 3.15, delta=0.03)
+        self.assertAlmostEqual(segments[1].start, 4.87, delta=0.03)
+        for segment in segments:
+            self.assertEqual(len(segment.samples), round((segment.end - segment.start) * SR))
+
+    def test_block_size_does_not_change_segments(self):
+        """Segments are the same however the audio is split into blocks."""
+        y = speech_like([(0.5, False), (3.0, True), (0.4, False), (2.0, True), (0.2, False)])
+        reference = [(s.start, s.end) for s in iter_speech_segments(iter([y]), SR)]
+        for size in (7, 480, 5000):
+            blocks = (y[i:i + size] for i in range(0, len(y), size))
+            self.assertEqual([(s.start, s.end) for s in iter_speech_segments(blocks, SR)], reference)
+
+    def test_long_speech_is_cut(self):
+        """Speech without pauses is cut into pieces no longer than the maximum, covering it all."""
+        y = speech_like([(25.0, True)])
+        segments = list(iter_speech_segments(iter([y]), SR, max_segment_seconds=10))
+        self.assertGreater(len(segments), 2)
+        self.assertTrue(all(s.end - s.start <= 10.0 for s in segments))
+        self.assertEqual(sum(len(s.samples) for s in segments), len(y))
+
+
+class TestSpeechRecognizers(unittest.TestCase):
+    """Test cases for the recognizer registry and transcription helpers."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        """Clean up after the tests."""
+        shutil.rmtree(self.temp_dir)
+        unload_models()
+
+    def _write(self, name: str, y: np.ndarray, sr: int = SR) -> Path:
+        path = self.temp_dir / name
+        sf.write(str(path), y, sr)
+        return path
+
+    def test_registry(self):
+        """Unknown names are rejected and unavailable backends raise RuntimeError."""
+        self.assertIn('vosk', recognizer_names())
+        with self.assertRaises(ValueError):
+            create_recognizer('no-such-recognizer')
+        with self.assertRaises(RuntimeError):
+            create_recognizer('vosk', model=str(self.temp_dir / 'missing-model'))
+        recognizer = LengthRecognizer()
+        self.assertIs(create_recognizer(recognizer), recognizer)
+
+    def test_recognizer_options(self):
+        """Only recognizers loading a model accept the model option."""
+        self.assertIn('model', recognizer_options('vosk'))
+        self.assertIn('model', recognizer_options('whisper'))
+        self.assertNotIn('model', recognizer_options('google'))
+        with self.assertRaises(ValueError):
+            recognizer_options('no-such-recognizer')
+
+    def test_transcribe_file_by_segments(self):
+        """Each pause-separated segment is recognized, resampled to the recognizer's rate."""
+        path = self._write("talk.wav", speech_like([(0.5, False), (1.0, True), (1.0, False), (2.0, True),
+                                                    (0.5, False)], sr=44100), sr=44100)
+        recognizer = LengthRecognizer()
+        result = transcribe_file(path, recognizer)
+        self.assertEqual(result["text"], "[13][23]")
+        self.assertEqual([s["text"] for s in result["segments"]], ["[13]", "[23]"])
+        self.assertAlmostEqual(result["segments"][1]["start"], 2.35, delta=0.03)
+
+        whole = transcribe_file(path, LengthRecognizer(), vad=False)
+        self.assertEqual(whole["text"], "[50]")
+
+    def test_transcribe_files_in_order(self):
+        """Batch results keep input order and failures do not stop the batch."""
+        paths = [self._write(f"clip_{i}.wav", speech_like([(0.2, False), (0.5 + 0.1 * i, True), (0.2, False)]))
+                 for i in range(6)]
+        paths.insert(3, self.temp_dir / "missing.wav")
+        results = list(transcribe_files(paths, LengthRecognizer(), max_workers=3))
+        self.assertEqual([path for path, _ in results], [str(p) for p in paths])
+        self.assertIn("error", results[3][1])
+        self.assertEqual([r["text"] for _, r in results[:3]], ["[8]", "[9]", "[10]"])
+
+    def test_models_are_loaded_once(self):
+        """Recognizers using the same model share one loaded instance."""
+        loads = []
+
+        class FakeModel:
+            def __init__(self, path):
+                loads.append(path)
+
+        class FakeKaldiRecognizer:
+            def __init__(self, model, sample_rate):
+                self.bytes = 0
+
+            def AcceptWaveform(self, data):
+                self.bytes += len(data)
+
+            def FinalResult(self):
+                return json.dumps({"text": "こんにちは 世界"})
+
+        fake_vosk = types.SimpleNamespace(Model=FakeModel, KaldiRecognizer=FakeKaldiRecognizer)
+        model_dir = self.temp_dir / 'model'
+        model_dir.mkdir()
+        with patch.object(speech_recognizers, 'vosk', fake_vosk, create=True), \
+                patch.object(speech_recognizers, 'VOSK_AVAILABLE', True):
+            first = create_recognizer('vosk', model=str(model_dir))
+            second = create_recognizer('vosk', model=str(model_dir))
+            self.assertEqual(len(loads), 1)
+            self.assertEqual(first.transcribe(np.zeros(SR, dtype=np.float32)), "こんにちは世界")
+            self.assertEqual(load_model(('vosk', str(model_dir.resolve())), lambda: None), second._model)
+
+    def test_processor_batch(self):
+        """The processor reuses one recognizer for speech_to_text and batches."""
+        from src.speech_processor import JapaneseSpeechProcessor
+        self._write("a.wav", speech_like([(0.2, False), (1.0, True), (0.2, False)]))
+        self._write("b.wav", speech_like([(0.2, False), (2.0, True), (0.2, False)]))
+        recognizer = LengthRecognizer()
+        processor = JapaneseSpeechProcessor(str(self.temp_dir), recognizer=recognizer)
+        self.assertEqual(processor.speech_to_text("a.wav"), "[13]")
+        results = processor.speech_to_text_batch(["a.wav", "b.wav"])
+        self.assertEqual([r["text"] for r in results.values()], ["[13]", "[23]"])
+        self.assertEqual(len(recognizer.calls), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -49,6 +49,30 @@ class TestJapaneseTextProcessor(unittest.TestCase):
         content = self.processor.read_text_file('test_japanese.txt')
         self.assertEqual(content, "これはテストです。\n日本語の処理をテストします。")
     
+    def test_iter_text_file_lines(self):
+        """Test streaming a file line by line."""
+        lines = list(self.processor.iter_text_file('test_japanese.txt'))
+        self.assertEqual(lines, ["これはテストです。\n", "日本語の処理をテストします。"])
+
+    def test_iter_text_file_chunks(self):
+        """Test sentence-aligned chunks across multi-byte read boundaries."""
+        text = "あいう。かきくけこ！さし「すせ？」そ" * 50 + "たちつてとなにぬねのはひふへほ"
+        big_file = self.test_data_dir / 'test_stream.txt'
+        with open(big_file, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+        chunks = list(self.processor.iter_text_file(str(big_file.resolve()), chunk_size=12, read_size=7))
+
+        self.assertEqual("".join(chunks), text)
+        self.assertTrue(all(len(chunk) <= 12 for chunk in chunks))
+        self.assertEqual(chunks[:2], ["あいう。かきくけこ！", "さし「すせ？」そあいう。"])
+        # No sentence end fits in the last window, so it is cut at chunk_size
+        self.assertEqual(chunks[-2:], ["」そたちつてとなにぬねの", "はひふへほ"])
+
+        # A read buffer holding many chunks at once cuts them the same way
+        self.assertEqual(list(self.processor.iter_text_file(str(big_file.resolve()), chunk_size=12,
+                                                            read_size=1 << 16)), chunks)
+
     def test_read_markdown_file(self):
         """Test reading a Japanese markdown file."""
         structure = self.processor.read_markdown_file('test_japanese.md')
@@ -65,6 +89,25 @@ class TestJapaneseTextProcessor(unittest.TestCase):
         # Check code blocks
         self.assertEqual(len(structure['code_blocks']), 1)
         self.assertEqual(structure['code_blocks'][0], "コードブロック")
+
+    def test_read_markdown_file_skips_code(self):
+        """Test that markers inside fenced code blocks are not counted."""
+        md_file = self.test_data_dir / 'test_code.md'
+        with open(md_file, 'w', encoding='utf-8') as f:
+            f.write("- 項目\n  ~~~\n- コード内\n  ~~~\n```python\n# コメント\n1. 番号\n```\n1. 本文")
+
+        structure = self.processor.read_markdown_file('test_code.md')
+
+        self.assertEqual(structure['headers'], [])
+        self.assertEqual(structure['bullet_lists'], ["項目"])
+        self.assertEqual(structure['numbered_lists'], ["本文"])
+        self.assertEqual(structure['code_blocks'], ["- コード内", "# コメント\n1. 番号"])
+        self.assertEqual(structure['paragraphs'], [])
+        self.assertNotIn('elements', structure)
+
+        elements = self.processor.read_markdown_file('test_code.md', elements=True)['elements']
+        self.assertEqual([(e.kind, e.line) for e in elements],
+                         [('bullet', 0), ('code', 1), ('code', 4), ('numbered', 8)])
     
     def test_write_text_file(self):
         """Test writing Japanese text to a file."""
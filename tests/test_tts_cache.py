@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the synthesis cache.
+"""
+
+import sys
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.tts_cache import SynthesisCache, make_cache_key
+from src import tts_engines
+from src.speech_processor_gtts import JapaneseSpeechProcessor
+
+
+def _fake_synthesize(text, lang, slow, **options):
+    """Google TTS stand-in returning deterministic bytes."""
+    return b"ID3" + text.encode('utf-8')
+
+
+class TestSynthesisCache(unittest.TestCase):
+    """Test cases for the SynthesisCache class."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.cache = SynthesisCache(self.temp_dir / 'cache', max_bytes=1024)
+
+    def tearDown(self):
+        """Clean up after the tests."""
+        shutil.rmtree(self.temp_dir)
+
+    def _audio_file(self, name: str, size: int) -> Path:
+        path = self.temp_dir / name
+        path.write_bytes(b"x" * size)
+        return path
+
+    def test_cache_key_normalization(self):
+        """Whitespace differences map to the same key, options do not."""
+        key = make_cache_key("こんにちは、 世界。")
+        self.assertEqual(key, make_cache_key("  こんにちは、\n世界。 "))
+        self.assertNotEqual(key, make_cache_key("こんにちは、 世界。", slow=True))
+        self.assertNotEqual(key, make_cache_key("こんにちは、 世界。", lang='en'))
+        self.assertNotEqual(key, make_cache_key("こんにちは、 世界。", engine='pyttsx3'))
+
+    def test_hit_and_miss_counters(self):
+        """A stored entry is served on the next lookup."""
+        key = make_cache_key("テスト")
+        output = self.temp_dir / 'out.mp3'
+
+        self.assertFalse(self.cache.get(key, output))
+        self.cache.put(key, self._audio_file('source.mp3', 100))
+        self.assertTrue(self.cache.get(key, output))
+        self.assertEqual(output.read_bytes(), b"x" * 100)
+
+        stats = self.cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hit_ratio"], 0.5)
+
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted when the size limit is exceeded."""
+        keys = [make_cache_key(f"文{i}") for i in range(3)]
+        self.cache.put(keys[0], self._audio_file('a.mp3', 400))
+        self.cache.put(keys[1], self._audio_file('b.mp3', 400))
+
+        # Touch the first entry so the second becomes least recently used
+        self.assertTrue(self.cache.get(keys[0], self.temp_dir / 'out.mp3'))
+        self.cache.put(keys[2], self._audio_file('c.mp3', 400))
+
+        self.assertTrue(self.cache.contains(keys[0]))
+        self.assertFalse(self.cache.contains(keys[1]))
+        self.assertTrue(self.cache.contains(keys[2]))
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+    def test_index_survives_restart(self):
+        """Entries written by one instance are visible to the next."""
+        key = make_cache_key("再起動")
+        self.cache.put(key, self._audio_file('source.mp3', 10))
+
+        reopened = SynthesisCache(self.temp_dir / 'cache', max_bytes=1024)
+        self.assertTrue(reopened.get(key, self.temp_dir / 'out.mp3'))
+
+    def test_processor_hit_skips_engine(self):
+        """A repeated request is served from the cache without calling gTTS."""
+        processor = JapaneseSpeechProcessor(str(self.temp_dir / 'audio'),
+                                            cache_dir=str(self.temp_dir / 'cache'))
+        with patch.object(tts_engines, 'GTTS_AVAILABLE', True), \
+                patch.object(tts_engines, 'google_synthesize', side_effect=_fake_synthesize) as mock_gtts:
+            processor.text_to_speech("同じ文です。", "first.mp3")
+            processor.text_to_speech("同じ文です。", "second.mp3")
+            # Re-rendering over a hardlinked output must not corrupt the entry
+            processor.text_to_speech("別の文です。", "second.mp3")
+            processor.text_to_speech("同じ文です。", "third.mp3")
+
+        self.assertEqual(mock_gtts.call_count, 2)
+        expected = b"ID3" + "同じ文です。".encode('utf-8')
+        self.assertEqual((self.temp_dir / 'audio' / 'first.mp3').read_bytes(), expected)
+        self.assertEqual((self.temp_dir / 'audio' / 'third.mp3').read_bytes(), expected)
+        self.assertEqual(processor.cache.stats()["hits"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for chunked speech synthesis.
+"""
+
+import io
+import sys
+import time
+import wave
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.tts_chunking import (split_sentences, split_for_streaming, strip_id3, concat_mp3, synthesize_chunks,
+                              iter_synthesized, streaming_wav_header)
+from src import tts_engines
+from src.speech_processor_gtts import JapaneseSpeechProcessor
+
+# Simulated latency of one remote synthesis request
+STUB_LATENCY = 0.05
+
+
+def _stub_engine(text: str) -> bytes:
+    """Local stand-in for Google TTS: slow, deterministic and tagged."""
+    time.sleep(STUB_LATENCY)
+    return b"ID3\x04\x00\x00\x00\x00\x00\x02XX" + text.encode('utf-8')
+
+
+class TestChunkedSynthesis(unittest.TestCase):
+    """Test cases for sentence-level chunked synthesis."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.sentences = [f"これは{i}番目の文です。" for i in range(8)]
+
+    def tearDown(self):
+        """Clean up after the tests."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_split_sentences(self):
+        """Text is split on Japanese terminators and newlines."""
+        text = "こんにちは。元気ですか？「はい！」\n\n見出し\n最後の文"
+        self.assertEqual(split_sentences(text),
+                         ["こんにちは。", "元気ですか？", "「はい！」", "見出し", "最後の文"])
+
+    def test_split_sentences_packing(self):
+        """Short sentences are packed up to max_chars."""
+        chunks = split_sentences("あ。い。う。えおかきく。", max_chars=5)
+        self.assertEqual(chunks, ["あ。\nい。", "う。", "えおかきく。"])
+
+    def test_split_sentences_packs_across_lines(self):
+        """Lines end sentences, but short lines are packed into one chunk."""
+        self.assertEqual(split_sentences("見出し\n本文です\n\n次の行", max_chars=20),
+                         ["見出し\n本文です\n次の行"])
+        self.assertEqual(split_sentences("見出し\n本文です\n\n次の行", max_chars=8),
+                         ["見出し\n本文です", "次の行"])
+
+    def test_concat_strips_tags(self):
+        """ID3 tags of the individual chunks are removed before joining."""
+        self.assertEqual(strip_id3(b"ID3\x04\x00\x00\x00\x00\x00\x02XXframes"), b"frames")
+        tag = b"ID3\x04\x00\x00\x00\x00\x00\x02XX"
+        self.assertEqual(concat_mp3([tag + b"first", tag + b"second"]), b"firstsecond")
+
+    def test_order_is_preserved(self):
+        """Chunks finishing out of order are still returned in document order."""
+        def engine(text):
+            time.sleep(0.01 * (len(self.sentences) - int(text[3])))
+            return text.encode('utf-8')
+
+        results = synthesize_chunks(self.sentences, engine, max_workers=4)
+        self.assertEqual(results, [s.encode('utf-8') for s in self.sentences])
+
+    def test_wall_clock_scales_with_workers(self):
+        """More workers finish the same document proportionally faster."""
+        timings = {}
+        for workers in (1, 4):
+            start = time.perf_counter()
+            synthesize_chunks(self.sentences, _stub_engine, max_workers=workers)
+            timings[workers] = time.perf_counter() - start
+
+        self.assertGreaterEqual(timings[1], STUB_LATENCY * len(self.sentences))
+        self.assertLess(timings[4], timings[1] / 2)
+
+    def test_processor_chunked_mode(self):
+        """The processor writes the concatenated chunks to one MP3 file."""
+        processor = JapaneseSpeechProcessor(str(self.temp_dir))
+        text = "\n".join(self.sentences)
+
+        with patch.object(tts_engines, 'GTTS_AVAILABLE', True), \
+                patch.object(processor, 'chunk_max_chars', 0), \
+                patch.object(processor, '_synthesize_bytes', side_effect=_stub_engine) as engine:
+            processor.text_to_speech(text, "chunked.mp3", chunked=True, max_workers=4)
+
+        self.assertEqual(engine.call_count, len(self.sentences))
+        expected = "".join(self.sentences).encode('utf-8')
+        self.assertEqual((self.temp_dir / "chunked.mp3").read_bytes(), expected)
+
+
+    def test_split_for_streaming(self):
+        """The first sentence stands alone and the rest are packed."""
+        chunks = split_for_streaming("あ。い。う。えおかきく。", max_chars=5)
+        self.assertEqual(chunks, ["あ。", "い。\nう。", "えおかきく。"])
+        self.assertEqual(split_for_streaming("  \n", max_chars=5), [])
+
+    def test_iter_synthesized_order(self):
+        """Streamed chunks are yielded in document order."""
+        def engine(text):
+            time.sleep(0.01 * (len(self.sentences) - int(text[3])))
+            return text.encode('utf-8')
+
+        results = list(iter_synthesized(self.sentences, engine, max_workers=4))
+        self.assertEqual(results, [s.encode('utf-8') for s in self.sentences])
+
+    def test_iter_synthesized_first_chunk_early(self):
+        """The first chunk arrives after one request, not after the whole document."""
+        start = time.perf_counter()
+        stream = iter_synthesized(self.sentences, _stub_engine, max_workers=2)
+        next(stream)
+        first = time.perf_counter() - start
+        stream.close()
+
+        self.assertLess(first, STUB_LATENCY * len(self.sentences) / 2)
+
+    def test_iter_synthesized_close_cancels(self):
+        """Closing the stream early leaves the remaining chunks unsynthesized."""
+        calls = []
+
+        def engine(text):
+            calls.append(text)
+            time.sleep(0.01)
+            return text.encode('utf-8')
+
+        stream = iter_synthesized(self.sentences, engine, max_workers=2)
+        next(stream)
+        stream.close()
+        self.assertLess(len(calls), len(self.sentences))
+
+    def test_streaming_wav_header(self):
+        """The streaming header is a valid WAV header for the PCM that follows."""
+        frames = b"\x00\x01" * 100
+        data = streaming_wav_header(1, 2, 22050) + frames
+        self.assertEqual(len(data) - len(frames), 44)
+        with wave.open(io.BytesIO(data), 'rb') as wav_file:
+            self.assertEqual(wav_file.getnchannels(), 1)
+            self.assertEqual(wav_file.getsampwidth(), 2)
+            self.assertEqual(wav_file.getframerate(), 22050)
+            self.assertEqual(wav_file.readframes(100), frames)
+
+    def test_processor_stream(self):
+        """The processor streams the chunks, which join to the chunked MP3."""
+        processor = JapaneseSpeechProcessor(str(self.temp_dir))
+        text = "\n".join(self.sentences)
+
+        with patch.object(tts_engines, 'GTTS_AVAILABLE', True), \
+                patch.object(processor, 'chunk_max_chars', 0), \
+                patch.object(processor, '_synthesize_bytes', side_effect=_stub_engine):
+            chunks = list(processor.stream_text_to_speech(text, max_workers=4))
+
+        self.assertEqual(chunks, [s.encode('utf-8') for s in self.sentences])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,243 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the TTS engine registry.
+"""
+
+import io
+import sys
+import wave
+import shutil
+import asyncio
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.tts_engines import TTSEngine, register_engine, engine_names, create_engine, _REGISTRY
+from src.tts_chunking import concat_wav, iter_stream_frames
+from src.speech_processor_engine import EngineSpeechProcessor
+from src.speech_processor_gtts import JapaneseSpeechProcessor
+from src.speech_processor_multi import JapaneseSpeechProcessorMulti
+
+TEXT = "こんにちは。今日は良い天気ですね。散歩に行きましょう。"
+
+
+class SilentEngine(TTSEngine):
+    """Dependency-free engine producing silence of the expected speech duration."""
+
+    name = 'silent'
+    label = 'Silent'
+    audio_format = 'wav'
+    max_chunk_chars = 200
+    max_concurrency = 16
+    offline = True
+
+    # Speaking rate used to size the silence, in characters per second
+    CHARS_PER_SECOND = 5
+    SAMPLE_RATE = 16000
+
+    def __init__(self, **options):
+        self.options = options
+
+    def synthesize(self, text):
+        frames = int(max(1, len(text.strip())) / self.CHARS_PER_SECOND * self.SAMPLE_RATE)
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(self.SAMPLE_RATE)
+            wav_file.writeframes(b"\x00\x00" * frames)
+        return buffer.getvalue()
+
+
+class UnavailableEngine(TTSEngine):
+    """Engine whose dependency is missing."""
+
+    name = 'unavailable'
+
+    @property
+    def available(self):
+        return False
+
+
+class TestEngineRegistry(unittest.TestCase):
+    """Test cases for registering and creating engines."""
+
+    def test_builtin_engines(self):
+        """The bundled engines are registered by name."""
+        self.assertEqual(sorted(engine_names()), ['gtts', 'pyttsx3'])
+
+    def test_unknown_engine(self):
+        """Unknown names raise ValueError listing the registered engines."""
+        with self.assertRaises(ValueError) as cm:
+            create_engine('espeak-ng')
+        self.assertIn('gtts', str(cm.exception))
+
+    def test_register_engine(self):
+        """A registered engine is created by name."""
+        with patch.dict(_REGISTRY, {'silent': SilentEngine}):
+            self.assertIsInstance(create_engine('silent'), SilentEngine)
+
+    def test_register_and_unavailable(self):
+        """Registered engines are created by name; unavailable ones are rejected."""
+        register_engine('unavailable', UnavailableEngine)
+        try:
+            with self.assertRaises(RuntimeError):
+                create_engine('unavailable')
+            self.assertFalse(create_engine('unavailable', require_available=False).available)
+        finally:
+            del _REGISTRY['unavailable']
+
+    def test_instance_passes_through(self):
+        """An engine instance is used as is."""
+        engine = SilentEngine()
+        self.assertIs(create_engine(engine), engine)
+
+
+class TestWavAudio(unittest.TestCase):
+    """Test cases for WAV chunk handling."""
+
+    def test_silent_engine_duration(self):
+        """The silent engine returns a valid WAV sized by the text length."""
+        audio = SilentEngine().synthesize("あいうえお")
+        with wave.open(io.BytesIO(audio), 'rb') as wav_file:
+            self.assertEqual(wav_file.getframerate(), SilentEngine.SAMPLE_RATE)
+            self.assertEqual(wav_file.getnframes(), SilentEngine.SAMPLE_RATE)
+
+    def test_concat_wav(self):
+        """Concatenated WAV chunks form one file with all frames."""
+        engine = SilentEngine()
+        audio = concat_wav([engine.synthesize("あいうえお"), engine.synthesize("かきくけこあいうえお")])
+        with wave.open(io.BytesIO(audio), 'rb') as wav_file:
+            self.assertEqual(wav_file.getnframes(), 3 * SilentEngine.SAMPLE_RATE)
+
+    def test_stream_frames(self):
+        """A WAV stream has one header followed by the PCM frames of every chunk."""
+        engine = SilentEngine()
+        chunks = [engine.synthesize("あいうえお"), engine.synthesize("かきくけこ")]
+        stream = list(iter_stream_frames(chunks, 'wav'))
+        self.assertEqual(len(stream), 3)
+        self.assertTrue(stream[0].startswith(b"RIFF"))
+        self.assertEqual(len(stream[1]) + len(stream[2]), 4 * SilentEngine.SAMPLE_RATE)
+
+    def test_engine_stream(self):
+        """TTSEngine.stream yields a decodable WAV stream."""
+        data = b"".join(SilentEngine().stream(TEXT))
+        self.assertTrue(data.startswith(b"RIFF"))
+        self.assertGreater(len(data), 44)
+
+
+class TestEngineSpeechProcessor(unittest.TestCase):
+    """Test cases for EngineSpeechProcessor."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        registry = patch.dict(_REGISTRY, {'silent': SilentEngine})
+        registry.start()
+        self.addCleanup(registry.stop)
+        self.processor = EngineSpeechProcessor('silent', str(self.temp_dir),
+                                               cache_dir=str(self.temp_dir / 'cache'))
+
+    def tearDown(self):
+        """Clean up after the tests."""
+        self.processor.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_capabilities(self):
+        """The processor takes format, chunk size and concurrency from the engine."""
+        self.assertEqual(self.processor.audio_format, 'wav')
+        self.assertEqual(self.processor.chunk_max_chars, SilentEngine.max_chunk_chars)
+        self.assertEqual(self.processor.async_concurrency, SilentEngine.max_concurrency)
+
+    def test_chunked_wav(self):
+        """Chunked synthesis writes one WAV file, with no format note."""
+        self.processor.text_to_speech(TEXT, "out.wav", chunked=True, max_workers=4)
+        with wave.open(str(self.temp_dir / "out.wav"), 'rb') as wav_file:
+            self.assertGreater(wav_file.getnframes(), 0)
+        self.assertTrue((self.temp_dir / "out.txt").exists())
+
+    def test_mp3_request_is_redirected(self):
+        """Asking a WAV engine for MP3 saves WAV and leaves a note."""
+        self.processor.text_to_speech(TEXT, "out.mp3")
+        self.assertTrue((self.temp_dir / "out.wav").exists())
+        self.assertIn("Silent can only generate WAV", (self.temp_dir / "out.mp3").read_text(encoding='utf-8'))
+
+    def test_cache_key_per_engine(self):
+        """The cache key includes the engine, so engines never share audio."""
+        silent_key = self.processor._cache_key(TEXT)
+        self.processor.engine_name = 'gtts'
+        self.assertNotEqual(self.processor._cache_key(TEXT), silent_key)
+
+    def test_pipeline_wav(self):
+        """The pipelined mode writes a WAV file with a correct header."""
+        stats = self.processor.pipeline_text_to_speech(["# 見出し\n", TEXT + "\n"], "piped.wav")
+        self.assertEqual(stats["synthesis"]["items"], stats["writer"]["items"])
+        with wave.open(str(self.temp_dir / "piped.wav"), 'rb') as wav_file:
+            self.assertGreater(wav_file.getnframes(), 0)
+
+    def test_async(self):
+        """atext_to_speech runs the engine in an executor."""
+        asyncio.run(self.processor.atext_to_speech(TEXT, "async.wav"))
+        self.assertTrue((self.temp_dir / "async.wav").read_bytes().startswith(b"RIFF"))
+
+    def test_concurrent_writes_to_one_output(self):
+        """Concurrent syntheses to one output leave one complete file and no temporary files."""
+        path = self.temp_dir / "shared.wav"
+        audios = [bytes([i]) * 1_000_000 for i in range(8)]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda audio: self.processor._store_audio(audio, path, None), audios))
+
+        self.assertIn(path.read_bytes(), audios)
+        self.assertEqual([p.name for p in self.temp_dir.iterdir() if p.name.endswith('.tmp')], [])
+
+
+class TestProcessorsUseRegistry(unittest.TestCase):
+    """Test cases for the processors creating their engines from the registry."""
+
+    def setUp(self):
+        """Register the silent engine in place of pyttsx3."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        registry = patch.dict(_REGISTRY, {'pyttsx3': SilentEngine})
+        registry.start()
+        self.addCleanup(registry.stop)
+
+    def tearDown(self):
+        """Clean up after the tests."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_gtts_processor(self):
+        """The gTTS processor is the engine processor with the registered gtts engine."""
+        processor = JapaneseSpeechProcessor(str(self.temp_dir))
+        self.assertIsInstance(processor, EngineSpeechProcessor)
+        self.assertIsInstance(processor.engine, _REGISTRY['gtts'])
+
+    def test_multi_processor(self):
+        """The multi-engine processor synthesizes with the registered engine."""
+        processor = JapaneseSpeechProcessorMulti(str(self.temp_dir), engine='pyttsx3')
+        success, _ = processor.text_to_speech(TEXT, "multi.wav")
+
+        self.assertTrue(success)
+        self.assertIsInstance(processor.engines['pyttsx3'], SilentEngine)
+        self.assertTrue((self.temp_dir / "multi.wav").read_bytes().startswith(b"RIFF"))
+
+    def test_speech_processor(self):
+        """The offline speech processor synthesizes with the registered pyttsx3 engine."""
+        from src import speech_processor
+        with patch.object(speech_processor, 'PYTTSX3_AVAILABLE', True):
+            processor = speech_processor.JapaneseSpeechProcessor(str(self.temp_dir))
+        processor.text_to_speech(TEXT, "offline.wav")
+
+        self.assertIsInstance(processor.tts_engine, SilentEngine)
+        with wave.open(str(self.temp_dir / "offline.wav"), 'rb') as wav_file:
+            self.assertEqual(wav_file.getframerate(), SilentEngine.SAMPLE_RATE)
+
+
+if __name__ == "__main__":
+    unittest.main()
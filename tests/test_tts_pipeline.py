@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the pipelined text-to-speech mode.
+"""
+
+import io
+import sys
+import wave
+import time
+import random
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.tts_pipeline import run_pipeline, pack_sentences
+
+ID3_TAG = b"ID3\x04\x00\x00\x00\x00\x00\x00"
+
+MARKDOWN = """# 見出し
+
+一つ目の文です。二つ目の文です！
+- 項目
+
+```
+print("読まない")
+```
+最後の文です。
+"""
+
+
+class TestSpeechPipeline(unittest.TestCase):
+    """Test cases for run_pipeline."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.output = self.temp_dir / 'out.mp3'
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def tearDown(self):
+        """Clean up after the tests."""
+        shutil.rmtree(self.temp_dir)
+
+    def _engine(self, chunk):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        # Finish out of order to check that the writer restores document order
+        time.sleep(random.uniform(0, 0.02))
+        with self.lock:
+            self.active -= 1
+        return ID3_TAG + f"[{chunk}]".encode('utf-8')
+
+    def test_pack_sentences(self):
+        """Sentences are packed up to max_chars without splitting them."""
+        chunks = list(pack_sentences(["一つ目。二つ目。", "三つ目の長い文です。"], max_chars=9))
+        self.assertEqual(chunks, ["一つ目。\n二つ目。", "三つ目の長い文です。"])
+
+    def test_chunks_are_written_in_order(self):
+        """Audio is appended in document order without per-chunk tags."""
+        written = []
+        stats = run_pipeline(io.StringIO(MARKDOWN), self._engine, self.output, max_workers=3,
+                             max_chars=1, on_chunk=lambda i, audio: written.append(i))
+
+        expected = ["見出し.", "一つ目の文です。", "二つ目の文です！", "項目.", "最後の文です。"]
+        self.assertEqual(self.output.read_bytes(), "".join(f"[{s}]" for s in expected).encode('utf-8'))
+        self.assertEqual(written, list(range(len(expected))))
+        self.assertLessEqual(self.max_active, 3)
+
+        self.assertEqual(stats["reader"]["items"], len(MARKDOWN.splitlines()))
+        self.assertEqual(stats["synthesis"]["items"], len(expected))
+        self.assertEqual(stats["writer"]["items"], len(expected))
+        self.assertLessEqual(stats["time_to_first_audio"], stats["elapsed"])
+
+    def test_plain_text_mode(self):
+        """Without markdown the lines are only segmented."""
+        run_pipeline(["# そのまま。\n"], self._engine, self.output, markdown=False)
+        self.assertEqual(self.output.read_bytes(), "[# そのまま。]".encode('utf-8'))
+
+    def test_writer_counts_every_byte(self):
+        """Writer units include the WAV header, so they add up to the file size."""
+        def wav_engine(chunk):
+            buffer = io.BytesIO()
+            with wave.open(buffer, 'wb') as wav_file:
+                wav_file.setnchannels(1)
+                wav_file.setsampwidth(2)
+                wav_file.setframerate(16000)
+                wav_file.writeframes(b"\x00\x01" * 100)
+            return buffer.getvalue()
+
+        output = self.temp_dir / 'out.wav'
+        stats = run_pipeline(["一つ目。\n", "二つ目。\n"], wav_engine, output, max_chars=1, audio_format='wav')
+        self.assertEqual(stats["writer"]["units"], output.stat().st_size)
+
+    def test_engine_failure_stops_the_pipeline(self):
+        """An engine error is raised to the caller and the stages shut down."""
+        def failing(chunk):
+            raise RuntimeError("engine failure")
+
+        lines = (f"文{i}です。\n" for i in range(10000))
+        with self.assertRaises(RuntimeError):
+            run_pipeline(lines, failing, self.output, max_workers=2)
+        self.assertEqual([t.name for t in threading.enumerate() if t.name.startswith("tts-pipeline")], [])
+
+    def test_failure_mid_pipeline_removes_the_partial_file(self):
+        """A chunk failing after others were written leaves no truncated output."""
+        def failing_later(chunk):
+            if "5" in chunk:
+                raise RuntimeError("engine failure")
+            return chunk.encode('utf-8')
+
+        lines = [f"文{i}です。\n" for i in range(10)]
+        with self.assertRaises(RuntimeError):
+            run_pipeline(lines, failing_later, self.output, max_workers=1, max_chars=1)
+        self.assertFalse(self.output.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the pyttsx3 process pool.
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add the parent directory to the path so we can import the src modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.tts_process_pool import TTSProcessPool, ROUND_ROBIN
+
+
+class FakeEngine:
+    """Stand-in for a pyttsx3 engine that writes the process id and text of each utterance."""
+
+    def __init__(self):
+        self.pending = []
+
+    def save_to_file(self, text, path):
+        if text == "crash":
+            os._exit(1)
+        self.pending.append((text, path))
+
+    def runAndWait(self):
+        time.sleep(0.01)
+        for text, path in self.pending:
+            Path(path).write_text(f"{os.getpid()}:{text}", encoding='utf-8')
+        self.pending = []
+
+
+def fake_engine():
+    return FakeEngine()
+
+
+def broken_engine():
+    raise OSError("no speech driver")
+
+
+class TestTTSProcessPool(unittest.TestCase):
+    """Test cases for TTSProcessPool."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        """Clean up after the tests."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_requests_are_spread_over_processes(self):
+        """Round-robin dispatch renders the requests in every worker process."""
+        with TTSProcessPool(2, fake_engine, policy=ROUND_ROBIN) as pool:
+            self.assertTrue(pool.available)
+            futures = [pool.submit(f"文{i}", self.temp_dir / f"{i}.wav") for i in range(8)]
+            self.assertTrue(all(future.result(timeout=30) for future in futures))
+            self.assertEqual(pool.queue_depth, 0)
+
+        outputs = [(self.temp_dir / f"{i}.wav").read_text(encoding='utf-8') for i in range(8)]
+        self.assertEqual([o.split(":", 1)[1] for o in outputs], [f"文{i}" for i in range(8)])
+        self.assertEqual(len({o.split(":", 1)[0] for o in outputs}), 2)
+        self.assertNotIn(str(os.getpid()), {o.split(":", 1)[0] for o in outputs})
+
+    def test_least_loaded_dispatch(self):
+        """Least-loaded dispatch keeps the per-process queues balanced."""
+        with TTSProcessPool(2, fake_engine) as pool:
+            futures = [pool.submit(f"文{i}", self.temp_dir / f"{i}.wav") for i in range(6)]
+            loads = pool.worker_loads()
+            self.assertLessEqual(max(loads) - min(loads), 1)
+            for future in futures:
+                future.result(timeout=30)
+
+    def test_crashed_worker_is_restarted(self):
+        """A dying process fails its requests and is replaced by a fresh one."""
+        with TTSProcessPool(1, fake_engine) as pool:
+            with self.assertRaises(RuntimeError):
+                pool.save_to_file("crash", self.temp_dir / "crash.wav", timeout=30)
+            self.assertTrue(pool.save_to_file("大丈夫", self.temp_dir / "ok.wav", timeout=30))
+            self.assertEqual(pool.restarts, 1)
+
+    def test_engine_start_failure(self):
+        """A pool whose engines cannot start is unavailable and rejects requests."""
+        pool = TTSProcessPool(2, broken_engine)
+        self.assertFalse(pool.available)
+        self.assertIn("no speech driver", pool.error)
+        with self.assertRaises(RuntimeError):
+            pool.submit("こんにちは", self.temp_dir / "a.wav")
+
+
+if __name__ == "__main__":
+    unittest.main()